@@ -6,7 +6,9 @@ Provides CLI interface to start servers and clients.
 import os
 import subprocess
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 
 import typer
 from rich.console import Console
@@ -17,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from clients import TraderClient
 from servers.obs import OrderBookServer
+from servers.obs.server import run_sharded
 from servers.tes import TradingEngineServer
 from shared.config import Config
 from shared.logging import setup_logger
@@ -44,6 +47,12 @@ def server(
         help="Server to start: [bold cyan]TES[/bold cyan] (Trading Engine Server) or [bold cyan]OBS[/bold cyan] (Order Book Server)",
     ),
     env: str = typer.Option(ENV, help="Environment: dev or prod"),
+    shards: Optional[int] = typer.Option(
+        None,
+        "--shards",
+        min=1,
+        help="Number of OBS shard processes (symbols routed by hash). TES must use the same value.",
+    ),
 ):
     """
     🖥️  Start a trading server (TES or OBS).
@@ -51,7 +60,9 @@ def server(
     [bold cyan]TES[/bold cyan]: Trading Engine Server - manages clients and portfolios
     [bold cyan]OBS[/bold cyan]: Order Book Server - handles order matching
     """
-    Config(env=env)  # Load config for environment
+    config = Config(env=env)  # Load config for environment
+    if shards is None:
+        shards = int(config.get("servers.obs.shards", 1))
 
     name = name.upper()
     if name not in ["TES", "OBS"]:
@@ -62,27 +73,37 @@ def server(
         console.print(
             Panel(
                 "[bold cyan]Trading Engine Server (TES)[/bold cyan]\n"
-                "Client management • Portfolio tracking • Order routing",
+                "Client management • Portfolio tracking • Order routing\n"
+                f"OBS shards: {shards}",
                 title="🚀 Starting Server",
                 border_style="cyan",
             )
         )
         logger.info("Starting Trading Engine Server (TES)")
-        server = TradingEngineServer()
+        server = TradingEngineServer(
+            shards=shards,
+            batch_size=int(config.get("servers.tes.batch_size", 100)),
+            batch_max_delay_ms=float(config.get("servers.tes.batch_max_delay_ms", 5)),
+            user_cache_size=int(config.get("servers.tes.user_cache_size", 100_000)),
+        )
         server.run()
 
     elif name == "OBS":
         console.print(
             Panel(
                 "[bold green]Order Book Server (OBS)[/bold green]\n"
-                "Order matching • Strategy execution • Trade recording",
+                "Order matching • Strategy execution • Trade recording\n"
+                f"Shards: {shards}",
                 title="🚀 Starting Server",
                 border_style="green",
             )
         )
-        logger.info("Starting Order Book Server (OBS)")
-        server = OrderBookServer()
-        server.run()
+        logger.info(f"Starting Order Book Server (OBS) with {shards} shard(s)")
+        if shards > 1:
+            run_sharded(shards)
+        else:
+            server = OrderBookServer()
+            server.run()
 
 
 @app.command()
@@ -174,11 +195,20 @@ def frontend(
 
 
 @app.command()
-def init_mock_data(env: str = typer.Option(ENV, help="Environment (must be dev)")):
+def init_mock_data(
+    env: str = typer.Option(ENV, help="Environment (must be dev)"),
+    scale: Optional[int] = typer.Option(None, help="Generate this many times the default data, vectorized"),
+    users: Optional[int] = typer.Option(None, help="Users with --scale (default 20 x scale)"),
+    seed: Optional[int] = typer.Option(None, help="Random seed for --scale, for reproducible data"),
+    chunk_size: int = typer.Option(1_000_000, help="Rows generated at a time with --scale"),
+    parquet: Optional[Path] = typer.Option(None, help="With --scale, write Parquet files here instead of loading the databases"),
+):
     """
     📊 Initialize database with mock data (dev only).
 
     Creates test users, orders, trades, and instruments for development.
+    With --scale N, generates N times as many rows (e.g. --scale 200000 for 20M orders
+    and 10M trades) as numpy columns streamed in chunks, for load and benchmark datasets.
     """
     if env != "dev":
         console.print(
@@ -188,6 +218,10 @@ def init_mock_data(env: str = typer.Option(ENV, help="Environment (must be dev)"
 
     Config(env=env)  # Load config for environment
 
+    if scale:
+        _init_scaled_mock_data(scale, users, seed, chunk_size, parquet)
+        return
+
     console.print(
         Panel(
             "[bold cyan]Mock Data Generator[/bold cyan]\n"
@@ -223,15 +257,73 @@ def init_mock_data(env: str = typer.Option(ENV, help="Environment (must be dev)"
     logger.info("✅ Mock data initialization complete")
 
 
+def _init_scaled_mock_data(scale: int, users: Optional[int], seed: Optional[int], chunk_size: int, parquet: Optional[Path]):
+    user_count = users or 20 * scale
+    console.print(
+        Panel(
+            f"[bold cyan]Scaled Mock Data Generator[/bold cyan] (x{scale:,}, seed {seed})\n"
+            f"• {user_count:,} test users\n"
+            f"• {100 * scale:,} historical orders\n"
+            f"• {50 * scale:,} executed trades\n"
+            + (f"• Parquet files in {parquet}" if parquet else "• 10 trading instruments\n• Portfolio positions and analytics"),
+            title="📊 Initializing Mock Data",
+            border_style="cyan",
+        )
+    )
+
+    logger.info(f"Initializing scaled mock data (x{scale})...")
+
+    from shared.mock_data import initialize_scaled_mock_data, write_mock_parquet
+
+    start = time.perf_counter()
+    with console.status("[bold cyan]Generating mock data...", spinner="dots"):
+        if parquet:
+            try:
+                write_mock_parquet(parquet, scale, users, seed, chunk_size)
+            except RuntimeError as e:
+                console.print(f"[bold red]Error:[/bold red] {e}")
+                raise typer.Exit(1)
+        else:
+            from database.analytics import AnalyticsDB
+            from database.transactional import TransactionalDB
+            from database.utilities import ModelParamsDB
+
+            trans_db = TransactionalDB()
+            analytics_db = AnalyticsDB()
+            utilities_db = ModelParamsDB()
+
+            initialize_scaled_mock_data(
+                trans_db, analytics_db, utilities_db, scale=scale, users=users, seed=seed, chunk_size=chunk_size
+            )
+
+            trans_db.close()
+            analytics_db.close()
+            utilities_db.close()
+
+    console.print(
+        f"\n[bold green]✅ Mock data initialization complete![/bold green] [dim]({time.perf_counter() - start:,.1f} s)[/dim]"
+    )
+    logger.info("✅ Scaled mock data initialization complete")
+
+
 @app.command()
 def simulated_traders(
     count: int = typer.Argument(..., help="Number of simulated traders to start"),
+    rate: Optional[float] = typer.Option(None, help="Target orders/sec over all traders (default from trade_frequency)"),
+    duration: Optional[float] = typer.Option(None, help="Seconds to run (default: until Ctrl+C)"),
+    workers: int = typer.Option(1, help="Worker processes, each with one event loop and connection"),
+    seed: Optional[int] = typer.Option(None, help="Random seed for reproducible schedules and orders"),
+    report: Optional[Path] = typer.Option(None, help="Write a JSON latency report (p50/p99/p99.9/max, throughput) here"),
+    per_second: bool = typer.Option(True, help="Print latency percentiles every second"),
     env: str = typer.Option(ENV, help="Environment (must be dev)"),
 ):
     """
     🤖 Start simulated traders (dev only).
 
     Automated bots that place random orders for testing the system.
+    Orders arrive open loop (Poisson, at --rate orders/sec), so thousands of
+    traders can run from a few workers. Submit -> ack and submit -> fill latencies
+    are printed every second and summarized at the end.
     """
     if env != "dev":
         console.print(
@@ -242,12 +334,14 @@ def simulated_traders(
     config = Config(env=env)
     dev_config = config.get_dev_config()
     trade_freq = dev_config.get("simulated_traders", {}).get("trade_frequency", 5.0)
+    rate = rate or count / trade_freq
 
     console.print(
         Panel(
             f"[bold green]Simulated Traders[/bold green]\n"
-            f"• Count: {count} traders\n"
-            f"• Trade Frequency: ~{trade_freq}s between trades\n"
+            f"• Count: {count:,} traders\n"
+            f"• Rate: {rate:,.1f} orders/sec over all traders\n"
+            f"• Workers: {workers}\n"
             f"• Symbols: AAPL, GOOGL, MSFT, TSLA, AMZN\n"
             f"• Press [bold red]Ctrl+C[/bold red] to stop",
             title="🤖 Starting Simulated Traders",
@@ -255,11 +349,19 @@ def simulated_traders(
         )
     )
 
-    logger.info(f"Starting {count} simulated traders...")
+    logger.info(f"Starting {count} simulated traders at {rate:,.1f} orders/sec...")
 
     from clients.simulated_traders import run_simulated_traders
 
-    run_simulated_traders(count=count, trade_frequency=trade_freq)
+    run_simulated_traders(
+        count=count,
+        rate=rate,
+        duration=duration,
+        workers=workers,
+        seed=seed,
+        per_second=per_second,
+        report_path=report,
+    )
 
 
 if __name__ == "__main__":
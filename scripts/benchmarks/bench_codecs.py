@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Message codec benchmark.
+
+Reports encode and decode nanoseconds per message, and body bytes on the wire, for the
+JSON and binary codecs. It uses the OrderMessage the TES routes to the OBS and the
+TradeMessage the OBS publishes for each fill.
+
+Usage:
+    python scripts/benchmarks/bench_codecs.py [--messages 200000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from messaging.codecs import get_codec
+
+console = Console()
+
+SYMBOLS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA"]
+
+
+def orders(n, seed=7):
+    rng = random.Random(seed)
+    now = time.time()
+    return [
+        {
+            "action": "place_order",
+            "order_id": i + 1,
+            "user_id": rng.randint(1, 10_000),
+            "symbol": rng.choice(SYMBOLS),
+            "side": rng.choice(("buy", "sell")),
+            "quantity": float(rng.randint(1, 500)),
+            "price": round(rng.uniform(50, 500), 2),
+            "order_type": "limit",
+            "timestamp": now + i * 1e-4,
+        }
+        for i in range(n)
+    ]
+
+
+def trades(n, seed=11):
+    rng = random.Random(seed)
+    now = time.time()
+    result = []
+    for i in range(n):
+        symbol = rng.choice(SYMBOLS)
+        result.append(
+            {
+                "event": "trade_executed",
+                "trade_id": f"{symbol}-{i + 1}",
+                "symbol": symbol,
+                "buyer_id": rng.randint(1, 10_000),
+                "seller_id": rng.randint(1, 10_000),
+                "buy_order_id": rng.randint(1, 10_000_000),
+                "sell_order_id": rng.randint(1, 10_000_000),
+                "quantity": float(rng.randint(1, 500)),
+                "price": round(rng.uniform(50, 500), 2),
+                "timestamp": now + i * 1e-4,
+                "buy_order_status": rng.choice(("filled", "partially_filled")),
+                "sell_order_status": rng.choice(("filled", "partially_filled")),
+            }
+        )
+    return result
+
+
+def measure(codec, messages):
+    """Return encode ns/msg, decode ns/msg and mean body bytes."""
+    encode = codec.encode
+    start = time.perf_counter()
+    encoded = [encode(m) for m in messages]
+    encode_ns = (time.perf_counter() - start) / len(messages) * 1e9
+
+    decode = codec.decode
+    bodies = [body for _, body in encoded]
+    start = time.perf_counter()
+    decoded = [decode(b) for b in bodies]
+    decode_ns = (time.perf_counter() - start) / len(messages) * 1e9
+
+    if decoded != messages:
+        raise AssertionError(f"{codec.name} codec did not round-trip")
+    return encode_ns, decode_ns, sum(map(len, bodies)) / len(bodies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message codec benchmark")
+    parser.add_argument("--messages", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rows = []
+    with console.status("[cyan]Encoding and decoding...", spinner="dots"):
+        for kind, messages in (("OrderMessage", orders(args.messages)), ("TradeMessage", trades(args.messages))):
+            for name in ("json", "binary"):
+                rows.append((kind, name, *measure(get_codec(name), messages)))
+
+    table = Table(
+        title=f"📦 Message Codecs ({args.messages:,} messages)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Message", style="cyan")
+    table.add_column("Codec", style="cyan")
+    table.add_column("Encode ns/msg", justify="right", style="yellow")
+    table.add_column("Decode ns/msg", justify="right", style="yellow")
+    table.add_column("Bytes/msg", justify="right", style="green")
+    for kind, name, encode_ns, decode_ns, size in rows:
+        table.add_row(kind, name, f"{encode_ns:,.0f}", f"{decode_ns:,.0f}", f"{size:.1f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Daily PnL benchmark.
+
+Records --days days of fills (--trades per day) in a transactional trades table and
+closes each day two ways:
+  - rescan: an end-of-day job with no state rebuilds every position from all trades
+    recorded so far, so each day costs more than the last
+  - incremental: one PnLEngine consumes only that day's new trades and closes the day
+
+Reports the time to close the first and last day, the trades read, and whether both
+produce the same daily_pnl rows.
+
+Usage:
+    python scripts/benchmarks/bench_daily_pnl.py [--days 20] [--trades 50000] [--users 1000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.analytics import AnalyticsDB, PnLEngine
+from database.transactional import TransactionalDB
+
+console = Console()
+
+SYMBOLS = ["AAPL", "GOOGL", "MSFT", "TSLA", "AMZN", "META", "NVDA", "JPM", "BAC", "WMT"]
+
+
+def record_day(conn, day, trades, users, rng):
+    date = f"2025-02-{day + 1:02d}"
+    rows = []
+    for i in range(trades):
+        second = i * 23_400 // trades
+        rows.append((
+            rng.randint(1, users),
+            rng.choice(SYMBOLS),
+            rng.choice(("buy", "sell")),
+            float(rng.randint(1, 20) * 10),
+            round(rng.uniform(95, 105), 2),
+            f"{date} {9 + second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}",
+        ))
+    conn.executemany(
+        "INSERT INTO trades (user_id, symbol, side, quantity, price, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    return date
+
+
+def rescan(conn, date):
+    """Close ``date`` from scratch: replay every trade up to its end."""
+    engine = PnLEngine()
+    previous = None
+    for user_id, symbol, side, quantity, price, timestamp in conn.execute(
+        "SELECT user_id, symbol, side, quantity, price, timestamp FROM trades "
+        "WHERE timestamp < ? ORDER BY id",
+        (date + " 99",),
+    ):
+        day = timestamp[:10]
+        if previous is not None and day != previous:
+            engine.close_day(previous)
+        previous = day
+        engine.on_trade(user_id, symbol, side, quantity, price)
+    rows = engine.close_day(date)
+    return rows, engine.trades_processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily PnL benchmark")
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--trades", type=int, default=50_000, help="Trades per day")
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    results = {"rescan": [], "incremental": []}
+    same = True
+    with tempfile.TemporaryDirectory() as root:
+        trans_db = TransactionalDB(Path(root) / "trading.db")
+        analytics_db = AnalyticsDB(Path(root) / "analytics.db")
+        engine = PnLEngine()
+        for day in range(args.days):
+            with console.status(f"[cyan]Day {day + 1}/{args.days}...", spinner="dots"):
+                date = record_day(trans_db.conn, day, args.trades, args.users, rng)
+
+                start = time.perf_counter()
+                expected, read = rescan(trans_db.conn, date)
+                results["rescan"].append((time.perf_counter() - start, read))
+
+                before = engine.trades_processed
+                start = time.perf_counter()
+                engine.consume(trans_db.conn)
+                rows = engine.write_day(analytics_db)
+                results["incremental"].append((time.perf_counter() - start, engine.trades_processed - before))
+
+                same = same and len(rows) == len(expected) and all(
+                    a[0] == b[0] and abs(a[4] - b[4]) < 1e-6 for a, b in zip(rows, expected)
+                )
+        analytics_db.close()
+        trans_db.close()
+
+    table = Table(
+        title=f"📈 Daily PnL ({args.days} days × {args.trades:,} trades, {args.users:,} users)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Close", style="cyan")
+    table.add_column("Day 1", justify="right")
+    table.add_column(f"Day {args.days}", justify="right", style="green")
+    table.add_column("Trades read, total", justify="right")
+    table.add_column("All days", justify="right", style="yellow")
+    for label, runs in results.items():
+        table.add_row(
+            label,
+            f"{runs[0][0] * 1000:,.0f} ms",
+            f"{runs[-1][0] * 1000:,.0f} ms",
+            f"{sum(n for _, n in runs):,}",
+            f"{sum(t for t, _ in runs):,.2f} s",
+        )
+    console.print(table)
+    console.print(f"Same daily_pnl rows: {'[green]yes[/green]' if same else '[red]NO[/red]'}")
+
+
+if __name__ == "__main__":
+    main()
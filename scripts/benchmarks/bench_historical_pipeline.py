@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Trade history off the matching thread benchmark.
+
+Feeds trades at a fixed rate, as the OBS matching loop would, into:
+  - inline: HistoricalWriter, which inserts a full batch on the caller's thread
+  - pipeline: HistoricalPipeline, which inserts from a background thread and journals
+    to disk while kdb+ is down
+
+The target is the stand-in q from bench_historical_writer.py, with a slow insert
+(--rtt-ms), and optionally down for the middle 40% of the run. For each case it
+reports the time the caller spends per trade, and whether every trade reached the
+stand-in exactly once.
+
+Usage:
+    python scripts/benchmarks/bench_historical_pipeline.py [--trades 50000] [--rate 20000] [--rtt-ms 5]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+import numpy as np
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from bench_historical_writer import StandInQ, generate
+from database.historical import BufferFullError, HistoricalPipeline, HistoricalWriter
+
+console = Console()
+
+
+class StandInKdb:
+    """The stand-in database: refuses calls while down and keeps every trade id it stores."""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.down = False
+        self.ids = []
+        self.connections = []
+
+    def connect(self):
+        if self.down:
+            raise ConnectionError("stand-in q is down")
+        connection = _Connection(self)
+        self.connections.append(connection)
+        return connection
+
+
+class _Connection(StandInQ):
+    def __init__(self, kdb):
+        super().__init__(kdb.rtt)
+        self.kdb = kdb
+
+    def __call__(self, query, *args):
+        if self.kdb.down:
+            raise ConnectionError("stand-in q is down")
+        super().__call__(query, *args)
+        self.kdb.ids.extend(args[1][0])
+
+
+def feed(trades, rate, add, kdb, outage):
+    """Add trades at ``rate`` per second; returns per-add times in µs and trades add() refused."""
+    times = np.empty(len(trades))
+    refused = 0
+    start = time.perf_counter()
+    for i, trade in enumerate(trades):
+        target = start + i / rate
+        now = time.perf_counter()
+        if now < target:
+            time.sleep(target - now)
+        if outage:
+            kdb.down = outage[0] <= i < outage[1]
+        t0 = time.perf_counter()
+        try:
+            add(trade)
+        except BufferFullError:
+            refused += 1
+        times[i] = time.perf_counter() - t0
+    kdb.down = False
+    return times * 1e6, refused
+
+
+def run(kind, trades, rate, rtt, outage, journal_dir):
+    kdb = StandInKdb(rtt)
+    outage = (len(trades) * 2 // 5, len(trades) * 4 // 5) if outage else None
+    if kind == "inline":
+        writer = HistoricalWriter(kdb.connect(), batch_size=1000, flush_interval=0.5, max_rows=10_000, block_timeout=0.05)
+    else:
+        writer = HistoricalPipeline(
+            kdb.connect, Path(journal_dir) / f"{kind}-{bool(outage)}.journal", batch_size=1000,
+            flush_interval=0.5, reconnect_delay=0.1,
+        )
+    times, refused = feed(trades, rate, writer.add_trade, kdb, outage)
+    start = time.perf_counter()
+    writer.close()
+    drain = time.perf_counter() - start
+    for connection in kdb.connections:
+        connection.close()
+    counts = Counter(kdb.ids)
+    expected = {trade["id"] for trade in trades}
+    lost = len(expected - counts.keys())
+    duplicates = sum(n - 1 for n in counts.values() if n > 1)
+    spilled = getattr(writer, "rows_spilled", 0) + getattr(writer, "rows_overflowed", 0)
+    return times, refused, drain, lost, duplicates, spilled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trade history off the matching thread benchmark")
+    parser.add_argument("--trades", type=int, default=50_000)
+    parser.add_argument("--rate", type=float, default=20_000, help="Trades per second")
+    parser.add_argument("--rtt-ms", type=float, default=5.0, help="Stand-in delay per insert call")
+    args = parser.parse_args()
+
+    # Failed writes during the outage are expected; the table reports the outcome
+    logging.getLogger("database.historical").setLevel(logging.CRITICAL)
+
+    trades = generate(args.trades)
+    rows = []
+    with tempfile.TemporaryDirectory() as journal_dir:
+        for kind, outage in (("inline", False), ("pipeline", False), ("inline", True), ("pipeline", True)):
+            label = f"{kind}{' (down)' if outage else ''}"
+            with console.status(f"[cyan]{label}...", spinner="dots"):
+                rows.append((label, *run(kind, trades, args.rate, args.rtt_ms / 1000, outage, journal_dir)))
+
+    table = Table(
+        title=f"🧵 Trade History Off the Matching Thread ({args.trades:,} trades at {args.rate:,.0f}/s, {args.rtt_ms:g} ms inserts)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Writer", style="cyan")
+    table.add_column("add() µs p50 / p99 / max", justify="right", style="green")
+    table.add_column("Journaled", justify="right")
+    table.add_column("close() s", justify="right")
+    table.add_column("Lost", justify="right", style="red")
+    table.add_column("Dupes", justify="right")
+    for label, times, _, drain, lost, duplicates, spilled in rows:
+        p50, p99 = np.percentile(times, [50, 99])
+        table.add_row(
+            label,
+            f"{p50:.1f} / {p99:.1f} / {times.max():,.0f}",
+            f"{spilled:,}",
+            f"{drain:.2f}",
+            f"{lost:,}",
+            f"{duplicates:,}",
+        )
+    console.print(table)
+    console.print(
+        "[dim](down): kdb+ unreachable for the middle 40% of trades. Inline writes block the caller "
+        "for a whole insert every batch and drop trades once its buffer stays full; the pipeline "
+        "journals them and replays after reconnecting.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
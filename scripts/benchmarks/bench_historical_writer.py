@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+KDB+ trade ingestion benchmark.
+
+Writes a stream of OBS-style trades through HistoricalWriter and compares:
+  - per-row: batch_size=1, one insert round trip per trade (the old insert_trade path)
+  - batched: columnar batches of several sizes, one insert round trip per batch
+  - backpressure: batched writes while kdb+ is unreachable for part of the run
+
+By default the target is a stand-in q process: a thread on the other end of a local
+socket that receives each pickled insert, unpickles it and acknowledges it, after an
+optional extra delay per call. Pass --kdb host:port to write to a real q process
+loaded with src/database/historical/schemas.q instead (needs a pykx license).
+
+Usage:
+    python scripts/benchmarks/bench_historical_writer.py [--trades 100000] [--rtt-us 50] [--kdb localhost:8080]
+"""
+
+import argparse
+import logging
+import pickle
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.historical.writer import BufferFullError, HistoricalWriter
+
+console = Console()
+
+SYMBOLS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA"]
+
+
+class StandInQ:
+    """
+    Called like a pykx QConnection; sends every call over a socket to a server thread.
+
+    The server acknowledges after ``rtt`` extra seconds. While ``down`` is set, calls
+    fail the way a dropped connection would.
+    """
+
+    def __init__(self, rtt=0.0):
+        self.client, server = socket.socketpair()
+        self.rtt = rtt
+        self.down = False
+        self.calls = 0
+        self.rows = 0
+        self.thread = threading.Thread(target=self._serve, args=(server,), daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def _read(sock, n):
+        data = bytearray()
+        while len(data) < n:
+            chunk = sock.recv(n - len(data))
+            if not chunk:
+                return None
+            data.extend(chunk)
+        return bytes(data)
+
+    def _serve(self, sock):
+        while True:
+            header = self._read(sock, 8)
+            if header is None:
+                return
+            query, table, columns = pickle.loads(self._read(sock, struct.unpack("<Q", header)[0]))
+            self.rows += len(columns[0])
+            if self.rtt:
+                time.sleep(self.rtt)
+            sock.sendall(b"\x01")
+
+    def __call__(self, query, *args):
+        if self.down:
+            raise ConnectionError("stand-in q is down")
+        payload = pickle.dumps((query, *args), protocol=pickle.HIGHEST_PROTOCOL)
+        self.client.sendall(struct.pack("<Q", len(payload)) + payload)
+        self._read(self.client, 1)
+        self.calls += 1
+
+    def close(self):
+        self.client.close()
+
+
+def generate(n, seed=3):
+    rng = random.Random(seed)
+    now = time.time()
+    return [
+        {
+            "id": f"T-{i}",
+            "timestamp": now + i * 1e-4,
+            "symbol": rng.choice(SYMBOLS),
+            "quantity": float(rng.randint(1, 100)),
+            "price": round(rng.uniform(100, 200), 2),
+            "buyer": rng.randint(1, 500),
+            "seller": rng.randint(1, 500),
+        }
+        for i in range(n)
+    ]
+
+
+def write_all(q, trades, batch_size, outage=None, max_rows=10_000):
+    """Add every trade; with ``outage=(start, end)`` the target is down for that stretch of trades."""
+    writer = HistoricalWriter(q, batch_size=batch_size, flush_interval=0.5, max_rows=max_rows, block_timeout=0.05)
+    dropped = 0
+    start = time.perf_counter()
+    for i, trade in enumerate(trades):
+        if outage:
+            q.down = outage[0] <= i < outage[1]
+        try:
+            writer.add_trade(trade)
+        except BufferFullError:
+            dropped += 1
+    if outage:
+        q.down = False
+    writer.close()
+    elapsed = time.perf_counter() - start
+    return elapsed, writer, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KDB+ trade ingestion benchmark")
+    parser.add_argument("--trades", type=int, default=100_000)
+    parser.add_argument("--rtt-us", type=float, default=50.0, help="Extra stand-in delay per insert call")
+    parser.add_argument("--kdb", help="host:port of a real q process instead of the stand-in")
+    args = parser.parse_args()
+
+    if args.kdb:
+        import pykx as kx
+
+        host, port = args.kdb.split(":")
+
+        def target():
+            return kx.QConnection(host=host, port=int(port))
+    else:
+
+        def target():
+            return StandInQ(args.rtt_us / 1e6)
+
+    # Failed writes during the outage are expected; the table reports them
+    logging.getLogger("database.historical").setLevel(logging.CRITICAL)
+
+    trades = generate(args.trades)
+    # The per-row path is slow; time it on a slice
+    per_row_trades = trades[: min(len(trades), 20_000)]
+    rows = []
+    with console.status("[cyan]Writing trades...", spinner="dots"):
+        for batch_size in (1, 100, 1000, 10_000):
+            q = target()
+            sample = per_row_trades if batch_size == 1 else trades
+            elapsed, writer, dropped = write_all(q, sample, batch_size)
+            rows.append((f"{batch_size:,} / batch" if batch_size > 1 else "per-row", len(sample), elapsed, writer, dropped))
+            q.close()
+
+        if not args.kdb:
+            # Down for 40% of the run: rows buffer up to max_rows, adds block, then are dropped
+            q = target()
+            outage = (len(trades) * 2 // 5, len(trades) * 4 // 5)
+            elapsed, writer, dropped = write_all(q, trades, 1000, outage=outage)
+            rows.append(("1,000 / batch, down 40%", len(trades), elapsed, writer, dropped))
+            q.close()
+
+    base_rate = rows[0][1] / rows[0][2]
+    table = Table(
+        title=f"🗄️  KDB+ Trade Ingestion ({'q at ' + args.kdb if args.kdb else f'stand-in q, +{args.rtt_us:g} µs/call'})",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Path", style="cyan")
+    table.add_column("Trades", justify="right")
+    table.add_column("Rows / s", justify="right", style="green")
+    table.add_column("vs per-row", justify="right", style="green")
+    table.add_column("Insert calls", justify="right", style="yellow")
+    table.add_column("Blocked s", justify="right", style="yellow")
+    table.add_column("Written", justify="right")
+    table.add_column("Dropped", justify="right", style="red")
+    for label, n, elapsed, writer, dropped in rows:
+        rate = n / elapsed
+        table.add_row(
+            label,
+            f"{n:,}",
+            f"{rate:,.0f}",
+            f"{rate / base_rate:,.1f}x",
+            f"{writer.batches_written:,}",
+            f"{writer.blocked_seconds:.2f}",
+            f"{writer.rows_written:,}",
+            f"{dropped:,}",
+        )
+    console.print(table)
+    console.print(
+        "[dim]During the outage rows stay buffered; adds block for up to block_timeout once "
+        "max_rows (10,000 here) are waiting and are dropped after that.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Market-data fan-out benchmark.
+
+Replays a random order flow (limit orders and cancels around a mid price) through the
+OBS MarketDataPublisher with a recording channel. For several dispatch batch sizes it
+reports:
+  - OBS cost per request with and without market data
+  - messages and bytes the OBS publishes per 1,000 requests
+  - that a subscriber rebuilding the book from snapshots and updates matches the OBS
+
+Usage:
+    python scripts/benchmarks/bench_market_data.py [--requests 100000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from messaging.codecs import decode_message
+from messaging.market_data import MarketDataBook
+from servers.obs.market_data import MarketDataPublisher
+from servers.obs.order_book import OrderBook
+
+console = Console()
+
+MID_PRICE = 150.0
+
+
+class RecordingChannel:
+    """Stands in for a pika channel and keeps every published message."""
+
+    def __init__(self):
+        self.published = []
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        self.published.append((routing_key, properties.content_type, body))
+
+
+def generate(n, seed=5):
+    """70% limit orders within ~3 dollars of the mid, 30% cancels of resting orders."""
+    rng = random.Random(seed)
+    flow, live = [], []
+    for i in range(1, n + 1):
+        if live and rng.random() < 0.3:
+            flow.append(("cancel", live.pop(rng.randrange(len(live))), None, None, None))
+        else:
+            side = rng.choice(("buy", "sell"))
+            offset = rng.uniform(-3, 3) + (-0.4 if side == "buy" else 0.4)
+            flow.append(("place", i, side, round(MID_PRICE + offset, 2), float(rng.randint(1, 10))))
+            live.append(i)
+    return flow
+
+
+def replay(flow, batch):
+    """Run the flow through a book; batch=0 means no market data. Returns (us/request, channel, book)."""
+    book = OrderBook("BENCH")
+    channel = RecordingChannel()
+    publisher = MarketDataPublisher(channel, snapshot_interval=3600)
+    publisher.publish_snapshots([book])
+    start = time.perf_counter()
+    for i, (kind, order_id, side, price, quantity) in enumerate(flow, 1):
+        if kind == "cancel":
+            cancelled = book.cancel_order(order_id)
+            if batch and cancelled:
+                publisher.book_changed(book, cancelled.side, cancelled.price)
+        else:
+            trades = book.add_order(order_id, order_id, side, price, quantity)
+            if batch:
+                if trades:
+                    publisher.book_changed(book)
+                else:
+                    publisher.book_changed(book, side, price)
+        if batch and i % batch == 0:
+            publisher.flush()
+    publisher.flush()
+    elapsed = time.perf_counter() - start
+    return elapsed / len(flow) * 1e6, channel, book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Market-data fan-out benchmark")
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    flow = generate(args.requests)
+    rows = []
+    with console.status("[cyan]Replaying order flow...", spinner="dots"):
+        base_us, _, _ = replay(flow, 0)
+        for batch in (1, 16, 256):
+            us, channel, book = replay(flow, batch)
+            subscriber = MarketDataBook("BENCH")
+            counts = {"snapshot": 0, "update": 0, "bbo": 0}
+            total_bytes = 0
+            for routing_key, content_type, body in channel.published:
+                message = decode_message(body, content_type)
+                counts[message["type"]] += 1
+                total_bytes += len(body)
+                if message["type"] != "bbo":
+                    subscriber.apply(message)
+            consistent = subscriber.depth() == book.depth(10)
+            rows.append((batch, us, counts, total_bytes, consistent))
+
+    per_k = 1000 / args.requests
+    table = Table(
+        title=f"📡 Market Data Publishing ({args.requests:,} requests)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Batch", justify="right", style="cyan")
+    table.add_column("µs / request", justify="right", style="yellow")
+    table.add_column("Updates / 1k", justify="right", style="green")
+    table.add_column("BBO / 1k", justify="right", style="green")
+    table.add_column("Bytes / 1k", justify="right", style="green")
+    table.add_column("Subscriber == OBS", justify="center")
+    table.add_row("no market data", f"{base_us:.1f}", "-", "-", "-", "-")
+    for batch, us, counts, total_bytes, consistent in rows:
+        table.add_row(
+            str(batch),
+            f"{us:.1f}",
+            f"{counts['update'] * per_k:,.1f}",
+            f"{counts['bbo'] * per_k:,.1f}",
+            f"{total_bytes * per_k:,.0f}",
+            "[green]yes[/green]" if consistent else "[red]NO[/red]",
+        )
+    console.print(table)
+
+    console.print(
+        "[dim]The OBS publishes each message once per book change; RabbitMQ copies it to each "
+        "subscribed queue, so OBS work does not depend on the number of viewers. Larger dispatch "
+        "batches conflate changes into fewer updates.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""
+Slow market-data subscriber benchmark.
+
+Feeds synthetic depth updates for several symbols at a fixed rate (default 50,000/s) to
+a MarketDataConsumer whose handler takes --handler-ms per call, and compares:
+  - direct delivery: messages wait in the queue (as they would in the broker) and the
+    handler sees every one of them in order
+  - conflated delivery: the consumer drains the queue and merges pending changes per
+    symbol and price level, so the handler only ever sees current state
+
+It reports the achieved feed rate, handler calls, peak backlog and its memory, and the
+latency from a message being fed to the handler seeing it (or a merge containing it).
+
+Usage:
+    python scripts/benchmarks/bench_market_data_conflation.py [--rate 50000] [--seconds 5] [--handler-ms 5]
+"""
+
+import argparse
+import queue
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+import numpy as np
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from messaging.codecs import encode_message
+from messaging.consumers import MarketDataConsumer
+
+console = Console()
+
+SYMBOLS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA"]
+LEVELS = 20
+
+
+def generate(count, seed=9):
+    """A snapshot per symbol, then single-level updates with consecutive seqs."""
+    rng = random.Random(seed)
+    bodies = []
+    seqs = {symbol: 0 for symbol in SYMBOLS}
+    for symbol in SYMBOLS:
+        bids = [[round(100 - 0.01 * (i + 1), 2), 100.0, 1] for i in range(LEVELS)]
+        asks = [[round(100 + 0.01 * (i + 1), 2), 100.0, 1] for i in range(LEVELS)]
+        message = {"type": "snapshot", "symbol": symbol, "seq": 0, "bids": bids, "asks": asks, "timestamp": time.time()}
+        bodies.append((symbol, 0, encode_message(message)))
+    for _ in range(count):
+        symbol = rng.choice(SYMBOLS)
+        seqs[symbol] += 1
+        level = [round(100 + rng.choice((-1, 1)) * 0.01 * rng.randint(1, LEVELS), 2), float(rng.randint(0, 500)), rng.randint(0, 9)]
+        if level[1] == 0:
+            level[2] = 0
+        side = "bids" if level[0] < 100 else "asks"
+        message = {
+            "type": "update",
+            "symbol": symbol,
+            "seq": seqs[symbol],
+            "bids": [level] if side == "bids" else [],
+            "asks": [level] if side == "asks" else [],
+            "timestamp": time.time(),
+        }
+        bodies.append((symbol, seqs[symbol], encode_message(message)))
+    return bodies
+
+
+def pace(bodies, rate, deliver, fed_at):
+    """Call deliver for each body at ``rate`` per second; returns the achieved rate."""
+    start = time.perf_counter()
+    step = max(1, int(rate / 1000))
+    for i in range(0, len(bodies), step):
+        target = start + i / rate
+        now = time.perf_counter()
+        if now < target:
+            time.sleep(target - now)
+        for symbol, seq, message in bodies[i:i + step]:
+            fed_at[(symbol, seq)] = time.perf_counter()
+            deliver(message)
+    return len(bodies) / (time.perf_counter() - start)
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes held by nested dicts/lists/tuples and their leaves."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_size(v, seen) for v in obj)
+    return size
+
+
+def run(bodies, rate, handler_ms, conflate):
+    fed_at = {}
+    latencies = []
+    handler_s = handler_ms / 1000
+
+    def handler(message):
+        if message["type"] != "bbo":
+            latencies.append(time.perf_counter() - fed_at[(message["symbol"], message["seq"])])
+        time.sleep(handler_s)
+
+    consumer = MarketDataConsumer(None, SYMBOLS, handler=handler, conflate=conflate)
+    props = {content_type: SimpleNamespace(content_type=content_type) for _, _, (content_type, _) in bodies[:1]}
+
+    def consume(message):
+        content_type, body = message
+        consumer.on_market_data(None, None, props[content_type], body)
+
+    peak = {"messages": 0, "bytes": 0}
+    done = threading.Event()
+
+    if conflate:
+        consumer.start_delivery()
+        deliver = consume
+
+        def sample():
+            with consumer.pending_ready:
+                messages = len(consumer.pending)
+                size = deep_size(consumer.pending)
+            peak["messages"] = max(peak["messages"], messages)
+            peak["bytes"] = max(peak["bytes"], size)
+    else:
+        # The broker queue: the consumer takes one message at a time and runs the handler inline
+        backlog = queue.Queue()
+        backlog_bytes = [0]
+
+        def drain():
+            while not done.is_set():
+                try:
+                    message = backlog.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                backlog_bytes[0] -= len(message[1])
+                consume(message)
+
+        drainer = threading.Thread(target=drain, daemon=True)
+        drainer.start()
+
+        def deliver(message):
+            backlog_bytes[0] += len(message[1])
+            backlog.put(message)
+
+        def sample():
+            peak["messages"] = max(peak["messages"], backlog.qsize())
+            peak["bytes"] = max(peak["bytes"], backlog_bytes[0])
+
+    def sampler():
+        while not done.is_set():
+            sample()
+            time.sleep(0.05)
+
+    sampler_thread = threading.Thread(target=sampler, daemon=True)
+    sampler_thread.start()
+    achieved = pace(bodies, rate, deliver, fed_at)
+    time.sleep(max(0.5, 4 * handler_s))
+    sample()
+    done.set()
+    if conflate:
+        consumer.stop_delivery()
+    left = 0 if conflate else backlog.qsize()
+    return achieved, consumer.delivered, peak, np.array(latencies) * 1000, left
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slow market-data subscriber benchmark")
+    parser.add_argument("--rate", type=float, default=50_000, help="Updates fed per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--handler-ms", type=float, default=5.0, help="Time the handler takes per call")
+    args = parser.parse_args()
+
+    with console.status("[cyan]Generating updates...", spinner="dots"):
+        bodies = generate(int(args.rate * args.seconds))
+
+    results = []
+    for label, conflate in (("Direct (every message)", False), ("Conflated", True)):
+        with console.status(f"[cyan]{label}...", spinner="dots"):
+            results.append((label, *run(bodies, args.rate, args.handler_ms, conflate)))
+
+    table = Table(
+        title=f"🐢 Slow Subscriber ({args.rate:,.0f} updates/s target, {args.handler_ms:g} ms handler, {args.seconds:g}s)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Delivery", style="cyan")
+    table.add_column("Fed / s", justify="right", style="green")
+    table.add_column("Handler calls", justify="right", style="green")
+    table.add_column("Peak backlog", justify="right", style="yellow")
+    table.add_column("Peak memory", justify="right", style="yellow")
+    table.add_column("Latency p50 / p99 / max ms", justify="right", style="blue")
+    table.add_column("Left unprocessed", justify="right", style="red")
+    for label, achieved, delivered, peak, latencies, left in results:
+        table.add_row(
+            label,
+            f"{achieved:,.0f}",
+            f"{delivered:,}",
+            f"{peak['messages']:,} msgs",
+            f"{peak['bytes'] / 1024:,.0f} KiB",
+            " / ".join(f"{v:,.1f}" for v in (*np.percentile(latencies, [50, 99]), latencies.max()))
+            if len(latencies) else "-",
+            f"{left:,}",
+        )
+    console.print(table)
+    console.print(
+        "[dim]Direct backlog memory counts message bodies only; a real broker adds per-message overhead.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Message validation benchmark.
+
+Reports nanoseconds per message for:
+  - json.loads + reading every field with .get(), the unvalidated path the servers used
+  - json.loads + the compiled schema validator
+  - json.loads + a reflective validator that walks the TypedDict hints per message
+  - binary codec decode + the compiled validator, the TES <-> OBS path
+  - the compiled validator alone
+
+It also checks that every malformed message in a corrupted sample is rejected.
+
+Usage:
+    python scripts/benchmarks/bench_message_validation.py [--messages 200000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import typing
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from messaging.codecs import get_codec
+from messaging.schemas import OrderMessage, TradeMessage
+from messaging.validation import MessageValidationError, validate_order_message, validate_trade_message
+
+# Reuse the message generators from the codec benchmark
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_codecs import orders, trades  # noqa: E402
+
+console = Console()
+
+
+def reflective_validator(schema):
+    """Validate by walking the schema's type hints for every message."""
+
+    def validate(message):
+        for field, annotation in typing.get_type_hints(schema).items():
+            value = message.get(field)
+            if typing.get_origin(annotation) is typing.Literal:
+                if value not in typing.get_args(annotation):
+                    raise MessageValidationError(f"Invalid {field}: {value!r}", field)
+            elif annotation is float:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise MessageValidationError(f"Invalid {field}: {value!r}", field)
+            elif not isinstance(value, annotation) or isinstance(value, bool):
+                raise MessageValidationError(f"Invalid {field}: {value!r}", field)
+        return message
+
+    return validate
+
+
+def corrupt(messages, seed=3):
+    """One broken field per message: None, wrong type, empty string, NaN or a missing key."""
+    rng = random.Random(seed)
+    broken = []
+    for message in messages:
+        message = dict(message)
+        field = rng.choice(list(message))
+        fault = rng.randrange(4)
+        if fault == 0:
+            message[field] = None
+        elif fault == 1:
+            message[field] = [message[field]]
+        elif fault == 2:
+            message[field] = float("nan") if isinstance(message[field], float) else ""
+        else:
+            del message[field]
+        broken.append(message)
+    return broken
+
+
+def per_message_ns(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message validation benchmark")
+    parser.add_argument("--messages", type=int, default=200_000)
+    args = parser.parse_args()
+
+    json_codec, binary_codec = get_codec("json"), get_codec("binary")
+    cases = (
+        ("OrderMessage", OrderMessage, orders(args.messages), validate_order_message),
+        ("TradeMessage", TradeMessage, trades(args.messages), validate_trade_message),
+    )
+
+    rows = []
+    rejections = []
+    with console.status("[cyan]Validating...", spinner="dots"):
+        for kind, schema, messages, validate in cases:
+            fields = list(typing.get_type_hints(schema))
+            reflective = reflective_validator(schema)
+            json_bodies = [json_codec.encode(m)[1] for m in messages]
+            binary_bodies = [binary_codec.encode(m)[1] for m in messages]
+
+            def dict_access(body):
+                message = json.loads(body)
+                return [message.get(f) for f in fields]
+
+            rows.append((kind, "json.loads + .get() per field (unvalidated)", per_message_ns(dict_access, json_bodies)))
+            rows.append((kind, "json.loads + compiled validator", per_message_ns(lambda b: validate(json.loads(b)), json_bodies)))
+            rows.append((kind, "json.loads + reflective validator", per_message_ns(lambda b: reflective(json.loads(b)), json_bodies)))
+            rows.append((kind, "binary decode + compiled validator", per_message_ns(lambda b: validate(binary_codec.decode(b)), binary_bodies)))
+            rows.append((kind, "compiled validator only", per_message_ns(validate, messages)))
+
+            broken = corrupt(messages[:10_000])
+            rejected = 0
+            for message in broken:
+                try:
+                    validate(message)
+                except MessageValidationError:
+                    rejected += 1
+            rejections.append((kind, rejected, len(broken)))
+
+    table = Table(
+        title=f"🛡️ Message Validation ({args.messages:,} messages)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Message", style="cyan")
+    table.add_column("Path", style="cyan")
+    table.add_column("ns / message", justify="right", style="green")
+    for kind, label, ns in rows:
+        table.add_row(kind, label, f"{ns:,.0f}")
+    console.print(table)
+    for kind, rejected, total in rejections:
+        console.print(f"[dim]{kind}: rejected {rejected:,} of {total:,} corrupted messages[/dim]")
+
+
+if __name__ == "__main__":
+    main()
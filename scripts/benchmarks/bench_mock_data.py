@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Mock data generation benchmark.
+
+Generates --scale times the default mock data (100 orders and 50 trades per unit) with:
+  - MockDataGenerator: one dict per row from random.choice calls (timed on
+    --single rows and scaled)
+  - ScaledMockDataGenerator: numpy columns, --chunk-size rows at a time
+
+then loads the scaled data into fresh databases with initialize_scaled_mock_data (users,
+orders and trades streamed into one batch insert per table; no analytics) and
+reports rows/s and the peak memory of the load.
+
+Usage:
+    python scripts/benchmarks/bench_mock_data.py [--scale 100000] [--chunk-size 1000000]
+"""
+
+import argparse
+import logging
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+import numpy as np
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.transactional import TransactionalDB
+from shared.mock_data import MockDataGenerator, ScaledMockDataGenerator, initialize_scaled_mock_data
+
+console = Console()
+
+
+def per_row(n, user_ids):
+    generator = MockDataGenerator()
+    start = time.perf_counter()
+    generator.generate_orders(user_ids, count=n)
+    orders = n / (time.perf_counter() - start)
+    start = time.perf_counter()
+    generator.generate_trades(user_ids, count=n)
+    trades = n / (time.perf_counter() - start)
+    return orders, trades
+
+
+def vectorized(orders, trades, user_ids, chunk_size):
+    generator = ScaledMockDataGenerator(seed=1, chunk_size=chunk_size)
+    start = time.perf_counter()
+    for _ in generator.orders(orders, user_ids):
+        pass
+    order_rate = orders / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in generator.trades(trades, user_ids):
+        pass
+    return order_rate, trades / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock data generation benchmark")
+    parser.add_argument("--scale", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--single", type=int, default=100_000, help="Rows generated one at a time")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    orders, trades = 100 * args.scale, 50 * args.scale
+    user_ids = np.arange(1, 20 * args.scale + 1)
+
+    with console.status(f"[cyan]MockDataGenerator x {args.single:,}...", spinner="dots"):
+        single_orders, single_trades = per_row(args.single, user_ids[:10_000].tolist())
+    with console.status("[cyan]ScaledMockDataGenerator...", spinner="dots"):
+        fast_orders, fast_trades = vectorized(orders, trades, user_ids, args.chunk_size)
+
+    with tempfile.TemporaryDirectory() as root:
+        db = TransactionalDB(Path(root) / "trading.db")
+        with console.status(f"[cyan]Loading x{args.scale:,}...", spinner="dots"):
+            start = time.perf_counter()
+            initialize_scaled_mock_data(db, scale=args.scale, seed=1, chunk_size=args.chunk_size)
+            load = time.perf_counter() - start
+        stored = sum(db.conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("users", "orders", "trades"))
+        db.close()
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    table = Table(
+        title=f"🧪 Mock Data (x{args.scale:,}: {orders:,} orders, {trades:,} trades)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Step", style="cyan")
+    table.add_column("Per row", justify="right", style="yellow")
+    table.add_column("Vectorized", justify="right", style="green")
+    table.add_column("Speedup", justify="right")
+    for name, count, single, fast in (("generate orders", orders, single_orders, fast_orders),
+                                      ("generate trades", trades, single_trades, fast_trades)):
+        table.add_row(
+            name,
+            f"{single:,.0f} rows/s\n{count / single:,.1f} s*",
+            f"{fast:,.0f} rows/s\n{count / fast:,.1f} s",
+            f"{fast / single:,.0f}x",
+        )
+    table.add_row("load users, orders, trades", "", f"{stored / load:,.0f} rows/s\n{load:,.1f} s", "")
+    console.print(table)
+    console.print(
+        f"[dim]* timed on {args.single:,} rows and scaled. Rows stored: {stored:,}. "
+        f"Peak RSS: {peak_mb:,.0f} MB[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
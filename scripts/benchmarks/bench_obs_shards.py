@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+OBS sharding scalability benchmark.
+
+Runs the matching core in 1..N worker processes, each owning the symbols that
+shard_for_symbol assigns to it, and reports aggregate orders/sec. With load spread
+across symbols, throughput should scale roughly with the number of cores.
+No RabbitMQ is needed; use bench_order_flow.py --symbols for the live path.
+
+Usage:
+    python scripts/benchmarks/bench_obs_shards.py [--max-shards 8] [--orders 400000]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from messaging.routing import shard_for_symbol
+from servers.obs.order_book import OrderBook
+
+console = Console()
+
+
+def generate_orders(count, symbols, seed):
+    """Generate a random stream of limit orders around a fixed mid price."""
+    rng = random.Random(seed)
+    return [
+        (
+            i,
+            rng.choice(symbols),
+            rng.choice(("buy", "sell")),
+            round(100.0 + rng.randint(-20, 20) * 0.01, 2),
+            float(rng.choice((10, 25, 50, 100))),
+        )
+        for i in range(count)
+    ]
+
+
+def match_shard(args):
+    """Worker: match only the orders for symbols owned by this shard."""
+    shard, shards, orders = args
+    books = {}
+    mine = [o for o in orders if shard_for_symbol(o[1], shards) == shard]
+    start = time.time()
+    for order_id, symbol, side, price, quantity in mine:
+        book = books.get(symbol)
+        if book is None:
+            book = books[symbol] = OrderBook(symbol)
+        book.add_order(order_id, 1, side, price, quantity)
+    return len(mine), start, time.time()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OBS sharding scalability benchmark")
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--orders", type=int, default=400_000)
+    parser.add_argument("--symbols", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    orders = generate_orders(args.orders, symbols, args.seed)
+
+    table = Table(
+        title="🧩 OBS Shard Scaling",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Shards", justify="right", style="cyan")
+    table.add_column("Orders/s", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="yellow")
+    table.add_column("Busiest shard", justify="right", style="blue")
+
+    baseline = None
+    shards = 1
+    while shards <= args.max_shards:
+        with console.status(f"[cyan]Matching with {shards} shard(s)...", spinner="dots"):
+            with multiprocessing.Pool(shards) as pool:
+                results = pool.map(match_shard, [(s, shards, orders) for s in range(shards)])
+        # Wall time from the first shard starting to the last one finishing
+        wall = max(end for _, _, end in results) - min(start for _, start, _ in results)
+        rate = args.orders / wall
+        baseline = baseline or rate
+        busiest = max(count for count, _, _ in results)
+        table.add_row(str(shards), f"{rate:,.0f}", f"{rate / baseline:.2f}x", f"{busiest:,}")
+        shards *= 2
+
+    console.print(table)
+    console.print(f"[dim]CPU cores available: {os.cpu_count()}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Order book microbenchmark.
+
+Measures the cost of an aggressive order sweeping the top of the book, a resting
+insert and a cancel by id while the book holds 10 to 1,000,000 resting orders.
+The per-operation cost should stay flat as depth grows.
+
+Usage:
+    python scripts/benchmarks/bench_order_book.py [--max-depth 1000000] [--ops 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from servers.obs.order_book import OrderBook
+
+console = Console()
+
+MID_PRICE = 150.0
+TICK = 0.01
+SWEEP_ORDERS = 3
+
+
+def build_book(depth: int):
+    """Build a book with ``depth`` resting orders split across both sides."""
+    book = OrderBook("BENCH", tick_size=TICK)
+    levels = max(1, min(depth // 10, 10_000))
+    order_id = 0
+    for i in range(depth):
+        order_id += 1
+        offset = (i % levels + 1) * TICK
+        if i % 2:
+            book.add_order(order_id, 1, "sell", MID_PRICE + offset, 100.0)
+        else:
+            book.add_order(order_id, 2, "buy", MID_PRICE - offset, 100.0)
+    return book, levels, order_id
+
+
+def run_depth(depth: int, ops: int, seed: int):
+    """Return (ns per match, ns per insert, ns per cancel) at a given depth."""
+    rng = random.Random(seed)
+    book, levels, next_id = build_book(depth)
+    ops = min(ops, max(1, depth // 2))
+
+    # Matching: sweep the best asks, then replenish them so depth stays constant
+    match_ns = 0
+    for _ in range(ops):
+        next_id += 1
+        start = time.perf_counter_ns()
+        book.add_order(next_id, 3, "buy", MID_PRICE + levels * TICK, SWEEP_ORDERS * 100.0)
+        match_ns += time.perf_counter_ns() - start
+        for _ in range(SWEEP_ORDERS):
+            next_id += 1
+            book.add_order(
+                next_id, 1, "sell", MID_PRICE + rng.randint(1, levels) * TICK, 100.0
+            )
+
+    # Inserting passive orders at random existing levels
+    inserted = []
+    insert_ns = 0
+    for _ in range(ops):
+        next_id += 1
+        price = MID_PRICE - rng.randint(1, levels) * TICK
+        start = time.perf_counter_ns()
+        book.add_order(next_id, 2, "buy", price, 100.0)
+        insert_ns += time.perf_counter_ns() - start
+        inserted.append(next_id)
+
+    # Cancelling the orders just inserted, in random order
+    rng.shuffle(inserted)
+    cancel_ns = 0
+    for order_id in inserted:
+        start = time.perf_counter_ns()
+        book.cancel_order(order_id)
+        cancel_ns += time.perf_counter_ns() - start
+
+    assert len(book) >= depth - SWEEP_ORDERS
+    return match_ns / ops, insert_ns / ops, cancel_ns / ops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-depth", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    table = Table(
+        title="📚 Order Book Microbenchmark",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Resting orders", justify="right", style="cyan")
+    table.add_column(f"Match (sweep {SWEEP_ORDERS}) ns", justify="right", style="green")
+    table.add_column("Insert ns", justify="right", style="blue")
+    table.add_column("Cancel ns", justify="right", style="yellow")
+
+    depth = 10
+    while depth <= args.max_depth:
+        with console.status(f"[cyan]Benchmarking depth {depth:,}...", spinner="dots"):
+            match_ns, insert_ns, cancel_ns = run_depth(depth, args.ops, args.seed)
+        table.add_row(f"{depth:,}", f"{match_ns:,.0f}", f"{insert_ns:,.0f}", f"{cancel_ns:,.0f}")
+        depth *= 10
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
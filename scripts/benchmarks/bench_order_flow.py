@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+End-to-end order flow throughput benchmark.
+
+Publishes a stream of crossing buy/sell orders to the TES without waiting between
+them, then measures how fast acks and fill notifications come back. Requires
+RabbitMQ plus running TES and OBS servers:
+
+    python main.py server OBS [--shards N]
+    python main.py server TES [--shards N]
+    python scripts/benchmarks/bench_order_flow.py --orders 20000 [--symbols 64]
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+import pika
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+RABBITMQ_HOST = "localhost"
+TES_QUEUE = "tes_requests"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end TES/OBS order throughput")
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument(
+        "--symbols", type=int, default=1, help="Spread order pairs across this many symbols"
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    connection = pika.BlockingConnection(pika.ConnectionParameters(host=RABBITMQ_HOST))
+    channel = connection.channel()
+    callback_queue = channel.queue_declare(queue="", exclusive=True).method.queue
+
+    trader_id = str(uuid.uuid4())
+    acks = 0
+    fills = 0
+    errors = 0
+    last_ack = last_fill = None
+
+    def on_message(ch, method, props, body):
+        nonlocal acks, fills, errors, last_ack, last_fill
+        message = json.loads(body)
+        if message.get("event") == "order_filled":
+            if message.get("status") == "filled":
+                fills += 1
+                last_fill = time.perf_counter()
+        elif message.get("status") == "ok":
+            acks += 1
+            last_ack = time.perf_counter()
+        else:
+            errors += 1
+
+    channel.basic_consume(queue=callback_queue, on_message_callback=on_message, auto_ack=True)
+
+    symbols = [f"BENCH{i}" for i in range(args.symbols)]
+
+    # Alternate sells and buys at the same price so every pair crosses
+    start = time.perf_counter()
+    for i in range(args.orders):
+        order = {
+            "action": "place_order",
+            "trader_id": trader_id,
+            "symbol": symbols[(i // 2) % len(symbols)],
+            "side": "sell" if i % 2 == 0 else "buy",
+            "quantity": 100.0,
+            "price": 100.0,
+            "type": "limit",
+            "timestamp": time.time(),
+        }
+        channel.basic_publish(
+            exchange="",
+            routing_key=TES_QUEUE,
+            properties=pika.BasicProperties(reply_to=callback_queue, correlation_id=str(i)),
+            body=json.dumps(order),
+        )
+    publish_done = time.perf_counter()
+
+    with console.status("[cyan]Waiting for acks and fills...", spinner="dots"):
+        deadline = publish_done + args.timeout
+        while (acks + errors < args.orders or fills < args.orders) and time.perf_counter() < deadline:
+            connection.process_data_events(time_limit=0.1)
+    connection.close()
+
+    def rate(count, end):
+        return f"{count / (end - start):,.0f}" if end else "-"
+
+    table = Table(title="🔁 Order Flow Throughput", box=box.ROUNDED, header_style="bold cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    table.add_row("Orders published", f"{args.orders:,}")
+    table.add_row("Publish rate (orders/s)", rate(args.orders, publish_done))
+    table.add_row("Acks received", f"{acks:,}")
+    table.add_row("Ack throughput (orders/s)", rate(acks, last_ack))
+    table.add_row("Orders fully filled", f"{fills:,}")
+    table.add_row("Fill throughput (orders/s)", rate(fills, last_fill))
+    table.add_row("Errors", str(errors))
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Resting order memory benchmark.
+
+Reports traced bytes per resting order and construction time for:
+  - the previous Order dataclass (per-instance __dict__, Enum members, two datetimes)
+  - a raw dict per order, as the legacy BasicStrategy lists hold them
+  - the slotted, integer-coded Order model
+  - the OrderBook's struct-of-arrays OrderStore
+
+Usage:
+    python scripts/benchmarks/bench_order_memory.py [--orders 200000]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from servers.obs.order_book import OrderBook
+from shared.models.order import Order, OrderSide, OrderStatus, OrderType
+
+console = Console()
+
+
+@dataclass
+class DataclassOrder:
+    """The Order model as it was before: a plain dataclass."""
+
+    id: str
+    user_id: int
+    symbol: str
+    side: OrderSide
+    order_type: OrderType
+    quantity: float
+    price: float
+    status: OrderStatus = OrderStatus.PENDING
+    filled_quantity: float = 0.0
+    remaining_quantity: Optional[float] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    def __post_init__(self):
+        if self.remaining_quantity is None:
+            self.remaining_quantity = self.quantity
+        if isinstance(self.side, str):
+            self.side = OrderSide(self.side)
+        if isinstance(self.order_type, str):
+            self.order_type = OrderType(self.order_type)
+        if isinstance(self.status, str):
+            self.status = OrderStatus(self.status)
+
+
+def generate(n, seed=7):
+    """Non-crossing orders: bids below 100, asks above, so everything rests."""
+    rng = random.Random(seed)
+    orders = []
+    for i in range(n):
+        if i % 2:
+            orders.append((i, i % 5000, "buy", round(rng.uniform(50, 99.99), 2), float(rng.randint(1, 100))))
+        else:
+            orders.append((i, i % 5000, "sell", round(rng.uniform(100.01, 150), 2), float(rng.randint(1, 100))))
+    return orders
+
+
+def build_dataclass(orders):
+    return [DataclassOrder(oid, uid, "AAPL", side, "limit", qty, price) for oid, uid, side, price, qty in orders]
+
+
+def build_dicts(orders):
+    return [
+        {"order_id": oid, "user_id": uid, "symbol": "AAPL", "side": side, "type": "limit",
+         "quantity": qty, "price": price, "timestamp": time.time()}
+        for oid, uid, side, price, qty in orders
+    ]
+
+
+def build_slotted(orders):
+    return [Order(oid, uid, "AAPL", side, "limit", qty, price) for oid, uid, side, price, qty in orders]
+
+
+def build_book(orders):
+    book = OrderBook("AAPL")
+    for oid, uid, side, price, qty in orders:
+        book.add_order(oid, uid, side, price, qty)
+    return book
+
+
+def measure(build, orders):
+    """Return retained bytes per order and construction ns per order."""
+    gc.collect()
+    tracemalloc.start()
+    # Fresh id/price/quantity objects are allocated while tracing, and the inputs are dropped
+    # after the build, so only what each representation keeps alive is counted
+    inputs = [(int(str(oid)), uid, side, float(repr(price)), float(repr(qty))) for oid, uid, side, price, qty in orders]
+    start = time.perf_counter()
+    result = build(inputs)
+    elapsed = time.perf_counter() - start
+    del inputs
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / len(orders), elapsed / len(orders) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resting order memory benchmark")
+    parser.add_argument("--orders", type=int, default=200_000)
+    args = parser.parse_args()
+
+    orders = generate(args.orders)
+    variants = [
+        ("Order dataclass (before)", build_dataclass),
+        ("Raw dict", build_dicts),
+        ("Slotted Order (int codes, ns)", build_slotted),
+        ("OrderBook / OrderStore", build_book),
+    ]
+
+    rows = []
+    with console.status("[cyan]Measuring...", spinner="dots"):
+        for label, build in variants:
+            rows.append((label, *measure(build, orders)))
+        book = build_book(orders)
+        column_bytes = book.store.nbytes() / len(book)
+
+    table = Table(
+        title=f"🧮 Bytes per Resting Order ({args.orders:,} orders)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Representation", style="cyan")
+    table.add_column("Bytes / order", justify="right", style="green")
+    table.add_column("Build ns / order (traced)", justify="right", style="yellow")
+    for label, per_order, ns in rows:
+        table.add_row(label, f"{per_order:,.0f}", f"{ns:,.0f}")
+    console.print(table)
+    console.print(
+        f"[dim]Bytes include the order id, price and quantity objects each representation keeps "
+        f"alive (and the id index for the book). OrderStore columns alone: {column_bytes:.0f} bytes/order.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
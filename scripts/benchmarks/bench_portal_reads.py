@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Trader portal read-path benchmark: fresh connection per call vs CachedReader.
+
+Simulates many open portal sessions refreshing the Dashboard and My Portfolio pages
+while a writer commits new orders between refresh rounds. Reports the number of
+queries that reached SQLite and the time spent per session refresh.
+
+Usage:
+    python scripts/benchmarks/bench_portal_reads.py [--sessions 200] [--rounds 20] [--write-every 4]
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add src and the portal utils to path
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "src" / "frontend" / "trader-portal" / "utils"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.transactional.models import SCHEMA
+from read_cache import CachedReader
+
+console = Console()
+
+SYMBOLS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA"]
+
+# Same statements as trading.get_orders / get_trades / get_positions / get_portfolio
+ALL_ORDERS = """
+    SELECT id as order_id, user_id, symbol, side, quantity, price, status,
+           created_at as timestamp
+    FROM orders
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+ALL_TRADES = """
+    SELECT id as trade_id, user_id, symbol, side, quantity, price, timestamp
+    FROM trades
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+TRADER_ORDERS = """
+    SELECT o.id as order_id, o.user_id, o.symbol, o.side, o.quantity, o.price, o.status,
+           o.created_at as timestamp
+    FROM orders o
+    JOIN users u ON o.user_id = u.id
+    WHERE u.username = ?
+    ORDER BY o.created_at DESC
+    LIMIT ?
+"""
+POSITIONS = """
+    SELECT p.id, p.symbol, p.quantity, p.avg_price, p.updated_at
+    FROM positions p
+    JOIN portfolios pf ON p.portfolio_id = pf.id
+    JOIN users u ON pf.user_id = u.id
+    WHERE u.username = ?
+"""
+PORTFOLIO = """
+    SELECT p.id, p.user_id, p.name, p.created_at
+    FROM portfolios p
+    JOIN users u ON p.user_id = u.id
+    WHERE u.username = ?
+"""
+
+
+def session_queries(trader):
+    """The queries one Dashboard + My Portfolio refresh issues."""
+    return [
+        (ALL_ORDERS, (1000,), False),
+        (ALL_TRADES, (1000,), False),
+        (TRADER_ORDERS, (trader, 50), False),
+        (POSITIONS, (trader,), False),
+        (PORTFOLIO, (trader,), True),
+    ]
+
+
+def seed(db_path, traders, orders):
+    conn = sqlite3.connect(db_path)
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    rng = random.Random(7)
+    conn.executemany(
+        "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+        [(t, "bench") for t in traders],
+    )
+    conn.executemany(
+        "INSERT INTO portfolios (user_id, name) VALUES (?, ?)",
+        [(i + 1, "Main") for i in range(len(traders))],
+    )
+    conn.executemany(
+        "INSERT INTO positions (portfolio_id, symbol, quantity, avg_price) VALUES (?, ?, ?, ?)",
+        [(i + 1, s, 10, 100.0) for i in range(len(traders)) for s in SYMBOLS[:2]],
+    )
+    rows = [
+        (rng.randint(1, len(traders)), rng.choice(SYMBOLS), rng.choice(["buy", "sell"]),
+         rng.randint(1, 100), round(rng.uniform(50, 500), 2))
+        for _ in range(orders)
+    ]
+    conn.executemany(
+        "INSERT INTO orders (user_id, symbol, side, quantity, price, status) VALUES (?, ?, ?, ?, ?, 'open')",
+        rows,
+    )
+    conn.executemany(
+        "INSERT INTO trades (user_id, symbol, side, quantity, price) VALUES (?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def fresh_connection_query(db_path):
+    """The previous read path: open, query, close on every call."""
+    counter = {"queries": 0}
+
+    def query(sql, params, one):
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.execute(sql, params)
+        result = cursor.fetchone() if one else [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        counter["queries"] += 1
+        return result
+
+    return query, lambda: counter["queries"]
+
+
+def run(db_path, query, traders, rounds, write_every, workers):
+    """Run refresh rounds for every session, committing new orders between rounds."""
+    writer = sqlite3.connect(db_path)
+    refresh_times = []
+
+    def refresh(trader):
+        start = time.perf_counter()
+        for sql, params, one in session_queries(trader):
+            query(sql, params, one)
+        return time.perf_counter() - start
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for r in range(rounds):
+            if r and r % write_every == 0:
+                writer.execute(
+                    "INSERT INTO orders (user_id, symbol, side, quantity, price, status) VALUES (1, 'AAPL', 'buy', 1, 100, 'open')"
+                )
+                writer.commit()
+            refresh_times.extend(pool.map(refresh, traders))
+    wall = time.perf_counter() - wall
+    writer.close()
+    return wall, sum(refresh_times) / len(refresh_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portal read-path benchmark")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20, help="Refresh rounds per session")
+    parser.add_argument("--write-every", type=int, default=4, help="Commit new data every N rounds")
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=8, help="Streamlit script threads")
+    args = parser.parse_args()
+
+    traders = [f"trader-{i:04d}" for i in range(args.sessions)]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        with console.status("[cyan]Seeding database...", spinner="dots"):
+            seed(db_path, traders, args.orders)
+
+        with console.status("[cyan]Fresh connection per call...", spinner="dots"):
+            query, count = fresh_connection_query(db_path)
+            wall, per_refresh = run(db_path, query, traders, args.rounds, args.write_every, args.workers)
+            results.append(("Connection per call", count(), wall, per_refresh, "-"))
+
+        with console.status("[cyan]CachedReader...", spinner="dots"):
+            # Poll data_version on every call so each commit is seen at once
+            reader = CachedReader(db_path, pool_size=4, ttl=60.0, check_interval=0.0)
+            wall, per_refresh = run(db_path, reader.query, traders, args.rounds, args.write_every, args.workers)
+            stats = reader.stats()
+            results.append(("CachedReader", stats["misses"], wall, per_refresh, f"{stats['hit_rate']:.1%}"))
+            reader.close()
+
+    table = Table(
+        title=f"🗄️ Portal Reads ({args.sessions} sessions x {args.rounds} refreshes)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Read path", style="cyan")
+    table.add_column("DB queries", justify="right", style="yellow")
+    table.add_column("Wall s", justify="right", style="green")
+    table.add_column("ms / refresh", justify="right", style="blue")
+    table.add_column("Hit rate", justify="right", style="magenta")
+    for label, queries, wall, per_refresh, hit_rate in results:
+        table.add_row(label, f"{queries:,}", f"{wall:.2f}", f"{per_refresh * 1000:.2f}", hit_rate)
+    console.print(table)
+    console.print(
+        f"[dim]{args.rounds // args.write_every} commits during the run; cached DB queries scale "
+        f"with commits x distinct queries, not sessions x refreshes.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
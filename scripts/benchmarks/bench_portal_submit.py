@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""
+Trader portal order-submit latency: connection per click vs TESConnectionPool.
+
+Measures round-trip latency of a portal request for:
+  - the previous pattern (new BlockingConnection, channel and exclusive reply queue
+    for every request, torn down after the reply)
+  - the shared connection pool, with 1 and N concurrent sessions
+
+By default requests go to an echo responder started by the benchmark, which isolates
+client-side cost. Pass --tes to send real place_order requests to a running TES.
+
+Requires a RabbitMQ broker on localhost.
+
+Usage:
+    python scripts/benchmarks/bench_portal_submit.py [--requests 500] [--sessions 20] [--tes]
+"""
+
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add the portal utils to path
+sys.path.insert(
+    0,
+    str(Path(__file__).resolve().parent.parent.parent / "src" / "frontend" / "trader-portal" / "utils"),
+)
+
+import pika
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from tes_pool import TESConnectionPool
+
+console = Console()
+
+BENCH_QUEUE = "bench_portal_requests"
+
+
+def echo_responder(ready):
+    """Reply to every request with a small order-accepted payload."""
+    connection = pika.BlockingConnection(pika.ConnectionParameters(host="localhost"))
+    channel = connection.channel()
+    channel.queue_declare(queue=BENCH_QUEUE)
+    channel.queue_purge(queue=BENCH_QUEUE)
+
+    def on_request(ch, method, props, body):
+        ch.basic_publish(
+            exchange="",
+            routing_key=props.reply_to,
+            properties=pika.BasicProperties(correlation_id=props.correlation_id),
+            body=json.dumps({"status": "order_accepted", "order_id": 1}),
+        )
+
+    channel.basic_consume(queue=BENCH_QUEUE, on_message_callback=on_request, auto_ack=True)
+    ready.set()
+    channel.start_consuming()
+
+
+def make_order():
+    return {
+        "action": "place_order",
+        "trader_id": "bench-portal",
+        "trader_name": "BenchPortal",
+        "symbol": "AAPL",
+        "side": "buy",
+        "quantity": 1,
+        "price": 100.0,
+        "type": "limit",
+    }
+
+
+def submit_per_click(queue):
+    """The previous send_order_to_tes body: a full connection lifecycle per request."""
+    connection = pika.BlockingConnection(pika.ConnectionParameters(host="localhost"))
+    channel = connection.channel()
+    callback_queue = channel.queue_declare(queue="", exclusive=True).method.queue
+    corr_id = str(uuid.uuid4())
+    channel.basic_publish(
+        exchange="",
+        routing_key=queue,
+        properties=pika.BasicProperties(reply_to=callback_queue, correlation_id=corr_id),
+        body=json.dumps(make_order()),
+    )
+    response = None
+    for method_frame, properties, body in channel.consume(callback_queue, inactivity_timeout=5.0):
+        if method_frame is None:
+            break
+        if properties.correlation_id == corr_id:
+            response = json.loads(body)
+            channel.basic_ack(method_frame.delivery_tag)
+            break
+    connection.close()
+    return response
+
+
+def run_sessions(submit, requests, sessions):
+    """Issue ``requests`` submits from ``sessions`` threads; return latencies and wall time."""
+    latencies = []
+    lock = threading.Lock()
+    per_session = max(1, requests // sessions)
+
+    def session():
+        local = []
+        for _ in range(per_session):
+            start = time.perf_counter()
+            submit()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    wall = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - wall
+
+
+def summarise(label, latencies, wall):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (
+        label,
+        statistics.median(ordered) * 1000,
+        p99 * 1000,
+        statistics.mean(ordered) * 1000,
+        len(ordered) / wall,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portal order-submit latency benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent portal sessions")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--tes", action="store_true", help="Target a running TES instead of an echo responder")
+    args = parser.parse_args()
+
+    queue = "tes_requests" if args.tes else BENCH_QUEUE
+    responder = None
+    if not args.tes:
+        ready = multiprocessing.Event()
+        responder = multiprocessing.Process(target=echo_responder, args=(ready,), daemon=True)
+        responder.start()
+        ready.wait(timeout=10)
+
+    pool = TESConnectionPool(size=args.pool_size, queue=queue)
+    n = args.requests
+    results = []
+    with console.status("[cyan]Measuring order-submit latency...", spinner="dots"):
+        results.append(summarise("Connection per click, 1 session", *run_sessions(lambda: submit_per_click(queue), n, 1)))
+        results.append(
+            summarise(
+                f"Connection per click, {args.sessions} sessions",
+                *run_sessions(lambda: submit_per_click(queue), n, args.sessions),
+            )
+        )
+        results.append(summarise("Pool, 1 session", *run_sessions(lambda: pool.request(make_order()), n, 1)))
+        results.append(
+            summarise(
+                f"Pool ({args.pool_size} connections), {args.sessions} sessions",
+                *run_sessions(lambda: pool.request(make_order()), n, args.sessions),
+            )
+        )
+    pool.close()
+    if responder is not None:
+        responder.terminate()
+
+    table = Table(
+        title="🖱️ Portal Order-Submit Latency",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Client", style="cyan")
+    table.add_column("p50 ms", justify="right", style="green")
+    table.add_column("p99 ms", justify="right", style="yellow")
+    table.add_column("Mean ms", justify="right", style="blue")
+    table.add_column("Submits/s", justify="right", style="magenta")
+    for label, p50, p99, mean, rate in results:
+        table.add_row(label, f"{p50:.2f}", f"{p99:.2f}", f"{mean:.2f}", f"{rate:,.0f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+RPC client benchmark: blocking busy-wait loop vs AsyncRPCClient.
+
+Starts an echo responder in a separate process, then measures requests/sec and
+client CPU seconds for:
+  - the previous blocking pattern (one request in flight, spinning on
+    process_data_events() until the reply arrives)
+  - AsyncRPCClient with 1 and N concurrent requests over one channel
+
+Requires a RabbitMQ broker on localhost.
+
+Usage:
+    python scripts/benchmarks/bench_rpc.py [--requests 5000] [--concurrency 100]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+import pika
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from messaging import AsyncRPCClient, MessageBroker
+
+console = Console()
+
+BENCH_QUEUE = "bench_rpc_requests"
+
+
+def echo_responder(ready):
+    """Reply to every request with a small status payload."""
+    connection = pika.BlockingConnection(pika.ConnectionParameters(host="localhost"))
+    channel = connection.channel()
+    channel.queue_declare(queue=BENCH_QUEUE)
+    channel.queue_purge(queue=BENCH_QUEUE)
+
+    def on_request(ch, method, props, body):
+        ch.basic_publish(
+            exchange="",
+            routing_key=props.reply_to,
+            properties=pika.BasicProperties(correlation_id=props.correlation_id),
+            body=json.dumps({"status": "ok"}),
+        )
+
+    channel.basic_qos(prefetch_count=500)
+    channel.basic_consume(queue=BENCH_QUEUE, on_message_callback=on_request, auto_ack=True)
+    ready.set()
+    channel.start_consuming()
+
+
+def run_blocking_spin(requests):
+    """The old send_request pattern: one request in flight, busy-wait for the reply."""
+    connection = pika.BlockingConnection(pika.ConnectionParameters(host="localhost"))
+    channel = connection.channel()
+    callback_queue = channel.queue_declare(queue="", exclusive=True).method.queue
+    state = {"corr_id": None, "response": None}
+
+    def on_response(ch, method, props, body):
+        if state["corr_id"] == props.correlation_id:
+            state["response"] = json.loads(body)
+
+    channel.basic_consume(queue=callback_queue, on_message_callback=on_response, auto_ack=True)
+    for _ in range(requests):
+        state["response"] = None
+        state["corr_id"] = str(uuid.uuid4())
+        channel.basic_publish(
+            exchange="",
+            routing_key=BENCH_QUEUE,
+            properties=pika.BasicProperties(
+                reply_to=callback_queue, correlation_id=state["corr_id"]
+            ),
+            body=json.dumps({"action": "ping"}),
+        )
+        while state["response"] is None:
+            connection.process_data_events()
+    connection.close()
+
+
+async def run_async(requests, concurrency):
+    """AsyncRPCClient with up to ``concurrency`` requests in flight."""
+    async with AsyncRPCClient(MessageBroker(), max_in_flight=concurrency) as client:
+        await asyncio.gather(
+            *(client.call(BENCH_QUEUE, {"action": "ping"}) for _ in range(requests))
+        )
+
+
+def measure(label, fn, requests):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    fn()
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    return label, requests / wall, cpu, cpu / wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blocking vs async RPC benchmark")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    ready = multiprocessing.Event()
+    responder = multiprocessing.Process(target=echo_responder, args=(ready,), daemon=True)
+    responder.start()
+    ready.wait(timeout=10)
+
+    n = args.requests
+    results = []
+    with console.status("[cyan]Running RPC benchmarks...", spinner="dots"):
+        results.append(measure("Blocking busy-wait", lambda: run_blocking_spin(n), n))
+        results.append(measure("Async, 1 in flight", lambda: asyncio.run(run_async(n, 1)), n))
+        results.append(
+            measure(
+                f"Async, {args.concurrency} in flight",
+                lambda: asyncio.run(run_async(n, args.concurrency)),
+                n,
+            )
+        )
+    responder.terminate()
+
+    table = Table(
+        title="📨 RPC Client Benchmark",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Client", style="cyan")
+    table.add_column("Requests/s", justify="right", style="green")
+    table.add_column("Client CPU s", justify="right", style="blue")
+    table.add_column("CPU utilisation", justify="right", style="yellow")
+    for label, rate, cpu, utilisation in results:
+        table.add_row(label, f"{rate:,.0f}", f"{cpu:.2f}", f"{utilisation:.0%}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
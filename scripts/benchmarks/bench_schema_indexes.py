@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+Transactional schema index benchmark.
+
+Builds an orders table of --rows rows (10M by default) on the base SCHEMA, times the
+portal queries and prints their query plans, applies the migrations, and repeats.
+Exits non-zero if any query still scans a large table, or a covered query still reads
+the table, after migrating. The queries live in database.transactional.portal_queries;
+test_migrations.py runs the same plan checks on an empty in-memory database.
+
+Usage:
+    python scripts/benchmarks/bench_schema_indexes.py [--rows 10000000] [--users 10000]
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.transactional.migrations import get_schema_version, migrate
+from database.transactional.models import SCHEMA
+from database.transactional.portal_queries import QUERIES, plan, uses_covering_index, uses_index
+
+console = Console()
+
+def build(db_path, rows, users):
+    """Create the base schema and fill it with generated rows."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    conn.execute(
+        f"""INSERT INTO users (username, password_hash)
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {users})
+            SELECT printf('trader-%05d', i), 'bench' FROM n"""
+    )
+    conn.execute("INSERT INTO portfolios (user_id, name) SELECT id, 'Main' FROM users")
+    conn.execute(
+        """INSERT INTO positions (portfolio_id, symbol, quantity, avg_price)
+           SELECT p.id, s.symbol, 10, 100.0 FROM portfolios p
+           CROSS JOIN (SELECT 'AAPL' AS symbol UNION ALL SELECT 'MSFT' UNION ALL SELECT 'TSLA') s"""
+    )
+    # Orders and trades spread over one day, 0.1% of orders still open
+    for table, extra_cols, extra_vals in (
+        ("orders", ", status, created_at", ", CASE WHEN i % 1000 = 4 THEN 'open' ELSE 'filled' END, ts"),
+        ("trades", ", timestamp", ", ts"),
+    ):
+        conn.execute(
+            f"""INSERT INTO {table} (user_id, symbol, side, quantity, price{extra_cols})
+                WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {rows})
+                SELECT i % {users} + 1,
+                       CASE i % 5 WHEN 0 THEN 'AAPL' WHEN 1 THEN 'MSFT' WHEN 2 THEN 'GOOGL'
+                                  WHEN 3 THEN 'AMZN' ELSE 'TSLA' END,
+                       CASE i % 2 WHEN 0 THEN 'buy' ELSE 'sell' END,
+                       i % 100 + 1, 100 + (i % 1000) / 100.0{extra_vals}
+                FROM (SELECT i, datetime('2025-01-01', printf('+%d seconds', i * 86400 / {rows})) AS ts FROM n)"""
+        )
+    conn.commit()
+    return conn
+
+
+def time_query(conn, sql, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transactional schema index benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows in orders and trades")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        with console.status(f"[cyan]Building {args.rows:,} orders and trades...", spinner="dots"):
+            conn = build(db_path, args.rows, args.users)
+
+        before = {}
+        with console.status("[cyan]Timing queries on the base schema...", spinner="dots"):
+            for label, (sql, params, _, _) in QUERIES.items():
+                before[label] = (time_query(conn, sql, params, args.repeat), plan(conn, sql, params))
+
+        with console.status("[cyan]Applying migrations...", spinner="dots"):
+            start = time.perf_counter()
+            version = migrate(conn)
+            migrate_time = time.perf_counter() - start
+            conn.execute("ANALYZE")
+
+        after = {}
+        for label, (sql, params, _, _) in QUERIES.items():
+            after[label] = (time_query(conn, sql, params, args.repeat), plan(conn, sql, params))
+        assert get_schema_version(conn) == version
+        conn.close()
+
+    table = Table(
+        title=f"🗂️ Portal Queries on {args.rows:,} Rows (schema v0 → v{version})",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Query", style="cyan")
+    table.add_column("Before ms", justify="right", style="red")
+    table.add_column("After ms", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="yellow")
+    table.add_column("Plan after", style="dim")
+
+    failures = []
+    for label, (_, _, name, covered) in QUERIES.items():
+        t_before, _ = before[label]
+        t_after, steps = after[label]
+        table.add_row(
+            label,
+            f"{t_before * 1000:.2f}",
+            f"{t_after * 1000:.2f}",
+            f"{t_before / t_after:,.0f}x" if t_after else "-",
+            "\n".join(steps),
+        )
+        if not uses_index(steps, name) or (covered and not uses_covering_index(steps, name)):
+            failures.append(label)
+    console.print(table)
+    console.print(f"Migration to v{version} took {migrate_time:.1f}s")
+
+    for label in QUERIES:
+        console.print(f"[dim]{label} before: {' | '.join(before[label][1])}[/dim]")
+
+    if failures:
+        console.print(f"[red]Full scans or uncovered reads remain after migrating: {', '.join(failures)}[/red]")
+        sys.exit(1)
+    console.print("[green]✓ Every portal query uses an index after migrating[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+SQLite contention benchmark: one writer, N readers.
+
+The writer commits small batches of orders, like the TES group-commit path, while
+reader processes run the portal's recent-orders query in a loop. This runs once with
+SQLite's defaults (rollback journal, synchronous=FULL) and once with the shared
+connection settings (WAL etc.). It reports writer commit latency, reader query latency,
+and lock errors.
+
+Usage:
+    python scripts/benchmarks/bench_sqlite_contention.py [--readers 4] [--seconds 10] [--batch 10]
+"""
+
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+import numpy as np
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.connection import connect, sqlite_settings
+from database.transactional.migrations import migrate
+from database.transactional.models import SCHEMA
+
+console = Console()
+
+# SQLite's own defaults, as every component used to open the database
+LEGACY_SETTINGS = {
+    "journal_mode": "delete",
+    "synchronous": "full",
+    "busy_timeout_ms": 5000,
+    "mmap_size": 0,
+    "cache_size_kb": 2000,
+}
+
+RECENT_ORDERS = """
+    SELECT id as order_id, user_id, symbol, side, quantity, price, status, created_at
+    FROM orders ORDER BY created_at DESC LIMIT 1000
+"""
+
+
+def setup(db_path, settings, rows):
+    conn = connect(db_path, settings=settings)
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    conn.commit()
+    migrate(conn)
+    conn.execute("INSERT INTO users (username, password_hash) VALUES ('bench', 'bench')")
+    conn.executemany(
+        "INSERT INTO orders (user_id, symbol, side, quantity, price, status) VALUES (1, 'AAPL', 'buy', ?, 100.0, 'open')",
+        [(i % 100 + 1,) for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def writer(db_path, settings, seconds, batch, results):
+    conn = connect(db_path, settings=settings)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.executemany(
+                "INSERT INTO orders (user_id, symbol, side, quantity, price, status) VALUES (1, 'AAPL', 'buy', 1, 100.0, 'open')",
+                [()] * batch,
+            )
+            conn.commit()
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            conn.rollback()
+            errors += 1
+    conn.close()
+    results.put(("writer", latencies, errors))
+
+
+def reader(db_path, settings, seconds, results):
+    conn = connect(db_path, settings=settings)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.execute(RECENT_ORDERS).fetchall()
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            errors += 1
+    conn.close()
+    results.put(("reader", latencies, errors))
+
+
+def run(label, settings, args, tmp):
+    db_path = str(Path(tmp) / f"{label.split()[0].lower()}.db")
+    setup(db_path, settings, args.rows)
+
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=writer, args=(db_path, settings, args.seconds, args.batch, results))]
+    procs += [
+        multiprocessing.Process(target=reader, args=(db_path, settings, args.seconds, results))
+        for _ in range(args.readers)
+    ]
+    for p in procs:
+        p.start()
+    collected = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    writes = [lat for role, lats, _ in collected if role == "writer" for lat in lats]
+    reads = [lat for role, lats, _ in collected if role == "reader" for lat in lats]
+    errors = sum(err for _, _, err in collected)
+    return label, np.array(writes) * 1000, np.array(reads) * 1000, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite writer/reader contention benchmark")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--batch", type=int, default=10, help="Orders per writer commit")
+    parser.add_argument("--rows", type=int, default=100_000, help="Orders preloaded")
+    args = parser.parse_args()
+
+    shared = sqlite_settings()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        with console.status("[cyan]Default settings (rollback journal)...", spinner="dots"):
+            results.append(run("Default (delete, full)", LEGACY_SETTINGS, args, tmp))
+        with console.status("[cyan]Shared settings...", spinner="dots"):
+            results.append(
+                run(f"Shared ({shared['journal_mode']}, {shared['synchronous']})", shared, args, tmp)
+            )
+
+    table = Table(
+        title=f"🔒 SQLite Contention (1 writer, {args.readers} readers, {args.seconds:.0f}s)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Settings", style="cyan")
+    table.add_column("Commits/s", justify="right", style="green")
+    table.add_column("Commit p50 / p99 / max ms", justify="right", style="yellow")
+    table.add_column("Reads/s", justify="right", style="green")
+    table.add_column("Read p50 / p99 ms", justify="right", style="blue")
+    table.add_column("Lock errors", justify="right", style="red")
+    for label, writes, reads, errors in results:
+        table.add_row(
+            label,
+            f"{len(writes) / args.seconds:,.0f}",
+            " / ".join(f"{v:.2f}" for v in (*np.percentile(writes, [50, 99]), writes.max()))
+            if len(writes) else "-",
+            f"{len(reads) / args.seconds:,.0f}",
+            " / ".join(f"{v:.2f}" for v in np.percentile(reads, [50, 99])) if len(reads) else "-",
+            str(errors),
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
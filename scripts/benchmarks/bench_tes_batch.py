@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+TES group-commit benchmark.
+
+Drives OrderBatchWriter against a scratch SQLite file for several batch size /
+max delay settings. For each one it reports saturated throughput (orders/sec)
+and the p50/p99 ack latency at a fixed offered load, where ack latency is the
+time from an order arriving to the commit that made it durable.
+batch_size=1 is equivalent to the old commit-per-order path, and --no-cache
+restores the users lookup on every order.
+
+Usage:
+    python scripts/benchmarks/bench_tes_batch.py [--orders 20000] [--rate 5000]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.transactional.models import SCHEMA
+from servers.tes.order_writer import OrderBatchWriter
+from servers.tes.user_cache import UserIdCache
+
+console = Console()
+
+SETTINGS = [(1, 0.0), (10, 1.0), (100, 5.0), (1000, 20.0)]
+TRADERS = 100
+
+
+def make_order(i):
+    return {
+        "trader_id": f"trader-{i % TRADERS}",
+        "symbol": "AAPL",
+        "side": "buy" if i % 2 else "sell",
+        "quantity": 100.0,
+        "price": 150.0,
+    }
+
+
+def open_db(directory, name):
+    conn = sqlite3.connect(str(Path(directory) / name))
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    conn.commit()
+    return conn
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def saturated_throughput(conn, batch_size, max_delay_ms, orders, cache):
+    """Submit orders back to back and flush whenever a batch is due."""
+    writer = OrderBatchWriter(conn, batch_size, max_delay_ms, user_cache=cache)
+    start = time.perf_counter()
+    for i in range(orders):
+        if writer.submit(make_order(i)) or writer.is_due():
+            writer.flush()
+    writer.flush()
+    return orders / (time.perf_counter() - start)
+
+
+def offered_load_latency(conn, batch_size, max_delay_ms, orders, rate, cache):
+    """Submit orders on a fixed arrival schedule and record arrival -> commit latency."""
+    writer = OrderBatchWriter(conn, batch_size, max_delay_ms, user_cache=cache)
+    interval = 1.0 / rate
+    latencies = []
+    start = time.perf_counter()
+    submitted = 0
+    while len(latencies) < orders:
+        now = time.perf_counter()
+        # Submit every order whose scheduled arrival time has passed
+        while submitted < orders and start + submitted * interval <= now:
+            writer.submit(make_order(submitted), start + submitted * interval)
+            submitted += 1
+        if writer.is_due() or (submitted == orders and len(writer)):
+            results = writer.flush()
+            done = time.perf_counter()
+            latencies.extend(done - arrival for _, arrival, _ in results)
+    return percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TES group-commit benchmark")
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=5_000, help="Offered load, orders/sec")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Disable the trader_id -> user_id cache"
+    )
+    args = parser.parse_args()
+
+    table = Table(
+        title="💾 TES Group Commit",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Batch size", justify="right", style="cyan")
+    table.add_column("Max delay ms", justify="right", style="cyan")
+    table.add_column("Orders/s (saturated)", justify="right", style="green")
+    table.add_column(f"p50 ack ms @ {args.rate:,.0f}/s", justify="right", style="blue")
+    table.add_column(f"p99 ack ms @ {args.rate:,.0f}/s", justify="right", style="yellow")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n, (batch_size, max_delay_ms) in enumerate(SETTINGS):
+            with console.status(f"[cyan]batch_size={batch_size}...", spinner="dots"):
+                conn = open_db(tmp, f"bench_{n}.db")
+                cache = None if args.no_cache else UserIdCache()
+                throughput = saturated_throughput(
+                    conn, batch_size, max_delay_ms, args.orders, cache
+                )
+                p50, p99 = offered_load_latency(
+                    conn, batch_size, max_delay_ms, args.orders, args.rate, cache
+                )
+                conn.close()
+            table.add_row(
+                str(batch_size),
+                f"{max_delay_ms:g}",
+                f"{throughput:,.0f}",
+                f"{p50:.2f}",
+                f"{p99:.2f}",
+            )
+
+    console.print(table)
+    if not args.no_cache:
+        console.print(f"[dim]User cache hit rate (last run): {cache.hit_rate:.1%}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
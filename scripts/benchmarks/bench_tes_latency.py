@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+End-to-end order latency benchmark (TES -> OBS path).
+
+Drives a running TES and OBS with the open-loop load generator: --traders traders
+place orders at --rate orders/s (Poisson arrivals) for --duration seconds from
+--workers processes, with a fixed --seed. Every order is timestamped at its
+scheduled send time and reports:
+  - submit -> ack: the TES reply, sent once the order is committed and routed
+  - submit -> fill: each order_filled event for the order
+
+as HDR-style histograms (p50/p90/p99/p99.9/max), printed every second and written
+to --report as JSON. With --baseline, the percentiles and throughput are compared
+to an earlier report.
+
+Requires RabbitMQ on localhost and the TES and OBS servers running.
+
+Usage:
+    python scripts/benchmarks/bench_tes_latency.py [--rate 1000] [--duration 60] [--traders 10000]
+        [--workers 2] [--report latency.json] [--baseline previous.json]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from clients.latency import load_report
+from clients.simulated_traders import run_simulated_traders
+
+console = Console()
+
+COMPARED = [
+    ("ack p50", ("ack_latency", "p50_ms")),
+    ("ack p99", ("ack_latency", "p99_ms")),
+    ("ack p99.9", ("ack_latency", "p99.9_ms")),
+    ("ack max", ("ack_latency", "max_ms")),
+    ("fill p50", ("fill_latency", "p50_ms")),
+    ("fill p99", ("fill_latency", "p99_ms")),
+    ("fill p99.9", ("fill_latency", "p99.9_ms")),
+    ("fill max", ("fill_latency", "max_ms")),
+    ("acked/s", ("throughput", "acked_per_s")),
+]
+
+
+def compare(baseline, report):
+    table = Table(
+        title="📉 Latency vs Baseline",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Metric", style="cyan")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Now", justify="right")
+    table.add_column("Change", justify="right")
+    for label, (section, key) in COMPARED:
+        before = baseline.get(section, {}).get(key)
+        after = report.get(section, {}).get(key)
+        if before is None or after is None:
+            table.add_row(label, "-" if before is None else f"{before:,.2f}", "-" if after is None else f"{after:,.2f}", "")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        # Higher latency is worse; lower throughput is worse
+        worse = change < 0 if section == "throughput" else change > 0
+        color = "red" if worse and abs(change) >= 10 else "green" if abs(change) >= 10 else "dim"
+        unit = "" if section == "throughput" else " ms"
+        table.add_row(label, f"{before:,.2f}{unit}", f"{after:,.2f}{unit}", f"[{color}]{change:+.1f}%[/{color}]")
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end order latency benchmark")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Target orders/s")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--traders", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--report", default="latency.json", help="JSON report to write")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare with")
+    parser.add_argument("--quiet", action="store_true", help="No per-second lines")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    report = run_simulated_traders(
+        count=args.traders,
+        rate=args.rate,
+        duration=args.duration,
+        workers=args.workers,
+        seed=args.seed,
+        stats_interval=args.duration + 1,
+        per_second=not args.quiet,
+        report_path=args.report,
+    )
+
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        if baseline is None:
+            console.print(f"[yellow]No baseline at {args.baseline}[/yellow]")
+        else:
+            compare(baseline, report)
+
+
+if __name__ == "__main__":
+    main()
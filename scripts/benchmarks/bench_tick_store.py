@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Local tick store benchmark.
+
+Writes synthetic trades and quotes (several symbols over several days) to a
+LocalTickStore in a temporary directory and reports:
+  - insert throughput, per row and in 1,000-row batches, and bytes on disk per trade
+  - query time for a one-hour, one-symbol scan, 1-minute OHLCV bars over everything and
+    a one-hour as-of join, next to the same work in pandas on a DataFrame already in
+    memory (the best case for pulling the raw table and aggregating client-side)
+
+Usage:
+    python scripts/benchmarks/bench_tick_store.py [--trades 200000] [--days 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.historical import LocalTickStore
+
+console = Console()
+
+SYMBOLS = np.array(["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA"], dtype=object)
+START = np.datetime64("2025-01-06T00:00:00", "ns")
+
+
+def generate(n, days, seed=11):
+    """Trades spread evenly over ``days`` days, in time order, plus twice as many quotes."""
+    rng = np.random.default_rng(seed)
+    span = days * 86_400 * 10**9
+    trades = pd.DataFrame({
+        "id": [f"T-{i}" for i in range(n)],
+        "timestamp": START + np.sort(rng.integers(0, span, n)).astype("timedelta64[ns]"),
+        "symbol": SYMBOLS[rng.integers(0, len(SYMBOLS), n)],
+        "quantity": rng.integers(1, 100, n).astype(float),
+        "price": np.round(150 + rng.normal(0, 5, n), 2),
+        "buyer": np.array([str(v) for v in rng.integers(1, 1000, n)], dtype=object),
+        "seller": np.array([str(v) for v in rng.integers(1, 1000, n)], dtype=object),
+    })
+    m = 2 * n
+    mid = np.round(150 + rng.normal(0, 5, m), 2)
+    quotes = pd.DataFrame({
+        "timestamp": START + np.sort(rng.integers(0, span, m)).astype("timedelta64[ns]"),
+        "symbol": SYMBOLS[rng.integers(0, len(SYMBOLS), m)],
+        "bid": mid - 0.01,
+        "ask": mid + 0.01,
+        "bid_size": rng.integers(1, 500, m).astype(float),
+        "ask_size": rng.integers(1, 500, m).astype(float),
+    })
+    return trades, quotes
+
+
+def timed(fn, repeat=3):
+    """Best of ``repeat`` runs, in ms, and the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local tick store benchmark")
+    parser.add_argument("--trades", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=5)
+    args = parser.parse_args()
+
+    with console.status("[cyan]Generating ticks...", spinner="dots"):
+        trades, quotes = generate(args.trades, args.days)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = LocalTickStore(root)
+        with console.status("[cyan]Writing...", spinner="dots"):
+            per_row = trades.head(5_000).to_dict("records")
+            for row in per_row:
+                row["timestamp"] = row["timestamp"].value / 1e9
+            start = time.perf_counter()
+            for row in per_row:
+                store.insert_trade(row)
+            per_row_rate = len(per_row) / (time.perf_counter() - start)
+
+        with tempfile.TemporaryDirectory() as batched_root:
+            store = LocalTickStore(batched_root)
+            with console.status("[cyan]Writing batches...", spinner="dots"):
+                start = time.perf_counter()
+                for lo in range(0, len(trades), 1000):
+                    store.insert_frame("trade", trades.iloc[lo:lo + 1000])
+                batch_rate = len(trades) / (time.perf_counter() - start)
+                for lo in range(0, len(quotes), 1000):
+                    store.insert_frame("quote", quotes.iloc[lo:lo + 1000])
+            trade_bytes = sum(p.stat().st_size for p in (Path(batched_root) / "trade").rglob("*") if p.is_file())
+
+            hour_start = START + np.timedelta64(2 * 86_400 + 14 * 3600, "s")
+            hour_end = hour_start + np.timedelta64(3600, "s") - np.timedelta64(1, "ns")
+
+            def mask_hour(df):
+                return df[(df["symbol"] == "MSFT") & (df["timestamp"] >= hour_start) & (df["timestamp"] <= hour_end)]
+
+            def pandas_bars():
+                df = trades.assign(bucket=trades["timestamp"].dt.floor("1min"), notional=trades["price"] * trades["quantity"])
+                return df.groupby(["symbol", "bucket"]).agg(
+                    open=("price", "first"), high=("price", "max"), low=("price", "min"),
+                    close=("price", "last"), volume=("quantity", "sum"), notional=("notional", "sum"),
+                    trades=("price", "size"),
+                )
+
+            def pandas_aj():
+                t = mask_hour(trades)
+                return pd.merge_asof(t, quotes[quotes["symbol"] == "MSFT"], on="timestamp", by="symbol")
+
+            with console.status("[cyan]Querying...", spinner="dots"):
+                rows = []
+                ms, local = timed(lambda: store.query_trades("MSFT", hour_start, hour_end))
+                base_ms, ref = timed(lambda: mask_hour(trades))
+                rows.append(("1h scan, 1 symbol", ms, base_ms, len(local), (local["id"].to_numpy() == ref["id"].to_numpy()).all()))
+                ms, local = timed(lambda: store.ohlcv("1min"), repeat=1)
+                base_ms, ref = timed(pandas_bars, repeat=1)
+                same = len(local) == len(ref) and np.allclose(local["close"], ref["close"]) and (local["trades"].to_numpy() == ref["trades"].to_numpy()).all()
+                rows.append(("1min OHLCV, all", ms, base_ms, len(local), same))
+                ms, local = timed(lambda: store.trades_with_quotes("MSFT", hour_start, hour_end))
+                base_ms, ref = timed(pandas_aj)
+                rows.append(("1h as-of join", ms, base_ms, len(local), np.allclose(local["bid"], ref["bid"])))
+
+    table = Table(
+        title=f"💾 Local Tick Store ({args.trades:,} trades, {len(quotes):,} quotes, {args.days} days)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Operation", style="cyan")
+    table.add_column("Tick store", justify="right", style="green")
+    table.add_column("pandas in memory", justify="right", style="yellow")
+    table.add_column("Rows", justify="right")
+    table.add_column("Same result", justify="center")
+    table.add_row("insert, per row", f"{per_row_rate:,.0f} rows/s", "-", f"{5_000:,}", "-")
+    table.add_row("insert, 1,000 / batch", f"{batch_rate:,.0f} rows/s", "-", f"{args.trades:,}", "-")
+    table.add_row("disk per trade", f"{trade_bytes / args.trades:.1f} B", "-", "-", "-")
+    for label, ms, base_ms, n, same in rows:
+        table.add_row(label, f"{ms:,.1f} ms", f"{base_ms:,.1f} ms", f"{n:,}", "[green]yes[/green]" if same else "[red]NO[/red]")
+    console.print(table)
+    console.print(
+        "[dim]The pandas column assumes the whole table is already in memory; fetching it from a "
+        "store first (the old query_trades) would add that transfer on top.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Trader metrics benchmark.
+
+Builds --trades fills for --users users over --days days, plus one daily PnL row per
+user per day, as numpy arrays, and computes every user's trader_metrics row:
+  - vectorized: compute_trader_metrics (grouped numpy reductions, no per-user loop)
+  - per user: the same formulas in a Python loop over each user's slice, after
+    grouping the arrays by user; the loop runs on --loop-users users and is scaled up
+
+Then inserts the rows with one executemany and, for comparison, one
+insert_trader_metrics call (and commit) per row on the first 2,000.
+
+Usage:
+    python scripts/benchmarks/bench_trader_metrics.py [--trades 50000000] [--users 100000] [--days 20]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+import numpy as np
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from database.analytics import AnalyticsDB, compute_trader_metrics
+from database.analytics.metrics import TRADING_DAYS, TradeArrays, trade_pnl
+
+console = Console()
+
+
+def generate(n, users, days, seed=5):
+    rng = np.random.default_rng(seed)
+    trades = TradeArrays(
+        user_id=rng.integers(1, users + 1, n, dtype=np.int32),
+        symbol=rng.integers(0, 10, n, dtype=np.int16),
+        quantity=(rng.integers(1, 20, n) * 10 * rng.choice(np.array([-1.0, 1.0]), n)),
+        price=np.round(100 + rng.normal(0, 2, n), 2),
+        day=np.repeat(np.arange(20_000, 20_000 + days, dtype=np.int32), -(-n // days))[:n],
+    )
+    pnl_user = np.repeat(np.arange(1, users + 1, dtype=np.int64), days)
+    daily_pnl = np.round(rng.normal(20, 500, users * days), 2)
+    return trades, pnl_user, daily_pnl
+
+
+def group_by_user(trade_user, fill_pnl):
+    order = np.argsort(trade_user, kind="stable")
+    return trade_user[order].astype(np.int64), fill_pnl[order]
+
+
+def per_user(sorted_users, sorted_pnl, pnl_user, daily_pnl, user_ids):
+    """The same metrics, one user at a time."""
+    rows = []
+    for user in user_ids:
+        lo, hi = np.searchsorted(sorted_users, [user, user + 1])
+        pnl = sorted_pnl[lo:hi]
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        plo, phi = np.searchsorted(pnl_user, [user, user + 1])
+        series = daily_pnl[plo:phi]
+        std = series.std(ddof=1) if len(series) > 1 else 0.0
+        sharpe = series.mean() / std * np.sqrt(TRADING_DAYS) if std > 0 else np.nan
+        equity = np.cumsum(series)
+        peak = np.maximum(np.maximum.accumulate(equity), 0.0)
+        rows.append((
+            user, hi - lo, len(wins), len(losses),
+            wins.mean() if len(wins) else 0.0, losses.mean() if len(losses) else 0.0,
+            sharpe, (equity - peak).min() if len(series) else np.nan,
+        ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trader metrics benchmark")
+    parser.add_argument("--trades", type=int, default=50_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--loop-users", type=int, default=10_000, help="Users timed in the per-user loop")
+    args = parser.parse_args()
+
+    with console.status("[cyan]Generating trades...", spinner="dots"):
+        trades, pnl_user, daily_pnl = generate(args.trades, args.users, args.days)
+
+    with console.status("[cyan]Vectorized...", spinner="dots"):
+        start = time.perf_counter()
+        fill_pnl = trade_pnl(trades)
+        metrics = compute_trader_metrics(trades.user_id, fill_pnl, pnl_user, daily_pnl)
+        vectorized = time.perf_counter() - start
+
+    with console.status("[cyan]Per-user loop...", spinner="dots"):
+        sample = metrics.user_id[:args.loop_users]
+        start = time.perf_counter()
+        sorted_users, sorted_pnl = group_by_user(trades.user_id, fill_pnl)
+        grouping = time.perf_counter() - start
+        start = time.perf_counter()
+        loop_rows = per_user(sorted_users, sorted_pnl, pnl_user, daily_pnl, sample)
+        looped = grouping + (time.perf_counter() - start) * len(metrics.user_id) / len(sample)
+    loop = np.array([row[1:] for row in loop_rows], dtype=np.float64)
+    ours = np.column_stack([
+        metrics.total_trades, metrics.winning_trades, metrics.losing_trades, metrics.avg_win,
+        metrics.avg_loss, metrics.sharpe_ratio, metrics.max_drawdown,
+    ])[:len(sample)]
+    same = np.allclose(loop, ours, equal_nan=True)
+
+    rows = metrics.rows("2024-10-01", "2024-10-28")
+    with tempfile.TemporaryDirectory() as root:
+        analytics_db = AnalyticsDB(Path(root) / "analytics.db")
+        with console.status("[cyan]Inserting...", spinner="dots"):
+            start = time.perf_counter()
+            analytics_db.insert_trader_metrics_rows(rows)
+            bulk_rate = len(rows) / (time.perf_counter() - start)
+            one_by_one = rows[:2000]
+            start = time.perf_counter()
+            for row in one_by_one:
+                analytics_db.insert_trader_metrics(*row[:6], row[8], row[9], sharpe_ratio=row[6], max_drawdown=row[7])
+            single_rate = len(one_by_one) / (time.perf_counter() - start)
+        analytics_db.close()
+
+    table = Table(
+        title=f"📊 Trader Metrics ({args.trades:,} trades, {args.users:,} users, {args.days} days)",
+        box=box.ROUNDED,
+        header_style="bold cyan",
+        border_style="cyan",
+    )
+    table.add_column("Step", style="cyan")
+    table.add_column("Vectorized / executemany", justify="right", style="green")
+    table.add_column("Per user / per row", justify="right", style="yellow")
+    table.add_column("Speedup", justify="right")
+    table.add_row("compute, all users", f"{vectorized:,.2f} s", f"{looped:,.2f} s*", f"{looped / vectorized:,.0f}x")
+    table.add_row("insert", f"{bulk_rate:,.0f} rows/s", f"{single_rate:,.0f} rows/s", f"{bulk_rate / single_rate:,.0f}x")
+    console.print(table)
+    console.print(
+        f"[dim]* grouping plus the loop timed on {len(sample):,} users and scaled to {len(metrics.user_id):,}. "
+        f"Same metrics on those users: {'yes' if same else 'NO'}[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
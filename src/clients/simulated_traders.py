@@ -1,30 +1,52 @@
 """
 Simulated trader bots for development and testing.
 Automatically generates trading activity for testing the order matching engine.
+
+Traders are lightweight objects, not threads: a few worker processes each run one
+asyncio event loop and one AsyncRPCClient connection, and send orders for their share
+of the traders on an open-loop Poisson schedule at a target aggregate rate. Orders go
+out at their scheduled times whether or not earlier replies have arrived, so a slow
+TES cannot hold the offered load back (no coordinated omission); when the sender
+falls behind its own schedule, the lag is reported instead.
+
+Latencies are measured from each order's scheduled send time, so time spent waiting
+to be sent counts too: submit -> ack (the TES reply) and submit -> fill (each
+order_filled event, matched to the order by its correlation_id). They are recorded
+in HDR-style histograms, merged across workers, printed every second and summarized
+in a JSON report.
 """
 
-import json
+import asyncio
 import logging
+import math
+import multiprocessing
+import queue
 import random
-import threading
+import signal
 import time
 import uuid
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
 
-import pika
 from rich import box
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+from messaging import AsyncRPCClient, MessageBroker
+
+from .latency import LatencyHistogram, latency_table, write_report
+
 logger = logging.getLogger(__name__)
 console = Console()
 
 RABBITMQ_HOST = "localhost"
+TES_QUEUE = "tes_requests"
 
 
 class SimulatedTrader:
-    """A simulated trader that automatically places orders."""
+    """A simulated trader: an identity and a random order source, sharing its worker's connection."""
 
     # Development symbols (limited set)
     DEV_SYMBOLS = ["AAPL", "GOOGL", "MSFT", "TSLA", "AMZN"]
@@ -38,253 +60,468 @@ class SimulatedTrader:
         "AMZN": (140.0, 180.0),
     }
 
+    __slots__ = ("trader_id", "name", "symbols", "orders_sent", "responses_received")
+
     def __init__(
         self,
-        trader_id: Optional[str] = None,
+        trader_id: str,
         name: Optional[str] = None,
-        trade_frequency: float = 5.0,
         symbols: Optional[list[str]] = None,
     ):
         """
         Initialize a simulated trader.
 
         Args:
-            trader_id: Unique trader ID (generated if not provided)
-            name: Trader name (generated if not provided)
-            trade_frequency: Seconds between trades (average)
+            trader_id: Unique trader ID; the TES keeps one user per trader_id, so stable
+                ids reuse the same users from run to run
+            name: Trader name (defaults to trader_id)
             symbols: List of symbols to trade (defaults to DEV_SYMBOLS)
         """
-        self.trader_id = trader_id or str(uuid.uuid4())
-        self.name = name or f"SimTrader_{self.trader_id[:8]}"
-        self.trade_frequency = trade_frequency
+        self.trader_id = trader_id
+        self.name = name or trader_id
         self.symbols = symbols or self.DEV_SYMBOLS
-        self.is_running = False
-        self.thread = None
-
-        # RabbitMQ connection
-        self.connection = None
-        self.channel = None
-        self.callback_queue = None
-        self.response = None
-        self.corr_id = None
 
         # Trading statistics
         self.orders_sent = 0
         self.responses_received = 0
 
-    def connect(self):
-        """Connect to RabbitMQ."""
-        try:
-            self.connection = pika.BlockingConnection(pika.ConnectionParameters(host=RABBITMQ_HOST))
-            self.channel = self.connection.channel()
-
-            # Setup callback queue for responses
-            result = self.channel.queue_declare(queue="", exclusive=True)
-            self.callback_queue = result.method.queue
-
-            self.channel.basic_consume(
-                queue=self.callback_queue, on_message_callback=self.on_response, auto_ack=True
-            )
-
-            logger.info(f"[{self.name}] Connected to RabbitMQ")
-            return True
-        except Exception as e:
-            logger.error(f"[{self.name}] Failed to connect to RabbitMQ: {e}")
-            return False
-
-    def on_response(self, ch, method, props, body):
-        """Handle response from TES."""
-        if self.corr_id == props.correlation_id:
-            self.response = json.loads(body)
-            self.responses_received += 1
+    def random_order(self, rng: random.Random) -> dict[str, Any]:
+        """Generate a random limit order."""
+        symbol = rng.choice(self.symbols)
+        side = rng.choice(["buy", "sell"])
 
-    def send_order(self, symbol: str, side: str, quantity: float, price: float):
-        """Send an order to the TES."""
-        self.response = None
-        self.corr_id = str(uuid.uuid4())
+        # Get price range for symbol
+        min_price, max_price = self.PRICE_RANGES.get(symbol, (100.0, 200.0))
 
-        order = {
+        return {
             "action": "place_order",
             "trader_id": self.trader_id,
             "symbol": symbol,
             "side": side,  # 'buy' or 'sell'
-            "quantity": quantity,
-            "price": price,
+            # Random quantity (multiples of 10)
+            "quantity": rng.choice([10, 25, 50, 100, 150, 200]) * 1.0,
+            # Random price within range
+            "price": round(rng.uniform(min_price, max_price), 2),
             "type": "limit",
             "timestamp": time.time(),
         }
 
-        try:
-            self.channel.basic_publish(
-                exchange="",
-                routing_key="tes_requests",
-                properties=pika.BasicProperties(
-                    reply_to=self.callback_queue,
-                    correlation_id=self.corr_id,
-                ),
-                body=json.dumps(order),
-            )
-            self.orders_sent += 1
-            logger.debug(f"[{self.name}] Sent {side} order: {symbol} {quantity}@{price}")
-        except Exception as e:
-            logger.error(f"[{self.name}] Failed to send order: {e}")
-
-    def generate_random_order(self):
-        """Generate and send a random order."""
-        symbol = random.choice(self.symbols)
-        side = random.choice(["buy", "sell"])
-
-        # Get price range for symbol
-        min_price, max_price = self.PRICE_RANGES.get(symbol, (100.0, 200.0))
 
-        # Generate random price within range
-        price = round(random.uniform(min_price, max_price), 2)
+@dataclass
+class LoadStats:
+    """Counters for one load generator (or the sum over workers)."""
+
+    traders: int = 0
+    target_rate: float = 0.0
+    # Seconds spent sending (the drain at the end is not counted)
+    elapsed: float = 0.0
+    sent: int = 0
+    acked: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    fills: int = 0
+    in_flight: int = 0
+    # How far the sender has fallen behind its arrival schedule, at worst (seconds)
+    max_lag: float = 0.0
+    ack_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    fill_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def send_rate(self) -> float:
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+    def merge(self, other: "LoadStats") -> "LoadStats":
+        ack_latency = LatencyHistogram()
+        fill_latency = LatencyHistogram()
+        for stats in (self, other):
+            ack_latency.merge(stats.ack_latency)
+            fill_latency.merge(stats.fill_latency)
+        return LoadStats(
+            traders=self.traders + other.traders,
+            target_rate=self.target_rate + other.target_rate,
+            elapsed=max(self.elapsed, other.elapsed),
+            sent=self.sent + other.sent,
+            acked=self.acked + other.acked,
+            rejected=self.rejected + other.rejected,
+            timeouts=self.timeouts + other.timeouts,
+            errors=self.errors + other.errors,
+            fills=self.fills + other.fills,
+            in_flight=self.in_flight + other.in_flight,
+            max_lag=max(self.max_lag, other.max_lag),
+            ack_latency=ack_latency,
+            fill_latency=fill_latency,
+        )
 
-        # Generate random quantity (multiples of 10)
-        quantity = random.choice([10, 25, 50, 100, 150, 200]) * 1.0
 
-        self.send_order(symbol, side, quantity, price)
+@dataclass
+class LoadInterval:
+    """What happened during one second of a run (from one worker, or merged)."""
 
-    def trading_loop(self):
-        """Main trading loop that runs in a separate thread."""
-        logger.info(f"[{self.name}] Starting trading loop...")
+    second: int
+    sent: int = 0
+    acked: int = 0
+    fills: int = 0
+    ack_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    fill_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
-        # Send initial connect message
-        self.response = None
-        self.corr_id = str(uuid.uuid4())
+    def merge(self, other: "LoadInterval"):
+        self.sent += other.sent
+        self.acked += other.acked
+        self.fills += other.fills
+        self.ack_latency.merge(other.ack_latency)
+        self.fill_latency.merge(other.fill_latency)
 
-        connect_msg = {
-            "action": "connect",
-            "trader_id": self.trader_id,
-            "timestamp": time.time(),
-            "description": f"Simulated trader {self.name} connecting",
+    def summary(self) -> dict[str, Any]:
+        return {
+            "second": self.second,
+            "sent": self.sent,
+            "acked": self.acked,
+            "fills": self.fills,
+            "ack_latency": self.ack_latency.summary(),
+            "fill_latency": self.fill_latency.summary(),
         }
 
-        try:
-            self.channel.basic_publish(
-                exchange="",
-                routing_key="tes_requests",
-                properties=pika.BasicProperties(
-                    reply_to=self.callback_queue,
-                    correlation_id=self.corr_id,
-                ),
-                body=json.dumps(connect_msg),
-            )
-        except Exception as e:
-            logger.error(f"[{self.name}] Failed to send connect message: {e}")
-            return
-
-        # Trading loop
-        while self.is_running:
-            try:
-                # Process any pending messages
-                self.connection.process_data_events(time_limit=0.1)
-
-                # Place a random order
-                self.generate_random_order()
-
-                # Wait for a random interval (around trade_frequency seconds)
-                sleep_time = random.uniform(self.trade_frequency * 0.5, self.trade_frequency * 1.5)
-                time.sleep(sleep_time)
 
-            except Exception as e:
-                logger.error(f"[{self.name}] Error in trading loop: {e}")
-                time.sleep(1)
+class LoadGenerator:
+    """
+    Sends orders for a set of traders from one event loop, on an open-loop schedule.
 
-        logger.info(f"[{self.name}] Trading loop stopped. Sent {self.orders_sent} orders.")
+    Arrivals form a Poisson process at ``rate`` orders/s (exponential gaps between
+    scheduled send times); each goes to a trader picked at random, which is the same
+    as every trader placing orders as its own Poisson process at rate / traders. Each
+    order is sent as its own task, so replies never delay later sends.
+    """
 
-    def start(self):
-        """Start the simulated trader."""
-        if self.is_running:
-            logger.warning(f"[{self.name}] Already running")
+    def __init__(
+        self,
+        traders: list[SimulatedTrader],
+        rate: float,
+        duration: Optional[float] = None,
+        seed: Optional[int] = None,
+        max_in_flight: int = 10_000,
+        timeout: float = 10.0,
+        fill_wait: float = 2.0,
+        client: Optional[AsyncRPCClient] = None,
+        stop_event=None,
+        report=None,
+    ):
+        """
+        Args:
+            traders: Traders to place orders for
+            rate: Target orders/s over all of them
+            duration: Seconds to run (None runs until stop_event is set)
+            seed: Random seed for the schedule and the orders
+            max_in_flight: Bound on unanswered orders; beyond it orders wait to be
+                published, and that wait counts towards their latency
+            timeout: Seconds to wait for each order's reply
+            fill_wait: Seconds to keep listening for fills once the last order is answered
+            client: RPC client to send with (an AsyncRPCClient by default)
+            stop_event: Event (e.g. multiprocessing.Event) that ends the run when set
+            report: Called with the LoadStats and the LoadInterval just finished, once
+                a second and at the end
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if not traders:
+            raise ValueError("at least one trader is required")
+        self.traders = traders
+        self.rate = rate
+        self.duration = duration
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.fill_wait = fill_wait
+        self.client = client or AsyncRPCClient(
+            MessageBroker(host=RABBITMQ_HOST),
+            max_in_flight=max_in_flight,
+            default_timeout=timeout,
+            event_handler=self.on_event,
+        )
+        self.stop_event = stop_event
+        self.report = report
+        self.running = False
+        self.sending = False
+        self.started = 0.0
+        self.tasks: set[asyncio.Task] = set()
+        # Scheduled send time of each order that may still be filled, by correlation_id
+        self.submitted: dict[str, float] = {}
+        self.stats = LoadStats(traders=len(traders), target_rate=rate)
+        self.interval = LoadInterval(second=1)
+
+    def on_event(self, message: dict[str, Any], properties):
+        """Record fill notifications, which arrive on the reply queue with the order's correlation_id."""
+        if message.get("event") == "order_rejected":
+            # Acked by the TES but refused by the OBS: it will never fill
+            if self.submitted.pop(properties.correlation_id, None) is not None:
+                self.stats.rejected += 1
             return
-
-        if not self.connect():
-            logger.error(f"[{self.name}] Cannot start - connection failed")
+        if message.get("event") == "order_cancelled":
+            self.submitted.pop(properties.correlation_id, None)
             return
-
-        self.is_running = True
-        self.thread = threading.Thread(target=self.trading_loop, daemon=True)
-        self.thread.start()
-        logger.info(f"[{self.name}] Started")
-
-    def stop(self):
-        """Stop the simulated trader."""
-        if not self.is_running:
+        if message.get("event") != "order_filled":
             return
-
-        logger.info(f"[{self.name}] Stopping...")
-        self.is_running = False
-
-        if self.thread:
-            self.thread.join(timeout=5)
-
-        if self.connection and self.connection.is_open:
-            self.connection.close()
-
-        logger.info(
-            f"[{self.name}] Stopped. Stats: {self.orders_sent} orders sent, {self.responses_received} responses received"
-        )
-
-    def get_stats(self):
-        """Get trading statistics."""
-        return {
-            "name": self.name,
-            "trader_id": self.trader_id,
-            "orders_sent": self.orders_sent,
-            "responses_received": self.responses_received,
-            "is_running": self.is_running,
-        }
+        self.stats.fills += 1
+        self.interval.fills += 1
+        if message.get("status") == "filled":
+            intended = self.submitted.pop(properties.correlation_id, None)
+        else:
+            intended = self.submitted.get(properties.correlation_id)
+        if intended is not None:
+            latency = asyncio.get_running_loop().time() - intended
+            self.stats.fill_latency.record(latency)
+            self.interval.fill_latency.record(latency)
+
+    async def run(self) -> LoadStats:
+        """Connect, send on schedule until the duration ends or stop_event is set, then drain."""
+        loop = asyncio.get_running_loop()
+        await self.client.connect()
+        self.running = self.sending = True
+        self.started = loop.time()
+        reporter = loop.create_task(self._report_every_second())
+        try:
+            await self._send_on_schedule()
+            self._snapshot()
+            self.sending = False
+            if self.tasks:
+                # Give the last orders their full timeout to be answered
+                await asyncio.wait(self.tasks, timeout=self.timeout)
+            if self.submitted and self.fill_wait > 0:
+                await asyncio.sleep(self.fill_wait)
+        finally:
+            self.running = self.sending = False
+            reporter.cancel()
+            self._snapshot()
+            await self.client.close()
+        if self.report is not None:
+            self.report(self.stats, self.interval)
+        return self.stats
+
+    async def _send_on_schedule(self):
+        loop = asyncio.get_running_loop()
+        end = self.started + self.duration if self.duration else math.inf
+        intended = self.started
+        while self.running:
+            intended += self.rng.expovariate(self.rate)
+            if intended >= end:
+                break
+            delay = intended - loop.time()
+            if delay < 0:
+                self.stats.max_lag = max(self.stats.max_lag, -delay)
+            # Even when behind schedule, yield so replies get processed
+            await asyncio.sleep(max(delay, 0.0))
+            trader = self.rng.choice(self.traders)
+            task = loop.create_task(self._submit(trader, trader.random_order(self.rng), intended))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _submit(self, trader: SimulatedTrader, order: dict[str, Any], intended: float):
+        """Send one order; latencies run from ``intended``, its scheduled send time."""
+        self.stats.sent += 1
+        self.interval.sent += 1
+        trader.orders_sent += 1
+        correlation_id = str(uuid.uuid4())
+        self.submitted[correlation_id] = intended
+        try:
+            reply = await self.client.call(TES_QUEUE, order, correlation_id=correlation_id)
+        except TimeoutError:
+            self.stats.timeouts += 1
+            self.submitted.pop(correlation_id, None)
+            return
+        except Exception as e:
+            self.stats.errors += 1
+            self.submitted.pop(correlation_id, None)
+            logger.debug(f"[{trader.name}] Failed to send order: {e}")
+            return
+        latency = asyncio.get_running_loop().time() - intended
+        trader.responses_received += 1
+        if reply.get("status") == "ok":
+            self.stats.acked += 1
+            self.interval.acked += 1
+            self.stats.ack_latency.record(latency)
+            self.interval.ack_latency.record(latency)
+        else:
+            self.stats.rejected += 1
+            self.submitted.pop(correlation_id, None)
+
+    async def _report_every_second(self):
+        while self.running:
+            await asyncio.sleep(1.0)
+            if self.stop_event is not None and self.stop_event.is_set():
+                self.running = False
+            self._snapshot()
+            interval, self.interval = self.interval, LoadInterval(second=self.interval.second + 1)
+            if self.report is not None:
+                self.report(self.stats, interval)
+
+    def _snapshot(self):
+        if self.sending:
+            self.stats.elapsed = asyncio.get_running_loop().time() - self.started
+        self.stats.in_flight = self.client.in_flight
+
+
+def _run_worker(
+    worker: int,
+    workers: int,
+    count: int,
+    rate: float,
+    duration: Optional[float],
+    seed: Optional[int],
+    symbols: Optional[list[str]],
+    stop_event,
+    results,
+):
+    """Worker process: run a LoadGenerator for every ``workers``-th trader, posting stats to ``results``."""
+    # Ctrl+C reaches the whole process group; the parent stops workers through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    traders = [
+        SimulatedTrader(trader_id=f"SimTrader_{i + 1}", symbols=symbols) for i in range(worker, count, workers)
+    ]
+    generator = LoadGenerator(
+        traders,
+        rate=rate * len(traders) / count,
+        duration=duration,
+        seed=None if seed is None else seed + worker,
+        stop_event=stop_event,
+        report=lambda stats, interval: results.put((worker, stats, interval)),
+    )
+    try:
+        asyncio.run(generator.run())
+    except Exception as e:
+        logger.error(f"Load generator worker {worker} failed: {e}")
+        results.put((worker, str(e), None))
 
 
 class SimulatedTradersManager:
-    """Manages multiple simulated traders."""
+    """Runs simulated traders across worker processes and collects their statistics."""
 
     def __init__(self):
         """Initialize the traders manager."""
-        self.traders: list[SimulatedTrader] = []
+        self.processes: list[multiprocessing.Process] = []
+        self.stop_event = multiprocessing.Event()
+        self.results = multiprocessing.Queue()
+        self.worker_stats: dict[int, LoadStats] = {}
+        self.worker_errors: dict[int, str] = {}
+        # Per-second intervals merged across workers, and how many workers have reported each
+        self.intervals: dict[int, LoadInterval] = {}
+        self.interval_reports: dict[int, int] = {}
+        self.completed_intervals: list[LoadInterval] = []
+        self.config: dict[str, Any] = {}
+        self.started_at: Optional[datetime] = None
 
     def spawn_traders(
-        self, count: int = 5, trade_frequency: float = 5.0, symbols: Optional[list[str]] = None
+        self,
+        count: int = 5,
+        rate: Optional[float] = None,
+        trade_frequency: float = 5.0,
+        symbols: Optional[list[str]] = None,
+        workers: int = 1,
+        duration: Optional[float] = None,
+        seed: Optional[int] = None,
     ):
         """
-        Spawn multiple simulated traders.
+        Start ``count`` simulated traders on ``workers`` worker processes.
 
         Args:
-            count: Number of traders to spawn
-            trade_frequency: Average seconds between trades per trader
+            count: Number of traders
+            rate: Target orders/s over all traders (default count / trade_frequency)
+            trade_frequency: Average seconds between trades per trader, used when rate is not given
             symbols: List of symbols to trade
+            workers: Worker processes, each with one event loop and one connection
+            duration: Seconds to run (None runs until stop_all)
+            seed: Random seed for reproducible schedules and orders
         """
-        logger.info(f"Spawning {count} simulated traders...")
-
-        for i in range(count):
-            trader = SimulatedTrader(
-                name=f"SimTrader_{i+1}", trade_frequency=trade_frequency, symbols=symbols
+        rate = rate or count / trade_frequency
+        workers = max(1, min(workers, count))
+        self.config = {
+            "traders": count,
+            "workers": workers,
+            "target_rate": rate,
+            "duration": duration,
+            "seed": seed,
+            "symbols": symbols or SimulatedTrader.DEV_SYMBOLS,
+        }
+        self.started_at = datetime.now()
+        logger.info(f"Spawning {count} simulated traders at {rate:,.1f} orders/s on {workers} workers...")
+
+        for worker in range(workers):
+            process = multiprocessing.Process(
+                target=_run_worker,
+                args=(worker, workers, count, rate, duration, seed, symbols, self.stop_event, self.results),
+                daemon=True,
             )
-            trader.start()
-            self.traders.append(trader)
-            time.sleep(0.2)  # Small delay between starting traders
+            process.start()
+            self.processes.append(process)
 
         logger.info(f"✅ Spawned {count} simulated traders")
 
-    def stop_all(self):
-        """Stop all simulated traders."""
-        logger.info(f"Stopping {len(self.traders)} simulated traders...")
+    def poll(self) -> list[LoadInterval]:
+        """
+        Take in the latest statistics posted by the workers.
 
-        for trader in self.traders:
-            trader.stop()
+        Returns the seconds that every running worker has now reported, merged and in order.
+        """
+        while True:
+            try:
+                worker, stats, interval = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(stats, str):
+                self.worker_errors[worker] = stats
+                continue
+            self.worker_stats[worker] = stats
+            merged = self.intervals.get(interval.second)
+            if merged is None:
+                self.intervals[interval.second] = interval
+            else:
+                merged.merge(interval)
+            self.interval_reports[interval.second] = self.interval_reports.get(interval.second, 0) + 1
+        return self._complete_intervals(len(self.processes) - len(self.worker_errors))
+
+    def _complete_intervals(self, reporting: int) -> list[LoadInterval]:
+        complete = []
+        for second in sorted(self.intervals):
+            if self.interval_reports[second] < reporting:
+                break
+            complete.append(self.intervals.pop(second))
+            del self.interval_reports[second]
+        self.completed_intervals.extend(complete)
+        return complete
+
+    def is_running(self) -> bool:
+        return any(process.is_alive() for process in self.processes)
+
+    def stop_all(self, timeout: float = 20.0) -> list[LoadInterval]:
+        """
+        Stop all workers; each drains its in-flight orders before exiting.
 
-        self.traders.clear()
+        Returns the intervals not returned by poll() yet, including each worker's last partial second.
+        """
+        logger.info(f"Stopping {len(self.processes)} load generator workers...")
+        self.stop_event.set()
+        complete = []
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            while process.is_alive() and time.monotonic() < deadline:
+                # Keep emptying the queue: a worker cannot exit with unread results
+                complete.extend(self.poll())
+                process.join(timeout=0.1)
+            if process.is_alive():
+                process.terminate()
+        complete.extend(self.poll())
+        complete.extend(self._complete_intervals(0))
+        self.processes.clear()
         logger.info("✅ All simulated traders stopped")
+        return complete
 
-    def get_all_stats(self):
-        """Get statistics for all traders."""
-        return [trader.get_stats() for trader in self.traders]
+    def total_stats(self) -> LoadStats:
+        total = LoadStats()
+        for stats in self.worker_stats.values():
+            total = total.merge(stats)
+        return total
 
     def generate_stats_table(self):
-        """Generate a rich table with trader statistics."""
-        stats = self.get_all_stats()
-
+        """Generate a rich table with per-worker and total statistics."""
+        self.poll()
         table = Table(
             title="🤖 Simulated Traders Statistics",
             box=box.ROUNDED,
@@ -293,80 +530,151 @@ class SimulatedTradersManager:
             border_style="cyan",
         )
 
-        table.add_column("Trader", style="cyan", no_wrap=True)
-        table.add_column("Status", justify="center")
+        table.add_column("Worker", style="cyan", no_wrap=True)
+        table.add_column("Traders", justify="right")
         table.add_column("Orders", justify="right", style="green")
-        table.add_column("Responses", justify="right", style="blue")
-        table.add_column("Response Rate", justify="right", style="yellow")
-
-        total_orders = 0
-        total_responses = 0
-        active_count = 0
-
-        for s in stats:
-            status = "🟢 [green]Running[/green]" if s["is_running"] else "🔴 [red]Stopped[/red]"
-            response_rate = (
-                f"{(s['responses_received'] / s['orders_sent'] * 100):.1f}%"
-                if s["orders_sent"] > 0
-                else "0.0%"
-            )
-
+        table.add_column("Orders/s (target)", justify="right")
+        table.add_column("Acked", justify="right", style="blue")
+        table.add_column("Rejected / Timeouts / Errors", justify="right", style="red")
+        table.add_column("Fills", justify="right", style="blue")
+        table.add_column("In flight", justify="right")
+        table.add_column("Max lag", justify="right", style="yellow")
+
+        def add_row(label, s):
             table.add_row(
-                s["name"],
-                status,
-                str(s["orders_sent"]),
-                str(s["responses_received"]),
-                response_rate,
+                label,
+                f"{s.traders:,}",
+                f"{s.sent:,}",
+                f"{s.send_rate:,.0f} ({s.target_rate:,.0f})",
+                f"{s.acked:,}",
+                f"{s.rejected:,} / {s.timeouts:,} / {s.errors:,}",
+                f"{s.fills:,}",
+                f"{s.in_flight:,}",
+                f"{s.max_lag * 1000:,.1f} ms",
             )
 
-            total_orders += s["orders_sent"]
-            total_responses += s["responses_received"]
-            if s["is_running"]:
-                active_count += 1
+        for worker in sorted(self.worker_stats):
+            add_row(f"Worker {worker + 1}", self.worker_stats[worker])
 
         # Add summary row
-        if stats:
+        if len(self.worker_stats) > 1:
             table.add_section()
-            overall_rate = (
-                f"{(total_responses / total_orders * 100):.1f}%" if total_orders > 0 else "0.0%"
-            )
-            table.add_row(
-                f"[bold]TOTAL ({active_count} active)[/bold]",
-                "",
-                f"[bold green]{total_orders}[/bold green]",
-                f"[bold blue]{total_responses}[/bold blue]",
-                f"[bold yellow]{overall_rate}[/bold yellow]",
-            )
+            add_row("[bold]TOTAL[/bold]", self.total_stats())
 
         return table
 
+    def build_report(self) -> dict[str, Any]:
+        """Latency and throughput report for the run so far, as JSON-serializable data."""
+        total = self.total_stats()
+
+        def per_second(count):
+            return round(count / total.elapsed, 1) if total.elapsed > 0 else 0.0
+
+        return {
+            "config": self.config,
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "elapsed_s": round(total.elapsed, 3),
+            "throughput": {
+                "sent_per_s": per_second(total.sent),
+                "acked_per_s": per_second(total.acked),
+                "fills_per_s": per_second(total.fills),
+            },
+            "counts": {
+                "sent": total.sent,
+                "acked": total.acked,
+                "rejected": total.rejected,
+                "timeouts": total.timeouts,
+                "errors": total.errors,
+                "fills": total.fills,
+            },
+            "max_schedule_lag_ms": round(total.max_lag * 1000, 3),
+            "ack_latency": total.ack_latency.summary(),
+            "fill_latency": total.fill_latency.summary(),
+            "per_second": [interval.summary() for interval in self.completed_intervals],
+            "worker_errors": {str(worker + 1): error for worker, error in self.worker_errors.items()},
+        }
+
+    def generate_latency_table(self):
+        """Generate a rich table of submit -> ack and submit -> fill latency percentiles."""
+        self.poll()
+        total = self.total_stats()
+        elapsed = max(total.elapsed, 1e-9)
+        return latency_table(
+            f"⏱️  Order Latency ({total.sent:,} orders in {total.elapsed:,.0f}s)",
+            [
+                ("submit → ack", total.ack_latency, total.acked / elapsed),
+                ("submit → fill", total.fill_latency, total.fills / elapsed),
+            ],
+        )
+
     def print_stats(self):
-        """Print statistics for all traders using rich formatting."""
+        """Print statistics for all workers using rich formatting."""
         table = self.generate_stats_table()
         console.print()
         console.print(table)
+        for worker, error in sorted(self.worker_errors.items()):
+            console.print(f"[bold red]Worker {worker + 1} failed:[/bold red] {error}")
         console.print()
 
 
-def run_simulated_traders(count: int = 5, trade_frequency: float = 5.0):
+def format_interval(interval: LoadInterval) -> str:
+    """One line per second: orders sent and acked, fills, and latency percentiles."""
+    ack, fill = interval.ack_latency, interval.fill_latency
+    return (
+        f"[dim]{interval.second:>5}s[/dim] sent [green]{interval.sent:,}[/green] "
+        f"acked [blue]{interval.acked:,}[/blue] "
+        f"[dim]p50/p99/p99.9[/dim] {_ms(ack.percentile(50))}/{_ms(ack.percentile(99))}/{_ms(ack.percentile(99.9))} ms "
+        f"[dim]│[/dim] fills [blue]{interval.fills:,}[/blue] "
+        f"[dim]p50/p99[/dim] {_ms(fill.percentile(50))}/{_ms(fill.percentile(99))} ms"
+    )
+
+
+def _ms(seconds: float) -> str:
+    return "-" if math.isnan(seconds) else f"{seconds * 1000:.2f}"
+
+
+def run_simulated_traders(
+    count: int = 5,
+    trade_frequency: float = 5.0,
+    rate: Optional[float] = None,
+    duration: Optional[float] = None,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    stats_interval: float = 30.0,
+    per_second: bool = True,
+    report_path: Optional[str] = None,
+) -> dict[str, Any]:
     """
     Run simulated traders (blocking).
 
     Args:
         count: Number of simulated traders
-        trade_frequency: Average seconds between trades
+        trade_frequency: Average seconds between trades per trader, used when rate is not given
+        rate: Target orders/s over all traders
+        duration: Seconds to run (None runs until Ctrl+C)
+        workers: Worker processes
+        seed: Random seed
+        stats_interval: Seconds between statistics tables
+        per_second: Print a line of latency percentiles every second
+        report_path: Write the latency report to this JSON file
+
+    Returns:
+        The latency report (see SimulatedTradersManager.build_report)
     """
     manager = SimulatedTradersManager()
+    rate = rate or count / trade_frequency
 
     try:
         # Display startup info
         console.print()
         console.print(
             Panel.fit(
-                f"[bold green]Starting {count} Simulated Traders[/bold green]\n\n"
-                f"📊 [cyan]Trade Frequency:[/cyan] ~{trade_frequency}s\n"
-                f"📈 [cyan]Symbols:[/cyan] AAPL, GOOGL, MSFT, TSLA, AMZN\n"
-                f"⏱️  [cyan]Stats Update:[/cyan] Every 30 seconds\n\n"
+                f"[bold green]Starting {count:,} Simulated Traders[/bold green]\n\n"
+                f"📊 [cyan]Target Rate:[/cyan] {rate:,.1f} orders/s (open loop, Poisson arrivals)\n"
+                f"⚙️  [cyan]Workers:[/cyan] {workers}\n"
+                f"📈 [cyan]Symbols:[/cyan] {', '.join(SimulatedTrader.DEV_SYMBOLS)}\n"
+                f"⏱️  [cyan]Duration:[/cyan] {f'{duration:,.0f}s' if duration else 'until stopped'}\n"
+                f"📋 [cyan]Stats Update:[/cyan] Every {stats_interval:,.0f} seconds\n\n"
                 f"[yellow]Press Ctrl+C to stop[/yellow]",
                 border_style="green",
                 title="🤖 Simulated Traders",
@@ -374,30 +682,48 @@ def run_simulated_traders(count: int = 5, trade_frequency: float = 5.0):
         )
         console.print()
 
-        manager.spawn_traders(count=count, trade_frequency=trade_frequency)
+        manager.spawn_traders(
+            count=count, rate=rate, workers=workers, duration=duration, seed=seed
+        )
 
         console.print("[bold green]✓[/bold green] All traders started and placing orders...\n")
         logger.info("Simulated traders running. Press Ctrl+C to stop...")
 
         # Keep running and print stats periodically
         start_time = time.time()
-        while True:
-            time.sleep(30)
-            elapsed = int(time.time() - start_time)
-            console.print(f"[dim]Elapsed time: {elapsed}s[/dim]")
-            manager.print_stats()
+        next_stats = start_time + stats_interval
+        while manager.is_running():
+            time.sleep(0.2)
+            for interval in manager.poll():
+                if per_second:
+                    console.print(format_interval(interval))
+            if time.time() >= next_stats:
+                next_stats += stats_interval
+                elapsed = int(time.time() - start_time)
+                console.print(f"[dim]Elapsed time: {elapsed}s[/dim]")
+                manager.print_stats()
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Received shutdown signal...[/yellow]")
         logger.info("\nShutting down simulated traders...")
 
-        with console.status("[yellow]Stopping all traders...", spinner="dots"):
-            manager.stop_all()
+    with console.status("[yellow]Stopping all traders...", spinner="dots"):
+        remaining = manager.stop_all()
+    if per_second:
+        for interval in remaining:
+            console.print(format_interval(interval))
 
-        # Final stats
-        console.print("\n[bold cyan]Final Statistics:[/bold cyan]")
-        manager.print_stats()
+    # Final stats
+    console.print("\n[bold cyan]Final Statistics:[/bold cyan]")
+    manager.print_stats()
+    console.print(manager.generate_latency_table())
 
-        console.print("[bold green]✓[/bold green] Simulated traders shutdown complete\n")
+    report = manager.build_report()
+    if report_path:
+        path = write_report(report_path, report)
+        console.print(f"[bold green]✓[/bold green] Latency report written to [cyan]{path}[/cyan]")
+        logger.info(f"Latency report written to {path}")
 
+    console.print("[bold green]✓[/bold green] Simulated traders shutdown complete\n")
     logger.info("Simulated traders shutdown complete")
+    return report
@@ -1,14 +1,16 @@
 """Trader client for testing and development."""
-import pika
 import uuid
-import json
 import logging
 import random
 import time
 
+from messaging.broker import MessageBroker
+from messaging.rpc import SyncRPCClient
+
 logger = logging.getLogger(__name__)
 
 RABBITMQ_HOST = "localhost"
+TES_QUEUE = "tes_requests"
 
 
 class TraderClient:
@@ -16,54 +18,34 @@ class TraderClient:
     
     def __init__(self):
         self._id = str(uuid.uuid4())
-        # Initialize RabbitMQ connection and channel
-        self.connection = pika.BlockingConnection(
-            pika.ConnectionParameters(host=RABBITMQ_HOST)
-        )
-        self.channel = self.connection.channel()
-        self.callback_queue = self.channel.queue_declare(
-            queue="", exclusive=True
-        ).method.queue
-        self.channel.basic_consume(
-            queue=self.callback_queue,
-            on_message_callback=self.on_response,
-            auto_ack=True,
-        )
-        self.response = None
-        self.corr_id = None
+        # Replies are matched by correlation_id; fills and other order events go to on_event
+        self.rpc = SyncRPCClient(MessageBroker(host=RABBITMQ_HOST), event_handler=self.on_event)
+        self.rpc.connect()
 
-    def on_response(self, ch, method, props, body):
-        if self.corr_id == props.correlation_id:
-            self.response = json.loads(body)
+    def on_event(self, message, properties):
+        if message.get("event") == "order_filled":
+            # Fills arrive after the order ack, on the same correlation_id
+            logger.info(
+                f"Order {message.get('order_id')} {message.get('status')}: "
+                f"{message.get('quantity')} {message.get('symbol')} @ {message.get('price')}"
+            )
+        elif message.get("event") == "order_rejected":
+            logger.warning(f"Order {message.get('order_id')} rejected: {message.get('reason')}")
+        elif message.get("event") == "order_cancelled":
+            logger.info(f"Order {message.get('order_id')} cancelled: {message.get('quantity')} {message.get('symbol')}")
 
     def send_request(self, request, timeout=10, retry=3):
         logger.info(f"Sending request: {request}")
-        attempt = 0
-        while attempt < retry:
-            self.response = None
-            self.corr_id = str(uuid.uuid4())
-            self.channel.basic_publish(
-                exchange="",
-                routing_key="tes_requests",
-                properties=pika.BasicProperties(
-                    reply_to=self.callback_queue,
-                    correlation_id=self.corr_id,
-                ),
-                body=json.dumps(request),
-            )
-            start_time = time.time()
-            while self.response is None:
-                self.connection.process_data_events()
-                if time.time() - start_time > timeout:
-                    logger.error(
-                        f"Timeout waiting for response from TES (attempt {attempt + 1}/{retry})."
-                    )
-                    break
-            if self.response is not None:
-                return self.response
-            attempt += 1
-            logger.info(f"Retrying send_request (attempt {attempt + 1}/{retry})...")
-        return self.response
+        for attempt in range(1, retry + 1):
+            try:
+                return self.rpc.call(TES_QUEUE, request, timeout=timeout)
+            except TimeoutError:
+                logger.error(
+                    f"Timeout waiting for response from TES (attempt {attempt}/{retry})."
+                )
+            if attempt < retry:
+                logger.info(f"Retrying send_request (attempt {attempt + 1}/{retry})...")
+        return None
 
     def check_tes_connection(self, timeout=10, retry=3):
         """Check TES connectivity by sending a simple request."""
@@ -116,5 +98,5 @@ class TraderClient:
                 time.sleep(5)
             except KeyboardInterrupt:
                 logger.info("Trader client stopped by user.")
-                self.connection.close()
+                self.rpc.close()
                 break
@@ -1,4 +1,13 @@
 """Analytics database module for aggregated metrics."""
 from .aggregations import AnalyticsDB
+from .metrics import TraderMetrics, compute_trader_metrics, run_trader_metrics
+from .pnl import PnLEngine, Position
 
-__all__ = ["AnalyticsDB"]
+__all__ = [
+    "AnalyticsDB",
+    "PnLEngine",
+    "Position",
+    "TraderMetrics",
+    "compute_trader_metrics",
+    "run_trader_metrics",
+]
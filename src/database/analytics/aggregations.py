@@ -3,6 +3,9 @@ import sqlite3
 from pathlib import Path
 import logging
 
+from database.bulk import insert_many, iter_rows
+from database.connection import connect
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent / 'analytics.db'
@@ -15,7 +18,8 @@ ANALYTICS_SCHEMA = [
         realized_pnl REAL NOT NULL,
         unrealized_pnl REAL NOT NULL,
         total_pnl REAL NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (user_id, date)
     )''',
     '''CREATE TABLE IF NOT EXISTS trader_metrics (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -46,37 +50,91 @@ ANALYTICS_SCHEMA = [
         slippage REAL,
         spread REAL,
         timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )''',
+    # PnLEngine state as of last_trade_id: open lots, marks and the open day (one row)
+    '''CREATE TABLE IF NOT EXISTS pnl_checkpoint (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        method TEXT NOT NULL,
+        last_trade_id INTEGER NOT NULL,
+        state TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )'''
 ]
 
+# daily_pnl tables created before UNIQUE (user_id, date) get the key as an index;
+# duplicate days from earlier re-runs keep their latest row
+DAILY_PNL_KEY = [
+    '''DELETE FROM daily_pnl WHERE id NOT IN (SELECT MAX(id) FROM daily_pnl GROUP BY user_id, date)''',
+    '''CREATE UNIQUE INDEX idx_daily_pnl_user_date ON daily_pnl (user_id, date)''',
+]
+
+UPSERT_DAILY_PNL = '''INSERT INTO daily_pnl (user_id, date, realized_pnl, unrealized_pnl, total_pnl)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (user_id, date) DO UPDATE SET
+        realized_pnl = excluded.realized_pnl,
+        unrealized_pnl = excluded.unrealized_pnl,
+        total_pnl = excluded.total_pnl,
+        created_at = CURRENT_TIMESTAMP'''
+
+TRADER_METRICS_COLUMNS = (
+    'user_id', 'total_trades', 'winning_trades', 'losing_trades', 'avg_win', 'avg_loss',
+    'sharpe_ratio', 'max_drawdown', 'period_start', 'period_end',
+)
+
 
 class AnalyticsDB:
     """Manager for analytics database operations."""
     
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self.conn.row_factory = sqlite3.Row
         self._init_schema()
     
     def _init_schema(self):
         """Initialize analytics schema."""
-        c = self.conn.cursor()
-        for stmt in ANALYTICS_SCHEMA:
-            c.execute(stmt)
-        self.conn.commit()
+        _create_schema(self.conn)
     
     def insert_daily_pnl(self, user_id, date, realized_pnl, unrealized_pnl, total_pnl):
-        """Insert daily PnL record."""
+        """Insert a daily PnL record, replacing the user's row for that date if there is one."""
         c = self.conn.cursor()
-        c.execute(
-            '''INSERT INTO daily_pnl (user_id, date, realized_pnl, unrealized_pnl, total_pnl)
-               VALUES (?, ?, ?, ?, ?)''',
-            (user_id, date, realized_pnl, unrealized_pnl, total_pnl)
-        )
+        c.execute(UPSERT_DAILY_PNL, (user_id, date, realized_pnl, unrealized_pnl, total_pnl))
         self.conn.commit()
         return c.lastrowid
     
+    def insert_daily_pnls(self, rows):
+        """
+        Insert many daily PnL rows in one transaction, replacing existing (user_id, date)
+        rows, and return the number of rows written.
+
+        ``rows`` is an iterable of (user_id, date, realized_pnl, unrealized_pnl, total_pnl)
+        tuples or dicts, or a mapping of those columns.
+        """
+        with self.conn:
+            cursor = self.conn.executemany(
+                UPSERT_DAILY_PNL,
+                iter_rows(rows, ('user_id', 'date', 'realized_pnl', 'unrealized_pnl', 'total_pnl'))
+            )
+        return max(cursor.rowcount, 0)
+
+    def save_pnl_checkpoint(self, method, last_trade_id, state):
+        """Replace the PnL engine checkpoint (``state`` is a JSON string)."""
+        with self.conn:
+            self.conn.execute(
+                '''INSERT INTO pnl_checkpoint (id, method, last_trade_id, state) VALUES (1, ?, ?, ?)
+                   ON CONFLICT (id) DO UPDATE SET method = excluded.method,
+                       last_trade_id = excluded.last_trade_id, state = excluded.state,
+                       updated_at = CURRENT_TIMESTAMP''',
+                (method, last_trade_id, state)
+            )
+
+    def load_pnl_checkpoint(self):
+        """The PnL engine checkpoint as (method, last_trade_id, state), or None."""
+        row = self.conn.execute(
+            'SELECT method, last_trade_id, state FROM pnl_checkpoint WHERE id = 1'
+        ).fetchone()
+        return tuple(row) if row is not None else None
+    
     def insert_trader_metrics(self, user_id, total_trades, winning_trades, losing_trades,
                             avg_win, avg_loss, period_start, period_end, 
                             sharpe_ratio=None, max_drawdown=None):
@@ -93,6 +151,23 @@ class AnalyticsDB:
         self.conn.commit()
         return c.lastrowid
     
+    def insert_trader_metrics_rows(self, rows):
+        """
+        Insert many trader metrics rows in one transaction and return their ids (a range).
+
+        ``rows`` is an iterable of (user_id, total_trades, winning_trades, losing_trades,
+        avg_win, avg_loss, sharpe_ratio, max_drawdown, period_start, period_end) tuples
+        or dicts, or a mapping of those columns.
+        """
+        return insert_many(
+            self.conn,
+            '''INSERT INTO trader_metrics 
+               (user_id, total_trades, winning_trades, losing_trades, avg_win, avg_loss,
+                sharpe_ratio, max_drawdown, period_start, period_end)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            iter_rows(rows, TRADER_METRICS_COLUMNS)
+        )
+    
     def insert_system_performance(self, timestamp, metric_name, metric_value, unit=None):
         """Insert system performance metric."""
         c = self.conn.cursor()
@@ -126,13 +201,22 @@ class AnalyticsDB:
         self.conn.close()
 
 
-def init_analytics_db(db_path=DB_PATH):
-    """Initialize analytics database."""
-    conn = sqlite3.connect(db_path)
+def _create_schema(conn):
+    """Create the analytics tables, and the daily_pnl key on tables that predate it."""
     c = conn.cursor()
     for stmt in ANALYTICS_SCHEMA:
         c.execute(stmt)
+    indexes = [tuple(row)[1:3] for row in c.execute("PRAGMA index_list('daily_pnl')")]
+    if not any(unique for _, unique in indexes):
+        for stmt in DAILY_PNL_KEY:
+            c.execute(stmt)
     conn.commit()
+
+
+def init_analytics_db(db_path=DB_PATH):
+    """Initialize analytics database."""
+    conn = connect(db_path)
+    _create_schema(conn)
     conn.close()
     print(f'Analytics database initialized at {db_path}')
 
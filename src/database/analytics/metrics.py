@@ -0,0 +1,198 @@
+"""
+Trader performance metrics.
+
+Every metric is computed for all users at once from flat numpy arrays, with grouped
+reductions (bincount, segment reductions) rather than a Python loop per user, and
+the results are written to trader_metrics in one executemany.
+
+Per-trade PnL marks each fill against the closing price of its symbol that day (the
+last trade price, as PnLEngine does); a fill is a win if it was bought below, or sold
+above, the close. Sharpe ratio and drawdown come from the daily_pnl series.
+"""
+from dataclasses import dataclass
+from typing import Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+# Signed quantity (sells negative) and the trade date as days since the epoch
+_TRADES = '''SELECT user_id, symbol, CASE side WHEN 'sell' THEN -quantity ELSE quantity END,
+                    price, CAST(strftime('%s', date(timestamp)) AS INTEGER) / 86400
+             FROM trades WHERE timestamp >= ? AND timestamp < date(?, '+1 day') ORDER BY id'''
+
+_DAILY_PNL = '''SELECT user_id, total_pnl FROM daily_pnl
+                WHERE date >= ? AND date <= ? ORDER BY user_id, date'''
+
+
+@dataclass
+class TradeArrays:
+    """Fills in recording order, one array per column."""
+
+    user_id: np.ndarray     # int64
+    symbol: np.ndarray      # int64 code per symbol
+    quantity: np.ndarray    # float64, sells negative
+    price: np.ndarray       # float64
+    day: np.ndarray         # int64, days since the epoch
+
+
+@dataclass
+class TraderMetrics:
+    """One entry per user in ``user_id``; sharpe_ratio and max_drawdown are NaN where undefined."""
+
+    user_id: np.ndarray
+    total_trades: np.ndarray
+    winning_trades: np.ndarray
+    losing_trades: np.ndarray
+    avg_win: np.ndarray
+    avg_loss: np.ndarray
+    sharpe_ratio: np.ndarray
+    max_drawdown: np.ndarray
+
+    def rows(self, period_start, period_end):
+        """Rows in insert_trader_metrics_rows column order, NaN as NULL."""
+        sharpe = self.sharpe_ratio.astype(object)
+        sharpe[np.isnan(self.sharpe_ratio)] = None
+        drawdown = self.max_drawdown.astype(object)
+        drawdown[np.isnan(self.max_drawdown)] = None
+        n = len(self.user_id)
+        return list(zip(
+            self.user_id.tolist(), self.total_trades.tolist(), self.winning_trades.tolist(),
+            self.losing_trades.tolist(), self.avg_win.tolist(), self.avg_loss.tolist(),
+            sharpe.tolist(), drawdown.tolist(), [str(period_start)] * n, [str(period_end)] * n,
+        ))
+
+
+def load_trades(conn, period_start, period_end, batch_size=100_000) -> TradeArrays:
+    """Read the trades between two dates (inclusive) from the transactional database."""
+    codes = {}
+    users, symbols, quantities, prices, days = [], [], [], [], []
+    cursor = conn.cursor()
+    cursor.execute(_TRADES, (str(period_start), str(period_end)))
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        user, symbol, quantity, price, day = zip(*batch)
+        users.append(np.array(user, dtype=np.int64))
+        symbols.append(np.array([codes.setdefault(s, len(codes)) for s in symbol], dtype=np.int64))
+        quantities.append(np.array(quantity, dtype=np.float64))
+        prices.append(np.array(price, dtype=np.float64))
+        days.append(np.array(day, dtype=np.int64))
+    if not users:
+        empty = np.array([], dtype=np.int64)
+        return TradeArrays(empty, empty, empty.astype(np.float64), empty.astype(np.float64), empty)
+    return TradeArrays(*(np.concatenate(parts) for parts in (users, symbols, quantities, prices, days)))
+
+
+def load_daily_pnl(conn, period_start, period_end):
+    """(user_id, total_pnl) arrays for the period, ordered by user and date."""
+    rows = conn.execute(_DAILY_PNL, (str(period_start), str(period_end))).fetchall()
+    if not rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+    user, pnl = zip(*rows)
+    return np.array(user, dtype=np.int64), np.array(pnl, dtype=np.float64)
+
+
+def trade_pnl(trades: TradeArrays) -> np.ndarray:
+    """PnL of each fill at the closing price of its symbol and day."""
+    if not len(trades.price):
+        return np.array([], dtype=np.float64)
+    first_day = trades.day.min()
+    n_days = int(trades.day.max() - first_day) + 1
+    key = trades.symbol * n_days + (trades.day - first_day)
+    # Trades are in recording order, so the highest index per (symbol, day) is the close
+    last = np.full(int(key.max()) + 1, -1, dtype=np.int64)
+    np.maximum.at(last, key, np.arange(len(key)))
+    close = trades.price[last[key]]
+    return trades.quantity * (close - trades.price)
+
+
+def compute_trader_metrics(trade_user: np.ndarray, fill_pnl: np.ndarray,
+                           pnl_user: np.ndarray, daily_pnl: np.ndarray) -> TraderMetrics:
+    """
+    Metrics for every user with a trade or a daily PnL row.
+
+    Args:
+        trade_user: User of each fill
+        fill_pnl: PnL of each fill (trade_pnl())
+        pnl_user: User of each daily PnL row, grouped by user and in date order within a user
+        daily_pnl: total_pnl of each row
+    """
+    size = int(max(trade_user.max(initial=0), pnl_user.max(initial=0))) + 1
+    trade_count = np.bincount(trade_user, minlength=size)
+    wins = fill_pnl > 0
+    losses = fill_pnl < 0
+    win_count = np.bincount(trade_user, weights=wins, minlength=size)
+    loss_count = np.bincount(trade_user, weights=losses, minlength=size)
+    win_sum = np.bincount(trade_user, weights=np.where(wins, fill_pnl, 0.0), minlength=size)
+    loss_sum = np.bincount(trade_user, weights=np.where(losses, fill_pnl, 0.0), minlength=size)
+
+    day_count = np.bincount(pnl_user, minlength=size)
+    user_id = np.flatnonzero((trade_count > 0) | (day_count > 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_win = np.where(win_count > 0, win_sum / win_count, 0.0)[user_id]
+        avg_loss = np.where(loss_count > 0, loss_sum / loss_count, 0.0)[user_id]
+    sharpe, drawdown = _pnl_series_metrics(pnl_user, daily_pnl, size)
+
+    return TraderMetrics(
+        user_id=user_id,
+        total_trades=trade_count[user_id],
+        winning_trades=win_count[user_id].astype(np.int64),
+        losing_trades=loss_count[user_id].astype(np.int64),
+        avg_win=avg_win,
+        avg_loss=avg_loss,
+        sharpe_ratio=sharpe[user_id],
+        max_drawdown=drawdown[user_id],
+    )
+
+
+def _pnl_series_metrics(pnl_user, daily_pnl, size):
+    """Annualized Sharpe ratio and max drawdown of cumulative PnL, indexed by user id."""
+    sharpe = np.full(size, np.nan)
+    drawdown = np.full(size, np.nan)
+    if not len(daily_pnl):
+        return sharpe, drawdown
+
+    days = np.bincount(pnl_user, minlength=size)
+    total = np.bincount(pnl_user, weights=daily_pnl, minlength=size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / days
+        # Sample standard deviation around each user's own mean
+        deviation = daily_pnl - mean[pnl_user]
+        var = np.bincount(pnl_user, weights=deviation * deviation, minlength=size) / (days - 1)
+        std = np.sqrt(var)
+        valid = (days > 1) & (std > 0)
+        sharpe[valid] = (mean[valid] / std[valid]) * np.sqrt(TRADING_DAYS)
+
+    # Lay each user's series out as a row of a (users x days) matrix, so running
+    # sums and peaks are single cumsum/maximum.accumulate calls along axis 1
+    starts = np.flatnonzero(np.r_[True, pnl_user[1:] != pnl_user[:-1]])
+    lengths = np.diff(np.r_[starts, len(pnl_user)])
+    row = np.repeat(np.arange(len(starts)), lengths)
+    col = np.arange(len(pnl_user)) - np.repeat(starts, lengths)
+    matrix = np.zeros((len(starts), int(lengths.max())))
+    matrix[row, col] = daily_pnl
+    equity = np.cumsum(matrix, axis=1)
+    # Peaks start from zero: losing from the first day is a drawdown too
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 0.0)
+    dips = equity - peak
+    # Cells past the end of a series repeat its final equity, so they never deepen the dip
+    drawdown[pnl_user[starts]] = dips.min(axis=1)
+    return sharpe, drawdown
+
+
+def run_trader_metrics(trans_conn, analytics_db, period_start, period_end) -> Optional[TraderMetrics]:
+    """Compute metrics for the period from trades and daily_pnl and write them to trader_metrics."""
+    trades = load_trades(trans_conn, period_start, period_end)
+    pnl_user, daily_pnl = load_daily_pnl(analytics_db.conn, period_start, period_end)
+    if not len(trades.user_id) and not len(pnl_user):
+        logger.info(f"No trades or PnL between {period_start} and {period_end}")
+        return None
+    metrics = compute_trader_metrics(trades.user_id, trade_pnl(trades), pnl_user, daily_pnl)
+    analytics_db.insert_trader_metrics_rows(metrics.rows(period_start, period_end))
+    logger.info(f"Wrote trader metrics for {len(metrics.user_id)} users ({period_start} to {period_end})")
+    return metrics
@@ -0,0 +1,274 @@
+"""
+Incremental daily PnL engine.
+
+Positions are built from the trade stream one fill at a time: each fill updates the
+position for its (user, symbol) and the user's realized PnL for the day, and becomes
+the latest mark for its symbol. Unrealized PnL comes from open positions and marks
+only, so closing a day touches each open position once and never the trade history.
+
+The engine's state (open lots, marks, the open day and the last trade id applied) is
+checkpointed to the analytics database, so a restarted engine resumes from the next
+trade instead of replaying the trades table from the start.
+"""
+from collections import defaultdict, deque
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+FIFO = 'fifo'
+AVERAGE = 'average'
+
+# Trades newer than a checkpoint, in the order they were recorded
+_NEW_TRADES = '''SELECT id, user_id, symbol, side, quantity, price, timestamp
+                 FROM trades WHERE id > ? ORDER BY id'''
+
+
+class Position:
+    """
+    Open quantity in one symbol, signed (short < 0), and what it cost.
+
+    With FIFO, closing fills match the oldest open lots first; with average cost,
+    every open unit carries the average price paid for the position.
+    """
+
+    __slots__ = ('method', 'quantity', 'cost', 'lots')
+
+    def __init__(self, method=FIFO):
+        if method not in (FIFO, AVERAGE):
+            raise ValueError(f'Unknown lot method {method!r}, expected {FIFO!r} or {AVERAGE!r}')
+        self.method = method
+        self.quantity = 0.0
+        self.cost = 0.0     # sum of quantity * price over open units, signed like quantity
+        self.lots = deque() if method == FIFO else None
+
+    def fill(self, quantity, price):
+        """Apply a fill (quantity > 0 buys, < 0 sells) and return the PnL it realizes."""
+        realized = 0.0
+        if self.quantity * quantity < 0:
+            closing = min(abs(quantity), abs(self.quantity))
+            sign = 1.0 if self.quantity > 0 else -1.0
+            if self.lots is None:
+                basis = closing * self.cost / self.quantity
+            else:
+                basis = self._close_lots(closing)
+            realized = sign * (closing * price - basis)
+            self.cost -= sign * basis
+            self.quantity -= sign * closing
+            quantity += sign * closing
+            if abs(self.quantity) < 1e-9:
+                self.quantity = self.cost = 0.0
+        if abs(quantity) > 1e-9:
+            # Opening (or adding to) a position; a fill that flips it opens the remainder
+            self.quantity += quantity
+            self.cost += quantity * price
+            if self.lots is not None:
+                self.lots.append([abs(quantity), price])
+        return realized
+
+    def _close_lots(self, closing):
+        """Remove ``closing`` units from the oldest lots; returns their cost (unsigned)."""
+        basis = 0.0
+        lots = self.lots
+        while closing > 1e-9:
+            lot = lots[0]
+            used = min(lot[0], closing)
+            basis += used * lot[1]
+            closing -= used
+            lot[0] -= used
+            if lot[0] <= 1e-9:
+                lots.popleft()
+        return basis
+
+    def unrealized(self, mark):
+        """PnL of the open quantity at ``mark``."""
+        return self.quantity * mark - self.cost
+
+    def state(self):
+        """JSON-serializable [quantity, cost, lots] (lots is None with average cost)."""
+        lots = None if self.lots is None else [list(lot) for lot in self.lots]
+        return [self.quantity, self.cost, lots]
+
+    @classmethod
+    def from_state(cls, method, state):
+        position = cls(method)
+        position.quantity, position.cost, lots = state
+        if position.lots is not None:
+            position.lots.extend([qty, price] for qty, price in lots or ())
+        return position
+
+
+class PnLEngine:
+    """
+    Realized and unrealized PnL per user, maintained incrementally from fills.
+
+    Feed fills with on_trade() (or consume() to read new rows of the transactional
+    trades table), override marks with mark() if a better price than the last trade is
+    available, and call close_day() at the end of each day for the daily_pnl rows.
+    from_checkpoint() restores an engine saved by consume(), write_day() or checkpoint().
+    """
+
+    def __init__(self, method=FIFO):
+        self.method = method
+        Position(method)    # validate the method up front
+        self.positions = defaultdict(dict)      # user_id -> symbol -> Position
+        self.marks = {}                         # symbol -> latest price
+        self.realized_today = defaultdict(float)
+        self.previous_unrealized = {}           # user_id -> unrealized at the last close
+        self.last_trade_id = 0
+        self.current_date = None
+        self.trades_processed = 0
+
+    @classmethod
+    def from_checkpoint(cls, analytics_db, method=FIFO):
+        """An engine restored from analytics_db's checkpoint, or a new one if there is none."""
+        engine = cls(method)
+        saved = analytics_db.load_pnl_checkpoint()
+        if saved is None:
+            return engine
+        saved_method, last_trade_id, state = saved
+        if saved_method != method:
+            raise ValueError(
+                f'PnL checkpoint was built with {saved_method!r} lots, not {method!r}'
+            )
+        state = json.loads(state)
+        # JSON object keys are strings; user ids are integers
+        for user_id, positions in state['positions'].items():
+            engine.positions[int(user_id)] = {
+                symbol: Position.from_state(method, position)
+                for symbol, position in positions.items()
+            }
+        engine.marks = state['marks']
+        engine.realized_today.update((int(u), pnl) for u, pnl in state['realized_today'].items())
+        engine.previous_unrealized = {
+            int(u): pnl for u, pnl in state['previous_unrealized'].items()
+        }
+        engine.current_date = state['current_date']
+        engine.last_trade_id = last_trade_id
+        return engine
+
+    def state(self):
+        """The engine's state as JSON (everything but last_trade_id and the method)."""
+        return json.dumps({
+            'positions': {
+                user_id: {symbol: p.state() for symbol, p in positions.items()}
+                for user_id, positions in self.positions.items()
+            },
+            'marks': self.marks,
+            'realized_today': self.realized_today,
+            'previous_unrealized': self.previous_unrealized,
+            'current_date': self.current_date,
+        })
+
+    def checkpoint(self, analytics_db):
+        """Save the engine's state as of last_trade_id to analytics_db."""
+        analytics_db.save_pnl_checkpoint(self.method, self.last_trade_id, self.state())
+
+    def on_trade(self, user_id, symbol, side, quantity, price):
+        """Apply one user's fill and return the PnL it realized."""
+        quantity = float(quantity)
+        price = float(price)
+        if side == 'sell':
+            quantity = -quantity
+        elif side != 'buy':
+            raise ValueError(f"Unknown side {side!r}, expected 'buy' or 'sell'")
+        positions = self.positions[user_id]
+        position = positions.get(symbol)
+        if position is None:
+            position = positions[symbol] = Position(self.method)
+        realized = position.fill(quantity, price)
+        self.realized_today[user_id] += realized
+        self.marks[symbol] = price
+        self.trades_processed += 1
+        return realized
+
+    def mark(self, symbol, price):
+        """Set the price open positions in ``symbol`` are valued at."""
+        self.marks[symbol] = float(price)
+
+    def unrealized(self, user_id):
+        """Unrealized PnL of a user's open positions at the current marks."""
+        total = 0.0
+        for symbol, position in self.positions.get(user_id, {}).items():
+            if position.quantity:
+                total += position.unrealized(self.marks[symbol])
+        return total
+
+    def close_day(self, date):
+        """
+        End the day: return one (user_id, date, realized, unrealized, total) row per user
+        with a position or realized PnL, and start the next day's realized PnL at zero.
+
+        realized is PnL locked in by the day's fills, unrealized the open positions at the
+        closing marks, and total the day's PnL: realized plus the change in unrealized
+        since the previous close.
+        """
+        date = str(date)
+        rows = []
+        users = set(self.realized_today)
+        users.update(u for u, positions in self.positions.items()
+                     if any(p.quantity for p in positions.values()))
+        users.update(self.previous_unrealized)
+        for user_id in sorted(users):
+            realized = self.realized_today.get(user_id, 0.0)
+            unrealized = self.unrealized(user_id)
+            total = realized + unrealized - self.previous_unrealized.get(user_id, 0.0)
+            rows.append((user_id, date, realized, unrealized, total))
+            if unrealized:
+                self.previous_unrealized[user_id] = unrealized
+            else:
+                self.previous_unrealized.pop(user_id, None)
+            # Flat users keep no state between days
+            positions = self.positions.get(user_id)
+            if positions is not None and not any(p.quantity for p in positions.values()):
+                del self.positions[user_id]
+        self.realized_today.clear()
+        self.current_date = None
+        return rows
+
+    def consume(self, conn, analytics_db=None, batch_size=10_000):
+        """
+        Apply the trades recorded since the last call, in one pass over the new rows.
+
+        Each time the trade date moves on, the finished day is closed, and its rows are
+        written to analytics_db.daily_pnl if given. The current day stays open; close it
+        with close_day() (or write_day()) once it is over. With analytics_db, the engine
+        is checkpointed after the new trades; a restart from an older checkpoint rewrites
+        the same daily_pnl rows, which replace the ones already there.
+
+        Returns:
+            daily_pnl rows for the days closed during this call
+        """
+        closed = []
+        cursor = conn.cursor()
+        cursor.execute(_NEW_TRADES, (self.last_trade_id,))
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for trade_id, user_id, symbol, side, quantity, price, timestamp in batch:
+                date = str(timestamp)[:10]
+                if self.current_date is not None and date != self.current_date:
+                    closed.extend(self._close(self.current_date, analytics_db))
+                self.current_date = date
+                self.on_trade(user_id, symbol, side, quantity, price)
+                self.last_trade_id = trade_id
+        if analytics_db is not None:
+            self.checkpoint(analytics_db)
+        return closed
+
+    def write_day(self, analytics_db, date=None):
+        """Close the current (or given) day and write its snapshot to daily_pnl."""
+        date = date or self.current_date
+        if date is None:
+            raise ValueError('No trades consumed yet; pass the date to close')
+        rows = self._close(date, analytics_db)
+        self.checkpoint(analytics_db)
+        return rows
+
+    def _close(self, date, analytics_db):
+        rows = self.close_day(date)
+        if analytics_db is not None:
+            analytics_db.insert_daily_pnls(rows)
+        logger.info(f"Closed PnL for {date}: {len(rows)} users")
+        return rows
@@ -0,0 +1,84 @@
+"""Bulk SQLite writes shared by the database managers."""
+
+# Rows taken from columnar input at a time, so large arrays are never turned into
+# one Python object per value all at once
+CHUNK_ROWS = 100_000
+
+
+def iter_rows(data, names, defaults=None):
+    """
+    Yield parameter tuples, in ``names`` order, from any of:
+      - an iterable of tuples already in that order
+      - an iterable of dicts (extra keys are ignored)
+      - columns: a mapping (or DataFrame) of name -> list / numpy array / Series
+
+    ``defaults`` fills names a dict row or the columns leave out. numpy values are
+    converted to Python ones, which sqlite3 can bind.
+    """
+    defaults = defaults or {}
+    if hasattr(data, 'keys'):
+        yield from _iter_columns(data, names, defaults)
+        return
+    for row in data:
+        if hasattr(row, 'keys'):
+            yield tuple(row[n] if n in row else defaults[n] for n in names)
+        else:
+            row = tuple(row)
+            yield row + tuple(defaults[n] for n in names[len(row):])
+
+
+def _iter_columns(columns, names, defaults):
+    present = [n for n in names if n in columns]
+    size = len(columns[present[0]]) if present else 0
+    for start in range(0, size, CHUNK_ROWS):
+        chunk = []
+        for name in names:
+            if name in columns:
+                values = columns[name][start:start + CHUNK_ROWS]
+                chunk.append(values.tolist() if hasattr(values, 'tolist') else list(values))
+            else:
+                chunk.append([defaults[name]] * min(CHUNK_ROWS, size - start))
+        yield from zip(*chunk)
+
+
+def insert_many(conn, sql, rows, rebuild_indexes=None):
+    """
+    Run an INSERT for each row with executemany in a single transaction.
+
+    Returns the new rows' ids as a range: the connection holds SQLite's write lock from
+    the first insert to the commit, so the rows of one call get consecutive rowids.
+    Any failure rolls back the whole batch.
+
+    Args:
+        conn: sqlite3 connection
+        sql: INSERT statement with one placeholder per column
+        rows: Iterable of parameter tuples (see iter_rows)
+        rebuild_indexes: Table whose indexes are dropped before the inserts and created
+            again after them, in the same transaction. For loads that are large next to
+            the table, building each index once is much cheaper than updating it row by
+            row; other connections keep seeing the indexes until the commit.
+    """
+    with conn:
+        if not conn.in_transaction:
+            # DDL does not open a transaction by itself
+            conn.execute('BEGIN IMMEDIATE')
+        indexes = _drop_indexes(conn, rebuild_indexes) if rebuild_indexes else []
+        cursor = conn.executemany(sql, rows)
+        count = cursor.rowcount
+        last = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+        for statement in indexes:
+            conn.execute(statement)
+    if count <= 0:
+        return range(0)
+    return range(last - count + 1, last + 1)
+
+
+def _drop_indexes(conn, table):
+    """Drop the explicit indexes on ``table`` and return the statements that recreate them."""
+    indexes = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    ).fetchall()
+    for name, _ in indexes:
+        conn.execute(f'DROP INDEX "{name}"')
+    return [statement for _, statement in indexes]
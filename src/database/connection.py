@@ -0,0 +1,91 @@
+"""Shared SQLite connection factory."""
+import logging
+import os
+import sqlite3
+from functools import lru_cache
+
+from shared.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Used when config has no database.sqlite section
+DEFAULT_SQLITE_SETTINGS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout_ms': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size_kb': 64 * 1024,
+}
+
+JOURNAL_MODES = {'delete', 'truncate', 'persist', 'memory', 'wal', 'off'}
+SYNCHRONOUS_LEVELS = {'off', 'normal', 'full', 'extra'}
+
+
+@lru_cache(maxsize=None)
+def sqlite_settings(env=None):
+    """
+    Return connection settings for an environment.
+
+    Values come from ``database.sqlite`` in the environment's config file, falling back
+    to DEFAULT_SQLITE_SETTINGS. ``env`` defaults to the ENV environment variable.
+    """
+    env = env or os.getenv('ENV', 'dev')
+    settings = dict(DEFAULT_SQLITE_SETTINGS)
+    settings.update(Config(env=env).get('database.sqlite', {}) or {})
+
+    journal_mode = str(settings['journal_mode']).lower()
+    synchronous = str(settings['synchronous']).lower()
+    if journal_mode not in JOURNAL_MODES:
+        raise ValueError(f'Invalid sqlite journal_mode: {journal_mode}')
+    if synchronous not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f'Invalid sqlite synchronous level: {synchronous}')
+    resolved = {
+        'journal_mode': journal_mode,
+        'synchronous': synchronous,
+        'busy_timeout_ms': int(settings['busy_timeout_ms']),
+        'mmap_size': int(settings['mmap_size']),
+        'cache_size_kb': int(settings['cache_size_kb']),
+    }
+    logger.debug(f'SQLite settings for {env}: {resolved}')
+    return resolved
+
+
+def connect(db_path, check_same_thread=True, read_only=False, settings=None):
+    """
+    Open a SQLite connection with the shared settings applied.
+
+    WAL lets readers and the single writer proceed concurrently, and busy_timeout makes
+    a blocked connection wait instead of failing with "database is locked".
+
+    Args:
+        db_path: Database file path
+        check_same_thread: Passed through to sqlite3.connect
+        read_only: Open with mode=ro; the journal mode is left to the writers
+        settings: Override the configured settings (mainly for benchmarks)
+
+    Returns:
+        sqlite3.Connection
+    """
+    settings = settings or sqlite_settings()
+    if read_only:
+        conn = sqlite3.connect(
+            f'file:{db_path}?mode=ro',
+            uri=True,
+            timeout=settings['busy_timeout_ms'] / 1000,
+            check_same_thread=check_same_thread,
+        )
+    else:
+        conn = sqlite3.connect(
+            str(db_path),
+            timeout=settings['busy_timeout_ms'] / 1000,
+            check_same_thread=check_same_thread,
+        )
+        if str(db_path) != ':memory:':
+            conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA busy_timeout = {settings['busy_timeout_ms']}")
+    conn.execute(f"PRAGMA mmap_size = {settings['mmap_size']}")
+    # Negative cache_size is in KiB rather than pages
+    conn.execute(f"PRAGMA cache_size = -{settings['cache_size_kb']}")
+    return conn
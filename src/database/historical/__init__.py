@@ -1,4 +1,14 @@
 """Historical database module for time-series data using KDB+."""
 from .kdb_client import KDBClient
+from .local_store import LocalTickStore
+from .pipeline import HistoricalPipeline, SpillJournal
+from .writer import BufferFullError, HistoricalWriter
 
-__all__ = ["KDBClient"]
+__all__ = [
+    "KDBClient",
+    "LocalTickStore",
+    "HistoricalWriter",
+    "BufferFullError",
+    "HistoricalPipeline",
+    "SpillJournal",
+]
@@ -1,10 +1,17 @@
 """KDB+ client for historical time-series data."""
 import pykx as kx
-from typing import Dict, List, Any
+import pandas as pd
+from typing import Dict, List, Any, Iterable, Optional, Union
 import logging
 
+from . import queries
+from .queries import DurationLike, TimeLike
+from .writer import HistoricalWriter, rows_to_columns
+
 logger = logging.getLogger(__name__)
 
+Symbols = Union[str, Iterable[str], None]
+
 
 class KDBClient:
     """Client for interacting with KDB+ database."""
@@ -27,60 +34,111 @@ class KDBClient:
     
     def insert_trade(self, trade_data: Dict[str, Any]):
         """Insert a trade into the trade table."""
-        try:
-            trade_table = kx.Table(data={
-                'id': [str(trade_data['id'])],
-                'timestamp': [trade_data['timestamp']],
-                'symbol': [str(trade_data.get('symbol', ''))],
-                'quantity': [trade_data.get('quantity', 0)],
-                'price': [trade_data.get('price', 0)],
-                'buyer': [str(trade_data.get('buyer', ''))],
-                'seller': [str(trade_data.get('seller', ''))]
-            })
-            self.q('insert', 'trade', trade_table)
-            logger.debug(f"Inserted trade: {trade_data['id']}")
-        except Exception as e:
-            logger.error(f"Failed to insert trade into KDB+: {e}")
-            raise
+        self.insert_trades([trade_data])
+        logger.debug(f"Inserted trade: {trade_data['id']}")
     
     def insert_quote(self, quote_data: Dict[str, Any]):
         """Insert a quote into the quote table."""
+        self.insert_quotes([quote_data])
+        logger.debug(f"Inserted quote for {quote_data['symbol']}")
+    
+    def insert_trades(self, trades: List[Dict[str, Any]]):
+        """Insert many trades with a single insert call."""
+        self._insert('trade', trades)
+    
+    def insert_quotes(self, quotes: List[Dict[str, Any]]):
+        """Insert many quotes with a single insert call."""
+        self._insert('quote', quotes)
+    
+    def _insert(self, table: str, rows: List[Dict[str, Any]]):
         try:
-            quote_table = kx.Table(data={
-                'timestamp': [quote_data['timestamp']],
-                'symbol': [str(quote_data['symbol'])],
-                'bid': [quote_data.get('bid', 0)],
-                'ask': [quote_data.get('ask', 0)],
-                'bid_size': [quote_data.get('bid_size', 0)],
-                'ask_size': [quote_data.get('ask_size', 0)]
-            })
-            self.q('insert', 'quote', quote_table)
-            logger.debug(f"Inserted quote for {quote_data['symbol']}")
+            self.q('insert', table, rows_to_columns(table, rows))
         except Exception as e:
-            logger.error(f"Failed to insert quote into KDB+: {e}")
+            logger.error(f"Failed to insert {table} into KDB+: {e}")
             raise
     
-    def query_trades(self, symbol: str = None, start_time: float = None, end_time: float = None):
-        """Query trades with optional filters."""
+    def writer(self, **kwargs) -> HistoricalWriter:
+        """
+        Create a HistoricalWriter on this connection.
+        
+        Use it for streams of trades and quotes: rows are buffered and written in
+        batches instead of one round trip each. Keyword arguments go to HistoricalWriter.
+        """
+        return HistoricalWriter(self.q, **kwargs)
+    
+    def _query(self, name: str, query: str, *args) -> pd.DataFrame:
+        """Run a pre-built query with typed arguments and return the result as a DataFrame."""
         try:
-            query = "select from trade"
-            conditions = []
-            
-            if symbol:
-                conditions.append(f"symbol=`{symbol}")
-            if start_time:
-                conditions.append(f"timestamp>={start_time}")
-            if end_time:
-                conditions.append(f"timestamp<={end_time}")
-            
-            if conditions:
-                query += " where " + ",".join(conditions)
-            
-            result = self.q(query)
-            return result
+            result = self.q(query, *args)
         except Exception as e:
-            logger.error(f"Failed to query trades: {e}")
+            logger.error(f"Failed to query {name}: {e}")
             raise
+        frame = result.pd()
+        # Keyed results (grouped by symbol/bucket) come back indexed by their keys
+        return frame.reset_index() if isinstance(result, kx.KeyedTable) else frame
+    
+    def query_trades(self, symbol: Symbols = None, start_time: TimeLike = None,
+                     end_time: TimeLike = None) -> pd.DataFrame:
+        """
+        Trades for one or more symbols (default all) between start_time and end_time.
+        
+        Times are epoch seconds, datetimes or numpy datetime64; either end may be None.
+        """
+        return self._query('trades', queries.TRADES, *self._window(symbol, start_time, end_time))
+    
+    def ohlcv(self, bucket: DurationLike, symbol: Symbols = None, start_time: TimeLike = None,
+              end_time: TimeLike = None) -> pd.DataFrame:
+        """
+        OHLCV bars computed in KDB+.
+        
+        Args:
+            bucket: Bar width in seconds, or a pandas timedelta string such as '5min'
+            symbol: A symbol or list of symbols (default all)
+            start_time: Window start, inclusive (default unbounded)
+            end_time: Window end, inclusive (default unbounded)
+        
+        Returns:
+            DataFrame with symbol, timestamp (bar start), open, high, low, close,
+            volume, vwap and trades per bar
+        """
+        args = self._window(symbol, start_time, end_time)
+        return self._query('ohlcv', queries.OHLCV, *args, queries.to_timespan(bucket))
+    
+    def vwap(self, symbol: Symbols = None, start_time: TimeLike = None, end_time: TimeLike = None,
+             bucket: Optional[DurationLike] = None) -> pd.DataFrame:
+        """
+        Volume-weighted average price and volume per symbol, over the whole window or
+        per ``bucket``.
+        """
+        args = self._window(symbol, start_time, end_time)
+        if bucket is None:
+            return self._query('vwap', queries.VWAP, *args)
+        return self._query('vwap', queries.VWAP_BUCKETED, *args, queries.to_timespan(bucket))
+    
+    def trade_counts(self, symbol: Symbols = None, start_time: TimeLike = None, end_time: TimeLike = None,
+                     bucket: Optional[DurationLike] = None) -> pd.DataFrame:
+        """Number of trades per symbol, over the whole window or per ``bucket``."""
+        args = self._window(symbol, start_time, end_time)
+        if bucket is None:
+            return self._query('trade counts', queries.TRADE_COUNTS, *args)
+        return self._query('trade counts', queries.TRADE_COUNTS_BUCKETED, *args, queries.to_timespan(bucket))
+    
+    def trades_with_quotes(self, symbol: Symbols = None, start_time: TimeLike = None,
+                           end_time: TimeLike = None) -> pd.DataFrame:
+        """
+        As-of join: each trade in the window with the bid, ask and sizes of the last
+        quote for its symbol at or before the trade.
+        """
+        args = self._window(symbol, start_time, end_time)
+        return self._query('trades with quotes', queries.TRADES_WITH_QUOTES, *args)
+    
+    @staticmethod
+    def _window(symbol: Symbols, start_time: TimeLike, end_time: TimeLike):
+        return (
+            queries.to_symbols(symbol),
+            queries.to_timestamp(start_time, queries.MIN_TIMESTAMP),
+            queries.to_timestamp(end_time, queries.MAX_TIMESTAMP),
+        )
     
     def close(self):
         """Close KDB+ connection."""
@@ -0,0 +1,379 @@
+"""
+Local columnar tick store with the KDBClient interface.
+
+Ticks live in append-only files under ``<root>/<table>/<YYYY-MM-DD>/<symbol>/``: one raw
+little-endian array per numeric column (timestamps as int64 nanoseconds) and an
+offsets/data pair per string column. Reads memory-map the arrays, so a time-range scan
+opens only the days and symbols in range and slices each with a binary search.
+
+Use it where no q process is available, or as a cold tier for ticks moved out of KDB+.
+One process should write a given symbol at a time; readers may run alongside.
+"""
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import queries
+from .queries import DurationLike, TimeLike
+from .writer import TABLE_COLUMNS, HistoricalWriter, rows_to_columns
+
+logger = logging.getLogger(__name__)
+
+Symbols = Union[str, Iterable[str], None]
+
+STR = 'str'
+
+# Stored columns per table and their on-disk type. The symbol is the partition, not a column.
+STORED_COLUMNS = {
+    'trade': (
+        ('id', STR),
+        ('timestamp', '<i8'),
+        ('quantity', '<f8'),
+        ('price', '<f8'),
+        ('buyer', STR),
+        ('seller', STR),
+    ),
+    'quote': (
+        ('timestamp', '<i8'),
+        ('bid', '<f8'),
+        ('ask', '<f8'),
+        ('bid_size', '<f8'),
+        ('ask_size', '<f8'),
+    ),
+}
+
+# Written when a partition receives a timestamp older than its last one; reads then sort it
+UNSORTED_MARKER = 'unsorted'
+
+# q's xbar buckets timestamps counted from 2000.01.01; bucket the same way
+Q_EPOCH_NS = np.datetime64('2000-01-01T00:00:00', 'ns').astype(np.int64)
+
+
+class _Partition:
+    """One table's ticks for one symbol on one day."""
+
+    def __init__(self, path: Path, columns):
+        self.path = path
+        self.columns = columns
+
+    def _length(self, name: str, kind: str) -> int:
+        if kind == STR:
+            path, itemsize = self.path / f'{name}.offsets', 8
+        else:
+            path, itemsize = self.path / f'{name}.bin', np.dtype(kind).itemsize
+        return path.stat().st_size // itemsize if path.exists() else 0
+
+    def rows(self) -> int:
+        """Rows present in every column (a torn append leaves some columns longer)."""
+        return min(self._length(name, kind) for name, kind in self.columns)
+
+    def _map(self, path: Path, dtype, count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+    def numeric(self, name: str, kind: str, rows: int) -> np.ndarray:
+        return self._map(self.path / f'{name}.bin', kind, rows)
+
+    def strings(self, name: str, rows: int, positions: np.ndarray) -> np.ndarray:
+        """Decode the strings at ``positions`` (row numbers below ``rows``)."""
+        offsets = self._map(self.path / f'{name}.offsets', '<i8', rows)
+        size = int(offsets[-1]) if rows else 0
+        data = self._map(self.path / f'{name}.data', np.uint8, size)
+        ends = offsets[positions]
+        starts = np.where(positions > 0, offsets[np.maximum(positions - 1, 0)], 0)
+        raw = data.tobytes() if size else b''
+        return np.array([raw[s:e].decode('utf-8') for s, e in zip(starts, ends)], dtype=object)
+
+    def last_timestamp(self, rows: int) -> Optional[int]:
+        return int(self.numeric('timestamp', '<i8', rows)[-1]) if rows else None
+
+    def sorted(self) -> bool:
+        return not (self.path / UNSORTED_MARKER).exists()
+
+    def repair(self) -> int:
+        """Truncate every column to the rows they all have. Returns the row count."""
+        rows = self.rows()
+        for name, kind in self.columns:
+            if kind == STR:
+                offsets_path = self.path / f'{name}.offsets'
+                if not offsets_path.exists():
+                    continue
+                offsets = self._map(offsets_path, '<i8', rows)
+                size = int(offsets[-1]) if rows else 0
+                del offsets
+                self._truncate(offsets_path, rows * 8)
+                self._truncate(self.path / f'{name}.data', size)
+            else:
+                self._truncate(self.path / f'{name}.bin', rows * np.dtype(kind).itemsize)
+        return rows
+
+    @staticmethod
+    def _truncate(path: Path, size: int):
+        if path.exists() and path.stat().st_size > size:
+            logger.warning(f'Truncating torn append in {path}')
+            with open(path, 'r+b') as f:
+                f.truncate(size)
+
+    def append(self, data: Dict[str, np.ndarray]):
+        """Append rows; strings are written before the offsets that point at them."""
+        for name, kind in self.columns:
+            values = data[name]
+            if kind == STR:
+                encoded = [str(v).encode('utf-8') for v in values]
+                data_path = self.path / f'{name}.data'
+                base = data_path.stat().st_size if data_path.exists() else 0
+                with open(data_path, 'ab') as f:
+                    f.write(b''.join(encoded))
+                ends = base + np.cumsum([len(b) for b in encoded], dtype=np.int64)
+                with open(self.path / f'{name}.offsets', 'ab') as f:
+                    f.write(ends.astype('<i8').tobytes())
+            else:
+                with open(self.path / f'{name}.bin', 'ab') as f:
+                    f.write(np.ascontiguousarray(values, dtype=kind).tobytes())
+
+
+class LocalTickStore:
+    """
+    Drop-in for KDBClient backed by local files.
+
+    It is also callable like a QConnection for inserts (``store('insert', table, columns)``),
+    so HistoricalWriter and HistoricalPipeline can write to it directly.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # (table, day, symbol) -> [partition, rows, last timestamp] for partitions written by us
+        self.open_partitions: Dict[tuple, list] = {}
+        logger.info(f"Using local tick store at {self.root}")
+
+    def __call__(self, query: str, *args):
+        if query != 'insert':
+            raise ValueError("LocalTickStore only accepts 'insert'; use its query methods")
+        table, columns = args
+        self._insert_columns(table, columns)
+
+    # -- writes ---------------------------------------------------------------
+
+    def insert_trade(self, trade_data: Dict[str, Any]):
+        """Insert a trade into the trade table."""
+        self.insert_trades([trade_data])
+
+    def insert_quote(self, quote_data: Dict[str, Any]):
+        """Insert a quote into the quote table."""
+        self.insert_quotes([quote_data])
+
+    def insert_trades(self, trades: List[Dict[str, Any]]):
+        """Insert many trades."""
+        self._insert_columns('trade', rows_to_columns('trade', trades))
+
+    def insert_quotes(self, quotes: List[Dict[str, Any]]):
+        """Insert many quotes."""
+        self._insert_columns('quote', rows_to_columns('quote', quotes))
+
+    def insert_frame(self, table: str, frame: pd.DataFrame):
+        """Insert a DataFrame with the table's columns, e.g. a KDBClient query result being archived."""
+        self._insert_columns(table, [frame[name].to_numpy() for name, _, _ in TABLE_COLUMNS[table]])
+
+    def writer(self, **kwargs) -> HistoricalWriter:
+        """Create a HistoricalWriter on this store. Keyword arguments go to HistoricalWriter."""
+        return HistoricalWriter(self, **kwargs)
+
+    def _insert_columns(self, table: str, columns: List[Any]):
+        names = [name for name, _, _ in TABLE_COLUMNS[table]]
+        data = dict(zip(names, columns))
+        symbols = np.asarray(data.pop('symbol'), dtype=object)
+        if not len(symbols):
+            return
+        timestamps = np.asarray(data['timestamp']).astype('datetime64[ns]')
+        data['timestamp'] = timestamps.view(np.int64)
+        days = timestamps.astype('datetime64[D]')
+
+        if (symbols == symbols[0]).all() and (days == days[0]).all():
+            groups = {(symbols[0], days[0]): None}
+        else:
+            frame = pd.DataFrame({'symbol': symbols, 'day': days})
+            groups = frame.groupby(['symbol', 'day'], sort=False).indices
+        for (symbol, day), positions in groups.items():
+            part = data if positions is None else {name: np.asarray(v)[positions] for name, v in data.items()}
+            self._append(table, str(np.datetime64(day, 'D')), str(symbol), part)
+
+    def _append(self, table: str, day: str, symbol: str, data: Dict[str, np.ndarray]):
+        key = (table, day, symbol)
+        state = self.open_partitions.get(key)
+        if state is None:
+            if not symbol or symbol.startswith('.') or os.sep in symbol or (os.altsep and os.altsep in symbol):
+                raise ValueError(f'Symbol {symbol!r} cannot name a partition directory')
+            path = self.root / table / day / symbol
+            path.mkdir(parents=True, exist_ok=True)
+            partition = _Partition(path, STORED_COLUMNS[table])
+            rows = partition.repair()
+            state = self.open_partitions[key] = [partition, rows, partition.last_timestamp(rows)]
+        partition, rows, last = state
+        timestamps = data['timestamp']
+        if partition.sorted() and (
+            (last is not None and timestamps[0] < last) or (len(timestamps) > 1 and (np.diff(timestamps) < 0).any())
+        ):
+            (partition.path / UNSORTED_MARKER).touch()
+        partition.append(data)
+        state[1] = rows + len(timestamps)
+        state[2] = int(timestamps[-1]) if last is None else max(last, int(timestamps.max()))
+
+    # -- reads ----------------------------------------------------------------
+
+    def _partitions(self, table: str, symbols: np.ndarray, start: int, end: int, before: bool = False):
+        """
+        Partitions of ``table`` overlapping [start, end] in day, then symbol order.
+
+        With ``before``, each symbol's latest partition from before the window is included
+        too (for as-of lookups).
+        """
+        table_dir = self.root / table
+        if not table_dir.exists():
+            return []
+        start_day = str(np.datetime64(start, 'ns').astype('datetime64[D]'))
+        end_day = str(np.datetime64(end, 'ns').astype('datetime64[D]'))
+        days = sorted(d for d in os.listdir(table_dir) if d <= end_day)
+        wanted = set(symbols) if len(symbols) else None
+        partitions = []
+        previous = {}
+        for day in days:
+            names = sorted(os.listdir(table_dir / day))
+            for symbol in names:
+                if wanted is not None and symbol not in wanted:
+                    continue
+                if day < start_day:
+                    previous[symbol] = day
+                    continue
+                partitions.append((day, symbol))
+        if before:
+            partitions = sorted([(day, symbol) for symbol, day in previous.items()] + partitions)
+        return [(symbol, _Partition(table_dir / day / symbol, STORED_COLUMNS[table])) for day, symbol in partitions]
+
+    def _scan(self, table: str, columns: Iterable[str], symbols: np.ndarray, start: int, end: int,
+              before: bool = False) -> Dict[str, np.ndarray]:
+        """Read ``columns`` (plus symbol) for rows in [start, end], time ordered within each partition."""
+        kinds = dict(STORED_COLUMNS[table])
+        columns = list(columns)
+        chunks: Dict[str, list] = {name: [] for name in ['symbol'] + columns}
+        for symbol, partition in self._partitions(table, symbols, start, end, before):
+            rows = partition.rows()
+            if not rows:
+                continue
+            timestamps = partition.numeric('timestamp', '<i8', rows)
+            order = None
+            if not partition.sorted():
+                order = np.argsort(timestamps, kind='stable')
+                timestamps = timestamps[order]
+            lo = 0 if before else int(np.searchsorted(timestamps, start, 'left'))
+            hi = int(np.searchsorted(timestamps, end, 'right'))
+            if lo >= hi:
+                continue
+            positions = np.arange(lo, hi) if order is None else order[lo:hi]
+            chunks['symbol'].append(np.full(hi - lo, symbol, dtype=object))
+            for name in columns:
+                if kinds[name] == STR:
+                    chunks[name].append(partition.strings(name, rows, positions))
+                elif order is None:
+                    chunks[name].append(np.array(partition.numeric(name, kinds[name], rows)[lo:hi]))
+                else:
+                    chunks[name].append(partition.numeric(name, kinds[name], rows)[positions])
+        return {
+            name: np.concatenate(parts) if parts else np.empty(0, dtype=object if name == 'symbol' or kinds[name] == STR else kinds[name])
+            for name, parts in chunks.items()
+        }
+
+    @staticmethod
+    def _window(symbol: Symbols, start_time: TimeLike, end_time: TimeLike):
+        return (
+            queries.to_symbols(symbol),
+            int(queries.to_timestamp(start_time, queries.MIN_TIMESTAMP).astype(np.int64)),
+            int(queries.to_timestamp(end_time, queries.MAX_TIMESTAMP).astype(np.int64)),
+        )
+
+    @staticmethod
+    def _frame(data: Dict[str, np.ndarray], columns: Iterable[str]) -> pd.DataFrame:
+        frame = pd.DataFrame({name: data[name] for name in columns})
+        if 'timestamp' in frame:
+            frame['timestamp'] = data['timestamp'].view('datetime64[ns]')
+        return frame
+
+    def query_trades(self, symbol: Symbols = None, start_time: TimeLike = None,
+                     end_time: TimeLike = None) -> pd.DataFrame:
+        """Trades for one or more symbols (default all) between start_time and end_time, in time order."""
+        columns = [name for name, _, _ in TABLE_COLUMNS['trade']]
+        data = self._scan('trade', [c for c in columns if c != 'symbol'], *self._window(symbol, start_time, end_time))
+        frame = self._frame(data, columns)
+        return frame.sort_values('timestamp', kind='stable', ignore_index=True)
+
+    def _bucketed(self, symbol, start_time, end_time, bucket, columns):
+        data = self._scan('trade', columns, *self._window(symbol, start_time, end_time))
+        frame = pd.DataFrame({'symbol': data['symbol']})
+        if bucket is not None:
+            width = int(queries.to_timespan(bucket).astype(np.int64))
+            frame['timestamp'] = (data['timestamp'] - Q_EPOCH_NS) // width * width + Q_EPOCH_NS
+        for name in columns:
+            if name != 'timestamp':
+                frame[name] = data[name]
+        keys = ['symbol'] if bucket is None else ['symbol', 'timestamp']
+        return frame, keys
+
+    @staticmethod
+    def _finish(result: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        result = result.reset_index()
+        if 'timestamp' in keys:
+            result['timestamp'] = result['timestamp'].to_numpy().view('datetime64[ns]')
+        return result
+
+    def ohlcv(self, bucket: DurationLike, symbol: Symbols = None, start_time: TimeLike = None,
+              end_time: TimeLike = None) -> pd.DataFrame:
+        """OHLCV bars; same columns and bucketing as KDBClient.ohlcv."""
+        frame, keys = self._bucketed(symbol, start_time, end_time, bucket, ['timestamp', 'price', 'quantity'])
+        frame['notional'] = frame['price'] * frame['quantity']
+        result = frame.groupby(keys, sort=True).agg(
+            open=('price', 'first'),
+            high=('price', 'max'),
+            low=('price', 'min'),
+            close=('price', 'last'),
+            volume=('quantity', 'sum'),
+            notional=('notional', 'sum'),
+            trades=('price', 'size'),
+        )
+        result.insert(5, 'vwap', result.pop('notional') / result['volume'])
+        return self._finish(result, keys)
+
+    def vwap(self, symbol: Symbols = None, start_time: TimeLike = None, end_time: TimeLike = None,
+             bucket: Optional[DurationLike] = None) -> pd.DataFrame:
+        """Volume-weighted average price and volume per symbol, over the window or per ``bucket``."""
+        frame, keys = self._bucketed(symbol, start_time, end_time, bucket, ['timestamp', 'price', 'quantity'])
+        frame['notional'] = frame['price'] * frame['quantity']
+        result = frame.groupby(keys, sort=True).agg(volume=('quantity', 'sum'), notional=('notional', 'sum'))
+        result.insert(0, 'vwap', result.pop('notional') / result['volume'])
+        return self._finish(result, keys)
+
+    def trade_counts(self, symbol: Symbols = None, start_time: TimeLike = None, end_time: TimeLike = None,
+                     bucket: Optional[DurationLike] = None) -> pd.DataFrame:
+        """Number of trades per symbol, over the window or per ``bucket``."""
+        frame, keys = self._bucketed(symbol, start_time, end_time, bucket, ['timestamp'])
+        result = frame.groupby(keys, sort=True).size().to_frame('trades')
+        return self._finish(result, keys)
+
+    def trades_with_quotes(self, symbol: Symbols = None, start_time: TimeLike = None,
+                           end_time: TimeLike = None) -> pd.DataFrame:
+        """As-of join: each trade with the last quote for its symbol at or before it."""
+        symbols, start, end = self._window(symbol, start_time, end_time)
+        trades = self.query_trades(symbol, start_time, end_time)
+        quote_columns = [name for name, _ in STORED_COLUMNS['quote']]
+        quotes = self._frame(self._scan('quote', quote_columns, symbols, start, end, before=True),
+                             ['symbol'] + quote_columns)
+        quotes = quotes.sort_values('timestamp', kind='stable')
+        return pd.merge_asof(trades, quotes, on='timestamp', by='symbol', direction='backward')
+
+    def close(self):
+        """Nothing to close; files are opened per call."""
+        self.open_partitions.clear()
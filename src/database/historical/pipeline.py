@@ -0,0 +1,389 @@
+"""Background KDB+ persistence with a bounded queue and an on-disk spill journal."""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .writer import DEFAULT_BATCH_SIZE, DEFAULT_FLUSH_INTERVAL, TABLE_COLUMNS, _append_row, _TableBuffer, to_columns
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 100_000
+DEFAULT_RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+# Inserts a batch may fail with a data (not connection) error before it is dead-lettered
+DEFAULT_MAX_BATCH_ATTEMPTS = 3
+
+_STOP = object()
+
+
+def is_connection_error(error: Exception) -> bool:
+    """
+    Whether an insert failed because KDB+ could not be reached, rather than because of the batch.
+
+    Connection failures are retried until KDB+ is back; anything else (a q type error,
+    a column that will not convert) is counted against the batch.
+    """
+    return isinstance(error, (ConnectionError, EOFError, OSError, TimeoutError))
+
+
+class SpillJournal:
+    """
+    Batches that could not be written to KDB+, one JSON line per batch.
+
+    Replay moves the journal aside before reading it, so appends never wait for a replay
+    to finish, and a replay that fails part way keeps only the batches it did not send.
+    A batch whose insert fails with a data error ``max_attempts`` times is moved to the
+    dead-letter file (``<path>.dead``) so it stops blocking the batches behind it.
+    """
+
+    def __init__(self, path, max_attempts: int = DEFAULT_MAX_BATCH_ATTEMPTS):
+        self.path = Path(path)
+        self.replay_path = self.path.with_name(self.path.name + '.replay')
+        self.dead_letter_path = self.path.with_name(self.path.name + '.dead')
+        self.max_attempts = max(1, max_attempts)
+        self.lock = threading.Lock()
+        self.file = None
+        self.has_pending = self.path.exists() or self.replay_path.exists()
+        self.rows_dead_lettered = 0
+
+    def append(self, table: str, columns: List[list], sync: bool = True, attempts: int = 0):
+        """
+        Journal a batch.
+
+        Args:
+            table: Target table
+            columns: Per-column value lists, in TABLE_COLUMNS order
+            sync: fsync before returning; without it the batch survives a process crash
+                but not a power loss
+            attempts: Inserts of this batch that already failed with a data error
+        """
+        batch = {'table': table, 'columns': columns}
+        if attempts:
+            batch['attempts'] = attempts
+        line = json.dumps(batch, separators=(',', ':')) + '\n'
+        with self.lock:
+            if self.file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.file = open(self.path, 'a', encoding='utf-8')
+            self.file.write(line)
+            self.file.flush()
+            if sync:
+                os.fsync(self.file.fileno())
+            self.has_pending = True
+
+    def replay(self, insert: Callable[[str, List[list]], Any]) -> int:
+        """
+        Pass every journaled batch, oldest first, to ``insert(table, columns)``.
+
+        If ``insert`` raises, the unsent batches stay journaled and the exception
+        propagates, except for a data error on a batch's last allowed attempt: that
+        batch is dead-lettered and replay carries on with the next one.
+
+        Returns:
+            Number of rows replayed
+        """
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            if not self.replay_path.exists():
+                if not self.path.exists():
+                    self.has_pending = False
+                    return 0
+                os.replace(self.path, self.replay_path)
+
+        rows = 0
+        with open(self.replay_path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    batch = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-append
+                    logger.error(f'Skipping unreadable line {number} of {self.replay_path}')
+                    continue
+                try:
+                    insert(batch['table'], batch['columns'])
+                except Exception as e:
+                    if is_connection_error(e):
+                        self._keep(line, f)
+                        raise
+                    batch['attempts'] = batch.get('attempts', 0) + 1
+                    if batch['attempts'] < self.max_attempts:
+                        self._keep(json.dumps(batch, separators=(',', ':')) + '\n', f)
+                        raise
+                    self.dead_letter(batch, e)
+                    continue
+                rows += len(batch['columns'][0])
+        os.remove(self.replay_path)
+        with self.lock:
+            self.has_pending = self.path.exists()
+        return rows
+
+    def dead_letter(self, batch: Dict[str, Any], error: Exception):
+        """Move a batch that keeps failing to the dead-letter file, with the last error."""
+        rows = len(batch['columns'][0])
+        record = dict(batch, error=repr(error), failed_at=time.time())
+        with open(self.dead_letter_path, 'a', encoding='utf-8') as out:
+            out.write(json.dumps(record, separators=(',', ':')) + '\n')
+            out.flush()
+            os.fsync(out.fileno())
+        self.rows_dead_lettered += rows
+        logger.error(
+            f"Dead-lettered {rows} {batch['table']} rows to {self.dead_letter_path} "
+            f"after {batch.get('attempts', 0)} failed inserts: {error!r}"
+        )
+
+    def _keep(self, line: str, rest):
+        """Rewrite the replay file as ``line`` plus the rest of the file being replayed."""
+        tmp = self.replay_path.with_name(self.replay_path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as out:
+            out.write(line)
+            out.write(rest.read())
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, self.replay_path)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class HistoricalPipeline:
+    """
+    Writes trades and quotes to KDB+ from a background thread.
+
+    add_trade()/add_quote() only put the row on a bounded queue, so callers never wait
+    on KDB+. The thread batches rows per table like HistoricalWriter (``batch_size``
+    rows or ``flush_interval`` seconds) and inserts each batch. While KDB+ is
+    unreachable, batches go to a SpillJournal at ``journal_path`` and the thread
+    reconnects with backoff; once connected it replays the journal before writing
+    anything new. A journal left by a previous run is replayed the same way. If the
+    queue is full, the caller journals its row directly instead of waiting.
+
+    A batch rejected by KDB+ itself (a data error, not a connection error) is journaled
+    and retried with the same backoff, without dropping the connection; after
+    ``max_batch_attempts`` failures it is dead-lettered (see SpillJournal).
+
+    Rows are written at least once: a crash between an insert and the journal update
+    that records it means that batch is replayed again.
+
+    ``connect`` returns something called like a pykx QConnection, e.g.
+    ``lambda: kx.QConnection(host='localhost', port=8080)``.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        journal_path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        reconnect_delay: float = DEFAULT_RECONNECT_DELAY,
+        max_batch_attempts: int = DEFAULT_MAX_BATCH_ATTEMPTS,
+    ):
+        self.connect = connect
+        self.journal = SpillJournal(journal_path, max_attempts=max_batch_attempts)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.buffers = {table: _TableBuffer(table) for table in TABLE_COLUMNS}
+        self.q = None
+        self.reconnect_delay = reconnect_delay
+        self.retry_delay = reconnect_delay
+        self.retry_at = 0.0
+
+        # Counters for monitoring
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_spilled = 0
+        self.rows_replayed = 0
+        self.rows_overflowed = 0
+        self.failed_writes = 0
+        self.rows_lost = 0
+
+        self.thread = threading.Thread(target=self._run, name='historical-writer', daemon=True)
+        self.thread.start()
+
+    @property
+    def queued(self) -> int:
+        """Rows waiting on the queue."""
+        return self.queue.qsize()
+
+    def add_trade(self, trade: Dict[str, Any]):
+        """Queue a trade (id, timestamp in epoch seconds, symbol, quantity, price, buyer, seller)."""
+        self.add('trade', trade)
+
+    def add_quote(self, quote: Dict[str, Any]):
+        """Queue a quote (timestamp in epoch seconds, symbol, bid, ask, bid_size, ask_size)."""
+        self.add('quote', quote)
+
+    def add(self, table: str, row: Dict[str, Any]):
+        """Queue a row for ``table``; journal it instead if the queue is full."""
+        spec = TABLE_COLUMNS[table]
+        try:
+            self.queue.put_nowait((table, row))
+        except queue.Full:
+            columns = [[] for _ in spec]
+            _append_row(spec, columns, row)
+            # No fsync here: the caller is the matching thread
+            self.journal.append(table, columns, sync=False)
+            self.rows_overflowed += 1
+
+    def _run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self._timeout())
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None:
+                table, row = item
+                buffer = self.buffers[table]
+                try:
+                    _append_row(buffer.spec, buffer.columns, row)
+                except KeyError as e:
+                    # Undo the columns appended before the missing one
+                    for values in buffer.columns:
+                        del values[buffer.rows:]
+                    logger.error(f'Discarding {table} row without {e}: {row}')
+                    continue
+                buffer.rows += 1
+                if buffer.since is None:
+                    buffer.since = time.monotonic()
+                if buffer.rows >= self.batch_size:
+                    self._write(table, buffer.take())
+            self._flush_due()
+
+        # Last chance to reach KDB+ before leaving the rest in the journal
+        self.retry_at = 0.0
+        for table, buffer in self.buffers.items():
+            if buffer.rows:
+                self._write(table, buffer.take())
+        if self.journal.has_pending:
+            self._ready()
+        if self.q is not None:
+            self._close_connection()
+
+    def _timeout(self) -> float:
+        """Seconds until the oldest buffered row is due."""
+        since = [buffer.since for buffer in self.buffers.values() if buffer.since is not None]
+        if not since:
+            return self.flush_interval
+        return max(0.0, min(since) + self.flush_interval - time.monotonic())
+
+    def _flush_due(self):
+        now = time.monotonic()
+        for table, buffer in self.buffers.items():
+            if buffer.since is not None and now - buffer.since >= self.flush_interval:
+                self._write(table, buffer.take())
+        # Replay spilled rows as soon as KDB+ is back, even if nothing new arrives
+        if self.journal.has_pending and now >= self.retry_at:
+            self._ready()
+
+    def _insert(self, table: str, columns: List[list]):
+        self.q('insert', table, to_columns(table, columns))
+
+    def _ready(self) -> bool:
+        """Connect if needed and replay the journal. Returns True if batches can be inserted."""
+        if self.q is None:
+            if time.monotonic() < self.retry_at:
+                return False
+            try:
+                self.q = self.connect()
+            except Exception as e:
+                self._disconnected(e)
+                return False
+            logger.info('Connected to KDB+')
+        elif self.journal.has_pending and time.monotonic() < self.retry_at:
+            # Connected, but the journal's first batch was rejected: wait out the backoff
+            return False
+        try:
+            while self.journal.has_pending:
+                rows = self.journal.replay(self._insert)
+                self.rows_replayed += rows
+                if rows:
+                    logger.info(f'Replayed {rows} journaled rows to KDB+')
+        except Exception as e:
+            self._failed(e)
+            return False
+        self.retry_delay = self.reconnect_delay
+        return True
+
+    def _write(self, table: str, columns: List[list]):
+        attempts = 0
+        if self._ready():
+            try:
+                self._insert(table, columns)
+            except Exception as e:
+                self.failed_writes += 1
+                if not is_connection_error(e):
+                    attempts = 1
+                self._failed(e)
+            else:
+                self.rows_written += len(columns[0])
+                self.batches_written += 1
+                return
+        try:
+            self.journal.append(table, columns, attempts=attempts)
+        except OSError as e:
+            self.rows_lost += len(columns[0])
+            logger.error(f'Lost {len(columns[0])} {table} rows: KDB+ unavailable and journal failed: {e}')
+        else:
+            self.rows_spilled += len(columns[0])
+
+    def _close_connection(self):
+        q, self.q = self.q, None
+        close = getattr(q, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def _failed(self, error: Exception):
+        """Back off after a failed insert; only a connection error drops the connection."""
+        if is_connection_error(error):
+            self._disconnected(error)
+            return
+        logger.warning(f'KDB+ rejected a batch, journaling to {self.journal.path}: {error!r}')
+        self.retry_at = time.monotonic() + self.retry_delay
+        self.retry_delay = min(self.retry_delay * 2, MAX_RECONNECT_DELAY)
+
+    def _disconnected(self, error: Exception):
+        if self.q is not None or self.retry_delay == self.reconnect_delay:
+            logger.warning(f'KDB+ unavailable, journaling to {self.journal.path}: {error}')
+        if self.q is not None:
+            self._close_connection()
+        self.retry_at = time.monotonic() + self.retry_delay
+        self.retry_delay = min(self.retry_delay * 2, MAX_RECONNECT_DELAY)
+
+    def close(self, timeout: float = 10.0):
+        """
+        Write (or journal) everything queued and stop the thread.
+
+        Rows still journaled afterwards are replayed by the next pipeline on the same path.
+        """
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error('Historical writer queue did not drain; unwritten rows remain queued')
+            return
+        self.thread.join(timeout=timeout)
+        if self.thread.is_alive():
+            logger.error('Historical writer did not stop in time')
+        self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
@@ -0,0 +1,82 @@
+"""
+Pre-built KDB+ queries.
+
+Each query is a q lambda sent together with its arguments, so values travel as typed
+IPC data and are never spliced into q source. Aggregation happens in the q process;
+only the result table crosses the wire.
+"""
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+TimeLike = Union[float, int, datetime, np.datetime64, pd.Timestamp, None]
+DurationLike = Union[float, int, str, np.timedelta64, pd.Timedelta]
+
+# Bounds used for an open-ended window (the datetime64[ns] range)
+MIN_TIMESTAMP = np.datetime64('1970-01-01T00:00:00', 'ns')
+MAX_TIMESTAMP = np.datetime64('2262-04-11T00:00:00', 'ns')
+
+# Shared filter: s is a symbol list (empty for all symbols), st/et an inclusive window
+_WHERE = 'timestamp within (st;et), (0=count s) or symbol in s'
+
+TRADES = '{[s;st;et] select from trade where ' + _WHERE + '}'
+
+OHLCV = (
+    '{[s;st;et;w] select open:first price, high:max price, low:min price, close:last price, '
+    'volume:sum quantity, vwap:quantity wavg price, trades:count i '
+    'by symbol, timestamp:w xbar timestamp from trade where ' + _WHERE + '}'
+)
+
+VWAP = (
+    '{[s;st;et] select vwap:quantity wavg price, volume:sum quantity '
+    'by symbol from trade where ' + _WHERE + '}'
+)
+
+VWAP_BUCKETED = (
+    '{[s;st;et;w] select vwap:quantity wavg price, volume:sum quantity '
+    'by symbol, timestamp:w xbar timestamp from trade where ' + _WHERE + '}'
+)
+
+TRADE_COUNTS = '{[s;st;et] select trades:count i by symbol from trade where ' + _WHERE + '}'
+
+TRADE_COUNTS_BUCKETED = (
+    '{[s;st;et;w] select trades:count i by symbol, timestamp:w xbar timestamp '
+    'from trade where ' + _WHERE + '}'
+)
+
+# Each trade with the quote prevailing at its timestamp. Quotes from before the window
+# are kept so trades early in it still find theirs.
+TRADES_WITH_QUOTES = (
+    '{[s;st;et] aj[`symbol`timestamp; select from trade where ' + _WHERE + '; '
+    'select symbol, timestamp, bid, ask, bid_size, ask_size from quote '
+    'where timestamp<=et, (0=count s) or symbol in s]}'
+)
+
+
+def to_timestamp(value: TimeLike, default: np.datetime64 = MIN_TIMESTAMP) -> np.datetime64:
+    """Epoch seconds, datetime or datetime64 -> datetime64[ns] (sent as a q timestamp)."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return np.datetime64(int(round(value * 1e9)), 'ns')
+    return pd.Timestamp(value).to_datetime64().astype('datetime64[ns]')
+
+
+def to_timespan(value: DurationLike) -> np.timedelta64:
+    """Seconds, '1min'-style strings or timedeltas -> timedelta64[ns] (sent as a q timespan)."""
+    span = pd.Timedelta(seconds=value) if isinstance(value, (int, float)) else pd.Timedelta(value)
+    span = span.to_timedelta64().astype('timedelta64[ns]')
+    if span <= np.timedelta64(0, 'ns'):
+        raise ValueError(f'Bucket must be positive, got {value!r}')
+    return span
+
+
+def to_symbols(symbols: Optional[Union[str, Iterable[str]]]) -> np.ndarray:
+    """A symbol, a list of symbols, or None for all -> array sent as a q symbol list."""
+    if symbols is None:
+        return np.array([], dtype=object)
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    return np.array([str(s) for s in symbols], dtype=object)
@@ -0,0 +1,249 @@
+"""Buffered, columnar writes to the KDB+ trade and quote tables."""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_ROWS = 100_000
+DEFAULT_BLOCK_TIMEOUT = 1.0
+MAX_RETRY_DELAY = 5.0
+
+
+def _symbols(values):
+    return np.array([str(v) for v in values], dtype=object)
+
+
+def _floats(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _timestamps(values):
+    # Epoch seconds -> datetime64[ns], which pykx sends as q timestamps
+    return (np.asarray(values, dtype=np.float64) * 1e9).astype('datetime64[ns]')
+
+
+_REQUIRED = object()
+
+# Column order, converter and default for each table in schemas.q
+TABLE_COLUMNS = {
+    'trade': (
+        ('id', _symbols, _REQUIRED),
+        ('timestamp', _timestamps, _REQUIRED),
+        ('symbol', _symbols, ''),
+        ('quantity', _floats, 0.0),
+        ('price', _floats, 0.0),
+        ('buyer', _symbols, ''),
+        ('seller', _symbols, ''),
+    ),
+    'quote': (
+        ('timestamp', _timestamps, _REQUIRED),
+        ('symbol', _symbols, _REQUIRED),
+        ('bid', _floats, 0.0),
+        ('ask', _floats, 0.0),
+        ('bid_size', _floats, 0.0),
+        ('ask_size', _floats, 0.0),
+    ),
+}
+
+
+def to_columns(table: str, columns: Iterable[list]) -> List[np.ndarray]:
+    """Convert per-column lists for ``table`` into typed numpy vectors, in schema order."""
+    return [convert(values) for (_, convert, _), values in zip(TABLE_COLUMNS[table], columns)]
+
+
+def rows_to_columns(table: str, rows: Iterable[Dict[str, Any]]) -> List[np.ndarray]:
+    """Pivot row dicts into typed column vectors for ``q('insert', table, columns)``."""
+    columns = [[] for _ in TABLE_COLUMNS[table]]
+    for row in rows:
+        _append_row(TABLE_COLUMNS[table], columns, row)
+    return to_columns(table, columns)
+
+
+def _append_row(spec, columns, row):
+    for (name, _, default), values in zip(spec, columns):
+        values.append(row[name] if default is _REQUIRED else row.get(name, default))
+
+
+class BufferFullError(RuntimeError):
+    """Raised when the writer's buffer stays full for longer than ``block_timeout``."""
+
+
+class _TableBuffer:
+    """Rows waiting to be written to one table, held column by column."""
+
+    __slots__ = ('spec', 'columns', 'rows', 'since')
+
+    def __init__(self, table: str):
+        self.spec = TABLE_COLUMNS[table]
+        self.columns = [[] for _ in self.spec]
+        self.rows = 0
+        self.since = None
+
+    def take(self):
+        """Return the buffered columns and start a new batch."""
+        columns, self.columns = self.columns, [[] for _ in self.spec]
+        self.rows = 0
+        self.since = None
+        return columns
+
+    def put_back(self, columns):
+        """Return columns from a failed write to the front of the buffer."""
+        for old, new in zip(columns, self.columns):
+            old.extend(new)
+        self.columns = columns
+        self.rows = len(columns[0])
+        self.since = time.monotonic()
+
+
+class HistoricalWriter:
+    """
+    Collects trades and quotes into columnar batches and writes each batch to KDB+
+    with one ``insert`` call.
+
+    A table is flushed when it has ``batch_size`` rows, or when its oldest row is
+    ``flush_interval`` seconds old (checked on every add and by maybe_flush(), which a
+    server loop should call while idle). If a write fails the rows stay buffered and the
+    write is retried with backoff. Once ``max_rows`` rows are buffered, adds block while
+    retrying and raise BufferFullError after ``block_timeout`` seconds, so a caller
+    outrunning KDB+ slows down instead of growing the buffer without bound. After one
+    add has timed out, further adds that find the buffer full raise straight away until
+    a write succeeds again, rather than each blocking for ``block_timeout``.
+
+    ``q`` is anything called like a pykx QConnection: ``q('insert', table, columns)``.
+    """
+
+    def __init__(
+        self,
+        q: Callable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+    ):
+        self.q = q
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_rows = max(max_rows, batch_size)
+        self.block_timeout = block_timeout
+        self.buffers = {table: _TableBuffer(table) for table in TABLE_COLUMNS}
+        self.lock = threading.RLock()
+        self.retry_delay = 0.0
+        self.retry_at = 0.0
+        self.shedding = False
+
+        # Counters for monitoring
+        self.rows_written = 0
+        self.batches_written = 0
+        self.failed_writes = 0
+        self.blocked_seconds = 0.0
+        self.rejected_rows = 0
+
+    @property
+    def buffered(self) -> int:
+        """Rows waiting to be written, across all tables."""
+        return sum(buffer.rows for buffer in self.buffers.values())
+
+    def add_trade(self, trade: Dict[str, Any]):
+        """Buffer a trade (id, timestamp in epoch seconds, symbol, quantity, price, buyer, seller)."""
+        self.add('trade', trade)
+
+    def add_quote(self, quote: Dict[str, Any]):
+        """Buffer a quote (timestamp in epoch seconds, symbol, bid, ask, bid_size, ask_size)."""
+        self.add('quote', quote)
+
+    def add(self, table: str, row: Dict[str, Any]):
+        """Buffer a row for ``table``, flushing if a batch is ready."""
+        with self.lock:
+            if self.buffered >= self.max_rows:
+                try:
+                    self._wait_for_room()
+                except BufferFullError:
+                    self.rejected_rows += 1
+                    raise
+            buffer = self.buffers[table]
+            _append_row(buffer.spec, buffer.columns, row)
+            buffer.rows += 1
+            now = time.monotonic()
+            if buffer.since is None:
+                buffer.since = now
+            if (buffer.rows >= self.batch_size or now - buffer.since >= self.flush_interval) and now >= self.retry_at:
+                self._flush_table(table, buffer)
+
+    def _wait_for_room(self):
+        """Backpressure: retry writes until there is room, or give up after block_timeout."""
+        if self.shedding:
+            if time.monotonic() >= self.retry_at:
+                self.flush()
+            if self.buffered >= self.max_rows:
+                raise BufferFullError(f'{self.buffered} rows buffered for KDB+ and writes are failing')
+            return
+        start = time.monotonic()
+        deadline = start + self.block_timeout
+        try:
+            while True:
+                self.retry_at = 0.0
+                self.flush()
+                if self.buffered < self.max_rows:
+                    return
+                now = time.monotonic()
+                if now >= deadline:
+                    self.shedding = True
+                    raise BufferFullError(f'{self.buffered} rows buffered for KDB+ and writes are failing')
+                time.sleep(min(self.retry_delay, deadline - now))
+        finally:
+            self.blocked_seconds += time.monotonic() - start
+
+    def _flush_table(self, table: str, buffer: _TableBuffer) -> bool:
+        if not buffer.rows:
+            return True
+        columns = buffer.take()
+        try:
+            self.q('insert', table, to_columns(table, columns))
+        except Exception as e:
+            buffer.put_back(columns)
+            self.failed_writes += 1
+            self.retry_delay = min(max(self.retry_delay * 2, 0.05), MAX_RETRY_DELAY)
+            self.retry_at = time.monotonic() + self.retry_delay
+            logger.error(f'Failed to write {buffer.rows} {table} rows to KDB+, retrying in {self.retry_delay:.2f}s: {e}')
+            return False
+        self.retry_delay = 0.0
+        self.retry_at = 0.0
+        self.shedding = False
+        self.rows_written += len(columns[0])
+        self.batches_written += 1
+        return True
+
+    def flush(self) -> bool:
+        """
+        Write every buffered row now.
+
+        Returns:
+            True if nothing is left buffered
+        """
+        with self.lock:
+            ok = True
+            for table, buffer in self.buffers.items():
+                ok = self._flush_table(table, buffer) and ok
+            return ok
+
+    def maybe_flush(self):
+        """Flush tables whose oldest row has waited ``flush_interval`` (unless backing off)."""
+        with self.lock:
+            now = time.monotonic()
+            if now < self.retry_at:
+                return
+            for table, buffer in self.buffers.items():
+                if buffer.since is not None and now - buffer.since >= self.flush_interval:
+                    if not self._flush_table(table, buffer):
+                        return
+
+    def close(self):
+        """Flush what is buffered; rows that still cannot be written are logged and dropped."""
+        if not self.flush():
+            logger.error(f'Dropping {self.buffered} rows that could not be written to KDB+')
@@ -1,6 +1,7 @@
-import sqlite3
 from pathlib import Path
 
+from database.connection import connect
+
 DB_PATH = Path(__file__).parent / 'trading_engine.db'
 CLIENT_DB_PATH = Path(__file__).parent.parent / 'database' / 'clients.db'
 
@@ -37,7 +38,7 @@ SCHEMA = [
 
 class ClientDB:
     def __init__(self, db_path=CLIENT_DB_PATH):
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self._init_schema()
 
     def _init_schema(self):
@@ -68,7 +69,7 @@ class ClientDB:
         self.conn.close()
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
     c = conn.cursor()
     for stmt in SCHEMA:
         c.execute(stmt)
@@ -1,5 +1,6 @@
 """Transactional database module for orders, trades, and user data."""
 from .manager import TransactionalDB
+from .migrations import LATEST_VERSION, get_schema_version, migrate
 from .models import SCHEMA
 
-__all__ = ["TransactionalDB", "SCHEMA"]
+__all__ = ["TransactionalDB", "SCHEMA", "migrate", "get_schema_version", "LATEST_VERSION"]
@@ -1,6 +1,11 @@
 """Database connection manager for transactional database."""
 import sqlite3
 from pathlib import Path
+
+from database.bulk import insert_many, iter_rows
+from database.connection import connect
+
+from .migrations import migrate
 from .models import SCHEMA
 
 DB_PATH = Path(__file__).parent / 'trading_engine.db'
@@ -11,7 +16,7 @@ class TransactionalDB:
     
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self.conn.row_factory = sqlite3.Row
         self._init_schema()
 
@@ -21,6 +26,7 @@ class TransactionalDB:
         for stmt in SCHEMA:
             c.execute(stmt)
         self.conn.commit()
+        self.schema_version = migrate(self.conn)
 
     def add_client(self, name, type, description=None):
         """Add a new client."""
@@ -48,6 +54,19 @@ class TransactionalDB:
         self.conn.commit()
         return c.lastrowid
 
+    def add_users(self, users):
+        """
+        Add many users in one transaction and return their ids (a range).
+
+        ``users`` is an iterable of (username, password_hash) tuples or dicts, or a
+        mapping of those columns. A duplicate username fails the whole batch.
+        """
+        return insert_many(
+            self.conn,
+            'INSERT INTO users (username, password_hash) VALUES (?, ?)',
+            iter_rows(users, ('username', 'password_hash')),
+        )
+
     def get_user_by_username(self, username):
         """Get user by username."""
         c = self.conn.cursor()
@@ -65,6 +84,27 @@ class TransactionalDB:
         self.conn.commit()
         return c.lastrowid
 
+    def place_orders(self, orders, rebuild_indexes=False):
+        """
+        Place many orders in one transaction and return their ids (a range).
+
+        ``orders`` is an iterable of (user_id, symbol, side, quantity, price) tuples or
+        dicts, or a mapping of those columns (lists or numpy arrays). Optional status
+        (default 'open') and created_at (default now) are used when given. For seeding,
+        rebuild_indexes=True builds the orders indexes once after the inserts.
+        """
+        return insert_many(
+            self.conn,
+            '''INSERT INTO orders (user_id, symbol, side, quantity, price, status, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))''',
+            iter_rows(
+                orders,
+                ('user_id', 'symbol', 'side', 'quantity', 'price', 'status', 'created_at'),
+                {'status': 'open', 'created_at': None},
+            ),
+            rebuild_indexes='orders' if rebuild_indexes else None,
+        )
+
     def record_trade(self, user_id, symbol, side, quantity, price):
         """Record a trade."""
         c = self.conn.cursor()
@@ -76,6 +116,26 @@ class TransactionalDB:
         self.conn.commit()
         return c.lastrowid
 
+    def record_trades(self, trades, rebuild_indexes=False):
+        """
+        Record many trades in one transaction and return their ids (a range).
+
+        ``trades`` is an iterable of (user_id, symbol, side, quantity, price) tuples or
+        dicts, or a mapping of those columns. An optional timestamp (default now) keeps
+        the original time when replaying trades. rebuild_indexes as for place_orders.
+        """
+        return insert_many(
+            self.conn,
+            '''INSERT INTO trades (user_id, symbol, side, quantity, price, timestamp)
+               VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))''',
+            iter_rows(
+                trades,
+                ('user_id', 'symbol', 'side', 'quantity', 'price', 'timestamp'),
+                {'timestamp': None},
+            ),
+            rebuild_indexes='trades' if rebuild_indexes else None,
+        )
+
     def update_order_status(self, order_id, status):
         """Update order status."""
         c = self.conn.cursor()
@@ -92,13 +152,14 @@ class TransactionalDB:
 
 def init_db(db_path=DB_PATH):
     """Initialize the database with schema."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     c = conn.cursor()
     for stmt in SCHEMA:
         c.execute(stmt)
     conn.commit()
+    version = migrate(conn)
     conn.close()
-    print(f'Transactional database initialized at {db_path}')
+    print(f'Transactional database initialized at {db_path} (schema version {version})')
 
 
 if __name__ == '__main__':
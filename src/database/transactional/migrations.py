@@ -0,0 +1,94 @@
+"""Versioned schema migrations for the transactional database."""
+import logging
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = '''CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)'''
+
+# (version, description, statements). Append new migrations; never edit applied ones.
+MIGRATIONS = [
+    (
+        1,
+        'Indexes for portal and TES access patterns',
+        [
+            # Recent orders, overall and per trader (ORDER BY created_at DESC LIMIT n)
+            'CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders (created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_orders_user_created ON orders (user_id, created_at)',
+            # Open orders by symbol
+            'CREATE INDEX IF NOT EXISTS idx_orders_symbol_status ON orders (symbol, status)',
+            # Recent trades, overall and per trader / time range
+            'CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades (timestamp)',
+            'CREATE INDEX IF NOT EXISTS idx_trades_user_timestamp ON trades (user_id, timestamp)',
+            # positions -> portfolios -> users joins
+            'CREATE INDEX IF NOT EXISTS idx_portfolios_user ON portfolios (user_id)',
+            'CREATE INDEX IF NOT EXISTS idx_positions_portfolio ON positions (portfolio_id, symbol)',
+        ],
+    ),
+    (
+        2,
+        'Covering indexes for open orders, trader trades and positions',
+        [
+            # Each replaces a migration 1 index with the same leading columns plus the
+            # columns its query selects, so the query never reads the table
+            'DROP INDEX IF EXISTS idx_orders_symbol_status',
+            'CREATE INDEX IF NOT EXISTS idx_orders_symbol_status_cover ON orders (symbol, status, price, quantity)',
+            'DROP INDEX IF EXISTS idx_trades_user_timestamp',
+            'CREATE INDEX IF NOT EXISTS idx_trades_user_timestamp_cover '
+            'ON trades (user_id, timestamp, symbol, side, quantity, price)',
+            'DROP INDEX IF EXISTS idx_positions_portfolio',
+            'CREATE INDEX IF NOT EXISTS idx_positions_portfolio_cover '
+            'ON positions (portfolio_id, symbol, quantity, avg_price)',
+        ],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version (0 for a fresh database)."""
+    conn.execute(VERSION_TABLE)
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def migrate(conn, target=None):
+    """
+    Apply pending migrations in order, each in its own transaction.
+
+    Args:
+        conn: sqlite3 connection to the transactional database
+        target: Version to migrate to (defaults to the latest)
+
+    Returns:
+        The schema version after migrating
+    """
+    target = LATEST_VERSION if target is None else target
+    if conn.in_transaction:
+        conn.commit()
+    version = get_schema_version(conn)
+    conn.commit()
+
+    for number, description, statements in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        logger.info(f'Applying transactional schema migration {number}: {description}')
+        try:
+            # DDL does not open an implicit transaction in sqlite3, so begin one explicitly
+            conn.execute('BEGIN')
+            for stmt in statements:
+                conn.execute(stmt)
+            conn.execute(
+                'INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                (number, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = number
+    return version
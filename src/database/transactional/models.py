@@ -26,7 +26,7 @@ SCHEMA = [
         side TEXT NOT NULL, -- 'buy' or 'sell'
         quantity REAL NOT NULL,
         price REAL NOT NULL,
-        status TEXT NOT NULL, -- 'open', 'filled', 'cancelled'
+        status TEXT NOT NULL, -- 'open', 'partially_filled', 'filled', 'cancelled', 'rejected'
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         FOREIGN KEY(user_id) REFERENCES users(id)
     )''',
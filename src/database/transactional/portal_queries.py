@@ -0,0 +1,78 @@
+"""
+Portal access patterns the transactional indexes are built for.
+
+scripts/benchmarks/bench_schema_indexes.py times these queries before and after
+migrating, and test_migrations.py checks their plans on every run.
+"""
+
+# label -> (sql, params, table or alias that must not be fully scanned, covered)
+#
+# ``covered`` queries are answered from the index alone. The rest select (nearly)
+# every column of orders or trades behind a LIMIT: the index finds the rows in order
+# and the few table lookups left are cheaper than a second copy of each table that
+# every order and fill would have to write.
+QUERIES = {
+    'Recent orders': (
+        '''SELECT id as order_id, user_id, symbol, side, quantity, price, status, created_at
+           FROM orders ORDER BY created_at DESC LIMIT 1000''',
+        (),
+        'orders',
+        False,
+    ),
+    'Trader orders': (
+        '''SELECT o.id, o.user_id, o.symbol, o.side, o.quantity, o.price, o.status, o.created_at
+           FROM orders o JOIN users u ON o.user_id = u.id
+           WHERE u.username = ? ORDER BY o.created_at DESC LIMIT 50''',
+        ('trader-00042',),
+        'o',
+        False,
+    ),
+    'Open orders by symbol': (
+        "SELECT id, price, quantity FROM orders WHERE symbol = ? AND status = 'open'",
+        ('TSLA',),
+        'orders',
+        True,
+    ),
+    'Recent trades': (
+        '''SELECT id, user_id, symbol, side, quantity, price, timestamp
+           FROM trades ORDER BY timestamp DESC LIMIT 1000''',
+        (),
+        'trades',
+        False,
+    ),
+    'Trader trades in range': (
+        '''SELECT id, symbol, side, quantity, price, timestamp FROM trades
+           WHERE user_id = ? AND timestamp >= ? ORDER BY timestamp DESC''',
+        (42, '2025-01-01 12:00:00'),
+        'trades',
+        True,
+    ),
+    'Trader positions': (
+        '''SELECT p.id, p.symbol, p.quantity, p.avg_price FROM positions p
+           JOIN portfolios pf ON p.portfolio_id = pf.id
+           JOIN users u ON pf.user_id = u.id WHERE u.username = ?''',
+        ('trader-00042',),
+        'p',
+        True,
+    ),
+}
+
+
+def plan(conn, sql, params=()):
+    """The steps of the query plan, as EXPLAIN QUERY PLAN describes them."""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def uses_index(steps, name):
+    """True unless the plan does a full table scan of ``name``."""
+    for step in steps:
+        words = step.split()
+        if words[:2] == ['SCAN', name] and 'USING' not in words:
+            return False
+    return True
+
+
+def uses_covering_index(steps, name):
+    """True if every step on ``name`` reads a covering index and never the table."""
+    steps = [step for step in steps if step.split()[1:2] == [name]]
+    return bool(steps) and all('USING COVERING INDEX' in step for step in steps)
@@ -4,6 +4,9 @@ from pathlib import Path
 import json
 import logging
 
+from database.bulk import insert_many, iter_rows
+from database.connection import connect
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent / 'utilities.db'
@@ -51,13 +54,26 @@ UTILITIES_SCHEMA = [
     )'''
 ]
 
+_UPSERT_PARAM = '''INSERT INTO model_params (model_name, param_name, param_value, data_type)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(model_name, param_name) 
+                   DO UPDATE SET param_value=excluded.param_value, data_type=excluded.data_type,
+                                 updated_at=CURRENT_TIMESTAMP'''
+
+
+def _param_row(model_name, param_name, param_value, data_type='string'):
+    # Convert complex types to JSON
+    if isinstance(param_value, (dict, list)):
+        return model_name, param_name, json.dumps(param_value), 'json'
+    return model_name, param_name, str(param_value), data_type
+
 
 class ModelParamsDB:
     """Manager for model parameters and reference data."""
     
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self.conn.row_factory = sqlite3.Row
         self._init_schema()
     
@@ -71,22 +87,21 @@ class ModelParamsDB:
     def set_param(self, model_name, param_name, param_value, data_type='string'):
         """Set or update a model parameter."""
         c = self.conn.cursor()
-        # Convert complex types to JSON
-        if isinstance(param_value, (dict, list)):
-            param_value = json.dumps(param_value)
-            data_type = 'json'
-        else:
-            param_value = str(param_value)
-        
-        c.execute(
-            '''INSERT INTO model_params (model_name, param_name, param_value, data_type)
-               VALUES (?, ?, ?, ?)
-               ON CONFLICT(model_name, param_name) 
-               DO UPDATE SET param_value=?, data_type=?, updated_at=CURRENT_TIMESTAMP''',
-            (model_name, param_name, param_value, data_type, param_value, data_type)
-        )
+        c.execute(_UPSERT_PARAM, _param_row(model_name, param_name, param_value, data_type))
         self.conn.commit()
     
+    def set_params(self, params):
+        """
+        Set or update many model parameters in one transaction.
+
+        ``params`` is an iterable of (model_name, param_name, param_value[, data_type])
+        tuples or dicts, or a mapping of those columns.
+        """
+        rows = iter_rows(params, ('model_name', 'param_name', 'param_value', 'data_type'),
+                         {'data_type': 'string'})
+        with self.conn:
+            self.conn.executemany(_UPSERT_PARAM, (_param_row(*row) for row in rows))
+    
     def get_param(self, model_name, param_name):
         """Get a model parameter."""
         c = self.conn.cursor()
@@ -117,6 +132,20 @@ class ModelParamsDB:
         self.conn.commit()
         return c.lastrowid
     
+    def add_instruments(self, instruments):
+        """
+        Add many instruments in one transaction and return their ids (a range).
+
+        ``instruments`` is an iterable of (symbol, name, asset_class, tick_size, lot_size)
+        tuples or dicts, or a mapping of those columns.
+        """
+        return insert_many(
+            self.conn,
+            '''INSERT INTO instruments (symbol, name, asset_class, tick_size, lot_size)
+               VALUES (?, ?, ?, ?, ?)''',
+            iter_rows(instruments, ('symbol', 'name', 'asset_class', 'tick_size', 'lot_size'))
+        )
+    
     def get_instrument(self, symbol):
         """Get instrument details."""
         c = self.conn.cursor()
@@ -149,7 +178,7 @@ class ModelParamsDB:
 
 def init_utilities_db(db_path=DB_PATH):
     """Initialize utilities database."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     c = conn.cursor()
     for stmt in UTILITIES_SCHEMA:
         c.execute(stmt)
@@ -0,0 +1,105 @@
+"""
+Live order book feed for the trader portal.
+One background subscription to the OBS market-data exchange keeps top-of-book and
+depth for every symbol in memory, so page reruns read local state instead of
+rebuilding books from the orders table.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from messaging.broker import MessageBroker
+from messaging.consumers import MarketDataConsumer
+
+logger = logging.getLogger(__name__)
+
+
+class MarketFeed:
+    """
+    Subscribes to market data for ``symbols`` on a daemon thread.
+
+    The thread owns the RabbitMQ connection and reconnects with backoff. Readers on
+    other threads get copies taken under a lock.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        host: str = "localhost",
+        port: int = 5672,
+        reconnect_delay: float = 1.0,
+    ):
+        self.symbols = list(symbols)
+        self.host = host
+        self.port = port
+        self.reconnect_delay = reconnect_delay
+        self.lock = threading.Lock()
+        self.consumer: Optional[MarketDataConsumer] = None
+        self.broker: Optional[MessageBroker] = None
+        self.stopped = False
+        self.last_error: Optional[str] = None
+        self.messages = 0
+
+        self.thread = threading.Thread(target=self._run, name="market-feed", daemon=True)
+        self.thread.start()
+
+    def _connect(self):
+        broker = MessageBroker(host=self.host, port=self.port)
+        if not broker.connect():
+            raise ConnectionError(f"Could not connect to RabbitMQ at {self.host}:{self.port}")
+        consumer = MarketDataConsumer(broker, self.symbols)
+        queue = consumer.subscribe()
+        broker.channel.basic_consume(queue=queue, on_message_callback=self._on_message, auto_ack=True)
+        with self.lock:
+            self.broker, self.consumer = broker, consumer
+        self.last_error = None
+        logger.info(f"Market feed subscribed to {', '.join(self.symbols)}")
+
+    def _on_message(self, ch, method, props, body):
+        with self.lock:
+            self.consumer.on_market_data(ch, method, props, body)
+            self.messages += 1
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self.stopped:
+            try:
+                if self.broker is None or self.broker.connection.is_closed:
+                    self._connect()
+                    delay = self.reconnect_delay
+                self.broker.connection.process_data_events(time_limit=1)
+            except Exception as e:
+                self.last_error = f"Market data feed failed: {e!r}"
+                logger.warning(f"{self.last_error}, retrying in {delay:.0f}s")
+                with self.lock:
+                    broker, self.broker, self.consumer = self.broker, None, None
+                if broker is not None:
+                    try:
+                        broker.close()
+                    except Exception:
+                        pass
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+        if self.broker is not None:
+            self.broker.close()
+
+    def depth(self, symbol: str, levels: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Current depth for ``symbol``, or None until a snapshot has arrived."""
+        with self.lock:
+            book = self.consumer.books.get(symbol) if self.consumer else None
+            if book is None or book.stale:
+                return None
+            return book.depth(levels)
+
+    def bbo(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest BBO message for ``symbol``, or None."""
+        with self.lock:
+            message = self.consumer.bbo.get(symbol) if self.consumer else None
+            return dict(message) if message else None
+
+    def close(self):
+        """Stop the feed thread; it closes the connection on its way out."""
+        self.stopped = True
+        self.thread.join(timeout=5)
@@ -0,0 +1,177 @@
+"""
+Shared read layer for the trader portal.
+Queries run on a small pool of long-lived SQLite connections and results are cached by
+(query, params). The cache is dropped whenever another connection commits to the
+database, so DB load follows the rate of data change rather than sessions x refreshes.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Tuple
+
+from database.connection import connect
+
+_MISSING = object()
+
+
+class CachedReader:
+    """
+    Thread-safe pooled, cached SQLite reader.
+
+    ``PRAGMA data_version`` on a dedicated watcher connection changes whenever any other
+    connection commits, which makes it a cheap, exact "has anything changed" check. It
+    is polled at most once per ``check_interval`` seconds; entries also expire after
+    ``ttl`` seconds as a safety net. Concurrent misses on the same key wait for one
+    query instead of all hitting the database.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 4,
+        ttl: float = 10.0,
+        check_interval: float = 0.5,
+    ):
+        self.db_path = str(db_path)
+        self.ttl = ttl
+        self.check_interval = check_interval
+
+        self.pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(max(1, pool_size)):
+            self.pool.put(self._connect())
+
+        self.watcher = self._connect()
+        self.watcher_lock = threading.Lock()
+        self.data_version = self._read_data_version()
+        self.last_check = time.monotonic()
+
+        self.lock = threading.Lock()
+        self.cache: Dict[Tuple[str, Hashable], Tuple[int, float, Any]] = {}
+        self.key_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        self.generation = 0
+
+        # Counters for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _read_data_version(self) -> int:
+        return self.watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def _refresh_generation(self) -> int:
+        """Bump the cache generation if the database changed since the last check."""
+        now = time.monotonic()
+        if now - self.last_check < self.check_interval:
+            return self.generation
+        # Only one thread polls; the others use the generation as it stands
+        if not self.watcher_lock.acquire(blocking=False):
+            return self.generation
+        try:
+            self.last_check = now
+            version = self._read_data_version()
+            if version != self.data_version:
+                self.data_version = version
+                with self.lock:
+                    self.generation += 1
+                    self.cache.clear()
+                    self.key_locks.clear()
+                    self.invalidations += 1
+        finally:
+            self.watcher_lock.release()
+        return self.generation
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection."""
+        conn = self.pool.get()
+        try:
+            yield conn
+        finally:
+            self.pool.put(conn)
+
+    def _lookup(self, key, generation):
+        entry = self.cache.get(key)
+        if entry is not None:
+            entry_generation, expires, rows = entry
+            if entry_generation == generation and time.monotonic() < expires:
+                return rows
+        return _MISSING
+
+    def query(self, sql: str, params: tuple = (), one: bool = False):
+        """
+        Run a read query, serving it from the cache when the data is unchanged.
+
+        Args:
+            sql: SELECT statement
+            params: Query parameters (must be hashable)
+            one: Return the first row (or None) instead of a list
+
+        Returns:
+            List of row dicts, or a single row dict when ``one`` is set
+        """
+        key = (sql, (params, one))
+        generation = self._refresh_generation()
+        with self.lock:
+            rows = self._lookup(key, generation)
+            if rows is not _MISSING:
+                self.hits += 1
+                return _copy(rows, one)
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another session may have filled the entry while we waited
+            with self.lock:
+                rows = self._lookup(key, self.generation)
+                if rows is not _MISSING:
+                    self.hits += 1
+                    return _copy(rows, one)
+                self.misses += 1
+                generation = self.generation
+
+            with self.connection() as conn:
+                cursor = conn.execute(sql, params)
+                if one:
+                    row = cursor.fetchone()
+                    rows = dict(row) if row is not None else None
+                else:
+                    rows = [dict(row) for row in cursor.fetchall()]
+
+            with self.lock:
+                # Skip storing if the data changed while the query ran
+                if generation == self.generation:
+                    self.cache[key] = (generation, time.monotonic() + self.ttl, rows)
+        return _copy(rows, one)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        """Close every pooled connection."""
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+        self.watcher.close()
+
+
+def _copy(rows, one: bool):
+    """Copy cached rows so callers can't mutate the shared entry."""
+    if rows is None:
+        return None
+    if one:
+        return dict(rows)
+    return [dict(row) for row in rows]
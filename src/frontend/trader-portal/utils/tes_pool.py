@@ -0,0 +1,213 @@
+"""
+Pooled RabbitMQ connections for requests from the trader portal to TES.
+Each pool member keeps one long-lived connection and one exclusive reply queue, and
+replies are matched to callers by correlation_id, so a click costs a publish and a
+reply instead of a full connection handshake.
+"""
+
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional
+
+import pika
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolMember:
+    """
+    One connection, channel and reply queue, owned by a background I/O thread.
+
+    pika connections are not thread-safe, so callers never touch the channel directly:
+    publishes are handed to the I/O thread with ``add_callback_threadsafe`` and replies
+    resolve a Future registered under the request's correlation_id.
+    """
+
+    def __init__(self, name: str, host: str, port: int, reconnect_delay: float = 1.0):
+        self.name = name
+        self.parameters = pika.ConnectionParameters(host=host, port=port, heartbeat=30)
+        self.reconnect_delay = reconnect_delay
+        self.connection: Optional[pika.BlockingConnection] = None
+        self.channel = None
+        self.callback_queue: Optional[str] = None
+        self.pending: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.stopped = False
+        self.last_error: Optional[str] = None
+
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _connect(self):
+        """Open the connection and start consuming the reply queue."""
+        self.connection = pika.BlockingConnection(self.parameters)
+        self.channel = self.connection.channel()
+        result = self.channel.queue_declare(queue="", exclusive=True)
+        self.callback_queue = result.method.queue
+        self.channel.basic_consume(
+            queue=self.callback_queue, on_message_callback=self._on_reply, auto_ack=True
+        )
+        self.last_error = None
+        self.ready.set()
+        logger.info(f"{self.name} connected, reply queue {self.callback_queue}")
+
+    def _run(self):
+        """Service the connection until the pool is closed, reconnecting on failure."""
+        delay = self.reconnect_delay
+        while not self.stopped:
+            try:
+                if self.connection is None or self.connection.is_closed:
+                    self._connect()
+                    delay = self.reconnect_delay
+                self.connection.process_data_events(time_limit=1)
+            except Exception as e:
+                self.last_error = f"RabbitMQ connection failed: {e!r}"
+                logger.warning(f"{self.name} {self.last_error}, retrying in {delay:.0f}s")
+                self._reset(ConnectionError(self.last_error))
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+        self._reset(ConnectionError("Connection pool closed"))
+
+    def _reset(self, error: Exception):
+        """Drop the connection and fail every outstanding request."""
+        self.ready.clear()
+        try:
+            if self.connection is not None and self.connection.is_open:
+                self.connection.close()
+        except Exception:
+            pass
+        self.connection = None
+        self.channel = None
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _on_reply(self, ch, method, props, body):
+        """Resolve the caller waiting on this reply's correlation_id."""
+        with self.lock:
+            future = self.pending.pop(props.correlation_id, None)
+        if future is not None:
+            if not future.done():
+                future.set_result(json.loads(body))
+        else:
+            # Late replies and fill notifications for orders placed by earlier calls
+            logger.debug(f"{self.name} dropping message for correlation_id={props.correlation_id}")
+
+    def _publish(self, queue: str, body: str, corr_id: str):
+        """Publish on the I/O thread. Called via add_callback_threadsafe."""
+        try:
+            self.channel.basic_publish(
+                exchange="",
+                routing_key=queue,
+                properties=pika.BasicProperties(
+                    reply_to=self.callback_queue,
+                    correlation_id=corr_id,
+                ),
+                body=body,
+            )
+        except Exception as e:
+            with self.lock:
+                future = self.pending.pop(corr_id, None)
+            if future is not None and not future.done():
+                future.set_exception(e)
+
+    def call(self, queue: str, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a request and block until its reply arrives.
+
+        Raises:
+            ConnectionError: If the member has no connection to RabbitMQ
+            TimeoutError: If no reply arrives within ``timeout`` seconds
+        """
+        deadline = time.monotonic() + timeout
+        if not self.ready.wait(timeout):
+            raise ConnectionError(self.last_error or "Not connected to RabbitMQ")
+
+        corr_id = str(uuid.uuid4())
+        future: Future = Future()
+        with self.lock:
+            self.pending[corr_id] = future
+        try:
+            connection = self.connection
+            if connection is None:
+                raise ConnectionError(self.last_error or "Not connected to RabbitMQ")
+            body = json.dumps(message)
+            connection.add_callback_threadsafe(lambda: self._publish(queue, body, corr_id))
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            raise TimeoutError(f"No reply from {queue} within {timeout}s") from None
+        finally:
+            with self.lock:
+                self.pending.pop(corr_id, None)
+
+    def close(self):
+        """Stop the I/O thread; it closes the connection on its way out."""
+        self.stopped = True
+        connection = self.connection
+        if connection is not None:
+            try:
+                # Wake the I/O thread so it notices the stop flag immediately
+                connection.add_callback_threadsafe(lambda: None)
+            except Exception:
+                pass
+        self.thread.join(timeout=5)
+
+
+class TESConnectionPool:
+    """
+    Process-wide pool of long-lived TES request channels.
+
+    Requests are spread round-robin over ``size`` members. The pool is thread-safe, so
+    one instance can be shared by every Streamlit session and script rerun.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        host: str = "localhost",
+        port: int = 5672,
+        queue: str = "tes_requests",
+    ):
+        self.queue = queue
+        self.members = [
+            _PoolMember(f"tes-pool-{i}", host, port) for i in range(max(1, size))
+        ]
+        self._next = itertools.count()
+
+    def request(
+        self,
+        message: Dict[str, Any],
+        timeout: float = 5.0,
+        queue: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a request to TES and wait for the reply.
+
+        Args:
+            message: Request payload
+            timeout: Seconds to wait for the reply
+            queue: Target queue (defaults to the pool's queue)
+
+        Returns:
+            Decoded reply
+
+        Raises:
+            ConnectionError: If RabbitMQ is unreachable
+            TimeoutError: If no reply arrives in time
+        """
+        member = self.members[next(self._next) % len(self.members)]
+        return member.call(queue or self.queue, message, timeout)
+
+    def close(self):
+        """Close every member connection."""
+        for member in self.members:
+            member.close()
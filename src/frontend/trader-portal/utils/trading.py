@@ -3,15 +3,28 @@ Utility functions for trader portal.
 Handles connections to TES and database.
 """
 
-import json
 import sqlite3
+import sys
 import uuid
 from pathlib import Path
 from typing import Any, Optional
 
-import pika
 import streamlit as st
 
+# Add src to path for the shared database modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from database.connection import connect
+from market_feed import MarketFeed
+from read_cache import CachedReader
+from tes_pool import TESConnectionPool
+
+DB_PATH = (
+    Path(__file__).parent.parent.parent.parent / "database" / "transactional" / "trading_engine.db"
+)
+
+MARKET_SYMBOLS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA"]
+
 
 def get_trader_id() -> str:
     """
@@ -33,17 +46,82 @@ def get_trader_name() -> str:
 
 def get_db_connection():
     """Get database connection to transactional DB."""
-    db_path = (
-        Path(__file__).parent.parent.parent.parent
-        / "database"
-        / "transactional"
-        / "trading_engine.db"
-    )
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+@st.cache_resource
+def get_reader() -> CachedReader:
+    """
+    Get the process-wide cached reader for the transactional DB.
+    Shared by every session, so repeated refreshes of unchanged data skip the database.
+    """
+    return CachedReader(DB_PATH, pool_size=4, ttl=10.0, check_interval=0.5)
+
+
+@st.cache_resource
+def get_tes_pool() -> TESConnectionPool:
+    """
+    Get the process-wide TES connection pool.
+    Cached as a resource, so it is shared by every session and survives reruns.
+    """
+    return TESConnectionPool(size=2, host="localhost", queue="tes_requests")
+
+
+@st.cache_resource
+def get_market_feed() -> MarketFeed:
+    """
+    Get the process-wide market-data subscription.
+    One feed serves every session, so load on the OBS does not grow with the number of viewers.
+    """
+    return MarketFeed(MARKET_SYMBOLS, host="localhost")
+
+
+def get_market_depth(symbol: str, levels: int = 20) -> dict[str, Any]:
+    """
+    Order book depth for a symbol, best to worst.
+
+    Reads the live OBS feed. While the feed has no snapshot (OBS or RabbitMQ down), it
+    falls back to aggregating recent open orders from the database. ``source`` says which was used.
+    """
+    depth = get_market_feed().depth(symbol, levels)
+    if depth is not None:
+        depth["source"] = "live"
+        return depth
+
+    books = {"buy": {}, "sell": {}}
+    for order in get_orders():
+        if order["symbol"] == symbol and order["status"] == "open" and order["side"] in books:
+            quantity, count = books[order["side"]].get(order["price"], (0.0, 0))
+            books[order["side"]][order["price"]] = (quantity + order["quantity"], count + 1)
+
+    def side(levels_by_price, reverse):
+        prices = sorted(levels_by_price, reverse=reverse)[:levels]
+        return [
+            {"price": p, "quantity": levels_by_price[p][0], "orders": levels_by_price[p][1]}
+            for p in prices
+        ]
+
+    return {
+        "symbol": symbol,
+        "bids": side(books["buy"], True),
+        "asks": side(books["sell"], False),
+        "source": "database",
+    }
+
+
+def request_tes(message: dict[str, Any], timeout_error: str, timeout: float = 5.0) -> dict[str, Any]:
+    """Send a request to TES over the shared pool and wrap the reply for the UI."""
+    try:
+        response = get_tes_pool().request(message, timeout=timeout)
+        return {"success": True, "data": response}
+    except TimeoutError:
+        return {"success": False, "error": timeout_error}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 def send_order_to_tes(
     symbol: str,
     side: str,
@@ -78,51 +156,23 @@ def send_order_to_tes(
         "type": order_type,  # 'limit' or 'market'
     }
 
-    try:
-        # Connect to RabbitMQ
-        connection = pika.BlockingConnection(pika.ConnectionParameters(host="localhost"))
-        channel = connection.channel()
-
-        # Create callback queue for response
-        result = channel.queue_declare(queue="", exclusive=True)
-        callback_queue = result.method.queue
-
-        # Correlation ID for matching request/response
-        corr_id = str(uuid.uuid4())
-
-        # Send order
-        channel.basic_publish(
-            exchange="",
-            routing_key="tes_requests",
-            properties=pika.BasicProperties(
-                reply_to=callback_queue,
-                correlation_id=corr_id,
-            ),
-            body=json.dumps(order),
-        )
-
-        # Wait for response (with timeout)
-        response = None
-        for method_frame, properties, body in channel.consume(
-            callback_queue, inactivity_timeout=5.0
-        ):
-            if method_frame is None:
-                # Timeout
-                break
-            if properties.correlation_id == corr_id:
-                response = json.loads(body)
-                channel.basic_ack(method_frame.delivery_tag)
-                break
-
-        connection.close()
-
-        if response:
-            return {"success": True, "data": response}
-        else:
-            return {"success": False, "error": "Timeout waiting for response"}
+    return request_tes(order, timeout_error="Timeout waiting for response")
 
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+
+def cancel_order_on_tes(order_id: int) -> dict[str, Any]:
+    """
+    Ask TES to cancel one of this trader's open orders.
+
+    TES replies once the cancel is on its way to the order book; the order_cancelled
+    event follows when the order has been removed.
+    """
+    cancel = {
+        "action": "cancel_order",
+        "trader_id": get_trader_id(),
+        "order_id": order_id,
+    }
+
+    return request_tes(cancel, timeout_error="Timeout waiting for response")
 
 
 def connect_trader_to_tes() -> dict[str, Any]:
@@ -140,52 +190,11 @@ def connect_trader_to_tes() -> dict[str, Any]:
         "description": f"Web trader {trader_name} connecting",
     }
 
-    try:
-        connection = pika.BlockingConnection(pika.ConnectionParameters(host="localhost"))
-        channel = connection.channel()
-
-        result = channel.queue_declare(queue="", exclusive=True)
-        callback_queue = result.method.queue
-        corr_id = str(uuid.uuid4())
-
-        channel.basic_publish(
-            exchange="",
-            routing_key="tes_requests",
-            properties=pika.BasicProperties(
-                reply_to=callback_queue,
-                correlation_id=corr_id,
-            ),
-            body=json.dumps(connect_msg),
-        )
-
-        # Wait for response
-        response = None
-        for method_frame, properties, body in channel.consume(
-            callback_queue, inactivity_timeout=5.0
-        ):
-            if method_frame is None:
-                break
-            if properties.correlation_id == corr_id:
-                response = json.loads(body)
-                channel.basic_ack(method_frame.delivery_tag)
-                break
-
-        connection.close()
-
-        if response:
-            return {"success": True, "data": response}
-        else:
-            return {"success": False, "error": "Connection timeout"}
-
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    return request_tes(connect_msg, timeout_error="Connection timeout")
 
 
 def get_orders(trader_id: Optional[str] = None, limit: int = 100):
     """Get orders from database, optionally filtered by trader."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     if trader_id:
         # Join with users table to filter by trader UUID (stored as username)
         query = """
@@ -197,27 +206,20 @@ def get_orders(trader_id: Optional[str] = None, limit: int = 100):
             ORDER BY o.created_at DESC
             LIMIT ?
         """
-        cursor.execute(query, (trader_id, limit))
-    else:
-        query = """
-            SELECT id as order_id, user_id, symbol, side, quantity, price, status,
-                   created_at as timestamp
-            FROM orders
-            ORDER BY created_at DESC
-            LIMIT ?
-        """
-        cursor.execute(query, (limit,))
+        return get_reader().query(query, (trader_id, limit))
 
-    orders = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return orders
+    query = """
+        SELECT id as order_id, user_id, symbol, side, quantity, price, status,
+               created_at as timestamp
+        FROM orders
+        ORDER BY created_at DESC
+        LIMIT ?
+    """
+    return get_reader().query(query, (limit,))
 
 
 def get_trades(trader_id: Optional[str] = None, limit: int = 100):
     """Get trades from database, optionally filtered by trader."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     if trader_id:
         # Join with users table to filter by trader UUID (stored as username)
         query = """
@@ -228,19 +230,15 @@ def get_trades(trader_id: Optional[str] = None, limit: int = 100):
             ORDER BY t.timestamp DESC
             LIMIT ?
         """
-        cursor.execute(query, (trader_id, limit))
-    else:
-        query = """
-            SELECT id as trade_id, user_id, symbol, side, quantity, price, timestamp
-            FROM trades
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """
-        cursor.execute(query, (limit,))
+        return get_reader().query(query, (trader_id, limit))
 
-    trades = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return trades
+    query = """
+        SELECT id as trade_id, user_id, symbol, side, quantity, price, timestamp
+        FROM trades
+        ORDER BY timestamp DESC
+        LIMIT ?
+    """
+    return get_reader().query(query, (limit,))
 
 
 def get_positions(trader_id: str):
@@ -250,9 +248,6 @@ def get_positions(trader_id: str):
     Since the schema doesn't have trader_id directly in positions,
     we need to join through portfolios->users.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     # Join through portfolios and users to match trader UUID
     query = """
         SELECT p.id, p.symbol, p.quantity, p.avg_price, p.updated_at
@@ -261,18 +256,11 @@ def get_positions(trader_id: str):
         JOIN users u ON pf.user_id = u.id
         WHERE u.username = ?
     """
-    cursor.execute(query, (trader_id,))
-
-    positions = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return positions
+    return get_reader().query(query, (trader_id,))
 
 
 def get_portfolio(trader_id: str):
     """Get portfolio information for a trader."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     # Join with users table to match trader UUID
     query = """
         SELECT p.id, p.user_id, p.name, p.created_at
@@ -280,13 +268,10 @@ def get_portfolio(trader_id: str):
         JOIN users u ON p.user_id = u.id
         WHERE u.username = ?
     """
-    cursor.execute(query, (trader_id,))
-
-    result = cursor.fetchone()
-    conn.close()
+    result = get_reader().query(query, (trader_id,), one=True)
 
     if result:
-        return dict(result)
+        return result
 
     # Return a default portfolio structure if none exists
     return {
@@ -1,6 +1,54 @@
 """RabbitMQ messaging module for inter-service communication."""
 from .broker import MessageBroker
 from .publishers import MessagePublisher
-from .consumers import MessageConsumer
+from .consumers import MarketDataConsumer, MessageConsumer
+from .market_data import MarketDataBook
+from .rpc import AsyncRPCClient, SyncRPCClient
+from .codecs import BinaryCodec, Codec, JSONCodec, decode_message, encode_message, get_codec, register_codec
+from .validation import (
+    MessageValidationError,
+    compile_validator,
+    validate_cancel_order_request,
+    validate_order_cancelled_message,
+    validate_order_message,
+    validate_order_rejected_message,
+    validate_place_order_request,
+    validate_trade_message,
+)
+from .routing import (
+    MARKET_DATA_EXCHANGE,
+    market_data_routing_key,
+    obs_queue_for_shard,
+    obs_queue_for_symbol,
+    shard_for_symbol,
+)
 
-__all__ = ["MessageBroker", "MessagePublisher", "MessageConsumer"]
+__all__ = [
+    "MessageBroker",
+    "MessagePublisher",
+    "MessageConsumer",
+    "MarketDataConsumer",
+    "MarketDataBook",
+    "AsyncRPCClient",
+    "SyncRPCClient",
+    "Codec",
+    "JSONCodec",
+    "BinaryCodec",
+    "register_codec",
+    "get_codec",
+    "encode_message",
+    "decode_message",
+    "MessageValidationError",
+    "compile_validator",
+    "validate_place_order_request",
+    "validate_cancel_order_request",
+    "validate_order_message",
+    "validate_trade_message",
+    "validate_order_rejected_message",
+    "validate_order_cancelled_message",
+    "shard_for_symbol",
+    "obs_queue_for_shard",
+    "obs_queue_for_symbol",
+    "MARKET_DATA_EXCHANGE",
+    "market_data_routing_key",
+]
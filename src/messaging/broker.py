@@ -18,19 +18,21 @@ class MessageBroker:
         self.connection: Optional[pika.BlockingConnection] = None
         self.channel: Optional[pika.channel.Channel] = None
     
+    def connection_parameters(self) -> pika.ConnectionParameters:
+        """Build connection parameters, shared by blocking and asyncio connections."""
+        if self.username and self.password:
+            credentials = pika.PlainCredentials(self.username, self.password)
+            return pika.ConnectionParameters(
+                host=self.host,
+                port=self.port,
+                credentials=credentials
+            )
+        return pika.ConnectionParameters(host=self.host, port=self.port)
+    
     def connect(self):
         """Establish connection to RabbitMQ."""
         try:
-            if self.username and self.password:
-                credentials = pika.PlainCredentials(self.username, self.password)
-                parameters = pika.ConnectionParameters(
-                    host=self.host,
-                    port=self.port,
-                    credentials=credentials
-                )
-            else:
-                parameters = pika.ConnectionParameters(host=self.host, port=self.port)
-            
+            parameters = self.connection_parameters()
             self.connection = pika.BlockingConnection(parameters)
             self.channel = self.connection.channel()
             logger.info(f"Connected to RabbitMQ at {self.host}:{self.port}")
@@ -0,0 +1,226 @@
+"""
+Message codecs selected by the AMQP content_type header.
+Publishers pick a codec; consumers decode with whichever codec the message's
+content_type names, so services using different codecs can share queues.
+"""
+import json
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+JSON_CONTENT_TYPE = 'application/json'
+BINARY_CONTENT_TYPE = 'application/x-trading-binary'
+
+
+class Codec:
+    """Base class: turns message dicts into bytes and back."""
+
+    name = ''
+    content_type = ''
+
+    def encode(self, message: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Encode a message. Returns (content_type, body)."""
+        raise NotImplementedError
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        """Decode a message body produced by this codec."""
+        raise NotImplementedError
+
+
+class JSONCodec(Codec):
+    """UTF-8 JSON; understood by every client."""
+
+    name = 'json'
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, message: Dict[str, Any]) -> Tuple[str, bytes]:
+        return JSON_CONTENT_TYPE, json.dumps(message).encode()
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        return json.loads(body)
+
+
+# Binary layouts. Every body starts with a one-byte message tag; enum fields are one-byte
+# codes, ids are int64, numbers are float64 and strings are length-prefixed UTF-8.
+_ORDER_TAG = 1
+_TRADE_TAG = 2
+
+_ORDER_ACTIONS = ('place_order', 'cancel_order', 'modify_order')
+_SIDES = ('buy', 'sell')
+_ORDER_TYPES = ('market', 'limit')
+_TRADE_EVENTS = ('trade_executed', 'trade_cancelled')
+_FILL_STATUSES = ('filled', 'partially_filled')
+
+_ORDER_KEYS = frozenset(
+    ('action', 'order_id', 'user_id', 'symbol', 'side', 'quantity', 'price', 'order_type', 'timestamp')
+)
+_TRADE_KEYS = frozenset(
+    ('event', 'trade_id', 'buyer_id', 'seller_id', 'buy_order_id', 'sell_order_id', 'symbol',
+     'quantity', 'price', 'timestamp', 'buy_order_status', 'sell_order_status')
+)
+
+# tag, action, side, order_type, order_id, user_id, quantity, price, timestamp, len(symbol)
+_ORDER = struct.Struct('<BBBBqqdddB')
+# tag, event, buy status, sell status, buyer, seller, buy order, sell order, quantity, price,
+# timestamp, len(symbol), len(trade_id)
+_TRADE = struct.Struct('<BBBBqqqqdddBB')
+
+_INDEX = {values: {v: i for i, v in enumerate(values)}
+          for values in (_ORDER_ACTIONS, _SIDES, _ORDER_TYPES, _TRADE_EVENTS, _FILL_STATUSES)}
+
+
+class BinaryCodec(Codec):
+    """
+    Fixed-layout struct packing for OrderMessage and TradeMessage.
+
+    Any message that does not exactly match one of those schemas (other actions, extra
+    or missing keys, non-integer ids) is sent as JSON instead, with a JSON content_type.
+    """
+
+    name = 'binary'
+    content_type = BINARY_CONTENT_TYPE
+
+    def __init__(self):
+        self.fallback = JSONCodec()
+
+    def encode(self, message: Dict[str, Any]) -> Tuple[str, bytes]:
+        keys = message.keys()
+        try:
+            if keys == _ORDER_KEYS:
+                return BINARY_CONTENT_TYPE, self._encode_order(message)
+            if keys == _TRADE_KEYS:
+                return BINARY_CONTENT_TYPE, self._encode_trade(message)
+        except (KeyError, TypeError, struct.error):
+            pass
+        return self.fallback.encode(message)
+
+    @staticmethod
+    def _encode_order(m):
+        symbol = m['symbol'].encode()
+        return _ORDER.pack(
+            _ORDER_TAG,
+            _INDEX[_ORDER_ACTIONS][m['action']],
+            _INDEX[_SIDES][m['side']],
+            _INDEX[_ORDER_TYPES][m['order_type']],
+            m['order_id'],
+            m['user_id'],
+            m['quantity'],
+            m['price'],
+            m['timestamp'],
+            len(symbol),
+        ) + symbol
+
+    @staticmethod
+    def _encode_trade(m):
+        symbol = m['symbol'].encode()
+        trade_id = m['trade_id'].encode()
+        return _TRADE.pack(
+            _TRADE_TAG,
+            _INDEX[_TRADE_EVENTS][m['event']],
+            _INDEX[_FILL_STATUSES][m['buy_order_status']],
+            _INDEX[_FILL_STATUSES][m['sell_order_status']],
+            m['buyer_id'],
+            m['seller_id'],
+            m['buy_order_id'],
+            m['sell_order_id'],
+            m['quantity'],
+            m['price'],
+            m['timestamp'],
+            len(symbol),
+            len(trade_id),
+        ) + symbol + trade_id
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        if not body:
+            raise ValueError('Empty binary message')
+        tag = body[0]
+        if tag == _ORDER_TAG:
+            if len(body) < _ORDER.size:
+                raise ValueError(f'Truncated binary order: {len(body)} bytes')
+            (_, action, side, order_type, order_id, user_id, quantity, price, timestamp,
+             symbol_len) = _ORDER.unpack_from(body)
+            offset = _ORDER.size
+            _check_length(body, offset + symbol_len, 'order')
+            return {
+                'action': _enum(_ORDER_ACTIONS, action, 'action'),
+                'order_id': order_id,
+                'user_id': user_id,
+                'symbol': body[offset:offset + symbol_len].decode(),
+                'side': _enum(_SIDES, side, 'side'),
+                'quantity': quantity,
+                'price': price,
+                'order_type': _enum(_ORDER_TYPES, order_type, 'order_type'),
+                'timestamp': timestamp,
+            }
+        if tag == _TRADE_TAG:
+            if len(body) < _TRADE.size:
+                raise ValueError(f'Truncated binary trade: {len(body)} bytes')
+            (_, event, buy_status, sell_status, buyer_id, seller_id, buy_order_id, sell_order_id,
+             quantity, price, timestamp, symbol_len, trade_id_len) = _TRADE.unpack_from(body)
+            offset = _TRADE.size
+            symbol_end = offset + symbol_len
+            _check_length(body, symbol_end + trade_id_len, 'trade')
+            return {
+                'event': _enum(_TRADE_EVENTS, event, 'event'),
+                'trade_id': body[symbol_end:symbol_end + trade_id_len].decode(),
+                'buyer_id': buyer_id,
+                'seller_id': seller_id,
+                'buy_order_id': buy_order_id,
+                'sell_order_id': sell_order_id,
+                'symbol': body[offset:symbol_end].decode(),
+                'quantity': quantity,
+                'price': price,
+                'timestamp': timestamp,
+                'buy_order_status': _enum(_FILL_STATUSES, buy_status, 'buy_order_status'),
+                'sell_order_status': _enum(_FILL_STATUSES, sell_status, 'sell_order_status'),
+            }
+        raise ValueError(f'Unknown binary message tag: {tag}')
+
+
+def _check_length(body: bytes, expected: int, kind: str):
+    """Reject a frame that is shorter or longer than its header says."""
+    if len(body) != expected:
+        raise ValueError(f'Malformed binary {kind}: {len(body)} bytes, expected {expected}')
+
+
+def _enum(values: Tuple[str, ...], code: int, field: str) -> str:
+    try:
+        return values[code]
+    except IndexError:
+        raise ValueError(f'Invalid {field} code in binary message: {code}') from None
+
+
+CODECS: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec):
+    """Make a codec available by name and by content_type."""
+    CODECS[codec.name] = codec
+    CODECS[codec.content_type] = codec
+
+
+register_codec(JSONCodec())
+register_codec(BinaryCodec())
+
+
+def get_codec(name_or_content_type: Optional[str] = None) -> Codec:
+    """
+    Look up a codec by name ('json', 'binary') or content_type.
+
+    Missing content types decode as JSON, which is what every legacy publisher sends.
+    """
+    if not name_or_content_type:
+        return CODECS['json']
+    try:
+        return CODECS[name_or_content_type]
+    except KeyError:
+        raise ValueError(f'Unknown message codec: {name_or_content_type}') from None
+
+
+def encode_message(message: Dict[str, Any], codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """Encode with the named codec. Returns (content_type, body)."""
+    return get_codec(codec).encode(message)
+
+
+def decode_message(body: bytes, content_type: Optional[str] = None) -> Dict[str, Any]:
+    """Decode a body using the codec its content_type names."""
+    return get_codec(content_type).decode(body)
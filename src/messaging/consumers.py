@@ -1,8 +1,12 @@
 """Message consumers for RabbitMQ."""
-import json
 import pika
 import logging
-from typing import Callable, Dict, Any
+import threading
+from typing import Callable, Dict, Any, Iterable, Optional
+
+from .codecs import decode_message, get_codec
+from .market_data import MarketDataBook
+from .routing import MARKET_DATA_EXCHANGE, MARKET_DATA_KINDS, market_data_routing_key
 
 logger = logging.getLogger(__name__)
 
@@ -10,9 +14,16 @@ logger = logging.getLogger(__name__)
 class MessageConsumer:
     """Consumes messages from RabbitMQ."""
     
-    def __init__(self, broker):
-        """Initialize consumer with a broker instance."""
+    def __init__(self, broker, codec: str = 'json'):
+        """
+        Initialize consumer with a broker instance.
+
+        Args:
+            broker: Connected MessageBroker
+            codec: Codec used to encode replies; requests are decoded by their content_type
+        """
         self.broker = broker
+        self.codec = get_codec(codec)
         self.handlers: Dict[str, Callable] = {}
     
     def register_handler(self, action: str, handler: Callable):
@@ -23,7 +34,7 @@ class MessageConsumer:
     def on_message(self, ch, method, properties, body):
         """Default message callback."""
         try:
-            message = json.loads(body)
+            message = decode_message(body, properties.content_type)
             action = message.get('action')
             
             logger.debug(f"Received message: {message}")
@@ -34,14 +45,15 @@ class MessageConsumer:
                 
                 # Send response if reply_to is set
                 if properties.reply_to:
+                    content_type, reply = self.codec.encode(response)
                     ch.basic_publish(
                         exchange='',
                         routing_key=properties.reply_to,
                         properties=pika.BasicProperties(
                             correlation_id=properties.correlation_id,
-                            content_type='application/json'
+                            content_type=content_type
                         ),
-                        body=json.dumps(response)
+                        body=reply
                     )
             else:
                 logger.warning(f"No handler registered for action: {action}")
@@ -73,15 +85,16 @@ class MessageConsumer:
 class RPCConsumer(MessageConsumer):
     """RPC-style consumer that expects and sends replies."""
     
-    def __init__(self, broker):
-        super().__init__(broker)
+    def __init__(self, broker, codec: str = 'json'):
+        super().__init__(broker, codec)
         self.response = None
         self.correlation_id = None
+        self.callback_queue = None
     
     def on_rpc_response(self, ch, method, properties, body):
         """Handle RPC response."""
         if self.correlation_id == properties.correlation_id:
-            self.response = json.loads(body)
+            self.response = decode_message(body, properties.content_type)
         ch.basic_ack(delivery_tag=method.delivery_tag)
     
     def call(self, queue_name: str, message: Dict[str, Any], timeout: int = 10) -> Dict[str, Any]:
@@ -89,16 +102,16 @@ class RPCConsumer(MessageConsumer):
         if not self.broker.channel:
             raise RuntimeError("Broker channel not initialized.")
         
-        # Create callback queue
-        result = self.broker.channel.queue_declare(queue='', exclusive=True)
-        callback_queue = result.method.queue
-        
-        # Setup consumer for callback
-        self.broker.channel.basic_consume(
-            queue=callback_queue,
-            on_message_callback=self.on_rpc_response,
-            auto_ack=False
-        )
+        # Create the callback queue once and reuse it for every call
+        if self.callback_queue is None:
+            result = self.broker.channel.queue_declare(queue='', exclusive=True)
+            self.callback_queue = result.method.queue
+            self.broker.channel.basic_consume(
+                queue=self.callback_queue,
+                on_message_callback=self.on_rpc_response,
+                auto_ack=False
+            )
+        callback_queue = self.callback_queue
         
         # Generate correlation ID
         import uuid
@@ -106,23 +119,196 @@ class RPCConsumer(MessageConsumer):
         self.response = None
         
         # Publish request
+        content_type, body = self.codec.encode(message)
         self.broker.channel.basic_publish(
             exchange='',
             routing_key=queue_name,
             properties=pika.BasicProperties(
                 reply_to=callback_queue,
                 correlation_id=self.correlation_id,
-                content_type='application/json'
+                content_type=content_type
             ),
-            body=json.dumps(message)
+            body=body
         )
         
-        # Wait for response
+        # Wait for response, blocking in the I/O loop rather than spinning
         import time
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
         while self.response is None:
-            self.broker.connection.process_data_events()
-            if time.time() - start_time > timeout:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise TimeoutError(f"RPC call timed out after {timeout}s")
+            self.broker.connection.process_data_events(time_limit=remaining)
         
         return self.response
+
+
+class MarketDataConsumer(MessageConsumer):
+    """
+    Subscribes to OBS market data for selected symbols.
+
+    Keeps a MarketDataBook per symbol from snapshots and updates, and the latest BBO
+    message per symbol. Every message is also passed to ``handler`` if one is set.
+
+    With ``conflate=True`` the handler runs on its own delivery thread instead. While it
+    is busy, new messages are merged into one pending message per symbol and kind: the
+    latest BBO, and level changes keyed by price, so later changes replace earlier ones.
+    A snapshot replaces any pending updates. A slow handler therefore gets fewer, larger
+    messages describing current state, and the broker queue does not back up.
+    """
+    
+    def __init__(self,
+                 broker,
+                 symbols: Iterable[str],
+                 handler: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 kinds: Iterable[str] = MARKET_DATA_KINDS,
+                 exchange: str = MARKET_DATA_EXCHANGE,
+                 conflate: bool = False):
+        super().__init__(broker)
+        self.symbols = list(symbols)
+        self.kinds = list(kinds)
+        self.exchange = exchange
+        self.handler = handler
+        self.books: Dict[str, MarketDataBook] = {s: MarketDataBook(s) for s in self.symbols}
+        self.bbo: Dict[str, Dict[str, Any]] = {}
+        self.queue: Optional[str] = None
+        
+        # Conflation: (symbol, 'bbo' | 'depth') -> pending message, levels keyed by price
+        self.conflate = conflate
+        self.pending: Dict[tuple, Dict[str, Any]] = {}
+        self.pending_ready = threading.Condition()
+        self.delivery_thread: Optional[threading.Thread] = None
+        self.stopped = False
+        
+        # Counters for monitoring
+        self.received = 0
+        self.delivered = 0
+        self.conflated = 0
+    
+    def subscribe(self) -> str:
+        """Declare an exclusive queue bound to each symbol's routing keys. Returns the queue name."""
+        if not self.broker.channel:
+            raise RuntimeError("Broker channel not initialized.")
+        
+        self.broker.declare_exchange(self.exchange, exchange_type='topic')
+        result = self.broker.channel.queue_declare(queue='', exclusive=True)
+        self.queue = result.method.queue
+        for symbol in self.symbols:
+            for kind in self.kinds:
+                self.broker.bind_queue(self.queue, self.exchange, market_data_routing_key(symbol, kind))
+        logger.info(f"Subscribed to market data for {', '.join(self.symbols)}")
+        return self.queue
+    
+    def on_market_data(self, ch, method, properties, body):
+        """Apply a market-data message to the local view."""
+        message = decode_message(body, properties.content_type)
+        self.received += 1
+        symbol = message.get('symbol')
+        changed = True
+        if message.get('type') == 'bbo':
+            self.bbo[symbol] = message
+        else:
+            book = self.books.get(symbol)
+            if book is None:
+                book = self.books[symbol] = MarketDataBook(symbol)
+            changed = book.apply(message)
+        if self.handler is None:
+            return
+        if not self.conflate:
+            self.delivered += 1
+            self.handler(message)
+        elif changed:
+            # Updates the book rejected (stale or out of order) are not passed on
+            self._merge(message)
+    
+    def _merge(self, message: Dict[str, Any]):
+        """Fold a message into the pending message for its symbol and kind."""
+        kind = message['type']
+        key = (message['symbol'], 'bbo' if kind == 'bbo' else 'depth')
+        with self.pending_ready:
+            pending = self.pending.get(key)
+            if kind != 'update':
+                if kind == 'snapshot':
+                    message = dict(message,
+                                   bids={level[0]: level for level in message['bids']},
+                                   asks={level[0]: level for level in message['asks']})
+                self.pending[key] = message
+            elif pending is None:
+                # first_seq lets a handler's own MarketDataBook check continuity across merges
+                self.pending[key] = dict(message,
+                                         first_seq=message['seq'],
+                                         bids={level[0]: level for level in message['bids']},
+                                         asks={level[0]: level for level in message['asks']})
+            else:
+                snapshot = pending['type'] == 'snapshot'
+                for side in ('bids', 'asks'):
+                    levels = pending[side]
+                    for level in message[side]:
+                        if snapshot and level[1] <= 0:
+                            levels.pop(level[0], None)
+                        else:
+                            levels[level[0]] = level
+                pending['seq'] = message['seq']
+                pending['timestamp'] = message['timestamp']
+            if pending is not None:
+                self.conflated += 1
+            self.pending_ready.notify()
+    
+    def _deliver(self):
+        """Delivery thread: hand each pending message to the handler."""
+        while True:
+            with self.pending_ready:
+                while not self.pending and not self.stopped:
+                    self.pending_ready.wait()
+                if self.stopped:
+                    return
+                batch, self.pending = self.pending, {}
+            for message in batch.values():
+                if message['type'] != 'bbo':
+                    message['bids'] = list(message['bids'].values())
+                    message['asks'] = list(message['asks'].values())
+                self.delivered += 1
+                try:
+                    self.handler(message)
+                except Exception as e:
+                    logger.error(f"Market data handler failed: {e}")
+    
+    def start_delivery(self):
+        """Start the conflated delivery thread (start_consuming does this itself)."""
+        if self.conflate and self.handler is not None and self.delivery_thread is None:
+            self.stopped = False
+            self.delivery_thread = threading.Thread(target=self._deliver, name='market-data-delivery', daemon=True)
+            self.delivery_thread.start()
+    
+    def stop_delivery(self):
+        """Stop the delivery thread; pending messages are dropped."""
+        with self.pending_ready:
+            self.stopped = True
+            self.pending_ready.notify()
+        if self.delivery_thread is not None:
+            self.delivery_thread.join(timeout=5)
+            self.delivery_thread = None
+    
+    def start_consuming(self, queue_name: Optional[str] = None, prefetch_count: int = 0):
+        """Subscribe (if needed) and consume market data until interrupted."""
+        if self.queue is None:
+            self.subscribe()
+        if prefetch_count:
+            self.broker.channel.basic_qos(prefetch_count=prefetch_count)
+        self.start_delivery()
+        # Market data is disposable: a lost message shows up as a seq gap and the next
+        # snapshot repairs the book, so there is nothing to gain from acks
+        self.broker.channel.basic_consume(
+            queue=self.queue,
+            on_message_callback=self.on_market_data,
+            auto_ack=True
+        )
+        
+        logger.info(f"Starting to consume market data from {self.queue}")
+        try:
+            self.broker.channel.start_consuming()
+        except KeyboardInterrupt:
+            logger.info("Stopping consumer...")
+            self.broker.channel.stop_consuming()
+        finally:
+            self.stop_delivery()
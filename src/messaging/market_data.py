@@ -0,0 +1,77 @@
+"""Client-side view of the OBS market-data feed."""
+from typing import Any, Dict, List, Optional
+
+
+class MarketDataBook:
+    """
+    Top-N depth for one symbol, rebuilt from snapshots and incremental updates.
+
+    Updates are applied only when their seq (or first_seq, for updates merged by a
+    conflating consumer) follows the book's seq. After a gap the book is marked stale and
+    waits for the next snapshot; updates already covered by a snapshot are ignored.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        # price -> (quantity, order count)
+        self.bids: Dict[float, tuple] = {}
+        self.asks: Dict[float, tuple] = {}
+        self.seq: Optional[int] = None
+        self.stale = True
+        self.timestamp: Optional[float] = None
+        self.gaps = 0
+
+    def apply(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply a snapshot or update message.
+
+        Returns:
+            True if the book changed
+        """
+        kind = message['type']
+        seq = message['seq']
+        if kind == 'snapshot':
+            if self.seq is not None and not self.stale and seq < self.seq:
+                return False
+            self.bids = {price: (qty, count) for price, qty, count in message['bids']}
+            self.asks = {price: (qty, count) for price, qty, count in message['asks']}
+            self.seq = seq
+            self.stale = False
+        elif kind == 'update':
+            if self.stale or seq <= self.seq:
+                return False
+            # Conflated updates cover first_seq..seq
+            if message.get('first_seq', seq) != self.seq + 1:
+                self.stale = True
+                self.gaps += 1
+                return False
+            for levels, changes in ((self.bids, message['bids']), (self.asks, message['asks'])):
+                for price, qty, count in changes:
+                    if qty > 0:
+                        levels[price] = (qty, count)
+                    else:
+                        levels.pop(price, None)
+            self.seq = seq
+        else:
+            return False
+        self.timestamp = message.get('timestamp')
+        return True
+
+    @staticmethod
+    def _side(levels: Dict[float, tuple], reverse: bool, n: Optional[int]) -> List[Dict[str, Any]]:
+        prices = sorted(levels, reverse=reverse)[:n]
+        return [{'price': p, 'quantity': levels[p][0], 'orders': levels[p][1]} for p in prices]
+
+    def depth(self, levels: Optional[int] = None) -> Dict[str, Any]:
+        """Levels best to worst, in the same shape as OrderBook.depth()."""
+        return {
+            'symbol': self.symbol,
+            'bids': self._side(self.bids, True, levels),
+            'asks': self._side(self.asks, False, levels),
+        }
+
+    def best_bid(self) -> Optional[float]:
+        return max(self.bids) if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        return min(self.asks) if self.asks else None
@@ -1,18 +1,26 @@
 """Message publishers for RabbitMQ."""
-import json
 import pika
 import logging
 from typing import Dict, Any, Optional
 
+from .codecs import get_codec
+
 logger = logging.getLogger(__name__)
 
 
 class MessagePublisher:
     """Publishes messages to RabbitMQ."""
     
-    def __init__(self, broker):
-        """Initialize publisher with a broker instance."""
+    def __init__(self, broker, codec: str = 'json'):
+        """
+        Initialize publisher with a broker instance.
+
+        Args:
+            broker: Connected MessageBroker
+            codec: Codec name or content_type used to encode message bodies
+        """
         self.broker = broker
+        self.codec = get_codec(codec)
     
     def publish(self, 
                 queue_name: str, 
@@ -27,16 +35,17 @@ class MessagePublisher:
         if routing_key is None:
             routing_key = queue_name
         
-        body = json.dumps(message)
+        content_type, body = self.codec.encode(message)
+        if properties is None:
+            properties = pika.BasicProperties(delivery_mode=2)  # Make message persistent
+        # Consumers pick the decoder from content_type, so it must describe this body
+        properties.content_type = content_type
         
         self.broker.channel.basic_publish(
             exchange=exchange,
             routing_key=routing_key,
             body=body,
-            properties=properties or pika.BasicProperties(
-                delivery_mode=2,  # Make message persistent
-                content_type='application/json'
-            )
+            properties=properties
         )
         logger.debug(f"Published message to {routing_key}: {message}")
     
@@ -48,8 +57,7 @@ class MessagePublisher:
         """Publish a message expecting a reply."""
         properties = pika.BasicProperties(
             correlation_id=correlation_id,
-            reply_to=reply_to,
-            content_type='application/json'
+            reply_to=reply_to
         )
         
         self.publish(
@@ -0,0 +1,42 @@
+"""Symbol-based routing of orders across sharded OBS workers, and market-data topics."""
+import zlib
+
+OBS_QUEUE = 'obs_requests'
+
+# Topic exchange the OBS publishes book updates to
+MARKET_DATA_EXCHANGE = 'market_data'
+MARKET_DATA_KINDS = ('bbo', 'snapshot', 'update')
+
+
+def shard_for_symbol(symbol: str, shards: int) -> int:
+    """
+    Map a symbol to a shard index.
+
+    Uses CRC32 rather than hash() so every process agrees on the mapping
+    regardless of PYTHONHASHSEED.
+    """
+    if shards <= 1:
+        return 0
+    return zlib.crc32(symbol.encode('utf-8')) % shards
+
+
+def obs_queue_for_shard(shard: int, shards: int) -> str:
+    """Name of the request queue consumed by an OBS shard."""
+    if shards <= 1:
+        return OBS_QUEUE
+    return f'{OBS_QUEUE}.{shard}'
+
+
+def obs_queue_for_symbol(symbol: str, shards: int) -> str:
+    """Name of the request queue that owns a symbol."""
+    return obs_queue_for_shard(shard_for_symbol(symbol, shards), shards)
+
+
+def market_data_routing_key(symbol: str, kind: str = '*') -> str:
+    """
+    Routing key for one symbol's market data: ``<symbol>.<kind>``.
+
+    With the default ``kind='*'`` this is the binding pattern that subscribes to every
+    message kind for the symbol; ``'*.bbo'`` (symbol='*') subscribes to every symbol's BBO.
+    """
+    return f'{symbol}.{kind}'
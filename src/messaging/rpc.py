@@ -0,0 +1,255 @@
+"""Asyncio RPC client for RabbitMQ, with a blocking wrapper for synchronous callers."""
+import asyncio
+import logging
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+from .broker import MessageBroker
+from .codecs import decode_message, get_codec
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRPCClient:
+    """
+    Multiplexes many outstanding RPC calls over one channel and reply queue.
+
+    Each call registers a Future under a fresh correlation_id; replies resolve the
+    matching Future. Calls that time out are removed from the map, so a late reply
+    is dropped instead of being handed to a later call. A semaphore bounds the
+    number of requests in flight.
+
+    Messages on the reply queue that do not belong to a pending call (for example
+    fill notifications sent after an order ack) go to ``event_handler`` if one is set.
+    """
+
+    def __init__(self,
+                 broker: Optional[MessageBroker] = None,
+                 max_in_flight: int = 1000,
+                 default_timeout: float = 10.0,
+                 event_handler: Optional[Callable[[Dict[str, Any], Any], None]] = None,
+                 codec: str = 'json'):
+        """Initialize the client with a broker used for connection settings."""
+        self.broker = broker or MessageBroker()
+        self.codec = get_codec(codec)
+        self.default_timeout = default_timeout
+        self.event_handler = event_handler
+        self.max_in_flight = max_in_flight
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.connection: Optional[AsyncioConnection] = None
+        self.channel = None
+        self.callback_queue: Optional[str] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Counters for monitoring
+        self.timeouts = 0
+        self.late_replies = 0
+
+    async def connect(self):
+        """Open the connection, channel and exclusive reply queue."""
+        self.loop = asyncio.get_running_loop()
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        opened = self.loop.create_future()
+        self.connection = AsyncioConnection(
+            parameters=self.broker.connection_parameters(),
+            on_open_callback=lambda conn: opened.set_result(conn),
+            on_open_error_callback=lambda conn, err: opened.set_exception(
+                ConnectionError(f'Failed to connect to RabbitMQ: {err!r}')
+            ),
+            on_close_callback=self._on_connection_closed,
+            custom_ioloop=self.loop,
+        )
+        await opened
+
+        channel_opened = self.loop.create_future()
+        self.connection.channel(on_open_callback=channel_opened.set_result)
+        self.channel = await channel_opened
+
+        declared = self.loop.create_future()
+        self.channel.queue_declare(queue='', exclusive=True, callback=declared.set_result)
+        self.callback_queue = (await declared).method.queue
+
+        consuming = self.loop.create_future()
+        self.channel.basic_consume(
+            queue=self.callback_queue,
+            on_message_callback=self._on_reply,
+            auto_ack=True,
+            callback=consuming.set_result,
+        )
+        await consuming
+        logger.info(f'Async RPC client connected to RabbitMQ at {self.broker.host}:{self.broker.port}')
+
+    def _on_connection_closed(self, connection, reason):
+        """Fail every outstanding call when the connection drops."""
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f'RabbitMQ connection closed: {reason}'))
+        self.pending.clear()
+        logger.info(f'Async RPC connection closed: {reason}')
+
+    def _on_reply(self, channel, method, properties, body):
+        """Resolve the Future registered for the reply's correlation_id."""
+        future = self.pending.pop(properties.correlation_id, None)
+        if future is not None:
+            if not future.done():
+                future.set_result(decode_message(body, properties.content_type))
+            return
+        if self.event_handler is not None:
+            self.event_handler(decode_message(body, properties.content_type), properties)
+        else:
+            self.late_replies += 1
+            logger.debug(f'Dropping reply for unknown correlation_id={properties.correlation_id}')
+
+    def publish(self, queue_name: str, message: Dict[str, Any], correlation_id: Optional[str] = None):
+        """Publish a message with this client's reply queue, without waiting for a reply."""
+        if self.channel is None:
+            raise RuntimeError('Client not connected. Call connect() first.')
+        content_type, body = self.codec.encode(message)
+        self.channel.basic_publish(
+            exchange='',
+            routing_key=queue_name,
+            properties=pika.BasicProperties(
+                reply_to=self.callback_queue,
+                correlation_id=correlation_id,
+                content_type=content_type
+            ),
+            body=body
+        )
+
+    async def call(self,
+                   queue_name: str,
+                   message: Dict[str, Any],
+                   timeout: Optional[float] = None,
+                   correlation_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send a request and await its reply.
+
+        ``correlation_id`` defaults to a fresh UUID; pass one to match later events
+        sent on the same correlation_id (such as fills) to this request.
+
+        Raises:
+            TimeoutError: If no reply arrives within ``timeout`` seconds
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        async with self.semaphore:
+            correlation_id = correlation_id or str(uuid.uuid4())
+            future = self.loop.create_future()
+            self.pending[correlation_id] = future
+            try:
+                self.publish(queue_name, message, correlation_id)
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise TimeoutError(f'RPC call to {queue_name} timed out after {timeout}s') from None
+            finally:
+                self.pending.pop(correlation_id, None)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    async def close(self):
+        """Close the connection and wait for it to finish closing."""
+        if self.connection is None or self.connection.is_closed:
+            return
+        closed = self.loop.create_future()
+        self.connection.add_on_close_callback(
+            lambda conn, reason: closed.done() or closed.set_result(None)
+        )
+        self.connection.close()
+        await closed
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+
+class SyncRPCClient:
+    """
+    Blocking wrapper around AsyncRPCClient for code that is not async.
+
+    The async client runs on an event loop in a daemon thread and each call waits on
+    its Future from the caller's thread, so replies are matched by correlation_id
+    without a per-call wait on the connection. ``event_handler`` is called on the
+    loop's thread.
+    """
+
+    def __init__(self,
+                 broker: Optional[MessageBroker] = None,
+                 max_in_flight: int = 1000,
+                 default_timeout: float = 10.0,
+                 event_handler: Optional[Callable[[Dict[str, Any], Any], None]] = None,
+                 codec: str = 'json'):
+        self.client = AsyncRPCClient(broker, max_in_flight, default_timeout, event_handler, codec)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the client's loop and wait for its result."""
+        if self.loop is None:
+            coro.close()
+            raise RuntimeError('Client not connected. Call connect() first.')
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def connect(self):
+        """Start the event loop thread and connect the async client on it."""
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self.loop.run_forever, name='sync-rpc', daemon=True)
+            self.thread.start()
+        try:
+            self._run(self.client.connect())
+        except Exception:
+            self.close()
+            raise
+
+    def call(self,
+             queue_name: str,
+             message: Dict[str, Any],
+             timeout: Optional[float] = None,
+             correlation_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send a request and block until its reply arrives.
+
+        Raises:
+            TimeoutError: If no reply arrives within ``timeout`` seconds
+        """
+        return self._run(self.client.call(queue_name, message, timeout, correlation_id))
+
+    def publish(self, queue_name: str, message: Dict[str, Any], correlation_id: Optional[str] = None):
+        """Publish a message with this client's reply queue, without waiting for a reply."""
+        if self.loop is None:
+            raise RuntimeError('Client not connected. Call connect() first.')
+        self.loop.call_soon_threadsafe(self.client.publish, queue_name, message, correlation_id)
+
+    def close(self):
+        """Close the connection, then stop the loop thread."""
+        if self.loop is None:
+            return
+        try:
+            self._run(self.client.close(), self.client.default_timeout)
+        except Exception as e:
+            logger.debug(f'Error closing RPC connection: {e!r}')
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            self.loop = self.thread = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
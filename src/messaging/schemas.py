@@ -1,11 +1,41 @@
 """Message schemas for RabbitMQ messages."""
-from typing import TypedDict, Literal, Optional
+from typing import TypedDict, Literal, Optional, Union
 from datetime import datetime
 
 
+class _PlaceOrderOptional(TypedDict, total=False):
+    """Optional fields of a PlaceOrderRequest."""
+    type: Literal['market', 'limit']
+    trader_name: str
+    timestamp: float
+
+
+class PlaceOrderRequest(_PlaceOrderOptional):
+    """Order request sent by a trader to the TES."""
+    action: Literal['place_order']
+    trader_id: Union[str, int]
+    symbol: str
+    side: Literal['buy', 'sell']
+    quantity: float
+    price: float
+
+
+class CancelOrderRequest(TypedDict):
+    """
+    Cancel sent by a trader to the TES.
+
+    The TES forwards it to the OBS shard holding the order's book; the trader hears back
+    with an order_cancelled event once the order has left the book.
+    """
+    action: Literal['cancel_order']
+    trader_id: Union[str, int]
+    order_id: int
+
+
 class OrderMessage(TypedDict):
     """Order message schema."""
     action: Literal['place_order', 'cancel_order', 'modify_order']
+    order_id: int
     user_id: int
     symbol: str
     side: Literal['buy', 'sell']
@@ -21,9 +51,76 @@ class TradeMessage(TypedDict):
     trade_id: str
     buyer_id: int
     seller_id: int
+    buy_order_id: int
+    sell_order_id: int
+    symbol: str
+    quantity: float
+    price: float
+    timestamp: float
+    buy_order_status: Literal['filled', 'partially_filled']
+    sell_order_status: Literal['filled', 'partially_filled']
+
+
+class FillMessage(TypedDict):
+    """Fill notification sent by the TES to the trader that placed the order."""
+    event: Literal['order_filled']
+    order_id: int
+    trade_id: str
     symbol: str
     quantity: float
     price: float
+    status: Literal['filled', 'partially_filled']
+    timestamp: float
+
+
+class OrderRejectedMessage(TypedDict):
+    """
+    An order the OBS could not accept, published on the OBS events queue.
+
+    The TES marks the order rejected and forwards the event to the trader that placed it.
+    """
+    event: Literal['order_rejected']
+    order_id: int
+    symbol: Optional[str]
+    reason: str
+    timestamp: float
+
+
+class OrderCancelledMessage(TypedDict):
+    """A resting order removed from the book by a cancel, published on the OBS events queue."""
+    event: Literal['order_cancelled']
+    order_id: int
+    symbol: str
+    quantity: float
+    timestamp: float
+
+
+class BBOMessage(TypedDict):
+    """Best bid and offer, published by the OBS when either changes."""
+    type: Literal['bbo']
+    symbol: str
+    seq: int
+    bid: Optional[float]
+    bid_quantity: float
+    ask: Optional[float]
+    ask_quantity: float
+    timestamp: float
+
+
+class DepthMessage(TypedDict):
+    """
+    Top-N price levels published by the OBS.
+
+    A snapshot carries every level in the window. An update carries only the changed
+    levels, and a level with quantity 0 has left the window. Each level is
+    [price, quantity, order_count]. ``seq`` increases by one per update for a symbol;
+    a snapshot carries the seq of the last update it includes.
+    """
+    type: Literal['snapshot', 'update']
+    symbol: str
+    seq: int
+    bids: list
+    asks: list
     timestamp: float
 
 
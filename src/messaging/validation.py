@@ -0,0 +1,134 @@
+"""
+Compiled validators for the TypedDict message schemas.
+Each schema is turned into a straight-line Python function once at import time, so
+checking a message is a handful of inlined type and membership tests with no
+per-message reflection over the schema.
+"""
+import math
+import types
+import typing
+from typing import Any, Callable, Dict, Iterable
+
+from .schemas import (
+    CancelOrderRequest,
+    OrderCancelledMessage,
+    OrderMessage,
+    OrderRejectedMessage,
+    PlaceOrderRequest,
+    TradeMessage,
+)
+
+# ``X | Y`` annotations (Python 3.10+)
+_UnionType = getattr(types, 'UnionType', None)
+
+
+class MessageValidationError(ValueError):
+    """Raised when a message does not match its schema."""
+
+    def __init__(self, message: str, field: str = None):
+        super().__init__(message)
+        self.field = field
+
+
+def _check_lines(field, annotation, var, consts, positive):
+    """Source lines that reject ``var`` unless it matches ``annotation``."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    fail = f'raise _Error(f"Invalid {field}: {{{var}!r}}", {field!r})'
+
+    if origin is typing.Literal:
+        name = f'_L{len(consts)}'
+        consts[name] = tuple(args)
+        return [f'if {var} not in {name}: {fail}']
+
+    if origin is typing.Union or (_UnionType is not None and origin is _UnionType):
+        members = [a for a in args if a is not type(None)]
+        if len(members) == 1:
+            lines = _check_lines(field, members[0], var, consts, positive)
+        else:
+            name = f'_T{len(consts)}'
+            consts[name] = tuple(members)
+            lines = [f"if type({var}) not in {name} or {var} == '': {fail}"]
+        if len(members) < len(args):
+            return [f'if {var} is not None:'] + ['    ' + line for line in lines]
+        return lines
+
+    if annotation is float:
+        lines = [
+            f'if type({var}) is not float:',
+            f'    if type({var}) is not int: {fail}',
+            f'    {var} = float({var})',
+            f'    m[{field!r}] = {var}',
+            f'if not -_INF < {var} < _INF: {fail}',
+        ]
+    elif annotation is int:
+        lines = [f'if type({var}) is not int: {fail}']
+    elif annotation is str:
+        lines = [f'if type({var}) is not str or not {var}: {fail}']
+    else:
+        name = f'_T{len(consts)}'
+        consts[name] = origin or annotation
+        lines = [f'if not isinstance({var}, {name}): {fail}']
+
+    if field in positive:
+        lines.append(f'if {var} <= 0: {fail}')
+    return lines
+
+
+def compile_validator(schema: type, positive: Iterable[str] = ()) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build a validator for a TypedDict schema.
+
+    The validator checks every declared field in one pass and returns the message,
+    with integer values in float fields converted to float. Literal fields must hold
+    one of their values, strings must be non-empty and floats finite. Keys not in
+    the schema are ignored.
+
+    Args:
+        schema: TypedDict class
+        positive: Numeric fields that must also be greater than zero
+
+    Returns:
+        A function that takes a message dict and returns it, or raises MessageValidationError
+    """
+    hints = typing.get_type_hints(schema)
+    positive = frozenset(positive)
+    consts = {'_Error': MessageValidationError, '_INF': math.inf}
+
+    required = [f for f in hints if f in schema.__required_keys__]
+    optional = [f for f in hints if f not in schema.__required_keys__]
+
+    lines = [
+        'def validate(m):',
+        '    if type(m) is not dict:',
+        f'        raise _Error(f"{schema.__name__} must be an object, got {{type(m).__name__}}")',
+        '    try:',
+    ]
+    for i, field in enumerate(required):
+        lines.append(f'        v{i} = m[{field!r}]')
+    lines += [
+        '    except KeyError as e:',
+        '        raise _Error(f"Missing {e.args[0]}", e.args[0]) from None',
+    ]
+    for i, field in enumerate(required):
+        lines += ['    ' + line for line in _check_lines(field, hints[field], f'v{i}', consts, positive)]
+    for i, field in enumerate(optional, len(required)):
+        lines.append(f'    v{i} = m.get({field!r})')
+        lines.append(f'    if v{i} is not None:')
+        lines += ['        ' + line for line in _check_lines(field, hints[field], f'v{i}', consts, positive)]
+    lines.append('    return m')
+
+    namespace = dict(consts)
+    exec(compile('\n'.join(lines), f'<validator {schema.__name__}>', 'exec'), namespace)
+    validate = namespace['validate']
+    validate.__name__ = validate.__qualname__ = f'validate_{schema.__name__}'
+    validate.__doc__ = f'Validate a {schema.__name__}; raises MessageValidationError.'
+    return validate
+
+
+validate_place_order_request = compile_validator(PlaceOrderRequest, positive=('quantity', 'price'))
+validate_cancel_order_request = compile_validator(CancelOrderRequest, positive=('order_id',))
+validate_order_message = compile_validator(OrderMessage, positive=('quantity', 'price'))
+validate_trade_message = compile_validator(TradeMessage, positive=('quantity', 'price'))
+validate_order_rejected_message = compile_validator(OrderRejectedMessage)
+validate_order_cancelled_message = compile_validator(OrderCancelledMessage)
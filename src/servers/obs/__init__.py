@@ -1,4 +1,5 @@
 """Order Book Server (OBS) module."""
+from .order_book import OrderBook
 from .server import OrderBookServer
 
-__all__ = ["OrderBookServer"]
+__all__ = ["OrderBook", "OrderBookServer"]
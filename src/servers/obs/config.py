@@ -1,9 +1,38 @@
 """Configuration for Order Book Server."""
 
+# The OBS request queue is named by messaging.routing, which also names its shard queues
+from messaging.routing import OBS_QUEUE  # noqa: F401
+
 RABBITMQ_HOST = "localhost"
-OBS_QUEUE = "obs_requests"
 OBS_RESPONSE_QUEUE = "obs_responses"
+OBS_EVENTS_QUEUE = "obs_events"
+
+# Codec for TES <-> OBS traffic (orders and fill events): "binary" or "json".
+# Incoming messages are decoded by their content_type, so mixed deployments still work.
+MESSAGE_CODEC = "binary"
+
+# Consumer settings
+PREFETCH_COUNT = 256
 
 # Order book settings
 MAX_PRICE_LEVELS = 100
 TICK_SIZE = 0.01
+
+# Market data: top-N levels published per symbol, and how often full snapshots go out
+# between incremental updates
+MARKET_DATA_DEPTH = 10
+MARKET_DATA_SNAPSHOT_INTERVAL = 2.0
+
+# Trade history: a background thread writes trades to kdb+ in batches of up to
+# HISTORY_BATCH_SIZE rows, at least every HISTORY_FLUSH_INTERVAL seconds. While kdb+ is
+# unreachable, batches are journaled under HISTORY_JOURNAL_DIR and replayed on reconnect.
+# HISTORY_BACKEND "kdb" writes to the q process at KDB_HOST:KDB_PORT; "local" writes to a
+# LocalTickStore under HISTORY_LOCAL_DIR, for machines without kdb+.
+HISTORY_BACKEND = "kdb"
+HISTORY_LOCAL_DIR = "data/ticks"
+KDB_HOST = "localhost"
+KDB_PORT = 8080
+HISTORY_BATCH_SIZE = 1000
+HISTORY_FLUSH_INTERVAL = 0.5
+HISTORY_QUEUE_SIZE = 100_000
+HISTORY_JOURNAL_DIR = "data/history"
@@ -0,0 +1,223 @@
+"""
+Market-data publishing for the Order Book Server.
+Book changes are collected while a batch of requests is dispatched. After the batch the
+OBS diffs each changed book's top-N levels against what it last published and sends only
+the changed levels, plus a BBO message when the touch moves. Periodic snapshots let new
+or lagging subscribers resynchronise.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pika
+
+from messaging.codecs import encode_message
+from messaging.routing import MARKET_DATA_EXCHANGE, market_data_routing_key
+
+from .config import MARKET_DATA_DEPTH, MARKET_DATA_SNAPSHOT_INTERVAL
+from .order_book import BUY
+
+logger = logging.getLogger(__name__)
+
+# price -> (quantity, order count)
+Levels = Dict[float, Tuple[float, int]]
+
+
+class _Published:
+    """What subscribers have been told about one symbol."""
+
+    __slots__ = ("seq", "bids", "asks", "bbo")
+
+    def __init__(self):
+        self.seq = 0
+        self.bids: Levels = {}
+        self.asks: Levels = {}
+        self.bbo = None
+
+
+def _diff(old: Levels, new: Levels) -> List[list]:
+    """Levels that changed between two windows; departed levels get quantity 0."""
+    changes = [[price, qty, count] for price, (qty, count) in new.items() if old.get(price) != (qty, count)]
+    changes.extend([price, 0.0, 0] for price in old if price not in new)
+    return changes
+
+
+class MarketDataPublisher:
+    """
+    Publishes BBO, depth snapshots and incremental level updates to a topic exchange.
+
+    Routing keys are ``<symbol>.bbo``, ``<symbol>.snapshot`` and ``<symbol>.update``
+    (see messaging.routing.market_data_routing_key), so subscribers bind only the
+    symbols they want.
+    """
+
+    def __init__(
+        self,
+        channel,
+        exchange: str = MARKET_DATA_EXCHANGE,
+        depth: int = MARKET_DATA_DEPTH,
+        snapshot_interval: float = MARKET_DATA_SNAPSHOT_INTERVAL,
+    ):
+        self.channel = channel
+        self.exchange = exchange
+        self.depth = depth
+        self.snapshot_interval = snapshot_interval
+        self.published: Dict[str, _Published] = {}
+        # symbol -> (book, [(side, price), ...] or None for a full rescan)
+        self.dirty: Dict[str, tuple] = {}
+        self.next_snapshot = time.monotonic() + snapshot_interval
+
+        # Counters for monitoring
+        self.updates_published = 0
+        self.snapshots_published = 0
+        self.bbos_published = 0
+
+    def _levels(self, book_side) -> Levels:
+        return {lvl.price: (lvl.total_quantity, lvl.count) for lvl in book_side.top(self.depth)}
+
+    def _publish(self, symbol: str, kind: str, message: dict):
+        content_type, body = encode_message(message)
+        self.channel.basic_publish(
+            exchange=self.exchange,
+            routing_key=market_data_routing_key(symbol, kind),
+            properties=pika.BasicProperties(content_type=content_type),
+            body=body,
+        )
+
+    def book_changed(self, book, side: Optional[str] = None, price: Optional[float] = None):
+        """
+        Note that an order hit ``book``; the change is published by the next flush().
+
+        Args:
+            book: The OrderBook that changed
+            side: Side of the order, when it only rested or was cancelled (no trades)
+            price: Price of that order
+
+        With ``side`` and ``price``, the flush only rescans that side, and not even that
+        when every hinted price lies outside a full published window. Omit them after
+        trades, which change both sides.
+        """
+        hints = self.dirty.get(book.symbol)
+        if hints is None:
+            self.dirty[book.symbol] = (book, None if side is None else [(side, price)])
+        elif hints[1] is not None:
+            if side is None:
+                self.dirty[book.symbol] = (book, None)
+            else:
+                hints[1].append((side, price))
+
+    def flush(self):
+        """Publish updates for every book changed since the last flush."""
+        if not self.dirty:
+            return
+        dirty, self.dirty = self.dirty, {}
+        for book, hints in dirty.values():
+            self._publish_changes(book, hints)
+
+    def _side_in_window(self, levels: Levels, side: str, price: float, margin: float) -> bool:
+        """Could an order at ``price`` have changed this published window?"""
+        if len(levels) < self.depth:
+            return True
+        worst = next(reversed(levels))
+        # Prices within half a tick of the worst published level may share its tick
+        return price >= worst - margin if side == BUY else price <= worst + margin
+
+    def _publish_changes(self, book, hints):
+        state = self.published.get(book.symbol)
+        if state is None:
+            state = self.published[book.symbol] = _Published()
+
+        if hints is None:
+            rescan_bids = rescan_asks = True
+        else:
+            margin = book.tick_size / 2
+            rescan_bids = any(
+                self._side_in_window(state.bids, side, price, margin) for side, price in hints if side == BUY
+            )
+            rescan_asks = any(
+                self._side_in_window(state.asks, side, price, margin) for side, price in hints if side != BUY
+            )
+        bids = self._levels(book.bids) if rescan_bids else state.bids
+        asks = self._levels(book.asks) if rescan_asks else state.asks
+        bid_changes = _diff(state.bids, bids) if rescan_bids else []
+        ask_changes = _diff(state.asks, asks) if rescan_asks else []
+        if not bid_changes and not ask_changes:
+            return
+
+        now = time.time()
+        state.seq += 1
+        state.bids = bids
+        state.asks = asks
+        self._publish(
+            book.symbol,
+            "update",
+            {
+                "type": "update",
+                "symbol": book.symbol,
+                "seq": state.seq,
+                "bids": bid_changes,
+                "asks": ask_changes,
+                "timestamp": now,
+            },
+        )
+        self.updates_published += 1
+
+        best_bid = book.best_bid()
+        best_ask = book.best_ask()
+        bbo = (
+            best_bid.price if best_bid else None,
+            best_bid.total_quantity if best_bid else 0.0,
+            best_ask.price if best_ask else None,
+            best_ask.total_quantity if best_ask else 0.0,
+        )
+        if bbo != state.bbo:
+            state.bbo = bbo
+            self._publish(
+                book.symbol,
+                "bbo",
+                {
+                    "type": "bbo",
+                    "symbol": book.symbol,
+                    "seq": state.seq,
+                    "bid": bbo[0],
+                    "bid_quantity": bbo[1],
+                    "ask": bbo[2],
+                    "ask_quantity": bbo[3],
+                    "timestamp": now,
+                },
+            )
+            self.bbos_published += 1
+
+    def publish_snapshots(self, books: Iterable):
+        """Publish the current top-N window of every book."""
+        # Snapshots carry the published window, so bring it up to date first
+        self.flush()
+        now = time.time()
+        for book in books:
+            state = self.published.get(book.symbol)
+            if state is None:
+                # Nothing published yet: start the window from the book as it stands
+                state = self.published[book.symbol] = _Published()
+                state.bids = self._levels(book.bids)
+                state.asks = self._levels(book.asks)
+            self._publish(
+                book.symbol,
+                "snapshot",
+                {
+                    "type": "snapshot",
+                    "symbol": book.symbol,
+                    "seq": state.seq,
+                    "bids": [[price, qty, count] for price, (qty, count) in state.bids.items()],
+                    "asks": [[price, qty, count] for price, (qty, count) in state.asks.items()],
+                    "timestamp": now,
+                },
+            )
+            self.snapshots_published += 1
+
+    def maybe_publish_snapshots(self, books: Iterable):
+        """Publish snapshots if the snapshot interval has elapsed."""
+        now = time.monotonic()
+        if now >= self.next_snapshot:
+            self.next_snapshot = now + self.snapshot_interval
+            self.publish_snapshots(books)
@@ -0,0 +1,337 @@
+"""
+In-memory limit order book.
+Price levels are kept in per-side heaps keyed by integer ticks. Resting orders live in a
+struct-of-arrays OrderStore, each level threads a FIFO doubly-linked list through it by
+slot index, and an id -> slot index gives O(1) cancels.
+"""
+
+import heapq
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from shared.models.order import SIDE_BUY, SIDE_SELL
+
+from .config import TICK_SIZE
+from .order_store import NIL, OrderStore, RestingOrder
+
+BUY = "buy"
+SELL = "sell"
+
+# Order statuses reported with each trade
+FILLED = "filled"
+PARTIALLY_FILLED = "partially_filled"
+
+SIDE_NAMES = {SIDE_BUY: BUY, SIDE_SELL: SELL}
+SIDE_CODES = {BUY: SIDE_BUY, SELL: SIDE_SELL}
+
+
+class PriceLevel:
+    """FIFO queue of resting order slots at a single price."""
+
+    __slots__ = ("ticks", "price", "head", "tail", "count", "total_quantity")
+
+    def __init__(self, ticks: int, price: float):
+        self.ticks = ticks
+        self.price = price
+        self.head = NIL
+        self.tail = NIL
+        self.count = 0
+        self.total_quantity = 0.0
+
+    def append(self, store: OrderStore, slot: int):
+        """Append an order to the back of the queue."""
+        store.prev[slot] = self.tail
+        store.next[slot] = NIL
+        if self.tail == NIL:
+            self.head = slot
+        else:
+            store.next[self.tail] = slot
+        self.tail = slot
+        self.count += 1
+        self.total_quantity += store.quantity[slot]
+
+    def remove(self, store: OrderStore, slot: int):
+        """Unlink an order from anywhere in the queue."""
+        prev = store.prev[slot]
+        nxt = store.next[slot]
+        if prev == NIL:
+            self.head = nxt
+        else:
+            store.next[prev] = nxt
+        if nxt == NIL:
+            self.tail = prev
+        else:
+            store.prev[nxt] = prev
+        self.count -= 1
+        self.total_quantity -= store.quantity[slot]
+
+    def slots(self, store: OrderStore) -> Iterator[int]:
+        """Iterate the queued slots front to back."""
+        slot = self.head
+        while slot != NIL:
+            yield slot
+            slot = store.next[slot]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class _BookSide:
+    """One side of the book: price levels plus a heap of their ticks.
+
+    Empty levels are dropped from ``levels`` immediately and their heap entries are
+    discarded lazily when they reach the top, so best-price access stays O(1) amortised.
+    """
+
+    __slots__ = ("sign", "levels", "heap", "in_heap")
+
+    def __init__(self, side: str):
+        # Heap is a min-heap, so bids store negated ticks to surface the highest price
+        self.sign = -1 if side == BUY else 1
+        self.levels: Dict[int, PriceLevel] = {}
+        self.heap: List[int] = []
+        self.in_heap = set()
+
+    def best(self) -> Optional[PriceLevel]:
+        """Return the best price level, or None if the side is empty."""
+        heap = self.heap
+        levels = self.levels
+        while heap:
+            ticks = heap[0] * self.sign
+            level = levels.get(ticks)
+            if level is not None:
+                return level
+            heapq.heappop(heap)
+            self.in_heap.discard(ticks)
+        return None
+
+    def get_or_create(self, ticks: int, price: float) -> PriceLevel:
+        """Return the level for ``ticks``, creating it if needed."""
+        level = self.levels.get(ticks)
+        if level is None:
+            level = PriceLevel(ticks, price)
+            self.levels[ticks] = level
+            if ticks not in self.in_heap:
+                heapq.heappush(self.heap, ticks * self.sign)
+                self.in_heap.add(ticks)
+        return level
+
+    def discard_if_empty(self, level: PriceLevel):
+        """Drop a level once its queue is empty."""
+        if level.count == 0:
+            self.levels.pop(level.ticks, None)
+
+    def top(self, n: int) -> List[PriceLevel]:
+        """Return up to ``n`` live levels ordered best to worst.
+
+        Walks the heap best-first from the root, so only about ``n`` entries (plus any
+        stale ones among them) are visited rather than every level on the side.
+        """
+        heap = self.heap
+        levels = self.levels
+        sign = self.sign
+        size = len(heap)
+        result = []
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(result) < n:
+            key, i = heapq.heappop(frontier)
+            level = levels.get(key * sign)
+            if level is not None:
+                result.append(level)
+            child = 2 * i + 1
+            if child < size:
+                heapq.heappush(frontier, (heap[child], child))
+                if child + 1 < size:
+                    heapq.heappush(frontier, (heap[child + 1], child + 1))
+        return result
+
+
+class OrderBook:
+    """
+    Price-time priority order book for a single symbol.
+
+    Inserting at a new price level is O(log L), inserting at an existing level and
+    cancelling by id are O(1), and the best bid/ask are available in O(1).
+    """
+
+    def __init__(self, symbol: str, tick_size: float = TICK_SIZE):
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.bids = _BookSide(BUY)
+        self.asks = _BookSide(SELL)
+        self.store = OrderStore()
+        self.orders: Dict[Any, int] = {}
+        # Trade ids continue from the current time in microseconds, so they keep
+        # increasing across OBS restarts as long as a book trades under 1M times a second
+        self.trade_counter = time.time_ns() // 1000
+
+    def _ticks(self, price: float) -> int:
+        return int(round(price / self.tick_size))
+
+    def _side(self, side: int) -> _BookSide:
+        return self.bids if side == SIDE_BUY else self.asks
+
+    def best_bid(self) -> Optional[PriceLevel]:
+        """Return the best bid level, or None."""
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[PriceLevel]:
+        """Return the best ask level, or None."""
+        return self.asks.best()
+
+    def add_order(
+        self,
+        order_id,
+        user_id,
+        side: str,
+        price: float,
+        quantity: float,
+        timestamp: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Match an incoming limit order and rest any remainder.
+
+        Args:
+            order_id: Unique order identifier
+            user_id: Owner of the order
+            side: 'buy' or 'sell'
+            price: Limit price
+            quantity: Order quantity
+            timestamp: Order time in epoch seconds (defaults to now)
+
+        Returns:
+            List of trades generated by the order
+        """
+        side_code = SIDE_CODES.get(side)
+        if side_code is None:
+            raise ValueError(f"Invalid side: {side}")
+        if quantity <= 0:
+            raise ValueError(f"Quantity must be positive, got {quantity}")
+        if order_id in self.orders:
+            raise ValueError(f"Duplicate order id: {order_id}")
+
+        ticks = self._ticks(price)
+        trades, remaining = self._match(order_id, user_id, side_code == SIDE_BUY, ticks, quantity)
+
+        if remaining > 0:
+            timestamp_ns = time.time_ns() if timestamp is None else int(timestamp * 1e9)
+            slot = self.store.allocate(order_id, user_id, side_code, ticks, remaining, timestamp_ns)
+            self._side(side_code).get_or_create(ticks, price).append(self.store, slot)
+            self.orders[order_id] = slot
+        return trades
+
+    def _match(self, order_id, user_id, is_buy, ticks, quantity):
+        """Sweep the opposite side while the incoming order crosses.
+
+        Returns the generated trades and the unfilled quantity. Each trade carries
+        ``buy_order_status`` and ``sell_order_status``: "filled" if that trade left the
+        order with nothing remaining, else "partially_filled".
+        """
+        trades = []
+        opposite = self.asks if is_buy else self.bids
+        orders = self.orders
+        store = self.store
+        resting_qty = store.quantity
+        resting_ids = store.order_id
+        resting_users = store.user_id
+        next_slot = store.next
+        prev_slot = store.prev
+
+        while quantity > 0:
+            level = opposite.best()
+            if level is None:
+                break
+            if (level.ticks > ticks) if is_buy else (level.ticks < ticks):
+                break
+
+            while quantity > 0 and level.head != NIL:
+                slot = level.head
+                available = resting_qty[slot]
+                trade_qty = quantity if quantity < available else available
+                quantity -= trade_qty
+                available -= trade_qty
+                # Each order's status as of this trade, not the end of the sweep
+                incoming_status = FILLED if quantity <= 0 else PARTIALLY_FILLED
+                resting_status = FILLED if available <= 0 else PARTIALLY_FILLED
+                self.trade_counter += 1
+                trades.append(
+                    {
+                        "id": self.trade_counter,
+                        "timestamp": time.time(),
+                        "symbol": self.symbol,
+                        "buyer": user_id if is_buy else resting_users[slot],
+                        "seller": resting_users[slot] if is_buy else user_id,
+                        "buy_order_id": order_id if is_buy else resting_ids[slot],
+                        "sell_order_id": resting_ids[slot] if is_buy else order_id,
+                        "quantity": trade_qty,
+                        "price": level.price,
+                        "buy_order_status": incoming_status if is_buy else resting_status,
+                        "sell_order_status": resting_status if is_buy else incoming_status,
+                    }
+                )
+                resting_qty[slot] = available
+                level.total_quantity -= trade_qty
+                if available <= 0:
+                    # Pop from the head of the queue without touching total_quantity again
+                    nxt = next_slot[slot]
+                    level.head = nxt
+                    if nxt == NIL:
+                        level.tail = NIL
+                    else:
+                        prev_slot[nxt] = NIL
+                    level.count -= 1
+                    del orders[resting_ids[slot]]
+                    store.release(slot)
+
+            opposite.discard_if_empty(level)
+        return trades, quantity
+
+    def _snapshot(self, slot: int) -> RestingOrder:
+        store = self.store
+        side = store.side[slot]
+        ticks = store.ticks[slot]
+        level = self._side(side).levels.get(ticks)
+        return RestingOrder(
+            store.order_id[slot],
+            store.user_id[slot],
+            SIDE_NAMES[side],
+            level.price if level is not None else ticks * self.tick_size,
+            store.quantity[slot],
+            store.timestamp_ns[slot],
+        )
+
+    def cancel_order(self, order_id) -> Optional[RestingOrder]:
+        """Cancel a resting order by id. Returns a snapshot of the removed order, or None."""
+        slot = self.orders.pop(order_id, None)
+        if slot is None:
+            return None
+        snapshot = self._snapshot(slot)
+        store = self.store
+        book_side = self._side(store.side[slot])
+        level = book_side.levels[store.ticks[slot]]
+        level.remove(store, slot)
+        book_side.discard_if_empty(level)
+        store.release(slot)
+        return snapshot
+
+    def get_order(self, order_id) -> Optional[RestingOrder]:
+        """Look up a resting order by id."""
+        slot = self.orders.get(order_id)
+        return None if slot is None else self._snapshot(slot)
+
+    def depth(self, levels: int = 5) -> Dict[str, Any]:
+        """Return an aggregated depth snapshot of the top ``levels`` on each side."""
+
+        def top(book_side):
+            return [
+                {"price": lvl.price, "quantity": lvl.total_quantity, "orders": lvl.count}
+                for lvl in book_side.top(levels)
+            ]
+
+        return {"symbol": self.symbol, "bids": top(self.bids), "asks": top(self.asks)}
+
+    def __contains__(self, order_id) -> bool:
+        return order_id in self.orders
+
+    def __len__(self) -> int:
+        return len(self.orders)
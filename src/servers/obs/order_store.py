@@ -0,0 +1,121 @@
+"""
+Struct-of-arrays storage for resting orders.
+Each resting order is a slot index into parallel typed arrays, so it costs a few bytes
+per column instead of a Python object with its own float and int attributes.
+"""
+
+from array import array
+
+# Empty link in the per-level FIFO lists
+NIL = -1
+
+
+class OrderStore:
+    """
+    Column storage for resting orders, addressed by slot.
+
+    Side is an integer code (see shared.models.order.SIDE_BUY/SIDE_SELL), price is held
+    as integer ticks and timestamps as epoch nanoseconds. Released slots are reused, so
+    the arrays only grow to the peak number of resting orders.
+    """
+
+    __slots__ = (
+        "order_id",
+        "user_id",
+        "side",
+        "ticks",
+        "quantity",
+        "timestamp_ns",
+        "prev",
+        "next",
+        "free",
+    )
+
+    def __init__(self):
+        # Ids are opaque (ints from the TES, strings elsewhere), so they stay Python objects
+        self.order_id: list = []
+        self.user_id: list = []
+        self.side = bytearray()
+        self.ticks = array("q")
+        self.quantity = array("d")
+        self.timestamp_ns = array("q")
+        self.prev = array("i")
+        self.next = array("i")
+        self.free = array("i")
+
+    def allocate(self, order_id, user_id, side: int, ticks: int, quantity: float, timestamp_ns: int) -> int:
+        """Store an order and return its slot."""
+        if self.free:
+            slot = self.free.pop()
+            self.order_id[slot] = order_id
+            self.user_id[slot] = user_id
+            self.side[slot] = side
+            self.ticks[slot] = ticks
+            self.quantity[slot] = quantity
+            self.timestamp_ns[slot] = timestamp_ns
+            self.prev[slot] = NIL
+            self.next[slot] = NIL
+            return slot
+
+        slot = len(self.order_id)
+        self.order_id.append(order_id)
+        self.user_id.append(user_id)
+        self.side.append(side)
+        self.ticks.append(ticks)
+        self.quantity.append(quantity)
+        self.timestamp_ns.append(timestamp_ns)
+        self.prev.append(NIL)
+        self.next.append(NIL)
+        return slot
+
+    def release(self, slot: int):
+        """Free a slot for reuse and drop its object references."""
+        self.order_id[slot] = None
+        self.user_id[slot] = None
+        self.free.append(slot)
+
+    def __len__(self) -> int:
+        return len(self.order_id) - len(self.free)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.order_id)
+
+    def nbytes(self) -> int:
+        """Bytes held by the columns (excluding the id/user objects themselves)."""
+        pointer = 8
+        fixed = (
+            len(self.side)
+            + sum(col.itemsize * len(col) for col in (self.ticks, self.quantity, self.timestamp_ns, self.prev, self.next, self.free))
+        )
+        return fixed + pointer * (len(self.order_id) + len(self.user_id))
+
+
+class RestingOrder:
+    """Read-only snapshot of a resting order, built at the edges of the book."""
+
+    __slots__ = ("order_id", "user_id", "side", "price", "quantity", "timestamp_ns")
+
+    def __init__(self, order_id, user_id, side: str, price: float, quantity: float, timestamp_ns: int):
+        self.order_id = order_id
+        self.user_id = user_id
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.timestamp_ns = timestamp_ns
+
+    @property
+    def timestamp(self) -> float:
+        """Order time in epoch seconds."""
+        return self.timestamp_ns / 1e9
+
+    def to_dict(self) -> dict:
+        """Convert resting order to dictionary."""
+        return {
+            "id": self.order_id,
+            "user_id": self.user_id,
+            "side": self.side,
+            "price": self.price,
+            "quantity": self.quantity,
+            "timestamp": self.timestamp,
+        }
@@ -4,32 +4,70 @@ Manages the order book, processes order requests, and interacts with trading str
 """
 import time
 import pika
-import json
 import logging
+import multiprocessing
 
-logger = logging.getLogger(__name__)
+from messaging.broker import MessageBroker
+from messaging.codecs import decode_message, encode_message
+from messaging.routing import MARKET_DATA_EXCHANGE, obs_queue_for_shard
+from messaging.validation import MessageValidationError, validate_order_message
+
+from .config import (
+    HISTORY_JOURNAL_DIR,
+    MARKET_DATA_SNAPSHOT_INTERVAL,
+    MESSAGE_CODEC,
+    OBS_EVENTS_QUEUE,
+    OBS_RESPONSE_QUEUE,
+    PREFETCH_COUNT,
+    RABBITMQ_HOST,
+)
+from .market_data import MarketDataPublisher
+from .strategy import BasicStrategy
 
-RABBITMQ_HOST = "localhost"
-OBS_QUEUE = "obs_requests"
-OBS_RESPONSE_QUEUE = "obs_responses"
+logger = logging.getLogger(__name__)
 
 
 class OrderBookServer:
-    def __init__(self):
-        # Initialize RabbitMQ connection and channel
-        logger.info("(OBS): Connecting to RabbitMQ")
-        self.connection = pika.BlockingConnection(
-            pika.ConnectionParameters(host=RABBITMQ_HOST)
+    def __init__(self, strategy=None, shard=0, shards=1):
+        # With shards > 1 this worker only sees the symbols routed to its own queue
+        self.shard = shard
+        self.shards = shards
+        self.queue = obs_queue_for_shard(shard, shards)
+        self.name = f"OBS-{shard}" if shards > 1 else "OBS"
+
+        # Matching strategy owning the per-symbol order books; each worker journals
+        # undelivered trade history to its own file
+        self.strategy = strategy or BasicStrategy(
+            history_journal=f"{HISTORY_JOURNAL_DIR}/{self.name.lower()}.journal"
         )
-        self.channel = self.connection.channel()
-        self.channel.queue_declare(queue=OBS_QUEUE)
+
+        # Initialize RabbitMQ connection and channel
+        logger.info(f"({self.name}): Connecting to RabbitMQ")
+        self.broker = MessageBroker(host=RABBITMQ_HOST)
+        if not self.broker.connect():
+            raise ConnectionError(f"({self.name}): Could not connect to RabbitMQ at {RABBITMQ_HOST}")
+        self.connection = self.broker.connection
+        self.channel = self.broker.channel
+        self.channel.queue_declare(queue=self.queue)
         self.channel.queue_declare(queue=OBS_RESPONSE_QUEUE)
+        self.channel.queue_declare(queue=OBS_EVENTS_QUEUE)
+
+        # BBO, depth snapshots and level updates, one routing key per symbol
+        self.broker.declare_exchange(MARKET_DATA_EXCHANGE, exchange_type="topic")
+        self.market_data = MarketDataPublisher(self.channel)
 
     def on_request(self, ch, method, props, body):
-        logger.info(f"Received request: {body}")
-        request = json.loads(body)
+        logger.debug(f"Received request: {body}")
+        try:
+            request = decode_message(body, props.content_type)
+            if not isinstance(request, dict):
+                raise ValueError(f"expected an object, got {type(request).__name__}")
+        except ValueError as e:
+            logger.error(f"({self.name}): Dropping undecodable request ({props.content_type}): {e}")
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
         action = request.get("action")
-        response = {}
+        response = None
 
         if action == "connect":
             logger.info(
@@ -37,26 +75,159 @@ class OrderBookServer:
             )
             response = {
                 "status": "ok",
-                "message": f"Engine {request.get('engine_id')} connected to OBS at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(request.get('timestamp')))}",
+                "message": f"Engine {request.get('engine_id')} connected to {self.name} at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(request.get('timestamp')))}",
+            }
+        elif action == "place_order":
+            try:
+                validate_order_message(request)
+            except MessageValidationError as e:
+                logger.error(f"({self.name}): Rejected order {request.get('order_id')}: {e}")
+                self.reject_order(ch, request, str(e))
+                if props.reply_to:
+                    response = {"status": "error", "order_id": request.get("order_id"), "message": str(e)}
+            else:
+                self.handle_place_order(ch, request)
+        elif action == "cancel_order":
+            cancelled = self.strategy.cancel_order(request.get("symbol"), request.get("order_id"))
+            if cancelled:
+                self.market_data.book_changed(
+                    self.strategy.get_book(request["symbol"]), cancelled.side, cancelled.price
+                )
+                self.publish_event(
+                    ch,
+                    {
+                        "event": "order_cancelled",
+                        "order_id": cancelled.order_id,
+                        "symbol": request["symbol"],
+                        "quantity": cancelled.quantity,
+                        "timestamp": time.time(),
+                    },
+                )
+            # Cancels routed by the TES are fire-and-forget too; order_cancelled confirms them
+            if props.reply_to:
+                response = {
+                    "status": "ok" if cancelled else "error",
+                    "order_id": request.get("order_id"),
+                    "message": "Order cancelled" if cancelled else "Order not on book",
+                }
+
+        # Orders are fire-and-forget; only reply when the sender asked for one
+        if response is not None or props.reply_to:
+            content_type, body = encode_message(response or {"status": "ok"}, MESSAGE_CODEC)
+            ch.basic_publish(
+                exchange="",
+                routing_key=props.reply_to if props.reply_to else OBS_RESPONSE_QUEUE,
+                properties=pika.BasicProperties(
+                    correlation_id=props.correlation_id, content_type=content_type
+                ),
+                body=body,
+            )
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    def handle_place_order(self, ch, request):
+        """Match an order against its book and publish any fills as events."""
+        try:
+            trades = self.strategy.submit_order(request)
+        except (KeyError, ValueError) as e:
+            logger.error(f"({self.name}): Rejected order {request.get('order_id')}: {e}")
+            self.reject_order(ch, request, str(e))
+            return
+
+        book = self.strategy.get_book(request["symbol"])
+        if trades:
+            self.market_data.book_changed(book)
+        else:
+            self.market_data.book_changed(book, request["side"], request["price"])
+        for trade in trades:
+            event = {
+                "event": "trade_executed",
+                "trade_id": f"{trade['symbol']}-{trade['id']}",
+                "symbol": trade["symbol"],
+                "buyer_id": trade["buyer"],
+                "seller_id": trade["seller"],
+                "buy_order_id": trade["buy_order_id"],
+                "sell_order_id": trade["sell_order_id"],
+                "quantity": trade["quantity"],
+                "price": trade["price"],
+                "timestamp": trade["timestamp"],
+                "buy_order_status": trade["buy_order_status"],
+                "sell_order_status": trade["sell_order_status"],
             }
+            self.publish_event(ch, event)
+            self.strategy.run(trade)
+
+    def reject_order(self, ch, request, reason):
+        """Tell the TES an order was not accepted, so it can close it out and notify the trader."""
+        order_id = request.get("order_id")
+        if type(order_id) is not int:
+            # Without an id there is no order for the TES to close
+            return
+        symbol = request.get("symbol")
+        self.publish_event(
+            ch,
+            {
+                "event": "order_rejected",
+                "order_id": order_id,
+                "symbol": symbol if isinstance(symbol, str) and symbol else None,
+                "reason": reason,
+                "timestamp": time.time(),
+            },
+        )
 
+    def publish_event(self, ch, event):
+        """Publish a fill, cancel or rejection to the TES on OBS_EVENTS_QUEUE."""
+        content_type, body = encode_message(event, MESSAGE_CODEC)
         ch.basic_publish(
             exchange="",
-            routing_key=props.reply_to if props.reply_to else OBS_RESPONSE_QUEUE,
-            properties=pika.BasicProperties(correlation_id=props.correlation_id),
-            body=json.dumps(response),
+            routing_key=OBS_EVENTS_QUEUE,
+            properties=pika.BasicProperties(content_type=content_type),
+            body=body,
         )
-        ch.basic_ack(delivery_tag=method.delivery_tag)
 
     def run(self):
         logger.info(
-            "OrderBookServer started. Waiting for client requests via RabbitMQ..."
+            f"OrderBookServer ({self.name}) started. Waiting for requests on {self.queue}..."
         )
-        self.channel.basic_qos(prefetch_count=1)
-        self.channel.basic_consume(queue=OBS_QUEUE, on_message_callback=self.on_request)
+        self.channel.basic_qos(prefetch_count=PREFETCH_COUNT)
+        self.channel.basic_consume(queue=self.queue, on_message_callback=self.on_request)
         try:
             while True:
-                self.connection.process_data_events(time_limit=1)
+                self.connection.process_data_events(time_limit=min(1, MARKET_DATA_SNAPSHOT_INTERVAL))
+                # One market-data update per changed book per dispatched batch
+                self.market_data.flush()
+                self.market_data.maybe_publish_snapshots(self.strategy.books.values())
         except KeyboardInterrupt:
-            logger.info("OrderBookServer stopped by user.")
+            logger.info(f"OrderBookServer ({self.name}) stopped by user.")
+            self.strategy.close()
             self.connection.close()
+
+
+def run_shard(shard, shards):
+    """Entry point for a single OBS worker process."""
+    OrderBookServer(shard=shard, shards=shards).run()
+
+
+def run_sharded(shards):
+    """
+    Run one OBS worker process per shard and wait for them.
+
+    Each worker consumes its own obs_requests.<shard> queue, so symbols are matched
+    in parallel without sharing a GIL. The TES must be started with the same
+    shard count so it routes orders to the matching queues.
+    """
+    workers = [
+        multiprocessing.Process(target=run_shard, args=(shard, shards), name=f"OBS-{shard}")
+        for shard in range(shards)
+    ]
+    for worker in workers:
+        worker.start()
+    logger.info(f"Started {shards} OBS shard workers")
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        logger.info("Stopping OBS shard workers...")
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
@@ -2,9 +2,26 @@
 Basic Trading Strategy
 A basic order matching strategy that can be extended for more advanced logic.
 """
+import logging
 import time
 import pykx as kx
 
+from database.historical import HistoricalPipeline, LocalTickStore
+
+from ..config import (
+    HISTORY_BACKEND,
+    HISTORY_BATCH_SIZE,
+    HISTORY_FLUSH_INTERVAL,
+    HISTORY_JOURNAL_DIR,
+    HISTORY_LOCAL_DIR,
+    HISTORY_QUEUE_SIZE,
+    KDB_HOST,
+    KDB_PORT,
+)
+from ..order_book import OrderBook
+
+logger = logging.getLogger(__name__)
+
 
 class BasicStrategy:
     """
@@ -12,21 +29,69 @@ class BasicStrategy:
     For now, this will simply provide a placeholder for matching logic.
     """
 
-    def __init__(self):
-        print("BasicStrategy initialised.")
-        # Set up kdb+ connection using pykx
-        self.q = kx.QConnection(host='localhost', port=8080)
+    def __init__(self, history_journal=f"{HISTORY_JOURNAL_DIR}/obs.journal"):
+        logger.info("BasicStrategy initialised.")
+        # Trades are recorded in kdb+ by a background thread, so a slow or unreachable
+        # kdb+ never holds up matching; while it is down they are journaled to disk
+        self.history = HistoricalPipeline(
+            self.connect_history,
+            history_journal,
+            batch_size=HISTORY_BATCH_SIZE,
+            flush_interval=HISTORY_FLUSH_INTERVAL,
+            queue_size=HISTORY_QUEUE_SIZE,
+        )
+        # One in-memory order book per symbol
+        self.books = {}
+
+    @staticmethod
+    def connect_history():
+        """Open the historical store selected by HISTORY_BACKEND."""
+        if HISTORY_BACKEND == "local":
+            return LocalTickStore(HISTORY_LOCAL_DIR)
+        return kx.QConnection(host=KDB_HOST, port=KDB_PORT)
+
+    def get_book(self, symbol):
+        """Get or create the order book for a symbol."""
+        book = self.books.get(symbol)
+        if book is None:
+            book = OrderBook(symbol)
+            self.books[symbol] = book
+        return book
+
+    def submit_order(self, order):
+        """
+        Match an order against its symbol's book and rest any remainder.
+        Returns the list of trades produced.
+        """
+        book = self.get_book(order["symbol"])
+        return book.add_order(
+            order_id=order["order_id"],
+            user_id=order["user_id"],
+            side=order["side"],
+            price=order["price"],
+            quantity=order["quantity"],
+            timestamp=order.get("timestamp"),
+        )
+
+    def cancel_order(self, symbol, order_id):
+        """Cancel a resting order. Returns the removed RestingOrder, or None if it was not on the book."""
+        book = self.books.get(symbol)
+        return None if book is None else book.cancel_order(order_id)
 
     def match_orders(self, bids, asks):
         """
         Match orders using a simple price-time priority.
         Returns a list of matched trades, each with id and timestamp.
+
+        Both lists must already be in priority order. Fully filled orders are
+        removed from the front of each list in one slice once matching ends.
         """
         trades = []
         trade_id = 1
-        while bids and asks and bids[0]["price"] >= asks[0]["price"]:
-            bid = bids[0]
-            ask = asks[0]
+        i = j = 0
+        while i < len(bids) and j < len(asks) and bids[i]["price"] >= asks[j]["price"]:
+            bid = bids[i]
+            ask = asks[j]
             trade_qty = min(bid["quantity"], ask["quantity"])
             trade_price = ask["price"]
             trade = {
@@ -42,9 +107,11 @@ class BasicStrategy:
             bid["quantity"] -= trade_qty
             ask["quantity"] -= trade_qty
             if bid["quantity"] == 0:
-                bids.pop(0)
+                i += 1
             if ask["quantity"] == 0:
-                asks.pop(0)
+                j += 1
+        del bids[:i]
+        del asks[:j]
         return trades
 
     def run(self, order_context):
@@ -52,19 +119,21 @@ class BasicStrategy:
         Accept the order context and return a result.
         This allows the server to call the strategy with the order context.
         """
-        print(f"Strategy running with context: {order_context}")
-        # Record the trade in kdb+ using pykx
-        try:
-            # Use a dict of lists for each column, even for a single row
-            trade_table = kx.Table(data={
-                'id': [str(order_context['id'])],
-                'timestamp': [order_context['timestamp']],
-                'symbol': [str(order_context.get('symbol', ''))],
-                'quantity': [order_context.get('quantity', 0)],
-                'price': [order_context.get('price', 0)]
-            })
-            self.q('insert', 'trade', trade_table)
-        except Exception as e:
-            print(f"Failed to insert trade into kdb+: {e}")
+        logger.debug(f"Strategy running with context: {order_context}")
+        # Queue the trade for kdb+; the history thread writes it with the rest of its batch
+        self.history.add_trade({
+            # Trade ids are per book, so qualify them with the symbol like trade events do
+            "id": f"{order_context.get('symbol', '')}-{order_context['id']}",
+            "timestamp": order_context["timestamp"],
+            "symbol": order_context.get("symbol", ""),
+            "quantity": order_context.get("quantity", 0),
+            "price": order_context.get("price", 0),
+            "buyer": order_context.get("buyer", ""),
+            "seller": order_context.get("seller", ""),
+        })
         # Always return a JSON-serializable response and flush stdout
         return {"status": "processed", "order_id": order_context["id"]}
+
+    def close(self):
+        """Write (or journal) queued trade history and stop the history thread."""
+        self.history.close()
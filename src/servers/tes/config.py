@@ -1,11 +1,35 @@
 """Configuration for Trading Engine Server."""
 
+# The OBS request queue is named by messaging.routing, which also names its shard queues
+from messaging.routing import OBS_QUEUE  # noqa: F401
+
 RABBITMQ_HOST = "localhost"
 TES_QUEUE = "tes_requests"
 TES_RESPONSE_QUEUE = "tes_responses"
-OBS_QUEUE = "obs_requests"
 OBS_RESPONSE_QUEUE = "obs_responses"
+OBS_EVENTS_QUEUE = "obs_events"
+
+# Codec for TES <-> OBS traffic (orders and fill events): "binary" or "json".
+# Incoming messages are decoded by their content_type, so mixed deployments still work.
+MESSAGE_CODEC = "binary"
 
 # Server settings
 DEFAULT_TIMEOUT = 10
 DEFAULT_RETRY = 3
+PREFETCH_COUNT = 256
+
+# Orders and fills are acked once their batch commits, so every commit is synced to
+# disk: under WAL, synchronous=normal only survives a process crash, not a power loss.
+# Group commit keeps this to one fsync per batch.
+DB_SYNCHRONOUS = "full"
+
+# Group commit for order persistence: flush every N orders or M milliseconds.
+# PREFETCH_COUNT must be at least ORDER_BATCH_SIZE or batches only fill on the timer.
+ORDER_BATCH_SIZE = 100
+ORDER_BATCH_MAX_DELAY_MS = 5.0
+
+# Bounded LRU cache of trader_id -> user_id, warmed from the users table on startup
+USER_CACHE_SIZE = 100_000
+
+# Seconds between daily PnL updates from new trades (0 disables)
+PNL_UPDATE_INTERVAL_S = 5.0
@@ -0,0 +1,258 @@
+"""
+Group-commit writers for TES order persistence.
+Orders, and the fills, cancels and rejections the OBS reports for them, are queued in
+memory and written in one transaction per batch, so a burst of N messages costs one
+commit (and one fsync) instead of N.
+"""
+
+import logging
+import time
+from typing import Any, List, Optional, Tuple
+
+from .user_cache import UserIdCache
+
+logger = logging.getLogger(__name__)
+
+
+class OrderBatchWriter:
+    """
+    Buffers validated orders and persists them in batches.
+
+    A batch is due once it holds ``batch_size`` orders or its oldest order has waited
+    ``max_delay_ms``. Each order is written inside its own savepoint, so one that fails
+    (and any user created for it) is rolled back on its own while the rest of the batch
+    commits. Callers must only acknowledge an order after the flush that wrote it
+    returns; acks survive a power loss only if the connection syncs on commit
+    (synchronous=full, as the TES opens its database), not just a process crash.
+    """
+
+    def __init__(
+        self,
+        db_conn,
+        batch_size: int = 100,
+        max_delay_ms: float = 5.0,
+        user_cache: Optional[UserIdCache] = None,
+    ):
+        self.db_conn = db_conn
+        self.user_cache = user_cache
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay_ms / 1000.0
+        self.pending: List[Tuple[dict, Any]] = []
+        self.oldest = None
+
+        # Counters for monitoring
+        self.batches_flushed = 0
+        self.orders_flushed = 0
+
+    def submit(self, request: dict, context: Any = None) -> bool:
+        """
+        Queue an order for the next batch.
+
+        Args:
+            request: Validated place_order request
+            context: Opaque value returned alongside the result on flush
+
+        Returns:
+            True if the batch is now full and should be flushed
+        """
+        if not self.pending:
+            self.oldest = time.monotonic()
+        self.pending.append((request, context))
+        return len(self.pending) >= self.batch_size
+
+    def is_due(self) -> bool:
+        """Whether the pending batch is full or has waited long enough."""
+        if not self.pending:
+            return False
+        return (
+            len(self.pending) >= self.batch_size
+            or time.monotonic() - self.oldest >= self.max_delay
+        )
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def get_user_id(self, cursor, trader_id):
+        """Get or create user_id from trader_id (UUID)."""
+        cache = self.user_cache
+        if cache is not None:
+            user_id = cache.get(trader_id)
+            if user_id is not None:
+                return user_id
+
+        # Check if user exists with this trader_id as username
+        cursor.execute("SELECT id FROM users WHERE username = ?", (trader_id,))
+        user = cursor.fetchone()
+        if user:
+            if cache is not None:
+                cache.put(trader_id, user[0])
+            return user[0]
+
+        # Create new user for this trader
+        cursor.execute(
+            "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+            (trader_id, "simulated"),  # Password hash not needed for simulated traders
+        )
+        user_id = cursor.lastrowid
+        logger.info(f"Created new user {user_id} for trader {trader_id[:8]}...")
+        if cache is not None:
+            cache.put(trader_id, user_id)
+        return user_id
+
+    def flush(self) -> List[Tuple[dict, Any, dict]]:
+        """
+        Write all pending orders in a single transaction.
+
+        Returns:
+            One (request, context, result) tuple per order, in submission order. On
+            success ``result`` holds ``order_id`` and ``user_id``; otherwise ``error``.
+        """
+        batch, self.pending = self.pending, []
+        self.oldest = None
+        if not batch:
+            return []
+
+        results = []
+        cursor = self.db_conn.cursor()
+        try:
+            if not self.db_conn.in_transaction:
+                cursor.execute("BEGIN")
+            for request, context in batch:
+                cursor.execute("SAVEPOINT place_order")
+                try:
+                    user_id = self.get_user_id(cursor, request["trader_id"])
+                    cursor.execute(
+                        """INSERT INTO orders (user_id, symbol, side, quantity, price, status)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        (
+                            user_id,
+                            request["symbol"],
+                            request["side"],
+                            request["quantity"],
+                            request["price"],
+                            "open",
+                        ),
+                    )
+                    result = {"order_id": cursor.lastrowid, "user_id": user_id}
+                except Exception as e:
+                    logger.error(f"Error placing order: {e}")
+                    cursor.execute("ROLLBACK TO place_order")
+                    if self.user_cache is not None:
+                        # A user created for this order was rolled back with it
+                        self.user_cache.discard(request["trader_id"])
+                    result = {"error": str(e)}
+                cursor.execute("RELEASE place_order")
+                results.append((request, context, result))
+            self.db_conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to commit batch of {len(batch)} orders: {e}")
+            self.db_conn.rollback()
+            if self.user_cache is not None:
+                # Users created in this batch were rolled back too
+                for request, _ in batch:
+                    self.user_cache.discard(request["trader_id"])
+            return [(request, context, {"error": str(e)}) for request, context in batch]
+
+        self.batches_flushed += 1
+        self.orders_flushed += len(batch)
+        return results
+
+
+# Final order status recorded for each OBS event that closes an order
+CLOSED_ORDER_STATUSES = {"order_cancelled": "cancelled", "order_rejected": "rejected"}
+# Statuses of orders that may still be resting on a book
+OPEN_ORDER_STATUSES = frozenset(("open", "partially_filled"))
+
+
+class OrderEventWriter:
+    """
+    Buffers validated OBS events (trade_executed, order_cancelled, order_rejected) and
+    records them in batches.
+
+    Each event is written inside its own savepoint, so one that fails is rolled back on
+    its own while the rest of the batch commits. As with orders, callers must only ack
+    an event after the flush that wrote it returns.
+    """
+
+    def __init__(self, db_conn, batch_size: int = 100):
+        self.db_conn = db_conn
+        self.batch_size = max(1, batch_size)
+        self.pending: List[Tuple[dict, Any]] = []
+
+        # Counters for monitoring
+        self.batches_flushed = 0
+        self.events_flushed = 0
+
+    def submit(self, event: dict, context: Any = None) -> bool:
+        """
+        Queue an event for the next batch.
+
+        Returns:
+            True if the batch is now full and should be flushed
+        """
+        self.pending.append((event, context))
+        return len(self.pending) >= self.batch_size
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    @staticmethod
+    def write(cursor, event: dict):
+        """Record one event: a trade row and order status per side, or a closed order's status."""
+        if event["event"] != "trade_executed":
+            cursor.execute(
+                "UPDATE orders SET status = ? WHERE id = ?",
+                (CLOSED_ORDER_STATUSES[event["event"]], event["order_id"]),
+            )
+            return
+        for side, user_key, order_key, status_key in (
+            ("buy", "buyer_id", "buy_order_id", "buy_order_status"),
+            ("sell", "seller_id", "sell_order_id", "sell_order_status"),
+        ):
+            cursor.execute(
+                """INSERT INTO trades (user_id, symbol, side, quantity, price)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (event[user_key], event["symbol"], side, event["quantity"], event["price"]),
+            )
+            cursor.execute(
+                "UPDATE orders SET status = ? WHERE id = ?",
+                (event[status_key], event[order_key]),
+            )
+
+    def flush(self) -> List[Tuple[dict, Any, dict]]:
+        """
+        Write all pending events in a single transaction.
+
+        Returns:
+            One (event, context, result) tuple per event, in submission order. ``result``
+            is empty on success and holds ``error`` otherwise.
+        """
+        batch, self.pending = self.pending, []
+        if not batch:
+            return []
+
+        results = []
+        cursor = self.db_conn.cursor()
+        try:
+            if not self.db_conn.in_transaction:
+                cursor.execute("BEGIN")
+            for event, context in batch:
+                cursor.execute("SAVEPOINT order_event")
+                try:
+                    self.write(cursor, event)
+                    result = {}
+                except Exception as e:
+                    logger.error(f"Error recording {event['event']} event: {e}")
+                    cursor.execute("ROLLBACK TO order_event")
+                    result = {"error": str(e)}
+                cursor.execute("RELEASE order_event")
+                results.append((event, context, result))
+            self.db_conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to commit batch of {len(batch)} order events: {e}")
+            self.db_conn.rollback()
+            return [(event, context, {"error": str(e)}) for event, context in batch]
+
+        self.batches_flushed += 1
+        self.events_flushed += len(batch)
+        return results
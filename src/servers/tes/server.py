@@ -12,27 +12,101 @@ from pathlib import Path
 
 import pika
 
-logger = logging.getLogger(__name__)
+from database.analytics.aggregations import AnalyticsDB
+from database.analytics.pnl import PnLEngine
+from database.connection import connect, sqlite_settings
+from database.transactional.migrations import migrate
+from database.transactional.models import SCHEMA
+from messaging.broker import MessageBroker
+from messaging.codecs import decode_message, encode_message
+from messaging.rpc import SyncRPCClient
+from messaging.routing import obs_queue_for_shard, obs_queue_for_symbol
+from messaging.validation import (
+    MessageValidationError,
+    validate_cancel_order_request,
+    validate_order_cancelled_message,
+    validate_order_rejected_message,
+    validate_place_order_request,
+    validate_trade_message,
+)
+
+from .config import (
+    DB_SYNCHRONOUS,
+    MESSAGE_CODEC,
+    OBS_EVENTS_QUEUE,
+    OBS_QUEUE,
+    ORDER_BATCH_MAX_DELAY_MS,
+    ORDER_BATCH_SIZE,
+    PNL_UPDATE_INTERVAL_S,
+    PREFETCH_COUNT,
+    RABBITMQ_HOST,
+    TES_QUEUE,
+    TES_RESPONSE_QUEUE,
+    USER_CACHE_SIZE,
+)
+from .order_writer import CLOSED_ORDER_STATUSES, OPEN_ORDER_STATUSES, OrderBatchWriter, OrderEventWriter
+from .user_cache import UserIdCache
 
-RABBITMQ_HOST = "localhost"
-TES_QUEUE = "tes_requests"
-TES_RESPONSE_QUEUE = "tes_responses"
+logger = logging.getLogger(__name__)
 
-OBS_QUEUE = "obs_requests"
-OBS_RESPONSE_QUEUE = "obs_responses"
+# OBS events the TES records, by event name
+ORDER_EVENT_VALIDATORS = {
+    "trade_executed": validate_trade_message,
+    "order_cancelled": validate_order_cancelled_message,
+    "order_rejected": validate_order_rejected_message,
+}
 
 # Database path
 DB_PATH = Path(__file__).parent.parent.parent / "database" / "transactional" / "trading_engine.db"
 
 
 class TradingEngineServer:
-    def __init__(self):
+    def __init__(
+        self,
+        shards=1,
+        batch_size=ORDER_BATCH_SIZE,
+        batch_max_delay_ms=ORDER_BATCH_MAX_DELAY_MS,
+        user_cache_size=USER_CACHE_SIZE,
+        pnl_update_interval_s=PNL_UPDATE_INTERVAL_S,
+    ):
         self._id = str(uuid.uuid4())
+        # Number of OBS shards; orders are routed to a shard queue by symbol hash
+        self.shards = shards
 
         # Initialize database connection
-        self.db_conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        self.db_conn = connect(
+            DB_PATH,
+            check_same_thread=False,
+            settings={**sqlite_settings(), "synchronous": DB_SYNCHRONOUS},
+        )
         self.db_conn.row_factory = sqlite3.Row
-        logger.info(f"(TES): Connected to database at {DB_PATH}")
+        for stmt in SCHEMA:
+            self.db_conn.execute(stmt)
+        self.db_conn.commit()
+        schema_version = migrate(self.db_conn)
+        logger.info(f"(TES): Connected to database at {DB_PATH} (schema version {schema_version})")
+
+        # Orders are group-committed: one transaction per batch_size orders or
+        # batch_max_delay_ms, whichever comes first
+        self.user_cache = UserIdCache(user_cache_size)
+        self.user_cache.warm(self.db_conn)
+        self.order_writer = OrderBatchWriter(
+            self.db_conn, batch_size, batch_max_delay_ms, user_cache=self.user_cache
+        )
+        self.flush_timer = None
+        # Fills, cancels and rejections from the OBS are committed once per drained
+        # delivery batch (or every batch_size events) and acked after the commit
+        self.event_writer = OrderEventWriter(self.db_conn, batch_size)
+
+        # Daily PnL follows the recorded trades, resuming from the analytics checkpoint
+        self.pnl_update_interval = pnl_update_interval_s
+        self.next_pnl_update = 0.0
+        self.analytics_db = None
+        self.pnl_engine = None
+        if pnl_update_interval_s:
+            self.analytics_db = AnalyticsDB()
+            self.pnl_engine = PnLEngine.from_checkpoint(self.analytics_db)
+            logger.info(f"(TES): PnL engine resuming after trade {self.pnl_engine.last_trade_id}")
 
         # Initialize RabbitMQ connection and channel
         logger.info("(TES): Connecting to RabbitMQ")
@@ -40,26 +114,36 @@ class TradingEngineServer:
         self.tes_channel = self.tes_connection.channel()
         self.tes_channel.queue_declare(queue=TES_QUEUE)
         self.tes_channel.queue_declare(queue=TES_RESPONSE_QUEUE)
+        self.tes_channel.queue_declare(queue=OBS_EVENTS_QUEUE)
 
         self.obs_connection = pika.BlockingConnection(pika.ConnectionParameters(host=RABBITMQ_HOST))
         self.obs_channel = self.obs_connection.channel()
-        self.obs_callback_queue = self.obs_channel.queue_declare(
-            queue="", exclusive=True
-        ).method.queue
-        self.obs_channel.basic_consume(
-            queue=self.obs_callback_queue,
-            on_message_callback=self.on_response,
-            auto_ack=True,
-        )
-        self.response = None
-        self.corr_id = None
+        # Request/reply calls to the OBS (connectivity checks)
+        self.obs_rpc = SyncRPCClient(MessageBroker(host=RABBITMQ_HOST))
+        self.obs_rpc.connect()
 
-    def on_response(self, ch, method, props, body):
-        if self.corr_id == props.correlation_id:
-            self.response = json.loads(body)
+        # Where to send fill notifications for each open order: order_id -> (reply_to, corr_id)
+        self.order_reply_to = {}
 
     def on_request(self, ch, method, props, body):
-        request = json.loads(body)
+        request = self.decode(ch, method, props, body)
+        if request is not None:
+            self.handle_request(ch, method, props, request)
+
+    @staticmethod
+    def decode(ch, method, props, body):
+        """Decode a delivery, or nack it without requeueing and return None if it cannot be read."""
+        try:
+            message = decode_message(body, props.content_type)
+            if not isinstance(message, dict):
+                raise ValueError(f"expected an object, got {type(message).__name__}")
+        except ValueError as e:
+            logger.error(f"Dropping undecodable message ({props.content_type}): {e}")
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return None
+        return message
+
+    def handle_request(self, ch, method, props, request):
         action = request.get("action")
         response = {}
         # --- Add your custom logic here ---
@@ -72,116 +156,266 @@ class TradingEngineServer:
                 "message": f"Trader {request.get('trader_id')} connected to TES at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(request.get('timestamp')))}",
             }
         elif action == "place_order":
-            # Handle order placement - persist to database
+            # Handle order placement - validate, persist to database, then route to OBS
             try:
-                trader_id = request.get("trader_id")
-                symbol = request.get("symbol")
-                side = request.get("side")
-                quantity = request.get("quantity")
-                price = request.get("price")
-                # order_type = request.get("type", "limit")  # Future use for order types
-
-                # Get or create user_id from trader_id (UUID)
-                cursor = self.db_conn.cursor()
-
-                # Check if user exists with this trader_id as username
-                cursor.execute("SELECT id FROM users WHERE username = ?", (trader_id,))
-                user = cursor.fetchone()
-
-                if not user:
-                    # Create new user for this trader
-                    cursor.execute(
-                        "INSERT INTO users (username, password_hash) VALUES (?, ?)",
-                        (trader_id, "simulated"),  # Password hash not needed for simulated traders
-                    )
-                    user_id = cursor.lastrowid
-                    logger.info(f"Created new user {user_id} for trader {trader_id[:8]}...")
-                else:
-                    user_id = user[0]
-
-                # Insert order into database
-                cursor.execute(
-                    """INSERT INTO orders (user_id, symbol, side, quantity, price, status)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (user_id, symbol, side, quantity, price, "open"),
-                )
-                order_id = cursor.lastrowid
-                self.db_conn.commit()
-
-                logger.info(f"Order {order_id} placed: {side} {quantity} {symbol} @ {price}")
-                response = {
-                    "status": "ok",
-                    "message": "Order placed successfully",
-                    "order_id": order_id,
-                }
-            except Exception as e:
-                logger.error(f"Error placing order: {e}")
+                validate_place_order_request(request)
+            except MessageValidationError as e:
+                logger.warning(f"Rejected order from {request.get('trader_id')}: {e}")
                 response = {"status": "error", "message": str(e)}
+            else:
+                # Reply and ack are deferred until the order's batch is committed
+                return self.place_order(ch, method, props, request)
+        elif action == "cancel_order":
+            try:
+                validate_cancel_order_request(request)
+            except MessageValidationError as e:
+                logger.warning(f"Rejected cancel from {request.get('trader_id')}: {e}")
+                response = {"status": "error", "message": str(e)}
+            else:
+                response = self.cancel_order(request)
+        elif action == "stats":
+            response = {"status": "ok", "data": self.get_stats()}
         elif action == "buy":
             # Legacy support - redirect to place_order
             request["action"] = "place_order"
             request["side"] = "buy"
-            return self.on_request(ch, method, props, json.dumps(request).encode())
+            return self.handle_request(ch, method, props, request)
         elif action == "sell":
             # Legacy support - redirect to place_order
             request["action"] = "place_order"
             request["side"] = "sell"
-            return self.on_request(ch, method, props, json.dumps(request).encode())
+            return self.handle_request(ch, method, props, request)
         # ----------------------------------
+        self.reply(ch, props, response)
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    def place_order(self, ch, method, props, request):
+        """Queue a validated order for the next group commit; it is acked once flushed."""
+        if self.order_writer.submit(request, (ch, method.delivery_tag, props)):
+            self.flush_orders()
+        elif self.flush_timer is None:
+            # First order of a new batch: bound how long it can wait for the flush
+            self.flush_timer = self.tes_connection.call_later(
+                self.order_writer.max_delay, self.on_flush_timer
+            )
+
+    def cancel_order(self, request):
+        """
+        Forward a trader's cancel for one of its open orders to the OBS shard holding it.
+
+        The OBS confirms with an order_cancelled event, which records the status and tells
+        the trader; an order that has already left the book gets no event.
+        """
+        order_id = request["order_id"]
+        row = self.db_conn.execute(
+            """SELECT o.symbol, o.status FROM orders o JOIN users u ON o.user_id = u.id
+               WHERE o.id = ? AND u.username = ?""",
+            (order_id, request["trader_id"]),
+        ).fetchone()
+        if row is None:
+            return {"status": "error", "order_id": order_id, "message": "Unknown order"}
+        symbol, status = row
+        if status not in OPEN_ORDER_STATUSES:
+            return {"status": "error", "order_id": order_id, "message": f"Order is {status}"}
+        self.route_order({"action": "cancel_order", "order_id": order_id, "symbol": symbol})
+        return {"status": "ok", "order_id": order_id, "message": "Cancel sent to order book"}
+
+    def on_flush_timer(self):
+        self.flush_timer = None
+        self.flush_orders()
+
+    def flush_orders(self):
+        """Persist the pending batch, then ack, reply and route each order to the OBS."""
+        if self.flush_timer is not None:
+            self.tes_connection.remove_timeout(self.flush_timer)
+            self.flush_timer = None
+        for request, (ch, delivery_tag, props), result in self.order_writer.flush():
+            if "error" in result:
+                response = {"status": "error", "message": result["error"]}
+            else:
+                order_id = result["order_id"]
+                logger.debug(
+                    f"Order {order_id} placed: {request['side']} {request['quantity']} "
+                    f"{request['symbol']} @ {request['price']}"
+                )
+                if props.reply_to:
+                    self.order_reply_to[order_id] = (props.reply_to, props.correlation_id)
+                self.route_order(
+                    {
+                        "action": "place_order",
+                        "order_id": order_id,
+                        "user_id": result["user_id"],
+                        "symbol": request["symbol"],
+                        "side": request["side"],
+                        "quantity": request["quantity"],
+                        "price": request["price"],
+                        "order_type": request.get("type", "limit"),
+                        "timestamp": request.get("timestamp") or time.time(),
+                    }
+                )
+                response = {
+                    "status": "ok",
+                    "message": "Order placed successfully",
+                    "order_id": order_id,
+                }
+            self.reply(ch, props, response)
+            ch.basic_ack(delivery_tag=delivery_tag)
+
+    def get_stats(self):
+        """Counters for monitoring the order write path."""
+        return {
+            "user_cache": self.user_cache.stats(),
+            "batches_flushed": self.order_writer.batches_flushed,
+            "orders_flushed": self.order_writer.orders_flushed,
+            "event_batches_flushed": self.event_writer.batches_flushed,
+            "events_flushed": self.event_writer.events_flushed,
+            "open_orders_tracked": len(self.order_reply_to),
+            "pnl_last_trade_id": self.pnl_engine.last_trade_id if self.pnl_engine else None,
+        }
+
+    def reply(self, ch, props, response):
+        """Send a response to the requester's callback queue."""
         ch.basic_publish(
             exchange="",
             routing_key=props.reply_to if props.reply_to else TES_RESPONSE_QUEUE,
             properties=pika.BasicProperties(correlation_id=props.correlation_id),
             body=json.dumps(response),
         )
-        ch.basic_ack(delivery_tag=method.delivery_tag)
 
-    def send_request(self, request, timeout=10, retry=3):
+    def route_order(self, order):
+        """
+        Publish an order or cancel to the OBS shard for its symbol. Fills and cancels come
+        back asynchronously on OBS_EVENTS_QUEUE.
+        """
+        content_type, body = encode_message(order, MESSAGE_CODEC)
+        self.obs_channel.basic_publish(
+            exchange="",
+            routing_key=obs_queue_for_symbol(order["symbol"], self.shards),
+            properties=pika.BasicProperties(content_type=content_type),
+            body=body,
+        )
+
+    def on_obs_event(self, ch, method, props, body):
+        """Queue a fill, cancel or rejection from the OBS; it is recorded and acked with its batch."""
+        event = self.decode(ch, method, props, body)
+        if event is None:
+            return
+        validate = ORDER_EVENT_VALIDATORS.get(event.get("event"))
+        if validate is None:
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+        try:
+            validate(event)
+        except MessageValidationError as e:
+            logger.error(f"Dropping malformed {event['event']} event for {event.get('trade_id') or event.get('order_id')}: {e}")
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+        if self.event_writer.submit(event, (ch, method.delivery_tag)):
+            self.flush_events()
+
+    def flush_events(self):
+        """Commit the queued OBS events in one transaction, then notify traders and ack each one."""
+        for event, (ch, delivery_tag), result in self.event_writer.flush():
+            if "error" in result:
+                ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+                continue
+            if event["event"] == "trade_executed":
+                for order_key, status_key in (
+                    ("buy_order_id", "buy_order_status"),
+                    ("sell_order_id", "sell_order_status"),
+                ):
+                    self.notify_fill(event, event[order_key], event[status_key])
+            else:
+                self.notify_closed(event)
+            ch.basic_ack(delivery_tag=delivery_tag)
+
+    def update_pnl(self, force=False):
+        """Apply trades recorded since the last update to the PnL engine and checkpoint it."""
+        if self.pnl_engine is None:
+            return
+        now = time.monotonic()
+        if not force and now < self.next_pnl_update:
+            return
+        self.next_pnl_update = now + self.pnl_update_interval
+        try:
+            self.pnl_engine.consume(self.db_conn, self.analytics_db)
+        except sqlite3.Error as e:
+            logger.error(f"PnL update failed after trade {self.pnl_engine.last_trade_id}: {e}")
+
+    def notify_closed(self, event):
+        """Tell the trader an order was cancelled or refused, and stop tracking where its fills go."""
+        status = CLOSED_ORDER_STATUSES[event["event"]]
+        if status == "rejected":
+            logger.warning(f"Order {event['order_id']} rejected by OBS: {event['reason']}")
+        target = self.order_reply_to.pop(event["order_id"], None)
+        if target is not None:
+            self.notify(target, {**event, "status": status})
+
+    def notify_fill(self, event, order_id, status):
+        """Send a fill notification to the trader that placed ``order_id``."""
+        target = self.order_reply_to.get(order_id)
+        if target is None:
+            return
+        if status == "filled":
+            del self.order_reply_to[order_id]
+        self.notify(
+            target,
+            {
+                "event": "order_filled",
+                "order_id": order_id,
+                "trade_id": event["trade_id"],
+                "symbol": event["symbol"],
+                "quantity": event["quantity"],
+                "price": event["price"],
+                "status": status,
+                "timestamp": event["timestamp"],
+            },
+        )
+
+    def notify(self, target, message):
+        """Publish an order event to a trader's reply queue, under the order's correlation_id."""
+        reply_to, correlation_id = target
+        self.tes_channel.basic_publish(
+            exchange="",
+            routing_key=reply_to,
+            properties=pika.BasicProperties(correlation_id=correlation_id),
+            body=json.dumps(message),
+        )
+
+    def send_request(self, request, timeout=10, retry=3, queue=OBS_QUEUE):
         logger.info(f"Sending request: {request}")
-        attempt = 0
-        while attempt < retry:
-            self.response = None
-            self.corr_id = str(uuid.uuid4())
-            self.obs_channel.basic_publish(
-                exchange="",
-                routing_key="obs_requests",
-                properties=pika.BasicProperties(
-                    reply_to=self.obs_callback_queue,
-                    correlation_id=self.corr_id,
-                ),
-                body=json.dumps(request),
-            )
-            start_time = time.time()
-            while self.response is None:
-                self.obs_connection.process_data_events()
-                if time.time() - start_time > timeout:
-                    logger.error("Timeout waiting for response from OBS.")
-                    break
-            if self.response is not None:
-                return self.response
-            attempt += 1
-            logger.info(f"Retrying send_request (attempt {attempt + 1}/{retry})...")
-        return self.response
+        for attempt in range(1, retry + 1):
+            try:
+                return self.obs_rpc.call(queue, request, timeout=timeout)
+            except TimeoutError:
+                logger.error("Timeout waiting for response from OBS.")
+            if attempt < retry:
+                logger.info(f"Retrying send_request (attempt {attempt + 1}/{retry})...")
+        return None
 
     def check_obs_connection(self, timeout=10, retry=3):
-        # Check OBS connectivity using send_request with timeout
+        # Check OBS connectivity (every shard) using send_request with timeout
         try:
-            response = self.send_request(
-                {
-                    "action": "connect",
-                    "engine_id": self._id,
-                    "timestamp": time.time(),
-                    "description": "Connecting TES to Order Book Server (OBS)",
-                },
-                timeout=timeout,
-                retry=retry,
-            )
-            if response and response.get("status") == "ok":
-                logger.info(response.get("message", "No message in response"))
-                return True
-            else:
-                logger.error("Order Book Server (OBS) did not respond as expected.")
-                return False
+            for shard in range(self.shards):
+                response = self.send_request(
+                    {
+                        "action": "connect",
+                        "engine_id": self._id,
+                        "timestamp": time.time(),
+                        "description": "Connecting TES to Order Book Server (OBS)",
+                    },
+                    timeout=timeout,
+                    retry=retry,
+                    queue=obs_queue_for_shard(shard, self.shards),
+                )
+                if response and response.get("status") == "ok":
+                    logger.info(response.get("message", "No message in response"))
+                else:
+                    logger.error(
+                        f"Order Book Server (OBS) shard {shard} did not respond as expected."
+                    )
+                    return False
+            return True
         except Exception as e:
             logger.error(f"Failed to connect to Order Book Server (OBS): {e}")
             logger.info("Try running the Order Book Server (OBS) first: \npython main.py -s OBS")
@@ -191,15 +425,30 @@ class TradingEngineServer:
         # Check OBS connectivity using check_obs_connection
         if not self.check_obs_connection():
             logger.error("Failed to connect to Order Book Server (OBS). Exiting.")
+            self.obs_rpc.close()
             return
 
         logger.info("TradingEngineServer started. Waiting for client requests via RabbitMQ...")
-        self.tes_channel.basic_qos(prefetch_count=1)
+        self.tes_channel.basic_qos(prefetch_count=PREFETCH_COUNT)
         self.tes_channel.basic_consume(queue=TES_QUEUE, on_message_callback=self.on_request)
+        self.tes_channel.basic_consume(
+            queue=OBS_EVENTS_QUEUE, on_message_callback=self.on_obs_event
+        )
         try:
             while True:
                 self.tes_connection.process_data_events(time_limit=1)
+                self.flush_events()
+                self.update_pnl()
+                # Keep the OBS connection serviced (heartbeats, flow control)
+                self.obs_connection.process_data_events(time_limit=0)
         except KeyboardInterrupt:
             logger.info("TradingEngineServer stopped by user.")
+            self.flush_orders()
+            self.flush_events()
+            self.update_pnl(force=True)
+            logger.info(f"TES stats: {self.get_stats()}")
+            self.obs_rpc.close()
             self.tes_connection.close()
             self.db_conn.close()
+            if self.analytics_db is not None:
+                self.analytics_db.close()
@@ -0,0 +1,78 @@
+"""
+Bounded LRU cache for trader_id -> user_id lookups.
+Traders are stored as users keyed by username, and the same few thousand traders
+send almost every order, so the users lookup is nearly always redundant.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UserIdCache:
+    """LRU mapping of username (trader UUID) to users.id with hit/miss counters."""
+
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = max(1, capacity)
+        self.entries: "OrderedDict[str, int]" = OrderedDict()
+
+        # Counters for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, username: str) -> Optional[int]:
+        """Return the cached user id, or None on a miss."""
+        user_id = self.entries.get(username)
+        if user_id is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(username)
+        self.hits += 1
+        return user_id
+
+    def put(self, username: str, user_id: int):
+        """Insert or refresh a mapping, evicting the least recently used if full."""
+        self.entries[username] = user_id
+        self.entries.move_to_end(username)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, username: str):
+        """Drop a mapping, e.g. after the transaction that created the user rolled back."""
+        self.entries.pop(username, None)
+
+    def warm(self, db_conn) -> int:
+        """Preload the most recently created users. Returns the number loaded."""
+        cursor = db_conn.cursor()
+        cursor.execute(
+            "SELECT username, id FROM users ORDER BY id DESC LIMIT ?", (self.capacity,)
+        )
+        rows = cursor.fetchall()
+        # Insert oldest first so the newest users end up most recently used
+        for username, user_id in reversed(rows):
+            self.entries[username] = user_id
+        logger.info(f"(TES): Warmed user cache with {len(rows)} users")
+        return len(rows)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -5,9 +5,16 @@ Generates realistic trading data for order book, users, trades, and instruments.
 import random
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from itertools import chain
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional
 import logging
 
+import numpy as np
+
+from database.analytics.metrics import run_trader_metrics
+from database.analytics.pnl import PnLEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -286,6 +293,143 @@ class MockDataGenerator:
         return positions
 
 
+class ScaledMockDataGenerator:
+    """
+    Vectorized, seedable mock data for load and benchmark datasets.
+
+    Users, orders and trades come out in chunks of columns (dicts of numpy arrays, at
+    most ``chunk_size`` rows each), so tens of millions of rows never sit in memory at
+    once. Prices follow a random walk per symbol in whole ticks, inside the
+    SYMBOL_PRICES range, carried from one chunk to the next. Timestamps increase
+    through the time spread, ending now.
+    """
+    
+    ORDER_QUANTITIES = np.array([10, 25, 50, 100, 150, 200, 500], dtype=np.float64)
+    TRADE_QUANTITIES = np.array([10, 25, 50, 100, 150, 200], dtype=np.float64)
+    ORDER_STATUSES = np.array(['open', 'filled', 'partially_filled', 'cancelled'], dtype=object)
+    ORDER_STATUS_WEIGHTS = [0.4, 0.3, 0.2, 0.1]
+    SIDES = np.array(['buy', 'sell'], dtype=object)
+    
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        chunk_size: int = 1_000_000,
+        symbols: List[str] = None,
+        time_spread_hours: int = 24
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+        self.symbols = np.array(symbols or MockDataGenerator.DEV_SYMBOLS, dtype=object)
+        prices = [MockDataGenerator.SYMBOL_PRICES[s] for s in self.symbols]
+        self.tick_size = np.array([tick for _, _, tick in prices])
+        self.min_ticks = np.array([round(low / tick) for low, _, tick in prices], dtype=np.int64)
+        self.max_ticks = np.array([round(high / tick) for _, high, tick in prices], dtype=np.int64)
+        # Every walk starts mid-range
+        self.ticks = (self.min_ticks + self.max_ticks) // 2
+        self.end = datetime.now().replace(microsecond=0)
+        self.span_seconds = time_spread_hours * 3600
+    
+    def _chunks(self, count: int) -> Iterator[slice]:
+        for start in range(0, count, self.chunk_size):
+            yield slice(start, min(start + self.chunk_size, count))
+    
+    def users(self, count: int, first_number: int = 1) -> Iterator[Dict[str, np.ndarray]]:
+        """Users trader<N>, numbered from ``first_number`` (pick one past existing users)."""
+        for rows in self._chunks(count):
+            names = [f'trader{n}' for n in range(first_number + rows.start, first_number + rows.stop)]
+            yield {
+                'username': names,
+                'password_hash': ['mock_hash_' + name for name in names],  # Not secure, just for dev
+            }
+    
+    def orders(self, count: int, user_ids: np.ndarray) -> Iterator[Dict[str, np.ndarray]]:
+        """Limit orders a few ticks behind each symbol's current price."""
+        activity = self._activity(len(user_ids))
+        for rows in self._chunks(count):
+            n = rows.stop - rows.start
+            symbol, ticks = self._walk(n)
+            side = self.rng.integers(0, 2, n)
+            # Buys rest below the current price, sells above it
+            offset = self.rng.integers(0, 10, n) * np.where(side == 0, -1, 1)
+            ticks = np.clip(ticks + offset, self.min_ticks[symbol], self.max_ticks[symbol])
+            yield {
+                'user_id': user_ids[self.rng.choice(len(user_ids), n, p=activity)],
+                'symbol': self.symbols[symbol],
+                'side': self.SIDES[side],
+                'quantity': self.rng.choice(self.ORDER_QUANTITIES, n),
+                'price': self._prices(symbol, ticks),
+                'status': self.ORDER_STATUSES[
+                    self.rng.choice(len(self.ORDER_STATUSES), n, p=self.ORDER_STATUS_WEIGHTS)
+                ],
+                'created_at': self._timestamps(rows, count),
+            }
+    
+    def trades(self, count: int, user_ids: np.ndarray) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Trade rows as the TES records them: each execution is a buy row for the buyer
+        followed by a sell row for the seller, at the same price and quantity.
+        """
+        if len(user_ids) < 2:
+            raise ValueError('Need at least 2 users to generate trades')
+        activity = self._activity(len(user_ids))
+        executions = count // 2
+        for rows in self._chunks(executions):
+            n = rows.stop - rows.start
+            symbol, ticks = self._walk(n)
+            buyer = self.rng.choice(len(user_ids), n, p=activity)
+            # A different user on the other side
+            seller = (buyer + self.rng.integers(1, len(user_ids), n)) % len(user_ids)
+            quantity = self.rng.choice(self.TRADE_QUANTITIES, n)
+            price = self._prices(symbol, ticks)
+            timestamp = self._timestamps(rows, executions)
+            yield {
+                'user_id': np.column_stack([user_ids[buyer], user_ids[seller]]).ravel(),
+                'symbol': np.repeat(self.symbols[symbol], 2),
+                'side': np.tile(self.SIDES, n),
+                'quantity': np.repeat(quantity, 2),
+                'price': np.repeat(price, 2),
+                'timestamp': np.repeat(timestamp, 2),
+            }
+    
+    def _activity(self, n: int) -> np.ndarray:
+        # A few heavy traders and a long tail of occasional ones
+        weights = self.rng.lognormal(0.0, 1.0, n)
+        return weights / weights.sum()
+    
+    def _walk(self, n: int):
+        """Pick a symbol for each of ``n`` events and advance its price walk by -1, 0 or +1 tick."""
+        symbol = self.rng.integers(0, len(self.symbols), n)
+        steps = self.rng.integers(-1, 2, n)
+        # Cumulative steps per symbol, in event order
+        order = np.argsort(symbol, kind='stable')
+        counts = np.bincount(symbol, minlength=len(self.symbols))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        total = np.concatenate(([0], np.cumsum(steps[order])))
+        walked = total[1:] - np.repeat(total[starts], counts)
+        levels = np.repeat(self.ticks, counts) + walked
+        levels = np.clip(levels, np.repeat(self.min_ticks, counts), np.repeat(self.max_ticks, counts))
+        moved = counts > 0
+        self.ticks[moved] = levels[(starts + counts - 1)[moved]]
+        ticks = np.empty(n, dtype=np.int64)
+        ticks[order] = levels
+        return symbol, ticks
+    
+    def _prices(self, symbol: np.ndarray, ticks: np.ndarray) -> np.ndarray:
+        return np.round(ticks * self.tick_size[symbol], 8)
+    
+    def _timestamps(self, rows: slice, count: int) -> List[str]:
+        """Increasing 'YYYY-MM-DD HH:MM:SS' times (the format of CURRENT_TIMESTAMP) for rows of ``count``."""
+        position = (np.arange(rows.start, rows.stop) + self.rng.random(rows.stop - rows.start)) / count
+        seconds = (self.span_seconds * (position - 1)).astype(np.int64)
+        # Format each distinct second once; a chunk covers far fewer seconds than rows
+        unique, inverse = np.unique(seconds, return_inverse=True)
+        text = np.array(
+            [(self.end + timedelta(seconds=s)).strftime('%Y-%m-%d %H:%M:%S') for s in unique.tolist()],
+            dtype=object
+        )
+        return text[inverse].tolist()
+
+
 def initialize_mock_data(db_manager, analytics_db=None, utilities_db=None):
     """
     Initialize databases with mock data.
@@ -302,13 +446,21 @@ def initialize_mock_data(db_manager, analytics_db=None, utilities_db=None):
     # 1. Generate and insert users
     logger.info("Creating mock users...")
     users = generator.generate_users(count=20)
-    user_ids = []
-    for user in users:
-        try:
-            user_id = db_manager.add_user(user['username'], user['password_hash'])
-            user_ids.append(user_id)
-        except Exception as e:
-            logger.warning(f"User {user['username']} might already exist: {e}")
+    # Usernames are random: skip repeats and names already in the database
+    users = list({user['username']: user for user in users}.values())
+    existing = {
+        row[0] for row in db_manager.conn.execute(
+            f"SELECT username FROM users WHERE username IN ({', '.join('?' * len(users))})",
+            [user['username'] for user in users]
+        )
+    }
+    if existing:
+        logger.warning(f"Skipping {len(existing)} users that already exist")
+    try:
+        user_ids = list(db_manager.add_users(u for u in users if u['username'] not in existing))
+    except Exception as e:
+        logger.error(f"Failed to insert users: {e}")
+        user_ids = []
     
     if not user_ids:
         logger.error("No users created. Cannot generate orders/trades.")
@@ -320,90 +472,191 @@ def initialize_mock_data(db_manager, analytics_db=None, utilities_db=None):
     if utilities_db:
         logger.info("Creating instrument definitions...")
         instruments = generator.generate_instruments()
-        for instrument in instruments:
-            try:
-                utilities_db.add_instrument(
-                    symbol=instrument['symbol'],
-                    name=instrument['name'],
-                    asset_class=instrument['asset_class'],
-                    tick_size=instrument['tick_size'],
-                    lot_size=instrument['lot_size']
-                )
-            except Exception as e:
-                logger.warning(f"Instrument {instrument['symbol']} might already exist: {e}")
-    
-    # 3. Generate and insert orders
+        existing = {row[0] for row in utilities_db.conn.execute('SELECT symbol FROM instruments')}
+        try:
+            utilities_db.add_instruments(i for i in instruments if i['symbol'] not in existing)
+        except Exception as e:
+            logger.error(f"Failed to insert instruments: {e}")
+    
+    # 3. Generate and insert orders, in one transaction
     logger.info("Creating mock orders...")
     orders = generator.generate_orders(
         user_ids=user_ids,
         count=100,
         time_spread_hours=24
     )
-    for order in orders:
-        try:
-            db_manager.place_order(
-                user_id=order['user_id'],
-                symbol=order['symbol'],
-                side=order['side'],
-                quantity=order['quantity'],
-                price=order['price']
-            )
-        except Exception as e:
-            logger.error(f"Failed to insert order: {e}")
+    try:
+        db_manager.place_orders(
+            (o['user_id'], o['symbol'], o['side'], o['quantity'], o['price']) for o in orders
+        )
+    except Exception as e:
+        logger.error(f"Failed to insert orders: {e}")
     
-    # 4. Generate and insert trades
+    # 4. Generate and insert trades, in one transaction
     logger.info("Creating mock trades...")
     trades = generator.generate_trades(
         user_ids=user_ids,
         count=50,
         time_spread_hours=24
     )
-    for trade in trades:
-        try:
-            db_manager.record_trade(
-                user_id=trade['user_id'],
-                symbol=trade['symbol'],
-                side=trade['side'],
-                quantity=trade['quantity'],
-                price=trade['price']
-            )
-        except Exception as e:
-            logger.error(f"Failed to insert trade: {e}")
+    try:
+        db_manager.record_trades(
+            (t['user_id'], t['symbol'], t['side'], t['quantity'], t['price']) for t in trades
+        )
+    except Exception as e:
+        logger.error(f"Failed to insert trades: {e}")
     
     # 5. Generate analytics data (if analytics_db provided)
     if analytics_db:
-        logger.info("Creating mock analytics data...")
-        for user_id in user_ids[:10]:  # Just for first 10 users
-            try:
-                # Daily PnL
-                analytics_db.insert_daily_pnl(
-                    user_id=user_id,
-                    date=datetime.now().date().isoformat(),
-                    realized_pnl=random.uniform(-1000, 2000),
-                    unrealized_pnl=random.uniform(-500, 1000),
-                    total_pnl=random.uniform(-1500, 3000)
-                )
-                
-                # Trader metrics
-                total_trades = random.randint(10, 100)
-                winning_trades = random.randint(0, total_trades)
-                analytics_db.insert_trader_metrics(
-                    user_id=user_id,
-                    total_trades=total_trades,
-                    winning_trades=winning_trades,
-                    losing_trades=total_trades - winning_trades,
-                    avg_win=random.uniform(50, 200),
-                    avg_loss=random.uniform(-200, -50),
-                    period_start=(datetime.now() - timedelta(days=30)).date().isoformat(),
-                    period_end=datetime.now().date().isoformat(),
-                    sharpe_ratio=random.uniform(0.5, 2.5),
-                    max_drawdown=random.uniform(-0.3, -0.05)
-                )
-            except Exception as e:
-                logger.error(f"Failed to insert analytics: {e}")
+        _initialize_analytics(db_manager, analytics_db)
     
     logger.info("✅ Mock data initialization complete!")
     logger.info(f"   - {len(user_ids)} users")
     logger.info(f"   - {len(orders)} orders")
     logger.info(f"   - {len(trades)} trades")
     logger.info(f"   - {len(MockDataGenerator.DEV_SYMBOLS)} instruments")
+
+
+def _initialize_analytics(db_manager, analytics_db):
+    """Daily PnL and trader metrics from the trades in the transactional database."""
+    logger.info("Creating mock analytics data...")
+    # Daily PnL from the trades just recorded
+    try:
+        pnl = PnLEngine()
+        pnl.consume(db_manager.conn, analytics_db)
+        if pnl.current_date is not None:
+            pnl.write_day(analytics_db)
+    except Exception as e:
+        logger.error(f"Failed to compute daily PnL: {e}")
+    
+    # Trader metrics over the last 30 days, from the same trades and daily PnL
+    try:
+        run_trader_metrics(
+            db_manager.conn,
+            analytics_db,
+            period_start=(datetime.now() - timedelta(days=30)).date().isoformat(),
+            period_end=datetime.now().date().isoformat(),
+        )
+    except Exception as e:
+        logger.error(f"Failed to compute trader metrics: {e}")
+
+
+def initialize_scaled_mock_data(
+    db_manager,
+    analytics_db=None,
+    utilities_db=None,
+    scale: int = 1,
+    users: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = 1_000_000,
+    time_spread_hours: int = 24
+):
+    """
+    Initialize databases with ``scale`` times the default mock data (20 users, 100
+    orders and 50 trades per unit), from ScaledMockDataGenerator.
+    
+    Rows are streamed into one batch insert per table, a chunk at a time, with the
+    table's indexes rebuilt after the load, so memory stays bounded by ``chunk_size``.
+    
+    Args:
+        db_manager: TransactionalDB instance
+        analytics_db: AnalyticsDB instance (optional)
+        utilities_db: ModelParamsDB instance (optional)
+        scale: Multiplier for the default counts
+        users: Number of users (default 20 * scale)
+        seed: Random seed; the same seed gives the same rows
+        chunk_size: Rows generated at a time
+        time_spread_hours: Orders and trades are spread over this many hours, up to now
+    """
+    from database.bulk import iter_rows
+    
+    generator = ScaledMockDataGenerator(seed, chunk_size, time_spread_hours=time_spread_hours)
+    user_count = users or 20 * scale
+    order_count = 100 * scale
+    trade_count = 50 * scale
+    
+    logger.info(f"Starting scaled mock data initialization (x{scale})...")
+    
+    # 1. Users, numbered after any already in the database
+    first_number = (db_manager.conn.execute('SELECT MAX(id) FROM users').fetchone()[0] or 0) + 1
+    user_ids = db_manager.add_users(chain.from_iterable(
+        iter_rows(chunk, ('username', 'password_hash'))
+        for chunk in generator.users(user_count, first_number)
+    ))
+    if not user_ids:
+        logger.error("No users created. Cannot generate orders/trades.")
+        return
+    user_ids = np.arange(user_ids.start, user_ids.stop)
+    logger.info(f"Created {len(user_ids)} users")
+    
+    # 2. Instruments (if utilities_db provided)
+    if utilities_db:
+        existing = {row[0] for row in utilities_db.conn.execute('SELECT symbol FROM instruments')}
+        utilities_db.add_instruments(
+            i for i in MockDataGenerator().generate_instruments() if i['symbol'] not in existing
+        )
+    
+    # 3. Orders and trades, one streamed batch insert each
+    names = ('user_id', 'symbol', 'side', 'quantity', 'price', 'status', 'created_at')
+    orders = db_manager.place_orders(chain.from_iterable(
+        iter_rows(chunk, names) for chunk in generator.orders(order_count, user_ids)
+    ), rebuild_indexes=True)
+    logger.info(f"Created {len(orders)} orders")
+    
+    names = ('user_id', 'symbol', 'side', 'quantity', 'price', 'timestamp')
+    trades = db_manager.record_trades(chain.from_iterable(
+        iter_rows(chunk, names) for chunk in generator.trades(trade_count, user_ids)
+    ), rebuild_indexes=True)
+    logger.info(f"Created {len(trades)} trades")
+    
+    # 4. Analytics (if analytics_db provided)
+    if analytics_db:
+        _initialize_analytics(db_manager, analytics_db)
+    
+    logger.info("✅ Scaled mock data initialization complete!")
+
+
+def write_mock_parquet(
+    directory,
+    scale: int = 1,
+    users: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = 1_000_000,
+    time_spread_hours: int = 24
+) -> Dict[str, int]:
+    """
+    Write scaled mock users, orders and trades as Parquet files instead of loading
+    them, one file per chunk: ``<directory>/<table>/part-00000.parquet``, ...
+    
+    Users get ids 1..users, as in a fresh database. Needs pyarrow.
+    
+    Returns:
+        Rows written per table
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+    
+    generator = ScaledMockDataGenerator(seed, chunk_size, time_spread_hours=time_spread_hours)
+    user_count = users or 20 * scale
+    user_ids = np.arange(1, user_count + 1)
+    tables = {
+        'users': generator.users(user_count),
+        'orders': generator.orders(100 * scale, user_ids),
+        'trades': generator.trades(50 * scale, user_ids),
+    }
+    
+    written = {}
+    for table, chunks in tables.items():
+        path = Path(directory) / table
+        path.mkdir(parents=True, exist_ok=True)
+        written[table] = 0
+        for part, chunk in enumerate(chunks):
+            if table == 'users':
+                chunk = {'id': np.arange(written[table] + 1, written[table] + len(chunk['username']) + 1), **chunk}
+            pq.write_table(pa.table(chunk), path / f'part-{part:05d}.parquet')
+            written[table] += len(next(iter(chunk.values())))
+        logger.info(f"Wrote {written[table]} {table} to {path}")
+    return written
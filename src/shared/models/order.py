@@ -1,8 +1,8 @@
 """Order model."""
-from dataclasses import dataclass, field
+import time
 from datetime import datetime
-from typing import Literal, Optional
 from enum import Enum
+from typing import Optional
 
 
 class OrderSide(Enum):
@@ -27,55 +27,143 @@ class OrderStatus(Enum):
     REJECTED = "rejected"
 
 
-@dataclass
+# Integer codes used on the hot path; each code indexes the matching enum tuple
+SIDES = tuple(OrderSide)
+ORDER_TYPES = tuple(OrderType)
+ORDER_STATUSES = tuple(OrderStatus)
+
+SIDE_BUY, SIDE_SELL = 0, 1
+TYPE_MARKET, TYPE_LIMIT = 0, 1
+STATUS_PENDING, STATUS_OPEN, STATUS_FILLED, STATUS_PARTIALLY_FILLED, STATUS_CANCELLED, STATUS_REJECTED = range(6)
+
+
+def _codes(members):
+    """Map both enum members and their string values to integer codes."""
+    codes = {member: i for i, member in enumerate(members)}
+    codes.update({member.value: i for i, member in enumerate(members)})
+    return codes
+
+
+SIDE_CODES = _codes(SIDES)
+ORDER_TYPE_CODES = _codes(ORDER_TYPES)
+ORDER_STATUS_CODES = _codes(ORDER_STATUSES)
+
+
+def to_ns(value) -> int:
+    """Convert a datetime (or epoch ns int) to epoch nanoseconds."""
+    if isinstance(value, datetime):
+        return int(value.timestamp()) * 1_000_000_000 + value.microsecond * 1000
+    return int(value)
+
+
+def from_ns(ns: int) -> datetime:
+    """Convert epoch nanoseconds to a local naive datetime."""
+    return datetime.fromtimestamp(ns // 1_000_000_000).replace(microsecond=(ns // 1000) % 1_000_000)
+
+
+def _code(codes: dict, value, kind: str) -> int:
+    try:
+        return codes[value]
+    except KeyError:
+        raise ValueError(f"Invalid {kind}: {value!r}") from None
+
+
 class Order:
-    """Order domain model."""
-    
-    id: str
-    user_id: int
-    symbol: str
-    side: OrderSide
-    order_type: OrderType
-    quantity: float
-    price: float
-    status: OrderStatus = OrderStatus.PENDING
-    filled_quantity: float = 0.0
-    remaining_quantity: Optional[float] = None
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
-    
-    def __post_init__(self):
-        """Post-initialization processing."""
-        if self.remaining_quantity is None:
-            self.remaining_quantity = self.quantity
-        
-        # Convert string enums to proper Enum types
-        if isinstance(self.side, str):
-            self.side = OrderSide(self.side)
-        if isinstance(self.order_type, str):
-            self.order_type = OrderType(self.order_type)
-        if isinstance(self.status, str):
-            self.status = OrderStatus(self.status)
-    
+    """
+    Order domain model.
+
+    Slotted, with side/type/status held as integer codes and timestamps as epoch
+    nanoseconds. The enum and datetime attributes are views over those fields, and
+    ``to_dict`` keeps the original format.
+    """
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "symbol",
+        "side_code",
+        "type_code",
+        "status_code",
+        "quantity",
+        "price",
+        "filled_quantity",
+        "remaining_quantity",
+        "created_ns",
+        "updated_ns",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        user_id: int,
+        symbol: str,
+        side,
+        order_type,
+        quantity: float,
+        price: float,
+        status=OrderStatus.PENDING,
+        filled_quantity: float = 0.0,
+        remaining_quantity: Optional[float] = None,
+        created_at=None,
+        updated_at=None,
+    ):
+        self.id = id
+        self.user_id = user_id
+        self.symbol = symbol
+        self.side_code = _code(SIDE_CODES, side, "side")
+        self.type_code = _code(ORDER_TYPE_CODES, order_type, "order type")
+        self.status_code = _code(ORDER_STATUS_CODES, status, "status")
+        self.quantity = quantity
+        self.price = price
+        self.filled_quantity = filled_quantity
+        self.remaining_quantity = quantity if remaining_quantity is None else remaining_quantity
+        now = time.time_ns()
+        self.created_ns = now if created_at is None else to_ns(created_at)
+        self.updated_ns = now if updated_at is None else to_ns(updated_at)
+
+    @property
+    def side(self) -> OrderSide:
+        return SIDES[self.side_code]
+
+    @property
+    def order_type(self) -> OrderType:
+        return ORDER_TYPES[self.type_code]
+
+    @property
+    def status(self) -> OrderStatus:
+        return ORDER_STATUSES[self.status_code]
+
+    @status.setter
+    def status(self, value):
+        self.status_code = _code(ORDER_STATUS_CODES, value, "status")
+
+    @property
+    def created_at(self) -> datetime:
+        return from_ns(self.created_ns)
+
+    @property
+    def updated_at(self) -> datetime:
+        return from_ns(self.updated_ns)
+
     def fill(self, quantity: float):
         """Fill part or all of the order."""
         if quantity > self.remaining_quantity:
             raise ValueError(f"Cannot fill {quantity}, only {self.remaining_quantity} remaining")
-        
+
         self.filled_quantity += quantity
         self.remaining_quantity -= quantity
-        self.updated_at = datetime.now()
-        
+        self.updated_ns = time.time_ns()
+
         if self.remaining_quantity == 0:
-            self.status = OrderStatus.FILLED
+            self.status_code = STATUS_FILLED
         elif self.filled_quantity > 0:
-            self.status = OrderStatus.PARTIALLY_FILLED
-    
+            self.status_code = STATUS_PARTIALLY_FILLED
+
     def cancel(self):
         """Cancel the order."""
-        self.status = OrderStatus.CANCELLED
-        self.updated_at = datetime.now()
-    
+        self.status_code = STATUS_CANCELLED
+        self.updated_ns = time.time_ns()
+
     def to_dict(self) -> dict:
         """Convert order to dictionary."""
         return {
@@ -92,3 +180,15 @@ class Order:
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
         }
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"Order(id={self.id!r}, user_id={self.user_id!r}, symbol={self.symbol!r}, "
+            f"side={self.side}, order_type={self.order_type}, quantity={self.quantity!r}, "
+            f"price={self.price!r}, status={self.status}, remaining_quantity={self.remaining_quantity!r})"
+        )
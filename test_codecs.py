@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Message codecs: binary round trips and malformed frames."""
+
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from messaging.codecs import (  # noqa: E402
+    BINARY_CONTENT_TYPE,
+    JSON_CONTENT_TYPE,
+    decode_message,
+    encode_message,
+)
+
+ORDER = {
+    "action": "place_order",
+    "order_id": 42,
+    "user_id": 7,
+    "symbol": "AAPL",
+    "side": "sell",
+    "quantity": 10.0,
+    "price": 101.25,
+    "order_type": "limit",
+    "timestamp": 1700000000.5,
+}
+
+TRADE = {
+    "event": "trade_executed",
+    "trade_id": "AAPL-1700000000000-3",
+    "buyer_id": 7,
+    "seller_id": 8,
+    "buy_order_id": 42,
+    "sell_order_id": 43,
+    "symbol": "AAPL",
+    "quantity": 5.0,
+    "price": 101.25,
+    "timestamp": 1700000000.5,
+    "buy_order_status": "partially_filled",
+    "sell_order_status": "filled",
+}
+
+
+@pytest.mark.parametrize("message", [ORDER, TRADE], ids=["order", "trade"])
+def test_binary_round_trip(message):
+    content_type, body = encode_message(message, "binary")
+    assert content_type == BINARY_CONTENT_TYPE
+    assert decode_message(body, content_type) == message
+
+
+def test_other_messages_fall_back_to_json():
+    message = {"action": "cancel_order", "order_id": 42, "symbol": "AAPL"}
+    content_type, body = encode_message(message, "binary")
+    assert content_type == JSON_CONTENT_TYPE
+    assert decode_message(body, content_type) == message
+
+
+@pytest.mark.parametrize("message", [ORDER, TRADE], ids=["order", "trade"])
+@pytest.mark.parametrize("change", [-3, -1, 1])
+def test_wrong_length_is_rejected(message, change):
+    _, body = encode_message(message, "binary")
+    body = body[:change] if change < 0 else body + b"X" * change
+    with pytest.raises(ValueError):
+        decode_message(body, BINARY_CONTENT_TYPE)
+
+
+@pytest.mark.parametrize("message", [ORDER, TRADE], ids=["order", "trade"])
+def test_truncated_header_is_rejected(message):
+    _, body = encode_message(message, "binary")
+    with pytest.raises(ValueError):
+        decode_message(body[:10], BINARY_CONTENT_TYPE)
+
+
+@pytest.mark.parametrize("message,offset", [(ORDER, 1), (ORDER, 2), (ORDER, 3), (TRADE, 1), (TRADE, 2)])
+def test_bad_enum_code_is_a_value_error(message, offset):
+    _, body = encode_message(message, "binary")
+    body = body[:offset] + struct.pack("<B", 200) + body[offset + 1:]
+    with pytest.raises(ValueError, match="code"):
+        decode_message(body, BINARY_CONTENT_TYPE)
+
+
+@pytest.mark.parametrize("body", [b"", b"\x09rest"])
+def test_empty_or_unknown_tag_is_rejected(body):
+    with pytest.raises(ValueError):
+        decode_message(body, BINARY_CONTENT_TYPE)
+
+
+def test_unknown_content_type_is_rejected():
+    with pytest.raises(ValueError):
+        decode_message(b"{}", "application/x-unknown")
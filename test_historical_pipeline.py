@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""Historical pipeline: spill journal replay, dead-lettering and reconnects, with a fake KDB+."""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database.historical.pipeline import HistoricalPipeline, SpillJournal  # noqa: E402
+
+
+class FakeKDB:
+    """Stands in for a QConnection; fails on demand with connection or data errors."""
+
+    def __init__(self):
+        self.down = False
+        self.rejected_ids = set()
+        self.inserted = []
+        self.connects = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def connect(self):
+        self.gate.wait()
+        if self.down:
+            raise ConnectionError("KDB+ is down")
+        self.connects += 1
+        return self
+
+    def __call__(self, op, table, columns):
+        if self.down:
+            raise ConnectionError("connection reset")
+        ids = [str(v) for v in columns[0]]
+        if self.rejected_ids.intersection(ids):
+            raise ValueError("type")
+        self.inserted.append(ids)
+
+    @property
+    def ids(self):
+        return [i for batch in self.inserted for i in batch]
+
+
+def trade(i):
+    return {"id": f"AAPL-{i}", "timestamp": 1700000000.0 + i, "symbol": "AAPL", "quantity": 1.0,
+            "price": 100.0, "buyer": "1", "seller": "2"}
+
+
+def columns(*ids):
+    return [[f"AAPL-{i}" for i in ids], [1700000000.0 + i for i in ids], ["AAPL"] * len(ids),
+            [1.0] * len(ids), [100.0] * len(ids), ["1"] * len(ids), ["2"] * len(ids)]
+
+
+def insert_into(kdb):
+    return lambda table, cols: kdb("insert", table, cols[:1])
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+# --- SpillJournal ---
+
+def test_replay_sends_batches_in_order_and_clears_journal(tmp_path):
+    journal = SpillJournal(tmp_path / "j")
+    journal.append("trade", columns(1, 2))
+    journal.append("trade", columns(3))
+    kdb = FakeKDB()
+
+    assert journal.replay(insert_into(kdb)) == 3
+    assert kdb.inserted == [["AAPL-1", "AAPL-2"], ["AAPL-3"]]
+    assert not journal.has_pending
+    assert not journal.path.exists() and not journal.replay_path.exists()
+
+
+def test_replay_skips_torn_line(tmp_path):
+    journal = SpillJournal(tmp_path / "j")
+    journal.append("trade", columns(1))
+    journal.close()
+    with open(journal.path, "a") as f:
+        f.write('{"table":"trade","colu')
+    kdb = FakeKDB()
+
+    assert journal.replay(insert_into(kdb)) == 1
+    assert kdb.ids == ["AAPL-1"]
+
+
+def test_connection_error_keeps_unsent_batches(tmp_path):
+    journal = SpillJournal(tmp_path / "j")
+    for i in (1, 2, 3):
+        journal.append("trade", columns(i))
+    kdb = FakeKDB()
+    calls = []
+
+    def flaky(table, cols):
+        calls.append(cols[0][0])
+        if len(calls) == 2:
+            raise ConnectionError("connection reset")
+        kdb("insert", table, cols[:1])
+
+    with pytest.raises(ConnectionError):
+        journal.replay(flaky)
+    kept = [json.loads(line) for line in journal.replay_path.read_text().splitlines()]
+    assert [b["columns"][0] for b in kept] == [["AAPL-2"], ["AAPL-3"]]
+    assert all("attempts" not in b for b in kept)
+
+    assert journal.replay(flaky) == 2
+    assert kdb.ids == ["AAPL-1", "AAPL-2", "AAPL-3"]
+
+
+def test_data_error_counts_attempts_then_dead_letters(tmp_path):
+    journal = SpillJournal(tmp_path / "j", max_attempts=3)
+    journal.append("trade", columns(1))
+    journal.append("trade", columns(2))
+    kdb = FakeKDB()
+    kdb.rejected_ids = {"AAPL-1"}
+
+    for attempts in (1, 2):
+        with pytest.raises(ValueError):
+            journal.replay(insert_into(kdb))
+        first = json.loads(journal.replay_path.read_text().splitlines()[0])
+        assert first["attempts"] == attempts
+    assert kdb.ids == []
+
+    # Third failure: dead-lettered, and the batch behind it goes through
+    assert journal.replay(insert_into(kdb)) == 1
+    assert kdb.ids == ["AAPL-2"]
+    dead = [json.loads(line) for line in journal.dead_letter_path.read_text().splitlines()]
+    assert len(dead) == 1
+    assert dead[0]["columns"][0] == ["AAPL-1"]
+    assert dead[0]["attempts"] == 3
+    assert "ValueError" in dead[0]["error"]
+    assert journal.rows_dead_lettered == 1
+    assert not journal.has_pending
+
+
+# --- HistoricalPipeline ---
+
+def make_pipeline(tmp_path, kdb, **kwargs):
+    options = {"batch_size": 2, "flush_interval": 0.05, "reconnect_delay": 0.02}
+    options.update(kwargs)
+    return HistoricalPipeline(kdb.connect, tmp_path / "history.journal", **options)
+
+
+def test_spills_while_down_and_replays_before_new_rows(tmp_path):
+    kdb = FakeKDB()
+    kdb.down = True
+    pipeline = make_pipeline(tmp_path, kdb)
+    for i in (1, 2, 3, 4):
+        pipeline.add_trade(trade(i))
+    wait_for(lambda: pipeline.rows_spilled == 4)
+    assert kdb.inserted == []
+
+    kdb.down = False
+    wait_for(lambda: pipeline.rows_replayed == 4)
+    for i in (5, 6):
+        pipeline.add_trade(trade(i))
+    pipeline.close()
+
+    assert kdb.ids == [f"AAPL-{i}" for i in range(1, 7)]
+    assert pipeline.rows_written == 2
+    assert not pipeline.journal.has_pending
+
+
+def test_rejected_batch_is_dead_lettered_without_reconnecting(tmp_path):
+    kdb = FakeKDB()
+    kdb.rejected_ids = {"AAPL-1"}
+    pipeline = make_pipeline(tmp_path, kdb, max_batch_attempts=3)
+    pipeline.add_trade(trade(1))
+    pipeline.add_trade(trade(2))
+    wait_for(lambda: pipeline.journal.rows_dead_lettered == 2)
+    pipeline.add_trade(trade(3))
+    pipeline.add_trade(trade(4))
+    pipeline.close()
+
+    assert kdb.ids == ["AAPL-3", "AAPL-4"]
+    assert kdb.connects == 1
+    assert pipeline.journal.dead_letter_path.exists()
+
+
+def test_full_queue_overflows_to_journal(tmp_path):
+    kdb = FakeKDB()
+    kdb.gate.clear()
+    pipeline = make_pipeline(tmp_path, kdb, batch_size=1, queue_size=1)
+    pipeline.add_trade(trade(1))
+    # The writer thread is now blocked connecting with trade 1
+    wait_for(lambda: pipeline.queued == 0)
+    pipeline.add_trade(trade(2))
+    pipeline.add_trade(trade(3))
+    assert pipeline.rows_overflowed == 1
+
+    kdb.gate.set()
+    pipeline.close()
+    assert sorted(kdb.ids) == ["AAPL-1", "AAPL-2", "AAPL-3"]
+    assert not pipeline.journal.has_pending
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Local tick store: partitions, out-of-order appends and torn-append repair."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database.historical.local_store import UNSORTED_MARKER, LocalTickStore  # noqa: E402
+from database.historical.writer import rows_to_columns  # noqa: E402
+
+DAY = 1704103200.0  # 2024-01-01 10:00:00 UTC
+
+
+def trade(i, seconds, symbol="AAPL", price=100.0, quantity=1.0):
+    return {"id": f"{symbol}-{i}", "timestamp": DAY + seconds, "symbol": symbol,
+            "quantity": quantity, "price": price, "buyer": "1", "seller": "2"}
+
+
+def partition(store, symbol="AAPL", day="2024-01-01"):
+    return store.root / "trade" / day / symbol
+
+
+def test_sorted_appends_and_time_range(tmp_path):
+    store = LocalTickStore(tmp_path)
+    store.insert_trades([trade(i, i) for i in range(10)])
+    store.insert_trades([trade(i, i) for i in range(10, 20)])
+
+    assert not (partition(store) / UNSORTED_MARKER).exists()
+    frame = store.query_trades("AAPL", DAY + 5, DAY + 14)
+    assert frame["id"].tolist() == [f"AAPL-{i}" for i in range(5, 15)]
+    assert frame["timestamp"].is_monotonic_increasing
+
+
+def test_out_of_order_appends_mark_partition_unsorted(tmp_path):
+    store = LocalTickStore(tmp_path)
+    store.insert_trades([trade(i, i) for i in range(10, 20)])
+    store.insert_trades([trade(i, i) for i in range(10)])
+
+    assert (partition(store) / UNSORTED_MARKER).exists()
+    frame = store.query_trades("AAPL", DAY + 5, DAY + 14)
+    assert frame["id"].tolist() == [f"AAPL-{i}" for i in range(5, 15)]
+
+
+def test_unsorted_within_one_batch(tmp_path):
+    store = LocalTickStore(tmp_path)
+    store.insert_trades([trade(1, 3), trade(2, 1), trade(3, 2)])
+
+    assert (partition(store) / UNSORTED_MARKER).exists()
+    assert store.query_trades("AAPL")["id"].tolist() == ["AAPL-2", "AAPL-3", "AAPL-1"]
+
+
+def test_partitions_by_symbol_and_day(tmp_path):
+    store = LocalTickStore(tmp_path)
+    store.insert_trades([trade(1, 0), trade(2, 1, symbol="MSFT"), trade(3, 86400)])
+
+    assert partition(store).exists()
+    assert partition(store, "MSFT").exists()
+    assert partition(store, day="2024-01-02").exists()
+    assert store.query_trades("AAPL")["id"].tolist() == ["AAPL-1", "AAPL-3"]
+    assert store.query_trades(["AAPL", "MSFT"], DAY, DAY + 10)["id"].tolist() == ["AAPL-1", "MSFT-2"]
+
+
+def test_repair_truncates_torn_append(tmp_path):
+    store = LocalTickStore(tmp_path)
+    store.insert_trades([trade(i, i) for i in range(5)])
+    # A crash mid-append: some columns got the new row, others did not
+    path = partition(store)
+    with open(path / "timestamp.bin", "ab") as f:
+        f.write(b"\x00" * 8)
+    with open(path / "id.data", "ab") as f:
+        f.write(b"AAPL-99")
+
+    reopened = LocalTickStore(tmp_path)
+    reopened.insert_trade(trade(5, 5))
+
+    frame = reopened.query_trades("AAPL")
+    assert frame["id"].tolist() == [f"AAPL-{i}" for i in range(6)]
+    assert (path / "timestamp.bin").stat().st_size == 6 * 8
+
+
+def test_ohlcv_and_vwap(tmp_path):
+    store = LocalTickStore(tmp_path)
+    store.insert_trades([trade(1, 0, price=10.0, quantity=1.0), trade(2, 10, price=12.0, quantity=3.0),
+                         trade(3, 70, price=11.0, quantity=2.0)])
+
+    bars = store.ohlcv("1min", "AAPL")
+    assert bars[["open", "high", "low", "close", "volume", "trades"]].values.tolist() == [
+        [10.0, 12.0, 10.0, 12.0, 4.0, 2], [11.0, 11.0, 11.0, 11.0, 2.0, 1]]
+    assert store.vwap("AAPL")["vwap"].tolist() == pytest.approx([(10 + 36 + 22) / 6])
+
+
+def test_insert_through_query_interface(tmp_path):
+    store = LocalTickStore(tmp_path)
+    # Columns as HistoricalWriter sends them (see writer.to_columns)
+    store("insert", "trade", rows_to_columns("trade", [trade(1, 0)]))
+    assert store.query_trades("AAPL", DAY, DAY + 1)["id"].tolist() == ["AAPL-1"]
+    with pytest.raises(ValueError):
+        store("select from trade")
+
+
+@pytest.mark.parametrize("symbol", ["", ".hidden", "A/B"])
+def test_symbol_must_name_a_directory(tmp_path, symbol):
+    store = LocalTickStore(tmp_path)
+    with pytest.raises(ValueError):
+        store.insert_trade(trade(1, 0, symbol=symbol))
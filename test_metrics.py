@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""Trader metrics: per-fill PnL, grouped win/loss counts, Sharpe and drawdown for all users."""
+
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database.analytics.aggregations import AnalyticsDB  # noqa: E402
+from database.analytics.metrics import (  # noqa: E402
+    TRADING_DAYS,
+    TradeArrays,
+    compute_trader_metrics,
+    run_trader_metrics,
+    trade_pnl,
+)
+
+
+def arrays(*fills):
+    """TradeArrays from (user_id, symbol, signed quantity, price, day) fills."""
+    user, symbol, quantity, price, day = zip(*fills)
+    return TradeArrays(
+        np.array(user, dtype=np.int64),
+        np.array(symbol, dtype=np.int64),
+        np.array(quantity, dtype=np.float64),
+        np.array(price, dtype=np.float64),
+        np.array(day, dtype=np.int64),
+    )
+
+
+def reference(series):
+    """Sharpe and max drawdown of one user's daily PnL, the slow way."""
+    sharpe = math.nan
+    if len(series) > 1:
+        mean = sum(series) / len(series)
+        std = math.sqrt(sum((x - mean) ** 2 for x in series) / (len(series) - 1))
+        if std > 0:
+            sharpe = mean / std * math.sqrt(TRADING_DAYS)
+    equity = peak = drawdown = 0.0
+    for pnl in series:
+        equity += pnl
+        peak = max(peak, equity)
+        drawdown = min(drawdown, equity - peak)
+    return sharpe, drawdown
+
+
+def test_trade_pnl_marks_fills_at_symbol_and_day_close():
+    trades = arrays(
+        (1, 0, 10, 100, 0),    # bought below the day-0 close of 105: +50
+        (2, 1, -5, 50, 0),     # other symbol, its own close of 40: +50
+        (1, 0, -10, 105, 0),   # the close itself: 0
+        (2, 1, 5, 40, 0),
+        (1, 0, 10, 90, 1),     # next day closes at 95: +50
+        (2, 0, -10, 95, 1),
+    )
+    assert trade_pnl(trades).tolist() == [50.0, 50.0, 0.0, 0.0, 50.0, 0.0]
+
+
+def test_trade_pnl_of_no_trades_is_empty():
+    empty = np.array([], dtype=np.int64)
+    trades = TradeArrays(empty, empty, empty.astype(float), empty.astype(float), empty)
+    assert trade_pnl(trades).shape == (0,)
+
+
+def test_win_loss_counts_and_averages_per_user():
+    trade_user = np.array([1, 1, 1, 3, 3], dtype=np.int64)
+    fill_pnl = np.array([10.0, 30.0, -5.0, 0.0, -7.0])
+    empty = np.array([], dtype=np.int64)
+    metrics = compute_trader_metrics(trade_user, fill_pnl, empty, empty.astype(float))
+
+    assert metrics.user_id.tolist() == [1, 3]
+    assert metrics.total_trades.tolist() == [3, 2]
+    assert metrics.winning_trades.tolist() == [2, 0]
+    assert metrics.losing_trades.tolist() == [1, 1]
+    assert metrics.avg_win.tolist() == [20.0, 0.0]
+    assert metrics.avg_loss.tolist() == [-5.0, -7.0]
+    assert np.isnan(metrics.sharpe_ratio).all()
+    assert np.isnan(metrics.max_drawdown).all()
+
+
+def test_sharpe_and_drawdown_match_per_user_loop():
+    series = {
+        1: [100.0, -50.0, 20.0, -80.0, 40.0],
+        2: [-10.0, -20.0, 5.0],         # losing from the first day is a drawdown
+        4: [25.0],                      # one day: no Sharpe
+        5: [10.0, 10.0, 10.0],          # no variance: no Sharpe
+    }
+    pnl_user = np.array([u for u, s in series.items() for _ in s], dtype=np.int64)
+    daily_pnl = np.array([x for s in series.values() for x in s])
+    empty = np.array([], dtype=np.int64)
+    metrics = compute_trader_metrics(empty, empty.astype(float), pnl_user, daily_pnl)
+
+    assert metrics.user_id.tolist() == list(series)
+    assert metrics.total_trades.tolist() == [0, 0, 0, 0]
+    for i, values in enumerate(series.values()):
+        sharpe, drawdown = reference(values)
+        assert metrics.max_drawdown[i] == pytest.approx(drawdown)
+        if math.isnan(sharpe):
+            assert np.isnan(metrics.sharpe_ratio[i])
+        else:
+            assert metrics.sharpe_ratio[i] == pytest.approx(sharpe)
+
+
+def test_rows_store_undefined_metrics_as_null():
+    pnl_user = np.array([1], dtype=np.int64)
+    metrics = compute_trader_metrics(
+        np.array([1], dtype=np.int64), np.array([5.0]), pnl_user, np.array([5.0])
+    )
+    assert metrics.rows("2024-01-01", "2024-01-31") == [
+        (1, 1, 1, 0, 5.0, 0.0, None, 0.0, "2024-01-01", "2024-01-31")
+    ]
+
+
+def test_run_trader_metrics_reads_period_and_writes_rows(tmp_path):
+    trans = sqlite3.connect(":memory:")
+    trans.execute(
+        """CREATE TABLE trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, symbol TEXT NOT NULL,
+            side TEXT NOT NULL, quantity REAL NOT NULL, price REAL NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )"""
+    )
+    trans.executemany(
+        "INSERT INTO trades (user_id, symbol, side, quantity, price, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (1, "AAPL", "buy", 10, 100, "2023-12-31 15:00:00"),   # before the period
+            (1, "AAPL", "buy", 10, 100, "2024-01-02 10:00:00"),
+            (2, "AAPL", "sell", 10, 100, "2024-01-02 10:00:00"),
+            (2, "AAPL", "buy", 10, 110, "2024-01-02 15:00:00"),
+            (1, "AAPL", "buy", 10, 100, "2024-02-01 10:00:00"),   # after it
+        ],
+    )
+    analytics = AnalyticsDB(tmp_path / "analytics.db")
+    try:
+        analytics.insert_daily_pnls([
+            (1, "2024-01-02", 0.0, 100.0, 100.0),
+            (2, "2024-01-02", 0.0, 0.0, -100.0),
+            (1, "2024-01-03", 0.0, 50.0, -50.0),
+        ])
+        metrics = run_trader_metrics(trans, analytics, "2024-01-01", "2024-01-31")
+        assert metrics.user_id.tolist() == [1, 2]
+        assert metrics.total_trades.tolist() == [1, 2]
+
+        rows = analytics.conn.execute(
+            """SELECT user_id, total_trades, winning_trades, losing_trades, max_drawdown
+               FROM trader_metrics ORDER BY user_id"""
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [(1, 1, 1, 0, -50.0), (2, 2, 0, 1, -100.0)]
+
+        assert run_trader_metrics(trans, analytics, "2025-01-01", "2025-01-31") is None
+    finally:
+        analytics.close()
+        trans.close()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Transactional migrations: every portal query is served by an index."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database.transactional.migrations import LATEST_VERSION, migrate  # noqa: E402
+from database.transactional.models import SCHEMA  # noqa: E402
+from database.transactional.portal_queries import (  # noqa: E402
+    QUERIES,
+    plan,
+    uses_covering_index,
+    uses_index,
+)
+
+
+@pytest.fixture(scope="module")
+def conn():
+    conn = sqlite3.connect(":memory:")
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    assert migrate(conn) == LATEST_VERSION
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("label", list(QUERIES))
+def test_portal_query_uses_index(conn, label):
+    sql, params, name, covered = QUERIES[label]
+    steps = plan(conn, sql, params)
+    assert any(step.split()[1] == name for step in steps), f"{label}: {name} not in plan"
+    assert uses_index(steps, name), f"{label}: {steps}"
+    if covered:
+        assert uses_covering_index(steps, name), f"{label}: {steps}"
+
+
+def test_migrations_apply_one_at_a_time(conn):
+    fresh = sqlite3.connect(":memory:")
+    for stmt in SCHEMA:
+        fresh.execute(stmt)
+    assert migrate(fresh, target=1) == 1
+    assert migrate(fresh) == LATEST_VERSION
+    indexes = {row[0] for row in fresh.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert indexes == {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    fresh.close()
+
+
+def test_migrate_is_idempotent(conn):
+    assert migrate(conn) == LATEST_VERSION
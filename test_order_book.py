@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""Order book matching: per-trade order statuses during a sweep."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from servers.obs.order_book import OrderBook  # noqa: E402
+
+
+def test_multi_level_sweep_statuses():
+    book = OrderBook("AAPL")
+    book.add_order(1, 1, "sell", 100.00, 5)
+    book.add_order(2, 1, "sell", 100.01, 5)
+
+    trades = book.add_order(3, 2, "buy", 100.01, 10)
+
+    assert [(t["sell_order_id"], t["quantity"], t["price"]) for t in trades] == [(1, 5, 100.00), (2, 5, 100.01)]
+    assert (trades[0]["buy_order_status"], trades[0]["sell_order_status"]) == ("partially_filled", "filled")
+    assert (trades[1]["buy_order_status"], trades[1]["sell_order_status"]) == ("filled", "filled")
+
+
+def test_partial_fill_of_resting_order():
+    book = OrderBook("AAPL")
+    book.add_order(1, 1, "buy", 100.00, 10)
+
+    trades = book.add_order(2, 2, "sell", 100.00, 4)
+
+    assert len(trades) == 1
+    assert (trades[0]["buy_order_status"], trades[0]["sell_order_status"]) == ("partially_filled", "filled")
+    assert 1 in book
+
+
+def test_trade_ids_increase_across_restarts():
+    first = OrderBook("AAPL")
+    first.add_order(1, 1, "sell", 100.00, 5)
+    before = first.add_order(2, 2, "buy", 100.00, 5)[0]["id"]
+
+    # A new book for the same symbol, as after an OBS restart
+    second = OrderBook("AAPL")
+    second.add_order(1, 1, "sell", 100.00, 5)
+    after = second.add_order(2, 2, "buy", 100.00, 5)[0]["id"]
+
+    assert after > before
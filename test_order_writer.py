@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""TES group-commit writers: one failed order or event never takes its batch with it."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database.transactional.models import SCHEMA  # noqa: E402
+from servers.tes.order_writer import OrderBatchWriter, OrderEventWriter  # noqa: E402
+from servers.tes.user_cache import UserIdCache  # noqa: E402
+
+
+@pytest.fixture
+def db_conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "tes.db")
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def order(trader_id, symbol="AAPL", side="buy"):
+    return {"trader_id": trader_id, "symbol": symbol, "side": side, "quantity": 10, "price": 100.0}
+
+
+def usernames(conn):
+    return [row[0] for row in conn.execute("SELECT username FROM users ORDER BY id")]
+
+
+def test_batch_commits_orders_and_new_users(db_conn):
+    cache = UserIdCache()
+    writer = OrderBatchWriter(db_conn, batch_size=2, user_cache=cache)
+    assert not writer.submit(order("trader-a"), "a")
+    assert writer.submit(order("trader-b"), "b")
+
+    results = writer.flush()
+    assert [context for _, context, _ in results] == ["a", "b"]
+    assert all("order_id" in result for _, _, result in results)
+    assert usernames(db_conn) == ["trader-a", "trader-b"]
+    assert cache.get("trader-a") == results[0][2]["user_id"]
+    assert writer.batches_flushed == 1 and writer.orders_flushed == 2
+
+
+def test_failed_order_rolls_back_only_its_own_new_user(db_conn):
+    cache = UserIdCache()
+    writer = OrderBatchWriter(db_conn, user_cache=cache)
+    writer.submit(order("trader-a"))
+    writer.submit(order("trader-bad", symbol=None))     # orders.symbol is NOT NULL
+    writer.submit(order("trader-c"))
+
+    results = writer.flush()
+    assert ["error" in result for _, _, result in results] == [False, True, False]
+    assert usernames(db_conn) == ["trader-a", "trader-c"]
+    assert db_conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 2
+    assert cache.get("trader-bad") is None
+
+    # The trader's next order creates the user for real
+    writer.submit(order("trader-bad"))
+    (_, _, result), = writer.flush()
+    assert usernames(db_conn) == ["trader-a", "trader-c", "trader-bad"]
+    assert cache.get("trader-bad") == result["user_id"]
+
+
+def test_failed_commit_fails_whole_batch(db_conn):
+    cache = UserIdCache()
+    writer = OrderBatchWriter(db_conn, user_cache=cache)
+    writer.submit(order("trader-a"))
+    db_conn.execute("DROP TABLE orders")
+
+    (_, _, result), = writer.flush()
+    assert "error" in result
+    assert usernames(db_conn) == []
+    assert cache.get("trader-a") is None
+
+
+def test_event_writer_isolates_bad_event(db_conn):
+    writer = OrderBatchWriter(db_conn)
+    writer.submit(order("trader-a"))
+    (_, _, placed), = writer.flush()
+
+    events = OrderEventWriter(db_conn)
+    events.submit({"event": "order_cancelled", "order_id": placed["order_id"]}, "ok")
+    events.submit({"event": "order_exploded", "order_id": placed["order_id"]}, "bad")
+
+    results = events.flush()
+    assert [("error" in result) for _, _, result in results] == [False, True]
+    status = db_conn.execute("SELECT status FROM orders WHERE id = ?", (placed["order_id"],)).fetchone()[0]
+    assert status == "cancelled"
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""PnL engine: FIFO and average-cost lots, day closes, checkpoints and daily_pnl upserts."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database.analytics.aggregations import AnalyticsDB  # noqa: E402
+from database.analytics.pnl import AVERAGE, FIFO, PnLEngine  # noqa: E402
+
+
+@pytest.fixture
+def trades_db():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """CREATE TABLE trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            symbol TEXT NOT NULL,
+            side TEXT NOT NULL,
+            quantity REAL NOT NULL,
+            price REAL NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )"""
+    )
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    db = AnalyticsDB(tmp_path / "analytics.db")
+    yield db
+    db.close()
+
+
+def record(conn, *trades):
+    conn.executemany(
+        "INSERT INTO trades (user_id, symbol, side, quantity, price, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+        trades,
+    )
+    conn.commit()
+
+
+def daily_pnl(analytics):
+    return [
+        tuple(row)
+        for row in analytics.conn.execute(
+            "SELECT user_id, date, realized_pnl, unrealized_pnl, total_pnl FROM daily_pnl ORDER BY date, user_id"
+        )
+    ]
+
+
+def test_fifo_closes_oldest_lots_first():
+    engine = PnLEngine(FIFO)
+    engine.on_trade(1, "AAPL", "buy", 10, 100)
+    engine.on_trade(1, "AAPL", "buy", 10, 110)
+    assert engine.on_trade(1, "AAPL", "sell", 15, 120) == pytest.approx(10 * 20 + 5 * 10)
+    assert engine.unrealized(1) == pytest.approx(5 * (120 - 110))
+
+
+def test_average_cost_uses_mean_price():
+    engine = PnLEngine(AVERAGE)
+    engine.on_trade(1, "AAPL", "buy", 10, 100)
+    engine.on_trade(1, "AAPL", "buy", 10, 110)
+    assert engine.on_trade(1, "AAPL", "sell", 15, 120) == pytest.approx(15 * 15)
+    assert engine.unrealized(1) == pytest.approx(5 * 15)
+
+
+def test_fill_that_flips_position_opens_the_remainder():
+    engine = PnLEngine()
+    engine.on_trade(1, "AAPL", "buy", 5, 100)
+    assert engine.on_trade(1, "AAPL", "sell", 8, 90) == pytest.approx(-50)
+    engine.mark("AAPL", 80)
+    assert engine.unrealized(1) == pytest.approx(3 * 10)
+
+
+def test_close_day_totals_include_change_in_unrealized():
+    engine = PnLEngine()
+    engine.on_trade(1, "AAPL", "buy", 10, 100)
+    engine.mark("AAPL", 105)
+    assert engine.close_day("2024-01-01") == [(1, "2024-01-01", 0.0, 50.0, 50.0)]
+
+    engine.on_trade(1, "AAPL", "sell", 10, 103)
+    assert engine.close_day("2024-01-02") == [(1, "2024-01-02", 30.0, 0.0, -20.0)]
+    # Flat users are forgotten once their day is closed
+    assert engine.close_day("2024-01-03") == []
+
+
+def test_consume_closes_days_as_trade_date_moves(trades_db, analytics):
+    record(
+        trades_db,
+        (1, "AAPL", "buy", 10, 100, "2024-01-01 10:00:00"),
+        (2, "AAPL", "sell", 10, 100, "2024-01-01 10:00:00"),
+        (1, "AAPL", "sell", 10, 110, "2024-01-02 10:00:00"),
+    )
+    engine = PnLEngine()
+    closed = engine.consume(trades_db, analytics)
+
+    assert closed == [(1, "2024-01-01", 0.0, 0.0, 0.0), (2, "2024-01-01", 0.0, 0.0, 0.0)]
+    assert engine.current_date == "2024-01-02"
+    assert engine.last_trade_id == 3
+    engine.write_day(analytics)
+    assert daily_pnl(analytics)[2:] == [
+        (1, "2024-01-02", 100.0, 0.0, 100.0),
+        (2, "2024-01-02", 0.0, -100.0, -100.0),
+    ]
+
+
+def test_checkpoint_restores_open_lots_without_rescanning(trades_db, analytics):
+    record(
+        trades_db,
+        (1, "AAPL", "buy", 10, 100, "2024-01-01 10:00:00"),
+        (1, "AAPL", "buy", 10, 110, "2024-01-01 11:00:00"),
+    )
+    PnLEngine().consume(trades_db, analytics)
+
+    restored = PnLEngine.from_checkpoint(analytics)
+    assert restored.last_trade_id == 2
+    assert restored.current_date == "2024-01-01"
+    assert list(restored.positions) == [1]
+    assert restored.trades_processed == 0
+
+    record(trades_db, (1, "AAPL", "sell", 15, 120, "2024-01-01 12:00:00"))
+    restored.consume(trades_db, analytics)
+    assert restored.trades_processed == 1
+    assert restored.realized_today[1] == pytest.approx(10 * 20 + 5 * 10)
+    assert restored.unrealized(1) == pytest.approx(5 * 10)
+
+
+def test_checkpoint_with_other_lot_method_is_refused(trades_db, analytics):
+    record(trades_db, (1, "AAPL", "buy", 10, 100, "2024-01-01 10:00:00"))
+    PnLEngine(FIFO).consume(trades_db, analytics)
+    with pytest.raises(ValueError, match="fifo"):
+        PnLEngine.from_checkpoint(analytics, AVERAGE)
+
+
+def test_missing_checkpoint_starts_a_new_engine(analytics):
+    engine = PnLEngine.from_checkpoint(analytics)
+    assert engine.last_trade_id == 0
+    assert not engine.positions
+
+
+def test_replay_from_older_checkpoint_replaces_daily_rows(trades_db, analytics):
+    record(
+        trades_db,
+        (1, "AAPL", "buy", 10, 100, "2024-01-01 10:00:00"),
+        (1, "AAPL", "sell", 10, 105, "2024-01-02 10:00:00"),
+    )
+    PnLEngine().consume(trades_db, analytics)
+    # A second engine that never saw the checkpoint closes the same day again
+    PnLEngine().consume(trades_db, analytics)
+    assert daily_pnl(analytics) == [(1, "2024-01-01", 0.0, 0.0, 0.0)]
+
+
+def test_daily_pnl_upsert_on_user_and_date(analytics):
+    analytics.insert_daily_pnl(1, "2024-01-01", 1.0, 2.0, 3.0)
+    assert analytics.insert_daily_pnls([(1, "2024-01-01", 4.0, 5.0, 9.0), (2, "2024-01-01", 0.0, 1.0, 1.0)]) == 2
+    assert daily_pnl(analytics) == [(1, "2024-01-01", 4.0, 5.0, 9.0), (2, "2024-01-01", 0.0, 1.0, 1.0)]
+
+
+def test_legacy_daily_pnl_table_is_deduplicated_and_keyed(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """CREATE TABLE daily_pnl (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, date DATE NOT NULL,
+            realized_pnl REAL NOT NULL, unrealized_pnl REAL NOT NULL, total_pnl REAL NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )"""
+    )
+    conn.executemany(
+        "INSERT INTO daily_pnl (user_id, date, realized_pnl, unrealized_pnl, total_pnl) VALUES (?, ?, ?, ?, ?)",
+        [(1, "2024-01-01", 1.0, 0.0, 1.0), (1, "2024-01-01", 2.0, 0.0, 2.0)],
+    )
+    conn.commit()
+    conn.close()
+
+    analytics = AnalyticsDB(path)
+    try:
+        assert daily_pnl(analytics) == [(1, "2024-01-01", 2.0, 0.0, 2.0)]
+        analytics.insert_daily_pnl(1, "2024-01-01", 3.0, 0.0, 3.0)
+        assert daily_pnl(analytics) == [(1, "2024-01-01", 3.0, 0.0, 3.0)]
+    finally:
+        analytics.close()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""TES request handling that needs no broker: cancels are checked and routed by symbol."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database.transactional.models import SCHEMA  # noqa: E402
+from messaging.codecs import decode_message  # noqa: E402
+from messaging.routing import obs_queue_for_symbol  # noqa: E402
+from servers.tes.order_writer import OrderBatchWriter  # noqa: E402
+from servers.tes.server import TradingEngineServer  # noqa: E402
+
+
+class RecordingChannel:
+    """Keeps what the TES publishes to the OBS instead of sending it."""
+
+    def __init__(self):
+        self.published = []
+
+    def basic_publish(self, exchange, routing_key, properties, body):
+        self.published.append((routing_key, decode_message(body, properties.content_type)))
+
+
+@pytest.fixture
+def tes(tmp_path):
+    conn = sqlite3.connect(tmp_path / "tes.db")
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    conn.commit()
+    # Only the parts of the server cancel_order uses; __init__ would connect to RabbitMQ
+    server = TradingEngineServer.__new__(TradingEngineServer)
+    server.db_conn = conn
+    server.shards = 4
+    server.obs_channel = RecordingChannel()
+    yield server
+    conn.close()
+
+
+def place(tes, trader_id, symbol):
+    writer = OrderBatchWriter(tes.db_conn)
+    writer.submit({"trader_id": trader_id, "symbol": symbol, "side": "buy", "quantity": 1, "price": 10.0})
+    (_, _, result), = writer.flush()
+    return result["order_id"]
+
+
+def test_cancel_routes_to_the_shard_for_the_order_symbol(tes):
+    order_id = place(tes, "trader-a", "MSFT")
+    response = tes.cancel_order({"action": "cancel_order", "trader_id": "trader-a", "order_id": order_id})
+
+    assert response["status"] == "ok"
+    assert tes.obs_channel.published == [
+        (obs_queue_for_symbol("MSFT", 4), {"action": "cancel_order", "order_id": order_id, "symbol": "MSFT"})
+    ]
+
+
+def test_cancel_of_another_traders_order_is_refused(tes):
+    order_id = place(tes, "trader-a", "MSFT")
+    place(tes, "trader-b", "AAPL")
+    response = tes.cancel_order({"action": "cancel_order", "trader_id": "trader-b", "order_id": order_id})
+
+    assert response == {"status": "error", "order_id": order_id, "message": "Unknown order"}
+    assert tes.obs_channel.published == []
+
+
+def test_cancel_of_closed_order_is_refused(tes):
+    order_id = place(tes, "trader-a", "MSFT")
+    tes.db_conn.execute("UPDATE orders SET status = 'filled' WHERE id = ?", (order_id,))
+    response = tes.cancel_order({"action": "cancel_order", "trader_id": "trader-a", "order_id": order_id})
+
+    assert response["message"] == "Order is filled"
+    assert tes.obs_channel.published == []